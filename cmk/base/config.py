@@ -594,6 +594,7 @@ def _perform_post_config_loading_actions() -> None:
     """These tasks must be performed after loading the Check_MK base configuration"""
     # First cleanup things (needed for e.g. reloading the config)
     cache_manager.clear_all()
+    cache_manager.set_max_size(config_cache_max_size)
 
     global_dict = globals()
     _collect_parameter_rulesets_from_globals(global_dict)
@@ -1954,29 +1955,65 @@ class ConfigCache:
                 ServiceID,
                 tuple[RulesetName, ConfiguredService],
             ],
-        ] = {}
-        self.__is_piggyback_host: dict[HostName, bool] = {}
-        self.__snmp_config: dict[tuple[HostName, HostAddress, SourceType], SNMPHostConfig] = {}
-        self.__hwsw_inventory_parameters: dict[HostName, HWSWInventoryParameters] = {}
-        self.__explicit_host_attributes: dict[HostName, dict[str, str]] = {}
-        self.__computed_datasources: dict[HostName | HostAddress, ComputedDataSources] = {}
-        self.__discovery_check_parameters: dict[HostName, DiscoveryCheckParameters] = {}
-        self.__active_checks: dict[HostName, Sequence[SSCRules]] = {}
-        self.__special_agents: dict[HostName, MixedSSCRules] = {}
-        self.__hostgroups: dict[HostName, Sequence[str]] = {}
-        self.__contactgroups: dict[HostName, Sequence[_ContactgroupName]] = {}
-        self.__explicit_check_command: dict[HostName, HostCheckCommand] = {}
-        self.__snmp_fetch_interval: dict[tuple[HostName, SectionName], int | None] = {}
-        self.__labels: dict[HostName, Labels] = {}
-        self.__label_sources: dict[HostName, LabelSources] = {}
-        self.__notification_plugin_parameters: dict[tuple[HostName, str], Mapping[str, object]] = {}
-        self.__snmp_backend: dict[HostName, SNMPBackendEnum] = {}
+        ] = cache_manager.new_evictable_cache("enforced_services_table")
+        self.__is_piggyback_host: dict[HostName, bool] = cache_manager.new_evictable_cache(
+            "is_piggyback_host"
+        )
+        self.__snmp_config: dict[tuple[HostName, HostAddress, SourceType], SNMPHostConfig] = (
+            cache_manager.new_evictable_cache("snmp_config")
+        )
+        self.__hwsw_inventory_parameters: dict[HostName, HWSWInventoryParameters] = (
+            cache_manager.new_evictable_cache("hwsw_inventory_parameters")
+        )
+        self.__explicit_host_attributes: dict[HostName, dict[str, str]] = (
+            cache_manager.new_evictable_cache("explicit_host_attributes")
+        )
+        self.__computed_datasources: dict[HostName | HostAddress, ComputedDataSources] = (
+            cache_manager.new_evictable_cache("computed_datasources")
+        )
+        self.__discovery_check_parameters: dict[HostName, DiscoveryCheckParameters] = (
+            cache_manager.new_evictable_cache("discovery_check_parameters")
+        )
+        self.__active_checks: dict[HostName, Sequence[SSCRules]] = (
+            cache_manager.new_evictable_cache("active_checks")
+        )
+        self.__special_agents: dict[HostName, MixedSSCRules] = cache_manager.new_evictable_cache(
+            "special_agents"
+        )
+        self.__hostgroups: dict[HostName, Sequence[str]] = cache_manager.new_evictable_cache(
+            "hostgroups"
+        )
+        self.__contactgroups: dict[HostName, Sequence[_ContactgroupName]] = (
+            cache_manager.new_evictable_cache("contactgroups")
+        )
+        self.__explicit_check_command: dict[HostName, HostCheckCommand] = (
+            cache_manager.new_evictable_cache("explicit_check_command")
+        )
+        self.__snmp_fetch_interval: dict[tuple[HostName, SectionName], int | None] = (
+            cache_manager.new_evictable_cache("snmp_fetch_interval")
+        )
+        self.__labels: dict[HostName, Labels] = cache_manager.new_evictable_cache("labels")
+        self.__label_sources: dict[HostName, LabelSources] = cache_manager.new_evictable_cache(
+            "label_sources"
+        )
+        self.__notification_plugin_parameters: dict[tuple[HostName, str], Mapping[str, object]] = (
+            cache_manager.new_evictable_cache("notification_plugin_parameters")
+        )
+        self.__snmp_backend: dict[HostName, SNMPBackendEnum] = cache_manager.new_evictable_cache(
+            "snmp_backend"
+        )
+        self._effective_host_cache: dict[tuple[HostName, ServiceName, tuple | None], HostName] = (
+            cache_manager.new_evictable_cache("effective_host")
+        )
+        self._check_mk_check_interval: dict[HostName, float] = cache_manager.new_evictable_cache(
+            "check_mk_check_interval"
+        )
         self.initialize()
 
     def initialize(self) -> ConfigCache:
         self.invalidate_host_config()
 
-        self._check_table_cache = cache_manager.obtain_cache("check_tables")
+        self._check_table_cache = cache_manager.obtain_cache("check_tables", evictable=True)
         self._cache_section_name_of: dict[str, str] = {}
         self._host_paths: dict[HostName, str] = ConfigCache._get_host_paths(host_paths)
         self._hosttags: dict[HostName, Sequence[TagID]] = {}
@@ -1990,8 +2027,6 @@ class ConfigCache:
         self._discovered_labels_cache = DiscoveredLabelsCache(
             self._nodes_cache, self._autochecks_manager.get_autochecks
         )
-        self._effective_host_cache: dict[tuple[HostName, ServiceName, tuple | None], HostName] = {}
-        self._check_mk_check_interval: dict[HostName, float] = {}
 
         self.hosts_config = make_hosts_config()
 
@@ -2217,6 +2252,8 @@ class ConfigCache:
         self.__label_sources.clear()
         self.__notification_plugin_parameters.clear()
         self.__snmp_backend.clear()
+        self._effective_host_cache.clear()
+        self._check_mk_check_interval.clear()
 
     @staticmethod
     def _get_host_paths(config_host_paths: dict[HostName, str]) -> dict[HostName, str]:
@@ -3972,11 +4009,17 @@ class ConfigCache:
     def get_piggybacked_hosts_time_settings(
         self, piggybacked_hostname: HostName | None = None
     ) -> Sequence[tuple[str | None, str, int]]:
-        all_sources = piggyback.get_piggybacked_host_with_sources(cmk.utils.paths.omd_root)
+        # Looking at the data of all piggybacked hosts is expensive on sites with many of them
         used_sources = (
-            {m.source for sources in all_sources.values() for m in sources}
+            {
+                m.source
+                for sources in piggyback.get_piggybacked_host_with_sources(
+                    cmk.utils.paths.omd_root
+                ).values()
+                for m in sources
+            }
             if piggybacked_hostname is None
-            else {m.source for m in all_sources.get(piggybacked_hostname, [])}
+            else set(piggyback.get_sources_for(piggybacked_hostname, cmk.utils.paths.omd_root))
         )
 
         return [
@@ -4379,15 +4422,33 @@ class FetcherFactory:
 
 class CEEConfigCache(ConfigCache):
     def __init__(self) -> None:
-        self.__rrd_config: dict[HostName, RRDObjectConfig | None] = {}
-        self.__recuring_downtimes: dict[HostName, Sequence[RecurringDowntime]] = {}
-        self.__flap_settings: dict[HostName, tuple[float, float, float]] = {}
-        self.__log_long_output: dict[HostName, bool] = {}
-        self.__state_translation: dict[HostName, dict] = {}
-        self.__smartping_settings: dict[HostName, dict] = {}
-        self.__lnx_remote_alert_handlers: dict[HostName, Sequence[Mapping[str, str]]] = {}
-        self.__rtc_secret: dict[HostName, str | None] = {}
-        self.__agent_config: dict[HostName, Mapping[str, Any]] = {}
+        self.__rrd_config: dict[HostName, RRDObjectConfig | None] = (
+            cache_manager.new_evictable_cache("rrd_config")
+        )
+        self.__recuring_downtimes: dict[HostName, Sequence[RecurringDowntime]] = (
+            cache_manager.new_evictable_cache("recuring_downtimes")
+        )
+        self.__flap_settings: dict[HostName, tuple[float, float, float]] = (
+            cache_manager.new_evictable_cache("flap_settings")
+        )
+        self.__log_long_output: dict[HostName, bool] = cache_manager.new_evictable_cache(
+            "log_long_output"
+        )
+        self.__state_translation: dict[HostName, dict] = cache_manager.new_evictable_cache(
+            "state_translation"
+        )
+        self.__smartping_settings: dict[HostName, dict] = cache_manager.new_evictable_cache(
+            "smartping_settings"
+        )
+        self.__lnx_remote_alert_handlers: dict[HostName, Sequence[Mapping[str, str]]] = (
+            cache_manager.new_evictable_cache("lnx_remote_alert_handlers")
+        )
+        self.__rtc_secret: dict[HostName, str | None] = cache_manager.new_evictable_cache(
+            "rtc_secret"
+        )
+        self.__agent_config: dict[HostName, Mapping[str, Any]] = cache_manager.new_evictable_cache(
+            "agent_config"
+        )
         super().__init__()
 
     def invalidate_host_config(self) -> None:
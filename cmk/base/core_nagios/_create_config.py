@@ -6,14 +6,18 @@
 
 import base64
 import itertools
+import multiprocessing
+import re
 import socket
 import sys
 from collections import Counter
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterator, Mapping, Sequence
 from contextlib import suppress
 from io import StringIO
-from typing import Any, cast, IO, Literal
+from pathlib import Path
+from typing import Any, cast, IO, Literal, NamedTuple
 
+import cmk.ccc.debug
 from cmk.ccc import store
 from cmk.ccc.exceptions import MKGeneralException
 
@@ -25,6 +29,7 @@ from cmk.utils.hostaddress import HostAddress, HostName, Hosts
 from cmk.utils.ip_lookup import IPStackConfig
 from cmk.utils.labels import Labels
 from cmk.utils.licensing.handler import LicensingHandler
+from cmk.utils.log import console
 from cmk.utils.macros import replace_macros_in_str
 from cmk.utils.notify import NotificationHostConfig, write_notify_host_file
 from cmk.utils.servicename import MAX_SERVICE_NAME_LEN, ServiceName
@@ -42,6 +47,7 @@ from cmk.base.core_config import (
     get_tags_with_groups_from_attributes,
 )
 
+from ._host_fingerprints import HostFingerprints
 from ._precompile_host_checks import precompile_hostchecks, PrecompileMode
 
 _ContactgroupName = str
@@ -107,6 +113,8 @@ class NagiosCore(core_config.MonitoringCore):
             licensing_handler=licensing_handler,
             passwords=passwords,
             ip_address_of=ip_address_of,
+            processes=multiprocessing.cpu_count(),
+            host_objects_cache=_host_objects_cache_file(),
         )
 
         store.save_text_to_file(cmk.utils.paths.nagios_objects_file, config_buffer.getvalue())
@@ -123,6 +131,7 @@ class NagiosCore(core_config.MonitoringCore):
             config_path,
             self._config_cache,
             precompile_mode=precompile_mode,
+            processes=multiprocessing.cpu_count(),
         )
         with suppress(IOError):
             print(tty.ok + "\n", end="", flush=True, file=sys.stdout)
@@ -176,6 +185,8 @@ def create_config(
     licensing_handler: LicensingHandler,
     passwords: Mapping[str, str],
     ip_address_of: config.IPLookup,
+    processes: int = 1,
+    host_objects_cache: Path | None = None,
 ) -> None:
     cfg = NagiosConfig(outfile, hostnames)
 
@@ -183,10 +194,19 @@ def create_config(
 
     licensing_counter = Counter("services")
     all_notify_host_configs: dict[HostName, NotificationHostConfig] = {}
-    for hostname in hostnames:
-        all_notify_host_configs[hostname] = _create_nagios_config_host(
-            cfg, config_cache, hostname, passwords, licensing_counter, ip_address_of
-        )
+    if host_objects_cache is None and (
+        processes <= 1 or len(_host_chunks(hostnames, processes)) <= 1
+    ):
+        for hostname in hostnames:
+            all_notify_host_configs[hostname] = _create_nagios_config_host(
+                cfg, config_cache, hostname, passwords, licensing_counter, ip_address_of
+            )
+    else:
+        for fragment in _create_nagios_config_fragments(
+            hostnames, processes, config_cache, passwords, ip_address_of, host_objects_cache
+        ):
+            _merge_fragment(cfg, fragment, licensing_counter, ip_address_of)
+            all_notify_host_configs.update(fragment.notify_host_configs)
 
     _validate_licensing(config_cache.hosts_config, licensing_handler, licensing_counter)
 
@@ -204,6 +224,257 @@ def create_config(
         cfg.write(config.extra_nagios_conf)
 
 
+# Forking the workers and merging their results only pays off for a bunch of hosts
+_MIN_HOSTS_PER_CHUNK = 100
+
+
+class _NagiosConfigFragment(NamedTuple):
+    """The objects of a host, created separately from the ones of the other hosts"""
+
+    objects: str
+    notify_host_configs: Mapping[HostName, NotificationHostConfig]
+    num_services: int
+    hostgroups_to_define: set[HostgroupName]
+    servicegroups_to_define: set[ServicegroupName]
+    contactgroups_to_define: set[_ContactgroupName]
+    checknames_to_define: set[CheckPluginName]
+    active_checks_to_define: dict[str, str]
+    custom_commands_to_define: set[CoreCommandName]
+    hostcheck_commands_to_define: list[tuple[CoreCommand, str]]
+    configuration_warnings: Sequence[str]
+    failed_ip_lookups: Mapping[HostName, Exception]
+
+
+class _FragmentContext(NamedTuple):
+    config_cache: ConfigCache
+    passwords: Mapping[str, str]
+    ip_address_of: config.IPLookup
+
+
+# The already loaded configuration, shared copy-on-write with the forked worker processes
+_fragment_context: _FragmentContext | None = None
+
+
+def _host_chunks(hostnames: Sequence[HostName], processes: int) -> Sequence[Sequence[HostName]]:
+    # A few chunks per process even out the different numbers of services of the hosts
+    size = max(_MIN_HOSTS_PER_CHUNK, -(-len(hostnames) // (processes * 4)))
+    return [hostnames[start : start + size] for start in range(0, len(hostnames), size)]
+
+
+def _host_objects_cache_file() -> Path:
+    return Path(cmk.utils.paths.var_dir, "core", "nagios_host_objects.pkl")
+
+
+_HostObjectsCache = Mapping[HostName, tuple[str, _NagiosConfigFragment]]
+
+
+def _create_nagios_config_fragments(
+    hostnames: Sequence[HostName],
+    processes: int,
+    config_cache: ConfigCache,
+    passwords: Mapping[str, str],
+    ip_address_of: config.IPLookup,
+    host_objects_cache: Path | None,
+) -> Iterator[_NagiosConfigFragment]:
+    """The objects of the hosts, in the order of the hosts
+
+    With a cache of the objects, only the objects of the hosts whose configuration has
+    changed since the last time are created again.
+    """
+    if host_objects_cache is None:
+        yield from _create_host_fragments(
+            hostnames, processes, config_cache, passwords, ip_address_of
+        )
+        return
+
+    fingerprint_of = HostFingerprints(config_cache, passwords, ip_address_of)
+    fingerprints = {hostname: fingerprint_of(hostname) for hostname in hostnames}
+    cached = _load_host_objects(host_objects_cache)
+    changed = [
+        hostname
+        for hostname in hostnames
+        if (entry := cached.get(hostname)) is None or entry[0] != fingerprints[hostname]
+    ]
+    console.verbose(f"Creating the objects of {len(changed)} of {len(hostnames)} hosts...")
+    created = dict(
+        zip(
+            changed,
+            _create_host_fragments(changed, processes, config_cache, passwords, ip_address_of),
+        )
+    )
+
+    fragments = {
+        hostname: created[hostname] if hostname in created else cached[hostname][1]
+        for hostname in hostnames
+    }
+    store.save_object_to_pickle_file(
+        host_objects_cache,
+        {
+            # The failed lookups are found again while computing the fingerprints
+            hostname: (fingerprints[hostname], fragment._replace(failed_ip_lookups={}))
+            for hostname, fragment in fragments.items()
+        },
+    )
+
+    for hostname, fragment in fragments.items():
+        if hostname not in created:
+            for warning in fragment.configuration_warnings:
+                console.warning(tty.format_warning(f"\n{warning}"))
+        yield fragment
+
+
+def _load_host_objects(path: Path) -> _HostObjectsCache:
+    try:
+        return store.load_object_from_pickle_file(path, default={})
+    except Exception:
+        # e.g. written by a version with other objects. Create all objects again.
+        if cmk.ccc.debug.enabled():
+            raise
+        return {}
+
+
+def _create_host_fragments(
+    hostnames: Sequence[HostName],
+    processes: int,
+    config_cache: ConfigCache,
+    passwords: Mapping[str, str],
+    ip_address_of: config.IPLookup,
+) -> Iterator[_NagiosConfigFragment]:
+    if processes <= 1 or len(chunks := _host_chunks(hostnames, processes)) <= 1:
+        for hostname in hostnames:
+            yield _create_host_fragment(config_cache, hostname, passwords, ip_address_of)
+        return
+
+    global _fragment_context
+    _fragment_context = _FragmentContext(config_cache, passwords, ip_address_of)
+    try:
+        with multiprocessing.get_context("fork").Pool(
+            processes=min(processes, len(chunks))
+        ) as pool:
+            # imap returns the fragments in the order of the chunks, so the result is the same
+            # as if the hosts were processed one after another.
+            for fragments in pool.imap(_create_chunk_fragments, chunks):
+                yield from fragments
+    finally:
+        _fragment_context = None
+
+
+def _create_chunk_fragments(hostnames: Sequence[HostName]) -> Sequence[_NagiosConfigFragment]:
+    assert _fragment_context is not None
+    config_cache, passwords, ip_address_of = _fragment_context
+    return [
+        _create_host_fragment(config_cache, hostname, passwords, ip_address_of)
+        for hostname in hostnames
+    ]
+
+
+def _create_host_fragment(
+    config_cache: ConfigCache,
+    hostname: HostName,
+    passwords: Mapping[str, str],
+    ip_address_of: config.IPLookup,
+) -> _NagiosConfigFragment:
+    cfg = NagiosConfig(outfile := StringIO(), [hostname])
+    licensing_counter = Counter("services")
+    num_warnings = len(config_warnings.g_configuration_warnings)
+    failed_ip_lookups = _failed_ip_lookups(ip_address_of)
+    num_failed = len(failed_ip_lookups)
+
+    notify_host_config = _create_nagios_config_host(
+        cfg, config_cache, hostname, passwords, licensing_counter, ip_address_of
+    )
+
+    # They are added again when merging the fragment
+    warnings = config_warnings.g_configuration_warnings[num_warnings:]
+    del config_warnings.g_configuration_warnings[num_warnings:]
+
+    return _NagiosConfigFragment(
+        objects=outfile.getvalue(),
+        notify_host_configs={hostname: notify_host_config},
+        num_services=licensing_counter["services"],
+        hostgroups_to_define=cfg.hostgroups_to_define,
+        servicegroups_to_define=cfg.servicegroups_to_define,
+        contactgroups_to_define=cfg.contactgroups_to_define,
+        checknames_to_define=cfg.checknames_to_define,
+        active_checks_to_define=cfg.active_checks_to_define,
+        custom_commands_to_define=cfg.custom_commands_to_define,
+        hostcheck_commands_to_define=cfg.hostcheck_commands_to_define,
+        configuration_warnings=warnings,
+        # Failed lookups are only ever added
+        failed_ip_lookups=(
+            dict(itertools.islice(failed_ip_lookups.items(), num_failed, None))
+            if len(failed_ip_lookups) > num_failed
+            else {}
+        ),
+    )
+
+
+def _failed_ip_lookups(ip_address_of: config.IPLookup) -> Mapping[HostName, Exception]:
+    if isinstance(ip_address_of, config.ConfiguredIPLookup) and isinstance(
+        ip_address_of.error_handler, ip_lookup.CollectFailedHosts
+    ):
+        return ip_address_of.error_handler.failed_ip_lookups
+    return {}
+
+
+def _merge_fragment(
+    cfg: NagiosConfig,
+    fragment: _NagiosConfigFragment,
+    licensing_counter: Counter,
+    ip_address_of: config.IPLookup,
+) -> None:
+    # The host check commands of the fragments are numbered starting from 1
+    offset = len(cfg.hostcheck_commands_to_define)
+    cfg.write(
+        _renumber_hostcheck_commands(fragment.objects, offset)
+        if fragment.hostcheck_commands_to_define
+        else fragment.objects
+    )
+    cfg.hostcheck_commands_to_define.extend(
+        (
+            _hostcheck_command_name(int(command.removeprefix(_HOSTCHECK_COMMAND_PREFIX)) + offset),
+            line,
+        )
+        for command, line in fragment.hostcheck_commands_to_define
+    )
+
+    licensing_counter["services"] += fragment.num_services
+    cfg.hostgroups_to_define.update(fragment.hostgroups_to_define)
+    cfg.servicegroups_to_define.update(fragment.servicegroups_to_define)
+    cfg.contactgroups_to_define.update(fragment.contactgroups_to_define)
+    cfg.checknames_to_define.update(fragment.checknames_to_define)
+    cfg.active_checks_to_define.update(fragment.active_checks_to_define)
+    cfg.custom_commands_to_define.update(fragment.custom_commands_to_define)
+
+    # They have already been printed
+    config_warnings.g_configuration_warnings.extend(fragment.configuration_warnings)
+    if isinstance(ip_address_of, config.ConfiguredIPLookup):
+        for host_name, exc in fragment.failed_ip_lookups.items():
+            ip_address_of.error_handler(host_name, exc)
+
+
+_HOSTCHECK_COMMAND_PREFIX = "check-mk-host-custom-"
+
+
+def _hostcheck_command_name(number: int) -> CoreCommand:
+    return f"{_HOSTCHECK_COMMAND_PREFIX}{number}"
+
+
+def _renumber_hostcheck_commands(objects: str, offset: int) -> str:
+    """
+    >>> _renumber_hostcheck_commands("  check_command  check-mk-host-custom-2\\n", 3)
+    '  check_command  check-mk-host-custom-5\\n'
+    """
+    if not offset:
+        return objects
+    return re.sub(
+        rf"^(  check_command +{_HOSTCHECK_COMMAND_PREFIX})(\d+)$",
+        lambda match: f"{match.group(1)}{int(match.group(2)) + offset}",
+        objects,
+        flags=re.MULTILINE,
+    )
+
+
 def _output_conf_header(cfg: NagiosConfig) -> None:
     cfg.write(
         """#
@@ -284,7 +555,7 @@ def create_nagios_host_spec(  # pylint: disable=too-many-branches
             host_spec[key] = value
 
     def host_check_via_service_status(service: ServiceName) -> CoreCommand:
-        command = "check-mk-host-custom-%d" % (len(cfg.hostcheck_commands_to_define) + 1)
+        command = _hostcheck_command_name(len(cfg.hostcheck_commands_to_define) + 1)
         service_with_hostname = replace_macros_in_str(
             service,
             {"$HOSTNAME$": hostname},
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Fingerprints of the configuration the objects of a host are created from
+
+The objects of a host depend on
+* the configuration which is not specific to hosts, like the global settings and the plugins,
+* the effective attributes of the host,
+* the rules matching the host and
+* the services discovered on the host.
+
+A fingerprint covers all of them. The objects of a host with an unchanged fingerprint are
+the same as the ones created before. A cluster also depends on its nodes, a node on its
+clusters.
+"""
+
+import hashlib
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import TypeGuard
+
+import cmk.ccc.version as cmk_version
+from cmk.ccc import store
+
+import cmk.utils.paths
+from cmk.utils.hostaddress import HostName
+from cmk.utils.rulesets.ruleset_matcher import RuleSpec
+
+from cmk.base import config
+from cmk.base.config import ConfigCache
+
+# The host definitions of the hosts.mk files, keyed by the host names. Only the entries of a
+# host go into its fingerprint.
+_HOST_VARIABLES = (
+    "host_attributes",
+    "host_labels",
+    "host_paths",
+    "host_tags",
+    "ipaddresses",
+    "ipv6addresses",
+    "explicit_snmp_communities",
+    "management_ipmi_credentials",
+    "management_protocol",
+    "management_snmp_credentials",
+)
+# The hosts themselves, covered by the fingerprints of the hosts, their clusters and nodes
+_HOST_LIST_VARIABLES = ("all_hosts", "clusters")
+# The loaded plugins can't be compared by value
+_PLUGIN_VARIABLES = ("check_info", "special_agent_info")
+
+_DATA_TYPES = (dict, list, tuple, set, frozenset, str, int, float, bool, type(None))
+
+
+class HostFingerprints:
+    def __init__(
+        self,
+        config_cache: ConfigCache,
+        passwords: Mapping[str, str],
+        ip_address_of: config.IPLookup,
+    ) -> None:
+        self._config_cache = config_cache
+        self._ip_address_of = ip_address_of
+
+        global_variables, rulesets = _split_config_variables(vars(config))
+        self._global_fingerprint = _hash(
+            (
+                cmk_version.__version__,
+                _local_files(cmk.utils.paths.local_checks_dir, cmk.utils.paths.local_lib_dir),
+                [sorted(getattr(config, name)) for name in _PLUGIN_VARIABLES],
+                sorted(passwords.items()),
+                sorted(config.get_resource_macros().items()),
+                global_variables,
+            )
+        )
+        self._host_variables = [(name, getattr(config, name, {})) for name in _HOST_VARIABLES] + [
+            (f"explicit_host_conf:{name}", values)
+            for name, values in config.explicit_host_conf.items()
+        ]
+        self._matching_rules = _matching_rules(config_cache, rulesets)
+        self._host_parts: dict[HostName, str] = {}
+
+    def __call__(self, host_name: HostName) -> str:
+        nodes = self._config_cache.nodes(host_name)
+        return _hash(
+            (
+                self._global_fingerprint,
+                self._host_part(host_name),
+                [(node, self._node_part(node)) for node in nodes],
+                self._config_cache.clusters_of(host_name),
+            )
+        )
+
+    def _node_part(self, host_name: HostName) -> str | None:
+        # Avoid looking up the addresses of nodes that are not monitored at all
+        if not (
+            self._config_cache.is_active(host_name) and self._config_cache.is_online(host_name)
+        ):
+            return None
+        return self._host_part(host_name)
+
+    def _host_part(self, host_name: HostName) -> str:
+        if (part := self._host_parts.get(host_name)) is not None:
+            return part
+        return self._host_parts.setdefault(
+            host_name,
+            _hash(
+                (
+                    host_name,
+                    _canonical(
+                        self._config_cache.get_host_attributes(host_name, self._ip_address_of)
+                    ),
+                    [
+                        (name, _canonical(values[host_name]))
+                        for name, values in self._host_variables
+                        if host_name in values
+                    ],
+                    self._matching_rules.get(host_name, []),
+                    store.load_bytes_from_file(
+                        Path(cmk.utils.paths.autochecks_dir, f"{host_name}.mk")
+                    ),
+                )
+            ),
+        )
+
+
+def _split_config_variables(
+    variables: Mapping[str, object],
+) -> tuple[Sequence[tuple[str, object]], Sequence[tuple[str, Sequence[RuleSpec[object]]]]]:
+    """Split the configuration into the global settings and the rulesets"""
+    global_variables: list[tuple[str, object]] = []
+    rulesets: list[tuple[str, Sequence[RuleSpec[object]]]] = []
+    for name, value in sorted(variables.items()):
+        if (
+            name.startswith("_")
+            or name in _HOST_VARIABLES
+            or name in _HOST_LIST_VARIABLES
+            or name in _PLUGIN_VARIABLES
+            or name == "explicit_host_conf"
+            or not isinstance(value, _DATA_TYPES)
+        ):
+            continue
+        if _is_ruleset(value):
+            rulesets.append((name, value))
+        elif isinstance(value, dict) and value and all(map(_is_ruleset, value.values())):
+            rulesets.extend((f"{name}:{key}", ruleset) for key, ruleset in value.items())
+        else:
+            global_variables.append((name, _canonical(value)))
+    return global_variables, rulesets
+
+
+def _is_ruleset(value: object) -> TypeGuard[Sequence[RuleSpec[object]]]:
+    """
+    >>> _is_ruleset([{"id": "1", "condition": {}, "value": 1}])
+    True
+    >>> _is_ruleset(["host1|tag"])
+    False
+    """
+    return isinstance(value, list) and all(
+        isinstance(rule, dict) and "condition" in rule and "value" in rule for rule in value
+    )
+
+
+def _matching_rules(
+    config_cache: ConfigCache, rulesets: Iterable[tuple[str, Sequence[RuleSpec[object]]]]
+) -> Mapping[HostName, Sequence[str]]:
+    """The rules matching the hosts by their host conditions
+
+    The complete rules are taken, including their service conditions.
+    """
+    optimizer = config_cache.ruleset_matcher.ruleset_optimizer
+    matching_rules: dict[HostName, list[str]] = {}
+    for name, ruleset in rulesets:
+        rule_reprs: dict[int, str] = {}
+        for host_name, indexes in optimizer.get_host_rule_indexes(
+            ruleset, with_foreign_hosts=False
+        ).items():
+            host_rules = matching_rules.setdefault(host_name, [])
+            for index in indexes:
+                if (rule_repr := rule_reprs.get(index)) is None:
+                    rule_repr = rule_reprs[index] = f"{name}:{_canonical(ruleset[index])!r}"
+                host_rules.append(rule_repr)
+    return matching_rules
+
+
+def _local_files(*directories: Path) -> Sequence[tuple[str, int, int]]:
+    return sorted(
+        (str(path), (stat := path.stat()).st_mtime_ns, stat.st_size)
+        for directory in directories
+        for path in directory.rglob("*")
+        if path.is_file()
+    )
+
+
+def _canonical(value: object) -> object:
+    """Make the representation of sets independent of the order of their elements
+
+    The order of dictionaries is kept, it may change the order of the created objects.
+
+    >>> _canonical({"b": {"y", "x"}, "a": [frozenset({2, 1})]})
+    {'b': ['x', 'y'], 'a': [[1, 2]]}
+    """
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_canonical(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_canonical(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(map(_canonical, value), key=repr)
+    return value
+
+
+def _hash(value: object) -> str:
+    return hashlib.sha256(repr(value).encode()).hexdigest()
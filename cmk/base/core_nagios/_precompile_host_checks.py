@@ -12,23 +12,29 @@ in adhoc mode (about 75%).
 """
 
 import enum
+import hashlib
+import importlib.util
 import itertools
+import multiprocessing
 import os
 import py_compile
 import re
 import socket
 import sys
-from collections.abc import Iterable
+from collections.abc import Container, Iterable, Iterator, Mapping, Sequence
 from pathlib import Path
-from typing import assert_never
+from typing import assert_never, NamedTuple
 
+import cmk.ccc.debug
+import cmk.ccc.version as cmk_version
 from cmk.ccc import store
+from cmk.ccc.exceptions import MKGeneralException
 
 import cmk.utils.config_path
 import cmk.utils.password_store
 import cmk.utils.paths
 from cmk.utils import tty
-from cmk.utils.config_path import VersionedConfigPath
+from cmk.utils.config_path import ConfigPath, LATEST_CONFIG, VersionedConfigPath
 from cmk.utils.hostaddress import HostAddress, HostName
 from cmk.utils.ip_lookup import IPStackConfig
 from cmk.utils.log import console
@@ -63,11 +69,11 @@ class HostCheckStore:
     """Caring about persistence of the precompiled host check files"""
 
     @staticmethod
-    def host_check_file_path(config_path: VersionedConfigPath, hostname: HostName) -> Path:
+    def host_check_file_path(config_path: ConfigPath, hostname: HostName) -> Path:
         return Path(config_path) / "host_checks" / hostname
 
     @staticmethod
-    def host_check_source_file_path(config_path: VersionedConfigPath, hostname: HostName) -> Path:
+    def host_check_source_file_path(config_path: ConfigPath, hostname: HostName) -> Path:
         # TODO: Use append_suffix(".py") once we are on Python 3.10
         path = HostCheckStore.host_check_file_path(config_path, hostname)
         return path.with_suffix(path.suffix + ".py")
@@ -95,7 +101,8 @@ class HostCheckStore:
                 py_compile.compile(
                     file=str(source_filename),
                     cfile=str(compiled_filename),
-                    dfile=str(compiled_filename),
+                    # The path the core executes, independent of the version of the config
+                    dfile=str(self.host_check_file_path(LATEST_CONFIG, hostname)),
                     doraise=True,
                 )
                 os.chmod(compiled_filename, 0o750)  # nosec B103 # BNS:c29b0e
@@ -104,12 +111,47 @@ class HostCheckStore:
 
         console.verbose(f" ==> {compiled_filename}.", file=sys.stderr)
 
+    @staticmethod
+    def hashes_file_path(config_path: ConfigPath) -> Path:
+        return Path(config_path) / "host_check_hashes.mk"
+
+    def link_previous(
+        self,
+        previous_config_path: ConfigPath,
+        config_path: VersionedConfigPath,
+        hostname: HostName,
+    ) -> bool:
+        """Take over the unchanged host check of the previous configuration
+
+        Returns False if it is not available anymore.
+        """
+        compiled_filename = self.host_check_file_path(config_path, hostname)
+        store.makedirs(compiled_filename.parent)
+        try:
+            os.link(
+                self.host_check_source_file_path(previous_config_path, hostname),
+                self.host_check_source_file_path(config_path, hostname),
+            )
+            # With a delayed precompilation this may still be the symlink to the source file
+            os.link(
+                self.host_check_file_path(previous_config_path, hostname),
+                compiled_filename,
+                follow_symlinks=False,
+            )
+        except FileNotFoundError:
+            self.host_check_source_file_path(config_path, hostname).unlink(missing_ok=True)
+            return False
+
+        console.verbose(f" ==> {compiled_filename} (unchanged).", file=sys.stderr)
+        return True
+
 
 def precompile_hostchecks(
     config_path: VersionedConfigPath,
     config_cache: ConfigCache,
     *,
     precompile_mode: PrecompileMode,
+    processes: int = 1,
 ) -> None:
     console.verbose("Creating precompiled host check config...")
     hosts_config = config_cache.hosts_config
@@ -118,44 +160,170 @@ def precompile_hostchecks(
 
     console.verbose("Precompiling host checks...")
 
-    host_check_store = HostCheckStore()
-    for hostname in {
+    hostnames = sorted(
         # Inconsistent with `create_config` above.
         hn
         for hn in itertools.chain(hosts_config.hosts, hosts_config.clusters)
         if config_cache.is_active(hn) and config_cache.is_online(hn)
-    }:
-        try:
-            console.verbose_no_lf(
-                f"{tty.bold}{tty.blue}{hostname:<16}{tty.normal}:", file=sys.stderr
-            )
-            host_check = dump_precompiled_hostcheck(
-                config_cache,
-                config_path,
-                hostname,
-                precompile_mode=precompile_mode,
-            )
-            if host_check is None:
-                console.verbose("(no Checkmk checks)")
-                continue
+    )
+    context = _PrecompileContext(
+        config_cache=config_cache,
+        config_path=config_path,
+        precompile_mode=precompile_mode,
+        ssc_special_agents=_load_ssc_special_agent_names(),
+        previous=_previous_host_checks(config_path),
+    )
+    try:
+        hashes = {
+            hostname: host_check_hash
+            for hostname, host_check_hash in _precompile_hostchecks(context, hostnames, processes)
+            if host_check_hash is not None
+        }
+    except MKGeneralException as e:
+        console.error(str(e), file=sys.stderr)
+        sys.exit(5)
+
+    store.save_object_to_file(HostCheckStore.hashes_file_path(config_path), hashes)
+
+
+# Forking the workers only pays off for a bunch of hosts
+_MIN_HOSTS_PER_CHUNK = 50
+
+
+class _PreviousHostChecks(NamedTuple):
+    config_path: ConfigPath
+    hashes: Mapping[HostName, str]
+
+
+class _PrecompileContext(NamedTuple):
+    config_cache: ConfigCache
+    config_path: VersionedConfigPath
+    precompile_mode: PrecompileMode
+    ssc_special_agents: Container[str]
+    previous: _PreviousHostChecks | None
 
-            host_check_store.write(
-                config_path, hostname, host_check, precompile_mode=precompile_mode
+
+# The already loaded configuration, shared copy-on-write with the forked worker processes
+_precompile_context: _PrecompileContext | None = None
+
+
+def _previous_host_checks(config_path: VersionedConfigPath) -> _PreviousHostChecks | None:
+    """The host checks of the configuration the core currently uses"""
+    if (
+        not Path(LATEST_CONFIG).exists()
+        or Path(LATEST_CONFIG).resolve() == Path(config_path).resolve()
+    ):
+        return None
+    return _PreviousHostChecks(
+        config_path=LATEST_CONFIG,
+        hashes=store.load_object_from_file(
+            HostCheckStore.hashes_file_path(LATEST_CONFIG), default={}
+        ),
+    )
+
+
+def _precompile_hostchecks(
+    context: _PrecompileContext, hostnames: Sequence[HostName], processes: int
+) -> Iterator[tuple[HostName, str | None]]:
+    size = max(_MIN_HOSTS_PER_CHUNK, -(-len(hostnames) // (processes * 4)))
+    chunks = [hostnames[start : start + size] for start in range(0, len(hostnames), size)]
+    if processes <= 1 or len(chunks) <= 1:
+        for hostname in hostnames:
+            yield hostname, _precompile_hostcheck(context, hostname)
+        return
+
+    global _precompile_context
+    _precompile_context = context
+    try:
+        with multiprocessing.get_context("fork").Pool(
+            processes=min(processes, len(chunks))
+        ) as pool:
+            for chunk_hashes in pool.imap_unordered(_precompile_chunk, chunks):
+                yield from chunk_hashes
+    finally:
+        _precompile_context = None
+
+
+def _precompile_chunk(hostnames: Sequence[HostName]) -> Sequence[tuple[HostName, str | None]]:
+    assert _precompile_context is not None
+    return [
+        (hostname, _precompile_hostcheck(_precompile_context, hostname)) for hostname in hostnames
+    ]
+
+
+def _precompile_hostcheck(context: _PrecompileContext, hostname: HostName) -> str | None:
+    """Write the host check and return the hash of it"""
+    try:
+        console.verbose_no_lf(f"{tty.bold}{tty.blue}{hostname:<16}{tty.normal}:", file=sys.stderr)
+        host_check = _dump_precompiled_hostcheck(
+            context.config_cache,
+            hostname,
+            verify_site_python=True,
+            precompile_mode=context.precompile_mode,
+            ssc_special_agents=context.ssc_special_agents,
+        )
+        if host_check is None:
+            console.verbose("(no Checkmk checks)")
+            return None
+
+        host_check_hash = _host_check_hash(host_check)
+        host_check_store = HostCheckStore()
+        if (
+            context.previous is not None
+            and context.previous.hashes.get(hostname) == host_check_hash
+            and host_check_store.link_previous(
+                context.previous.config_path, context.config_path, hostname
             )
-        except Exception as e:
-            if cmk.ccc.debug.enabled():
-                raise
-            console.error(f"Error precompiling checks for host {hostname}: {e}", file=sys.stderr)
-            sys.exit(5)
+        ):
+            return host_check_hash
+
+        host_check_store.write(
+            context.config_path, hostname, host_check, precompile_mode=context.precompile_mode
+        )
+        return host_check_hash
+    except Exception as e:
+        if cmk.ccc.debug.enabled():
+            raise
+        raise MKGeneralException(f"Error precompiling checks for host {hostname}: {e}")
+
+
+def _host_check_hash(host_check: str) -> str:
+    # The compiled host checks can only be taken over for the same Python and Checkmk version
+    return hashlib.sha256(
+        importlib.util.MAGIC_NUMBER + cmk_version.__version__.encode() + host_check.encode()
+    ).hexdigest()
 
 
-def dump_precompiled_hostcheck(  # pylint: disable=too-many-branches
+def _load_ssc_special_agent_names() -> set[str]:
+    return {p.name for p in server_side_calls.load_special_agents()[1].values()}
+
+
+def dump_precompiled_hostcheck(
     config_cache: ConfigCache,
     config_path: VersionedConfigPath,
     hostname: HostName,
     *,
     verify_site_python: bool = True,
     precompile_mode: PrecompileMode,
+) -> str | None:
+    # The host check does not depend on the version of the configuration, see below.
+    del config_path
+    return _dump_precompiled_hostcheck(
+        config_cache,
+        hostname,
+        verify_site_python=verify_site_python,
+        precompile_mode=precompile_mode,
+        ssc_special_agents=_load_ssc_special_agent_names(),
+    )
+
+
+def _dump_precompiled_hostcheck(  # pylint: disable=too-many-branches
+    config_cache: ConfigCache,
+    hostname: HostName,
+    *,
+    verify_site_python: bool,
+    precompile_mode: PrecompileMode,
+    ssc_special_agents: Container[str],
 ) -> str | None:
     (
         needed_agent_based_check_plugin_names,
@@ -174,7 +342,9 @@ def dump_precompiled_hostcheck(  # pylint: disable=too-many-branches
                 node_needed_agent_based_inventory_plugin_names
             )
 
-    needed_legacy_special_agents = _get_needed_legacy_special_agents(config_cache, hostname)
+    needed_legacy_special_agents = _get_needed_legacy_special_agents(
+        config_cache, hostname, ssc_special_agents
+    )
 
     if not any(
         (
@@ -257,8 +427,10 @@ def dump_precompiled_hostcheck(  # pylint: disable=too-many-branches
     host_check_config = HostCheckConfig(
         delay_precompile=precompile_mode
         is PrecompileMode.DELAYED,  # propagation of enum would break b/c of the repr() below :-(
-        src=str(HostCheckStore.host_check_source_file_path(config_path, hostname)),
-        dst=str(HostCheckStore.host_check_file_path(config_path, hostname)),
+        # The paths the core executes: The host checks of unchanged hosts are taken over into
+        # the next versions of the configuration.
+        src=str(HostCheckStore.host_check_source_file_path(LATEST_CONFIG, hostname)),
+        dst=str(HostCheckStore.host_check_file_path(LATEST_CONFIG, hostname)),
         verify_site_python=verify_site_python,
         locations=locations,
         checks_to_load=legacy_checks_to_load,
@@ -303,12 +475,13 @@ def _get_needed_plugin_names(
     )
 
 
-def _get_needed_legacy_special_agents(config_cache: ConfigCache, host_name: HostName) -> set[str]:
-    ssc_api_special_agents = {p.name for p in server_side_calls.load_special_agents()[1].values()}
+def _get_needed_legacy_special_agents(
+    config_cache: ConfigCache, host_name: HostName, ssc_special_agents: Container[str]
+) -> set[str]:
     return {
         f"agent_{name}"
         for name, _p in config_cache.special_agents(host_name)
-        if name not in ssc_api_special_agents
+        if name not in ssc_special_agents
     }
 
 
@@ -73,6 +73,9 @@ check_mk_perfdata_with_times = True
 debug_log = False  # deprecated
 monitoring_host: str | None = None  # deprecated
 max_num_processes = 50
+# Maximum approximate size in bytes of each of the per host caches of the configuration.
+# The least recently used hosts are evicted from a cache growing beyond it.
+config_cache_max_size: int | None = None
 fallback_agent_output_encoding = "latin-1"
 stored_passwords: dict[str, Password] = {}
 # Collection of predefined rule conditions. For the moment this setting is only stored
@@ -354,3 +357,5 @@ config_storage_format: Literal["standard", "raw", "pickle"] = "pickle"
 automatic_host_removal: list[RuleSpec[object]] = []
 
 ruleset_matching_stats = False
+# Sum up the times of the section parse functions and check plugins of all check runs
+plugin_timing_stats = False
@@ -3,6 +3,7 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import atexit
 import dataclasses
 import itertools
 import logging
@@ -12,7 +13,7 @@ import sys
 import time
 from collections.abc import Callable, Container, Iterable, Mapping, Sequence
 from contextlib import suppress
-from functools import partial
+from functools import cache, partial
 from pathlib import Path
 from types import ModuleType
 from typing import Final, Literal, NamedTuple, overload, Protocol, TypedDict, TypeVar
@@ -45,7 +46,9 @@ from cmk.utils.diagnostics import (
 from cmk.utils.everythingtype import EVERYTHING
 from cmk.utils.hostaddress import HostAddress, HostName, Hosts
 from cmk.utils.log import console, section
+from cmk.utils.misc import pnp_cleanup
 from cmk.utils.paths import configuration_lockfile
+from cmk.utils.prediction import find_due_predictions, precompute_predictions, PredictionStore
 from cmk.utils.resulttype import Result
 from cmk.utils.rulesets.ruleset_matcher import RulesetMatcher
 from cmk.utils.rulesets.tuple_rulesets import hosttags_match_taglist
@@ -80,7 +83,16 @@ from cmk.fetchers.config import make_persisted_section_dir
 from cmk.fetchers.filecache import FileCacheOptions, MaxAge
 
 from cmk.checkengine import inventory
-from cmk.checkengine.checking import CheckPluginName, execute_checkmk_checks, make_timing_results
+from cmk.checkengine.checking import (
+    CheckPlugin,
+    CheckPluginName,
+    execute_checkmk_checks,
+    make_timing_results,
+    PluginTimer,
+    PluginTimesBuffer,
+    PluginTimesStore,
+    slowest_plugins,
+)
 from cmk.checkengine.checkresults import ActiveCheckResult
 from cmk.checkengine.discovery import (
     commandline_discovery,
@@ -872,6 +884,87 @@ modes.register(
     )
 )
 
+# .
+#   .--predict.------------------------------------------------------------.
+#   |                                     _  _        _                    |
+#   |              _ __   _ __   ___   __| |(_)  ___ | |_                  |
+#   |             | '_ \ | '__| / _ \ / _` || | / __|| __|                 |
+#   |             | |_) || |   |  __/| (_| || || (__ | |_  _               |
+#   |             | .__/ |_|    \___| \__,_||_| \___| \__|(_)              |
+#   |             |_|                                                      |
+#   '----------------------------------------------------------------------'
+
+_PREDICTION_LOOKAHEAD = 3600
+
+
+def _make_get_recorded_data(
+    host_name: HostName, service_description: str
+) -> Callable[[str, int, int], livestatus.RRDResponse | None]:
+    return partial(
+        livestatus.get_rrd_data, livestatus.LocalConnection(), host_name, service_description
+    )
+
+
+def mode_precompute_predictions(options: Mapping[str, object]) -> None:
+    processes = options.get("procs", 4)
+    assert isinstance(processes, int)
+
+    now = time.time()
+    stores = []
+    for host_name, service_description in livestatus.LocalConnection().query(
+        "GET services\nColumns: host_name description\n"
+    ):
+        store = PredictionStore(
+            cmk.utils.paths.predictions_dir / host_name / pnp_cleanup(service_description)
+        )
+        if store.path.exists():
+            stores.append((HostName(host_name), service_description, store))
+
+    jobs = find_due_predictions(stores, now, _PREDICTION_LOOKAHEAD)
+    console.verbose(f"{len(jobs)} predictions are due\n")
+
+    total_duration = 0.0
+    num_computed = 0
+    for result in precompute_predictions(jobs, _make_get_recorded_data, processes):
+        total_duration += result.duration
+        num_computed += result.computed
+        console.verbose(
+            f"{result.job.host_name} / {result.job.service_description} / "
+            f"{result.job.meta.metric} ({result.job.meta.params.period}, "
+            f"valid from {result.job.meta.valid_interval[0]}): "
+            f"{'computed' if result.computed else 'no data'} in {result.duration:.2f}s\n"
+        )
+
+    console.verbose(
+        f"Computed {num_computed} of {len(jobs)} predictions in {total_duration:.2f}s\n"
+    )
+
+
+modes.register(
+    Mode(
+        long_option="precompute-predictions",
+        handler_function=mode_precompute_predictions,
+        needs_config=False,
+        needs_checks=False,
+        short_help="Compute due and upcoming predictions",
+        long_help=[
+            "Computes all missing or outdated predictions of predictive levels and the "
+            "predictions of the upcoming period, if it starts within the next hour. "
+            "This way the checks do not have to compute them on their own at the "
+            "start of a new period.",
+        ],
+        sub_options=[
+            Option(
+                long_option="procs",
+                argument=True,
+                argument_descr="N",
+                argument_conv=int,
+                short_help="Use at most N processes (default: 4)",
+            ),
+        ],
+    )
+)
+
 # .
 #   .--snmptranslate-------------------------------------------------------.
 #   |                            _                       _       _         |
@@ -2331,6 +2424,7 @@ def mode_check(
         snmp_backend=config_cache.get_snmp_backend(hostname),
         keepalive=keepalive,
     )
+    plugin_timer = PluginTimer() if config.plugin_timing_stats else None
     checks_result: Sequence[ActiveCheckResult] = [ActiveCheckResult(3, "unknown error")]
     fetched: Sequence[
         tuple[
@@ -2347,19 +2441,23 @@ def mode_check(
     ):
         console.debug(f"Checkmk version {cmk_version.__version__}")
         fetched = fetcher(hostname, ip_address=ipaddress)
-        check_plugins = CheckPluginMapper(
+        check_plugins: Mapping[CheckPluginName, CheckPlugin] = CheckPluginMapper(
             config_cache,
             value_store_manager,
             clusters=hosts_config.clusters,
             rtc_package=None,
         )
+        section_plugins: SectionMap[SectionPlugin] = SectionPluginMapper()
+        if plugin_timer is not None:
+            check_plugins = plugin_timer.check_plugins(check_plugins)
+            section_plugins = plugin_timer.section_plugins(section_plugins)
         with CPUTracker(console.debug) as tracker:
             checks_result = execute_checkmk_checks(
                 hostname=hostname,
                 fetched=((f[0], f[1]) for f in fetched),
                 parser=parser,
                 summarizer=summarizer,
-                section_plugins=SectionPluginMapper(),
+                section_plugins=section_plugins,
                 section_error_handling=lambda section_name, raw_data: create_section_crash_dump(
                     operation="parsing",
                     section_name=section_name,
@@ -2414,6 +2512,8 @@ def mode_check(
         config_cache.ruleset_matcher.persist_matching_stats(
             "tmp/ruleset_matching_stats", config.get_ruleset_id_mapping()
         )
+    if plugin_timer is not None:
+        _plugin_times_buffer().add(plugin_timer.times)
     return check_result.state
 
 
@@ -2474,6 +2574,64 @@ def register_mode_check(
 if cmk_version.edition(cmk.utils.paths.omd_root) is cmk_version.Edition.CRE:
     register_mode_check(get_submitter, active_check_handler=lambda *args: None, keepalive=False)
 
+
+def _plugin_times_store() -> PluginTimesStore:
+    return PluginTimesStore(Path(cmk.utils.paths.var_dir, "plugin_times.mk"))
+
+
+@cache
+def _plugin_times_buffer() -> PluginTimesBuffer:
+    # Shared by all check runs of the process, the rest is added when the process exits
+    plugin_times_buffer = PluginTimesBuffer(_plugin_times_store(), flush_interval=60.0)
+    atexit.register(plugin_times_buffer.flush)
+    return plugin_times_buffer
+
+
+def mode_plugin_times(options: Mapping[str, object]) -> None:
+    limit = options.get("limit")
+    assert limit is None or isinstance(limit, int)
+    plugin_times_store = _plugin_times_store()
+    times = plugin_times_store.pop() if options.get("reset") else plugin_times_store.load()
+
+    print_(f"{'CALLS':>10} {'WALL TIME':>10} {'AVERAGE':>10} {'CPU TIME':>10}  PLUGIN\n")
+    for kind, name, plugin_time in slowest_plugins(times, limit):
+        print_(
+            f"{plugin_time.calls:>10} {plugin_time.wall_time:>9.2f}s "
+            f"{plugin_time.wall_time / plugin_time.calls * 1000:>8.2f}ms "
+            f"{plugin_time.cpu_time:>9.2f}s  {name} ({kind})\n"
+        )
+
+
+modes.register(
+    Mode(
+        long_option="plugin-times",
+        handler_function=mode_plugin_times,
+        needs_config=False,
+        needs_checks=False,
+        short_help="Show the slowest section parse functions and check plugins",
+        long_help=[
+            "Shows the times of the section parse functions and the check plugins, summed "
+            "up over all check runs since the last reset, the slowest ones first. The times "
+            "are only collected with the global setting 'Collect plugin timing statistics'. "
+            "The wall time includes the time spent waiting, e.g. for the value store. "
+            "Long running check helpers add their times about once a minute.",
+        ],
+        sub_options=[
+            Option(
+                long_option="limit",
+                argument=True,
+                argument_descr="N",
+                argument_conv=int,
+                short_help="Show the N slowest plugins only",
+            ),
+            Option(
+                long_option="reset",
+                short_help="Start summing up the times from scratch after showing them",
+            ),
+        ],
+    )
+)
+
 # .
 #   .--inventory-----------------------------------------------------------.
 #   |             _                      _                                 |
@@ -2090,13 +2090,24 @@ def do_bulk_notify(  # pylint: disable=too-many-branches
         )
 
     logger.info("    --> storing for bulk notification %s", "|".join(bulk_path))
-    bulk_dir = _create_bulk_dir(bulk_path)
-    notify_uuid = str(uuid.uuid4())
-    filename_new = bulk_dir / f"{notify_uuid}.new"
-    filename_final = bulk_dir / notify_uuid
-    filename_new.write_text(f"{(params, plugin_context)!r}\n")
-    filename_new.rename(filename_final)  # We need an atomic creation!
-    logger.info("        - stored in %s", filename_final)
+    # The bulk directory must not be removed by a concurrent sending of the bulk before the
+    # notification is stored in it
+    with store.locked(_bulk_index_path()):
+        bulk_dir = _create_bulk_dir(bulk_path)
+        notify_uuid = str(uuid.uuid4())
+        filename_new = bulk_dir / f"{notify_uuid}.new"
+        filename_final = bulk_dir / notify_uuid
+        filename_new.write_text(f"{(params, plugin_context)!r}\n")
+        filename_new.rename(filename_final)  # We need an atomic creation!
+        logger.info("        - stored in %s", filename_final)
+
+        if (index := _load_bulk_index()) is None:
+            index = _scan_bulk_index()  # already contains the new notification
+        else:
+            key = _bulk_index_key(str(bulk_dir))
+            count, oldest = index.get(key, (0, time.time()))
+            index[key] = (count + 1, min(oldest, filename_final.stat().st_mtime))
+        _save_bulk_index(index)
 
 
 def _create_bulk_dir(bulk_path: Sequence[str]) -> Path:
@@ -2153,6 +2164,13 @@ def bulk_uuids(bulk_dir: str) -> tuple[UUIDs, float]:
     return uuids, oldest
 
 
+def _existing_bulk_uuids(bulk_dir: str) -> tuple[UUIDs, float]:
+    try:
+        return bulk_uuids(bulk_dir)
+    except FileNotFoundError:
+        return [], time.time()
+
+
 def remove_if_orphaned(bulk_dir: str, max_age: float, ref_time: float | None = None) -> None:
     if not ref_time:
         ref_time = time.time()
@@ -2166,15 +2184,36 @@ def remove_if_orphaned(bulk_dir: str, max_age: float, ref_time: float | None = N
             logger.info("    -> Error removing it: %s", e)
 
 
-def find_bulks(only_ripe: bool, *, bulk_interval: int) -> NotifyBulks:
-    # pylint: disable=too-many-branches
-    if not os.path.exists(notification_bulkdir):
-        return []
+# The open bulks with the number of their notifications and the time of the oldest one, keyed
+# by the bulk directories relative to the notification_bulkdir. Finding the ripe bulks does not
+# need to walk through all bulk directories and notification files this way. The index is only
+# changed while holding its lock, together with the bulk directories.
+BulkIndex = dict[str, tuple[int, float]]
+
+
+def _bulk_index_path() -> Path:
+    return Path(notification_bulkdir, ".index.mk")
+
+
+def _bulk_index_key(bulk_dir: str) -> str:
+    return os.path.relpath(bulk_dir, notification_bulkdir)
+
+
+def _load_bulk_index() -> BulkIndex | None:
+    """The index, None if it has not been created yet"""
+    return store.load_object_from_file(_bulk_index_path(), default=None)
+
+
+def _save_bulk_index(index: BulkIndex) -> None:
+    """Save the index and release its lock"""
+    store.save_object_to_file(_bulk_index_path(), index)
 
+
+def _scan_bulk_index() -> BulkIndex:
     def listdir_visible(path: str) -> list[str]:
         return [x for x in os.listdir(path) if not x.startswith(".")]
 
-    bulks: NotifyBulks = []
+    index: BulkIndex = {}
     now = time.time()
     for contact in listdir_visible(notification_bulkdir):
         contact_dir = os.path.join(notification_bulkdir, contact)
@@ -2187,71 +2226,116 @@ def find_bulks(only_ripe: bool, *, bulk_interval: int) -> NotifyBulks:
                 if not uuids:
                     remove_if_orphaned(bulk_dir, max_age=60, ref_time=now)
                     continue
-                age = now - oldest
+                index[_bulk_index_key(bulk_dir)] = (len(uuids), oldest)
+    return index
+
+
+def _reindex_bulk(bulk_dir: str) -> None:
+    """Update the index entry of a bulk from its notification files
+
+    Must be called with the index locked.
+    """
+    if (index := _load_bulk_index()) is None:
+        index = _scan_bulk_index()
+    else:
+        uuids, oldest = _existing_bulk_uuids(bulk_dir)
+        if uuids:
+            index[_bulk_index_key(bulk_dir)] = (len(uuids), oldest)
+        else:
+            index.pop(_bulk_index_key(bulk_dir), None)
+    _save_bulk_index(index)
+
+
+def find_bulks(only_ripe: bool, *, bulk_interval: int) -> NotifyBulks:
+    # pylint: disable=too-many-branches
+    if not os.path.exists(notification_bulkdir):
+        return []
+
+    with store.locked(_bulk_index_path()):
+        if (index := _load_bulk_index()) is None:
+            index = _scan_bulk_index()
+            _save_bulk_index(index)
 
-                # e.g. 60,10,host,localhost OR timeperiod:late_night,1000,host,localhost
-                parts = bulk_parts(method_dir, bulk)
-                if parts is None:
+    bulks: NotifyBulks = []
+
+    def add_bulk(
+        bulk_dir: str, age: float, interval: int | str, timeperiod: str | None, count: int
+    ) -> None:
+        # Only the notification files of the found bulks are needed
+        if uuids := _existing_bulk_uuids(bulk_dir)[0]:
+            bulks.append((bulk_dir, age, interval, timeperiod, count, uuids))
+            return
+        logger.info("Bulk %s has vanished", bulk_dir)
+        with store.locked(_bulk_index_path()):
+            _reindex_bulk(bulk_dir)
+
+    now = time.time()
+    for key, (num_uuids, oldest) in sorted(index.items()):
+        bulk_dir = os.path.join(notification_bulkdir, key)
+        method_dir, bulk = os.path.split(bulk_dir)
+        age = now - oldest
+
+        # e.g. 60,10,host,localhost OR timeperiod:late_night,1000,host,localhost
+        parts = bulk_parts(method_dir, bulk)
+        if parts is None:
+            continue
+        interval, timeperiod, count = parts
+
+        if interval is not None:
+            if age >= interval:
+                logger.info("Bulk %s is ripe: age %d >= %d", bulk_dir, age, interval)
+            elif num_uuids >= count:
+                logger.info("Bulk %s is ripe: count %d >= %d", bulk_dir, num_uuids, count)
+            else:
+                logger.info(
+                    "Bulk %s is not ripe yet (age: %d, count: %d)!",
+                    bulk_dir,
+                    age,
+                    num_uuids,
+                )
+                if only_ripe:
                     continue
-                interval, timeperiod, count = parts
 
-                if interval is not None:
-                    if age >= interval:
-                        logger.info("Bulk %s is ripe: age %d >= %d", bulk_dir, age, interval)
-                    elif len(uuids) >= count:
-                        logger.info("Bulk %s is ripe: count %d >= %d", bulk_dir, len(uuids), count)
-                    else:
-                        logger.info(
-                            "Bulk %s is not ripe yet (age: %d, count: %d)!",
-                            bulk_dir,
-                            age,
-                            len(uuids),
-                        )
-                        if only_ripe:
-                            continue
+            add_bulk(bulk_dir, age, interval, "n.a.", count)
+        else:
+            try:
+                active = timeperiod_active(str(timeperiod))
+            except Exception:
+                # This prevents sending bulk notifications if a
+                # livestatus connection error appears. It also implies
+                # that an ongoing connection error will hold back bulk
+                # notifications.
+                logger.info(
+                    "Error while checking activity of time period %s: assuming active",
+                    timeperiod,
+                )
+                active = True
 
-                    bulks.append((bulk_dir, age, interval, "n.a.", count, uuids))
-                else:
-                    try:
-                        active = timeperiod_active(str(timeperiod))
-                    except Exception:
-                        # This prevents sending bulk notifications if a
-                        # livestatus connection error appears. It also implies
-                        # that an ongoing connection error will hold back bulk
-                        # notifications.
-                        logger.info(
-                            "Error while checking activity of time period %s: assuming active",
-                            timeperiod,
-                        )
-                        active = True
-
-                    if active is True and len(uuids) < count:
-                        # Only add a log entry every 10 minutes since timeperiods
-                        # can be very long (The default would be 10s).
-                        if now % 600 <= bulk_interval:
-                            logger.info(
-                                "Bulk %s is not ripe yet (time period %s: active, count: %d)",
-                                bulk_dir,
-                                timeperiod,
-                                len(uuids),
-                            )
-
-                        if only_ripe:
-                            continue
-                    elif active is False:
-                        logger.info(
-                            "Bulk %s is ripe: time period %s has ended", bulk_dir, timeperiod
-                        )
-                    elif len(uuids) >= count:
-                        logger.info("Bulk %s is ripe: count %d >= %d", bulk_dir, len(uuids), count)
-                    else:
-                        logger.info(
-                            "Bulk %s is ripe: time period %s is not known anymore",
-                            bulk_dir,
-                            timeperiod,
-                        )
+            if active is True and num_uuids < count:
+                # Only add a log entry every 10 minutes since timeperiods
+                # can be very long (The default would be 10s).
+                if now % 600 <= bulk_interval:
+                    logger.info(
+                        "Bulk %s is not ripe yet (time period %s: active, count: %d)",
+                        bulk_dir,
+                        timeperiod,
+                        num_uuids,
+                    )
 
-                    bulks.append((bulk_dir, age, "n.a.", timeperiod, count, uuids))
+                if only_ripe:
+                    continue
+            elif active is False:
+                logger.info("Bulk %s is ripe: time period %s has ended", bulk_dir, timeperiod)
+            elif num_uuids >= count:
+                logger.info("Bulk %s is ripe: count %d >= %d", bulk_dir, num_uuids, count)
+            else:
+                logger.info(
+                    "Bulk %s is ripe: time period %s is not known anymore",
+                    bulk_dir,
+                    timeperiod,
+                )
+
+            add_bulk(bulk_dir, age, "n.a.", timeperiod, count)
     return bulks
 
 
@@ -2366,12 +2450,14 @@ def notify_bulk(
     if unhandled_uuids:
         notify_bulk(dirname, unhandled_uuids, get_http_proxy, plugin_timeout=plugin_timeout)
 
-    # Remove directory. Not necessary if emtpy
-    try:
-        os.rmdir(dirname)
-    except Exception as e:
-        if not unhandled_uuids:
-            logger.info("Warning: cannot remove directory %s: %s", dirname, e)
+    with store.locked(_bulk_index_path()):
+        # Remove directory. Not necessary if emtpy
+        try:
+            os.rmdir(dirname)
+        except Exception as e:
+            if not unhandled_uuids:
+                logger.info("Warning: cannot remove directory %s: %s", dirname, e)
+        _reindex_bulk(dirname)
 
 
 def call_bulk_notification_script(
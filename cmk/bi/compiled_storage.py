@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""On-disk format of compiled aggregations
+
+A compiled aggregation file consists of
+
+    MAGIC | header length (8 bytes, network byte order) | header | branch payloads
+
+The header is a pickled dict with the aggregation attributes and an index entry
+(title, required elements, offset, length) for each branch. Each branch payload
+is the pickled serialization of the branch. The file is mmap'ed on load and a
+branch is only unpickled and converted into its object tree on first access.
+This way filtered views only pay for the branches they actually render.
+"""
+
+import mmap
+import pickle
+import struct
+from pathlib import Path
+from typing import Any
+
+from cmk.ccc import store
+
+from cmk.bi.aggregation import BIAggregation
+from cmk.bi.lib import BIAggregationComputationOptions, BIAggregationGroups, RequiredBIElement
+from cmk.bi.rule import BIRule
+from cmk.bi.trees import (
+    BIBranchInfo,
+    BICompiledAggregation,
+    BICompiledRule,
+    BILazyCompiledBranches,
+)
+
+_MAGIC = b"CMKBI\x00\x01\n"
+_HEADER_LENGTH = struct.Struct("!Q")
+
+
+def save_compiled_aggregation(path: Path, compiled_aggregation: BICompiledAggregation) -> None:
+    branch_index = []
+    payloads = []
+    offset = 0
+    for branch in compiled_aggregation.branches:
+        payload = pickle.dumps(branch.serialize(), protocol=pickle.HIGHEST_PROTOCOL)
+        branch_index.append(
+            (
+                branch.properties.title,
+                [tuple(element) for element in branch.required_elements()],
+                offset,
+                len(payload),
+            )
+        )
+        payloads.append(payload)
+        offset += len(payload)
+
+    header = pickle.dumps(
+        {
+            "id": compiled_aggregation.id,
+            "computation_options": compiled_aggregation.computation_options.serialize(),
+            "aggregation_visualization": compiled_aggregation.aggregation_visualization,
+            "groups": compiled_aggregation.groups.serialize(),
+            "branches": branch_index,
+        },
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    store.save_bytes_to_file(
+        path, b"".join([_MAGIC, _HEADER_LENGTH.pack(len(header)), header, *payloads])
+    )
+
+
+def load_compiled_aggregation(path: Path) -> BICompiledAggregation:
+    with path.open("rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            # Compiled by a previous version, will be replaced with the next compilation
+            return BIAggregation.create_trees_from_schema(
+                store.load_object_from_pickle_file(path, default={})
+            )
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    header_start = len(_MAGIC) + _HEADER_LENGTH.size
+    (header_length,) = _HEADER_LENGTH.unpack_from(mapped, len(_MAGIC))
+    header: dict[str, Any] = pickle.loads(mapped[header_start : header_start + header_length])
+    payload_start = header_start + header_length
+
+    branch_index = header["branches"]
+
+    def _load_branch(index: int) -> BICompiledRule:
+        _title, _required_elements, offset, length = branch_index[index]
+        start = payload_start + offset
+        return BIRule.create_tree_from_schema(pickle.loads(mapped[start : start + length]))
+
+    return BICompiledAggregation(
+        header["id"],
+        BILazyCompiledBranches(
+            [
+                BIBranchInfo(
+                    title,
+                    frozenset(RequiredBIElement(*element) for element in required_elements),
+                )
+                for title, required_elements, _offset, _length in branch_index
+            ],
+            _load_branch,
+        ),
+        BIAggregationComputationOptions(header["computation_options"]),
+        header["aggregation_visualization"],
+        BIAggregationGroups(header["groups"]),
+    )
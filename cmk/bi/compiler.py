@@ -7,7 +7,6 @@ from __future__ import annotations
 
 import ast
 import os
-import pickle
 import time
 from pathlib import Path
 from typing import TypedDict
@@ -23,6 +22,7 @@ from cmk.utils.paths import default_config_dir
 from cmk.utils.redis import get_redis_client
 
 from cmk.bi.aggregation import BIAggregation
+from cmk.bi.compiled_storage import load_compiled_aggregation, save_compiled_aggregation
 from cmk.bi.data_fetcher import BIStructureFetcher, get_cache_dir, SiteProgramStart
 from cmk.bi.lib import SitesCallback
 from cmk.bi.packs import BIAggregationPacks
@@ -67,9 +67,8 @@ class BICompiler:
         self, aggr_name: str
     ) -> tuple[BICompiledAggregation, BICompiledRule] | None:
         for _name, compiled_aggregation in self._compiled_aggregations.items():
-            for branch in compiled_aggregation.branches:
-                if branch.properties.title == aggr_name:
-                    return compiled_aggregation, branch
+            if branch := compiled_aggregation.get_branch_by_title(aggr_name):
+                return compiled_aggregation, branch
         return None
 
     def cleanup(self) -> None:
@@ -92,11 +91,11 @@ class BICompiler:
 
     def _freeze_new_branches(self, compiled_aggregation: BICompiledAggregation) -> bool:
         new_branch_found = False
-        for branch in list(compiled_aggregation.branches):
-            if self._frozen_branch_file(branch.properties.title).exists():
+        for branch_info in compiled_aggregation.branch_infos():
+            if self._frozen_branch_file(branch_info.title).exists():
                 continue
             new_branch_found = True
-            self.freeze_branch(branch.properties.title)
+            self.freeze_branch(branch_info.title)
         return new_branch_found
 
     def freeze_branch(self, branch_name: str) -> None:
@@ -167,15 +166,13 @@ class BICompiler:
 
             # Read frozen branches. Each branch gets a separate aggregation ID since
             # the computation time may differ, which also means possibly changed computation options
-            for branch in list(compiled_aggregation.branches):
-                if branch.properties.title in frozen_branch_names:
+            for branch_info in compiled_aggregation.branch_infos():
+                if branch_info.title in frozen_branch_names:
                     frozen_aggregation = BIAggregation.create_trees_from_schema(
-                        ast.literal_eval(
-                            (frozen_aggregations_dir / branch.properties.title).read_text()
-                        )
+                        ast.literal_eval((frozen_aggregations_dir / branch_info.title).read_text())
                     )
                     frozen_aggregation.frozen_info = FrozenBIInfo(
-                        compiled_aggregation.id, branch.properties.title
+                        compiled_aggregation.id, branch_info.title
                     )
                     updated_aggregations[
                         self.get_frozen_aggr_id(frozen_aggregation.frozen_info)
@@ -198,9 +195,8 @@ class BICompiler:
                 continue
 
             self._logger.debug("Loading cached aggregation results %s" % aggr_id)
-            self._compiled_aggregations[aggr_id] = BIAggregation.create_trees_from_schema(
-                store.load_object_from_pickle_file(path_object, default={})
-            )
+            # Only the branch index is read here, the branches are materialized on access
+            self._compiled_aggregations[aggr_id] = load_compiled_aggregation(path_object)
 
         self._compiled_aggregations = self._manage_frozen_branches(self._compiled_aggregations)
 
@@ -232,12 +228,13 @@ class BICompiler:
 
             for aggr_id, compiled_aggr in self._compiled_aggregations.items():
                 start = time.time()
-                result = compiled_aggr.serialize()
+                save_compiled_aggregation(
+                    path_compiled_aggregations.joinpath(aggr_id), compiled_aggr
+                )
                 self._logger.debug(
                     "Schema dump %s took config took %f (%d branches)"
                     % (aggr_id, time.time() - start, len(compiled_aggr.branches))
                 )
-                self._save_data(path_compiled_aggregations.joinpath(aggr_id), result)
 
             self._compiled_aggregations = self._manage_frozen_branches(self._compiled_aggregations)
             self._generate_part_of_aggregation_lookup(self._compiled_aggregations)
@@ -263,8 +260,8 @@ class BICompiler:
     ) -> None:
         used_titles: dict[str, str] = {}
         for aggr_id, bi_aggregation in compiled_aggregations.items():
-            for bi_branch in bi_aggregation.branches:
-                branch_title = bi_branch.properties.title
+            for branch_info in bi_aggregation.branch_infos():
+                branch_title = branch_info.title
                 if branch_title in used_titles:
                     raise MKGeneralException(
                         _(
@@ -352,9 +349,6 @@ class BICompiler:
 
         return latest_timestamp
 
-    def _save_data(self, filepath: Path, data: dict) -> None:
-        store.save_bytes_to_file(filepath, pickle.dumps(data))
-
     def _get_redis_client(self) -> Redis[str]:
         if self._redis_client is None:
             self._redis_client = get_redis_client()
@@ -392,14 +386,14 @@ class BICompiler:
     def _generate_part_of_aggregation_lookup(self, compiled_aggregations):
         part_of_aggregation_map: dict[str, list[str]] = {}
         for aggr_id, compiled_aggregation in compiled_aggregations.items():
-            for branch in compiled_aggregation.branches:
-                for _site, host_name, service_description in branch.required_elements():
+            for branch_info in compiled_aggregation.branch_infos():
+                for _site, host_name, service_description in branch_info.required_elements:
                     # This information can be used to selectively load the relevant compiled
                     # aggregation for any host/service. Right now it is only an indicator if this
                     # host/service is part of an aggregation
                     key = f"bi:aggregation_lookup:{host_name}:{service_description}"
                     part_of_aggregation_map.setdefault(key, []).append(
-                        f"{aggr_id}\t{branch.properties.title}"
+                        f"{aggr_id}\t{branch_info.title}"
                     )
 
         client = self._get_redis_client()
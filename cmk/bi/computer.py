@@ -14,7 +14,8 @@ from cmk.utils.servicename import ServiceName
 
 from cmk.bi.data_fetcher import BIStatusFetcher
 from cmk.bi.lib import NodeResultBundle, RequiredBIElement
-from cmk.bi.trees import BICompiledAggregation, BICompiledRule
+from cmk.bi.result_cache import BINodeResultCache
+from cmk.bi.trees import BIBranchInfo, BICompiledAggregation, BICompiledRule
 
 
 class BIAggregationFilter(NamedTuple):
@@ -59,9 +60,12 @@ class BIComputer:
         self,
         compiled_aggregations: dict[str, BICompiledAggregation],
         bi_status_fetcher: BIStatusFetcher,
+        node_result_cache: BINodeResultCache | None = None,
     ) -> None:
         self._compiled_aggregations = compiled_aggregations
         self._bi_status_fetcher = bi_status_fetcher
+        # Optional: Keeps node results between computations, only dirty paths get recomputed
+        self._node_result_cache = node_result_cache
         self._legacy_branch_cache: dict = {}
 
     def compute_aggregation_result(
@@ -76,9 +80,8 @@ class BIComputer:
         if not compiled_aggregation:
             return []
 
-        for branch in compiled_aggregation.branches:
-            if branch.properties.title == title:
-                return self.compute_results([(compiled_aggregation, [branch])])
+        if branch := compiled_aggregation.get_branch_by_title(title):
+            return self.compute_results([(compiled_aggregation, [branch])])
         return []
 
     def compute_result_for_filter(
@@ -114,9 +117,12 @@ class BIComputer:
     ) -> list[tuple[BICompiledAggregation, list[NodeResultBundle]]]:
         results = []
         for compiled_aggregation, branches in required_aggregations:
-            node_result_bundles = compiled_aggregation.compute_branches(
-                branches,
-                self._bi_status_fetcher,
+            node_result_bundles = (
+                compiled_aggregation.compute_branches(branches, self._bi_status_fetcher)
+                if self._node_result_cache is None
+                else self._node_result_cache.compute_branches(
+                    compiled_aggregation, branches, self._bi_status_fetcher
+                )
             )
 
             # Postprocess results. Custom user plugins may add additional information for each node
@@ -138,11 +144,10 @@ class BIComputer:
         if not self._use_aggregation(compiled_aggregation, bi_aggregation_filter):
             return []
 
-        return [
-            compiled_branch
-            for compiled_branch in compiled_aggregation.branches
-            if self._use_aggregation_branch(compiled_branch, bi_aggregation_filter)
-        ]
+        # Only the selected branches are materialized in case of lazily loaded aggregations
+        return compiled_aggregation.select_branches(
+            lambda branch_info: self._use_aggregation_branch(branch_info, bi_aggregation_filter)
+        )
 
     def _use_aggregation(
         self,
@@ -176,9 +181,9 @@ class BIComputer:
         )
 
     def _use_aggregation_branch(
-        self, compiled_branch: BICompiledRule, bi_aggregation_filter: BIAggregationFilter
+        self, branch_info: BIBranchInfo, bi_aggregation_filter: BIAggregationFilter
     ) -> bool:
-        branch_elements = compiled_branch.required_elements()
+        branch_elements = branch_info.required_elements
         branch_hosts = {x[1] for x in branch_elements}
         branch_services = {(x[1], x[2]) for x in branch_elements if x[2] is not None}
         if bi_aggregation_filter.hosts and not branch_hosts.intersection(
@@ -193,7 +198,7 @@ class BIComputer:
 
         return (
             not bi_aggregation_filter.aggr_titles
-            or compiled_branch.properties.title in bi_aggregation_filter.aggr_titles
+            or branch_info.title in bi_aggregation_filter.aggr_titles
         )
 
     #   .--Legacy--------------------------------------------------------------.
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Incremental evaluation of compiled BI aggregations
+
+The BINodeResultCache keeps the computed result of every rule node of the
+branches it has evaluated, together with the state of each required element
+the result was based on. On the next computation only those rule nodes are
+re-evaluated which (transitively) depend on an element whose state changed.
+All other subtrees are taken from the cache.
+
+The rule nodes are identified by their position in the branches, not by the
+node objects. This way the cache outlives the compiled aggregations of a
+request, which are loaded again by the next one.
+"""
+
+import threading
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+
+from cmk.checkengine.submitters import ServiceState  # pylint: disable=cmk-module-layer-violation
+
+from cmk.bi.lib import (
+    ABCBICompiledNode,
+    ABCBIStatusFetcher,
+    BIAggregationComputationOptions,
+    BIHostSpec,
+    BIHostStatusInfoRow,
+    NodeResultBundle,
+    RequiredBIElement,
+)
+from cmk.bi.trees import BICompiledAggregation, BICompiledRule
+from cmk.bi.type_defs import HostState
+
+# The aggregation, the title of the branch and the indexes of the nodes on the way down
+_NodePath = tuple[str, str, tuple[int, ...]]
+_NodeResultKey = tuple[_NodePath, bool]
+
+
+@dataclass
+class BINodeResultCacheStats:
+    computed_nodes: int = 0
+    cached_nodes: int = 0
+    dirty_elements: int = 0
+
+
+def element_state_key(
+    element: RequiredBIElement, bi_status_fetcher: ABCBIStatusFetcher
+) -> Hashable:
+    """Everything the computation of a leaf for this element depends on"""
+    host_row = bi_status_fetcher.states.get(BIHostSpec(element.site_id, element.host_name))
+    assumed_state = bi_status_fetcher.assumed_states.get(element)
+    if host_row is None:
+        return None, assumed_state
+
+    if element.service_description is None:
+        return (
+            host_row.state,
+            host_row.has_been_checked,
+            host_row.hard_state,
+            host_row.plugin_output,
+            host_row.scheduled_downtime_depth,
+            host_row.in_service_period,
+            host_row.acknowledged,
+        ), assumed_state
+
+    return (
+        host_row.scheduled_downtime_depth,
+        host_row.services_with_fullstate.get(element.service_description),
+    ), assumed_state
+
+
+class BINodeResultCache:
+    """Caches node results of compiled BI branches keyed on the element states
+
+    The cache must be cleared as soon as the aggregations are compiled again. It may be
+    shared by the threads of a process.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Maps a required element to all rule nodes (including the branch root)
+        # which have this element somewhere below them.
+        self._dependency_index: dict[RequiredBIElement, list[_NodePath]] = {}
+        self._indexed_branches: set[tuple[str, str]] = set()
+        self._elements_of_host: dict[BIHostSpec, set[RequiredBIElement]] = {}
+        self._host_rows: dict[BIHostSpec, BIHostStatusInfoRow | None] = {}
+        self._assumed_states: dict[RequiredBIElement, HostState | ServiceState] = {}
+        self._element_states: dict[RequiredBIElement, Hashable] = {}
+        self._node_results: dict[_NodeResultKey, NodeResultBundle | None] = {}
+        self.stats = BINodeResultCacheStats()
+        self._source_state: Hashable = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def clear_on_change(self, source_state: Hashable) -> None:
+        """Clears the cache in case the compiled aggregations are not the ones seen so far"""
+        with self._lock:
+            if source_state != self._source_state:
+                self._clear()
+                self._source_state = source_state
+
+    def _clear(self) -> None:
+        self._dependency_index.clear()
+        self._indexed_branches.clear()
+        self._elements_of_host.clear()
+        self._host_rows.clear()
+        self._assumed_states.clear()
+        self._element_states.clear()
+        self._node_results.clear()
+        self.stats = BINodeResultCacheStats()
+
+    def compute_branches(
+        self,
+        compiled_aggregation: BICompiledAggregation,
+        branches: list[BICompiledRule],
+        bi_status_fetcher: ABCBIStatusFetcher,
+    ) -> list[NodeResultBundle]:
+        """Same as BICompiledAggregation.compute_branches, but only recomputes dirty paths"""
+        with self._lock:
+            return self._compute_branches(compiled_aggregation, branches, bi_status_fetcher)
+
+    def _compute_branches(
+        self,
+        compiled_aggregation: BICompiledAggregation,
+        branches: list[BICompiledRule],
+        bi_status_fetcher: ABCBIStatusFetcher,
+    ) -> list[NodeResultBundle]:
+        for branch in branches:
+            self._index_branch(compiled_aggregation.id, branch)
+        self._invalidate_changed_elements(
+            {host_spec for branch in branches for host_spec in branch.get_required_hosts()},
+            bi_status_fetcher,
+        )
+
+        assumed_state_ids = set(bi_status_fetcher.assumed_states)
+        aggregation_results = []
+        for bi_compiled_branch in branches:
+            required_elements = bi_compiled_branch.required_elements()
+            compute_assumed_state = any(assumed_state_ids.intersection(required_elements))
+            result = self._compute_node(
+                bi_compiled_branch,
+                (compiled_aggregation.id, bi_compiled_branch.properties.title, ()),
+                compiled_aggregation.computation_options,
+                bi_status_fetcher,
+                compute_assumed_state,
+            )
+            if result is not None:
+                aggregation_results.append(result)
+        return aggregation_results
+
+    def _index_branch(self, aggr_id: str, branch: BICompiledRule) -> None:
+        if (branch_key := (aggr_id, branch.properties.title)) in self._indexed_branches:
+            return
+        self._indexed_branches.add(branch_key)
+
+        def _index(node: ABCBICompiledNode, path: _NodePath, ancestors: list[_NodePath]) -> None:
+            if isinstance(node, BICompiledRule):
+                for index, child in enumerate(node.nodes):
+                    _index(child, (*path[:2], (*path[2], index)), [*ancestors, path])
+                return
+
+            for element in node.required_elements():
+                self._dependency_index.setdefault(element, []).extend(ancestors)
+                self._elements_of_host.setdefault(
+                    BIHostSpec(element.site_id, element.host_name), set()
+                ).add(element)
+
+        _index(branch, (*branch_key, ()), [])
+
+    def _invalidate_changed_elements(
+        self,
+        required_hosts: Iterable[BIHostSpec],
+        bi_status_fetcher: ABCBIStatusFetcher,
+    ) -> None:
+        hosts_with_changed_assumptions = {
+            BIHostSpec(element.site_id, element.host_name)
+            for element in set(self._assumed_states) | set(bi_status_fetcher.assumed_states)
+            if self._assumed_states.get(element) != bi_status_fetcher.assumed_states.get(element)
+        }
+        self._assumed_states = dict(bi_status_fetcher.assumed_states)
+
+        dirty_nodes: set[_NodePath] = set()
+        for host_spec in required_hosts:
+            # Comparing the whole status row is much cheaper than comparing each element
+            host_row = bi_status_fetcher.states.get(host_spec)
+            if (
+                host_spec in self._host_rows
+                and self._host_rows[host_spec] == host_row
+                and host_spec not in hosts_with_changed_assumptions
+            ):
+                continue
+            self._host_rows[host_spec] = host_row
+
+            for element in self._elements_of_host.get(host_spec, ()):
+                state_key = element_state_key(element, bi_status_fetcher)
+                if element in self._element_states and self._element_states[element] == state_key:
+                    continue
+                self._element_states[element] = state_key
+                self.stats.dirty_elements += 1
+                dirty_nodes.update(self._dependency_index.get(element, []))
+
+        for node in dirty_nodes:
+            self._node_results.pop((node, False), None)
+            self._node_results.pop((node, True), None)
+
+    def _compute_node(
+        self,
+        node: ABCBICompiledNode,
+        path: _NodePath,
+        computation_options: BIAggregationComputationOptions,
+        bi_status_fetcher: ABCBIStatusFetcher,
+        use_assumed: bool,
+    ) -> NodeResultBundle | None:
+        if not isinstance(node, BICompiledRule):
+            # Leaves are only reached below dirty rule nodes and are cheap to compute
+            return node.compute(computation_options, bi_status_fetcher, use_assumed)
+
+        key = (path, use_assumed)
+        if key in self._node_results:
+            self.stats.cached_nodes += 1
+            return self._node_results[key]
+
+        self.stats.computed_nodes += 1
+        result = node.aggregate_nested_results(
+            [
+                bundle
+                for index, child in enumerate(node.nodes)
+                if (
+                    bundle := self._compute_node(
+                        child,
+                        (*path[:2], (*path[2], index)),
+                        computation_options,
+                        bi_status_fetcher,
+                        use_assumed,
+                    )
+                )
+                is not None
+            ],
+            computation_options,
+            use_assumed,
+        )
+        self._node_results[key] = result
+        return result
@@ -5,8 +5,8 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
-from typing import Any, Literal, NamedTuple, NotRequired, TypedDict
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any, Literal, NamedTuple, NotRequired, overload, TypedDict
 
 from marshmallow import pre_dump
 from marshmallow_oneofschema import OneOfSchema
@@ -402,6 +402,14 @@ class BICompiledRule(ABCBICompiledNode):
             ]
             if bundle is not None
         ]
+        return self.aggregate_nested_results(bundled_results, computation_options, use_assumed)
+
+    def aggregate_nested_results(
+        self,
+        bundled_results: list[NodeResultBundle],
+        computation_options: BIAggregationComputationOptions,
+        use_assumed: bool,
+    ) -> NodeResultBundle | None:
         if not bundled_results:
             return None
         actual_result = self._process_node_compute_result(
@@ -575,11 +583,56 @@ class FrozenBIInfo(NamedTuple):
     based_on_branch_title: str
 
 
+class BIBranchInfo(NamedTuple):
+    title: str
+    required_elements: frozenset[RequiredBIElement]
+
+
+class BILazyCompiledBranches(Sequence[BICompiledRule]):
+    """Branches of a compiled aggregation which are only materialized on access
+
+    The branch infos are always available, so branches can be selected by
+    title or required elements without creating their object trees.
+    """
+
+    def __init__(
+        self, branch_infos: list[BIBranchInfo], load_branch: Callable[[int], BICompiledRule]
+    ) -> None:
+        self.branch_infos = branch_infos
+        self._load_branch = load_branch
+        self._branches: dict[int, BICompiledRule] = {}
+
+    def __len__(self) -> int:
+        return len(self.branch_infos)
+
+    @overload
+    def __getitem__(self, index: int) -> BICompiledRule: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[BICompiledRule]: ...
+
+    def __getitem__(self, index: int | slice) -> BICompiledRule | list[BICompiledRule]:
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(len(self))[index]]
+
+        index = range(len(self))[index]  # normalizes negative indices, raises IndexError
+        if (branch := self._branches.get(index)) is None:
+            branch = self._branches[index] = self._load_branch(index)
+        return branch
+
+    def __iter__(self) -> Iterator[BICompiledRule]:
+        return (self[idx] for idx in range(len(self)))
+
+    @property
+    def num_materialized(self) -> int:
+        return len(self._branches)
+
+
 class BICompiledAggregation:
     def __init__(
         self,
         aggregation_id: str,
-        branches: list[BICompiledRule],
+        branches: Sequence[BICompiledRule],
         computation_options: BIAggregationComputationOptions,
         aggregation_visualization: dict[str, Any],
         groups: BIAggregationGroups,
@@ -591,8 +644,28 @@ class BICompiledAggregation:
         self.aggregation_visualization = aggregation_visualization
         self.groups = groups
 
+    def branch_infos(self) -> list[BIBranchInfo]:
+        """Title and required elements of all branches, without materializing lazy branches"""
+        if isinstance(self.branches, BILazyCompiledBranches):
+            return self.branches.branch_infos
+        return [
+            BIBranchInfo(branch.properties.title, frozenset(branch.required_elements()))
+            for branch in self.branches
+        ]
+
+    def select_branches(self, predicate: Callable[[BIBranchInfo], bool]) -> list[BICompiledRule]:
+        return [
+            self.branches[idx]
+            for idx, branch_info in enumerate(self.branch_infos())
+            if predicate(branch_info)
+        ]
+
+    def get_branch_by_title(self, title: str) -> BICompiledRule | None:
+        branches = self.select_branches(lambda branch_info: branch_info.title == title)
+        return branches[0] if branches else None
+
     def compute_branches(
-        self, branches: list[BICompiledRule], bi_status_fetcher: ABCBIStatusFetcher
+        self, branches: Sequence[BICompiledRule], bi_status_fetcher: ABCBIStatusFetcher
     ) -> list[NodeResultBundle]:
         assumed_state_ids = set(bi_status_fetcher.assumed_states)
         aggregation_results = []
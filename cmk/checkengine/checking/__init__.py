@@ -13,7 +13,15 @@ from ._plugin import (
     ServiceConfigurer,
     ServiceID,
 )
-from ._timing import make_timing_results
+from ._timing import (
+    make_timing_results,
+    PluginKind,
+    PluginTime,
+    PluginTimer,
+    PluginTimesBuffer,
+    PluginTimesStore,
+    slowest_plugins,
+)
 
 __all__ = [
     "AggregatedResult",
@@ -26,5 +34,11 @@ __all__ = [
     "make_timing_results",
     "ServiceConfigurer",
     "merge_enforced_services",
+    "PluginKind",
+    "PluginTime",
+    "PluginTimer",
+    "PluginTimesBuffer",
+    "PluginTimesStore",
     "ServiceID",
+    "slowest_plugins",
 ]
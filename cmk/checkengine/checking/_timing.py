@@ -3,17 +3,43 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+from __future__ import annotations
+
+import dataclasses
+import time
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from contextlib import suppress
-from typing import DefaultDict
+from pathlib import Path
+from typing import DefaultDict, Final, Generic, Literal, ParamSpec, TypeVar
+
+from cmk.ccc import store
 
 from cmk.utils.cpu_tracking import Snapshot
+from cmk.utils.sectionname import SectionMap
 
 from cmk.checkengine.checkresults import ActiveCheckResult
 from cmk.checkengine.fetcher import FetcherType, SourceInfo
+from cmk.checkengine.sectionparser import SectionPlugin
+
+from ._plugin import CheckPlugin, CheckPluginName
 
-__all__ = ["make_timing_results"]
+__all__ = [
+    "make_timing_results",
+    "PluginKind",
+    "PluginTime",
+    "PluginTimer",
+    "PluginTimesBuffer",
+    "PluginTimesStore",
+    "slowest_plugins",
+]
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+_TKey = TypeVar("_TKey")
+_TValue = TypeVar("_TValue")
+
+PluginKind = Literal["parse", "check"]
 
 
 def make_timing_results(
@@ -54,3 +80,163 @@ def make_timing_results(
         perfdata.append(f"cmk_time_{phase}={duration.idle:.3f}")
 
     return ActiveCheckResult(0, infotext, (), perfdata)
+
+
+@dataclasses.dataclass(frozen=True)
+class PluginTime:
+    calls: int
+    wall_time: float
+    cpu_time: float
+
+    @classmethod
+    def null(cls) -> PluginTime:
+        return cls(0, 0.0, 0.0)
+
+    def __add__(self, other: PluginTime) -> PluginTime:
+        if not isinstance(other, PluginTime):
+            return NotImplemented
+        return PluginTime(
+            self.calls + other.calls,
+            self.wall_time + other.wall_time,
+            self.cpu_time + other.cpu_time,
+        )
+
+
+class PluginTimer:
+    """Measure the time spent in the section parse functions and the check plugins
+
+    The times are exclusive: The sections are parsed on demand while the check plugins are
+    running, their parse functions are not accounted to the check plugins.
+    """
+
+    def __init__(self) -> None:
+        self.times: dict[tuple[PluginKind, str], PluginTime] = {}
+        # The wall and CPU time of the tracked functions called by the running ones
+        self._nested: list[list[float]] = []
+
+    def track(self, kind: PluginKind, name: str, function: Callable[_P, _R]) -> Callable[_P, _R]:
+        def tracked(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            self._nested.append([0.0, 0.0])
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                wall_time = time.perf_counter() - wall_start
+                cpu_time = time.process_time() - cpu_start
+                nested_wall_time, nested_cpu_time = self._nested.pop()
+                if self._nested:
+                    self._nested[-1][0] += wall_time
+                    self._nested[-1][1] += cpu_time
+                self.times[(kind, name)] = self.times.get(
+                    (kind, name), PluginTime.null()
+                ) + PluginTime(1, wall_time - nested_wall_time, cpu_time - nested_cpu_time)
+
+        return tracked
+
+    def section_plugins(self, plugins: SectionMap[SectionPlugin]) -> SectionMap[SectionPlugin]:
+        return _TrackedPlugins(
+            plugins,
+            lambda name, plugin: dataclasses.replace(
+                plugin, parse_function=self.track("parse", str(name), plugin.parse_function)
+            ),
+        )
+
+    def check_plugins(
+        self, plugins: Mapping[CheckPluginName, CheckPlugin]
+    ) -> Mapping[CheckPluginName, CheckPlugin]:
+        return _TrackedPlugins(
+            plugins,
+            lambda name, plugin: dataclasses.replace(
+                plugin, function=self.track("check", str(name), plugin.function)
+            ),
+        )
+
+
+class _TrackedPlugins(Mapping[_TKey, _TValue], Generic[_TKey, _TValue]):
+    """Wrap the plugins when they are looked up, the mappings may create them on demand"""
+
+    def __init__(
+        self, plugins: Mapping[_TKey, _TValue], wrap: Callable[[_TKey, _TValue], _TValue]
+    ) -> None:
+        self._plugins: Final = plugins
+        self._wrap: Final = wrap
+
+    def __getitem__(self, key: _TKey) -> _TValue:
+        return self._wrap(key, self._plugins[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._plugins
+
+    def __iter__(self) -> Iterator[_TKey]:
+        return iter(self._plugins)
+
+    def __len__(self) -> int:
+        return len(self._plugins)
+
+
+class PluginTimesStore:
+    """The plugin times summed up over all check runs of the site"""
+
+    def __init__(self, path: Path) -> None:
+        self.path: Final = path
+
+    def add(self, times: Mapping[tuple[PluginKind, str], PluginTime]) -> None:
+        if not times:
+            return
+        with store.locked(self.path):
+            summed = dict(self.load())
+            for key, plugin_time in times.items():
+                summed[key] = summed.get(key, PluginTime.null()) + plugin_time
+            store.save_object_to_file(
+                self.path,
+                {key: dataclasses.astuple(plugin_time) for key, plugin_time in summed.items()},
+            )
+
+    def pop(self) -> Mapping[tuple[PluginKind, str], PluginTime]:
+        """Load the times and start summing up from scratch"""
+        with store.locked(self.path):
+            times = self.load()
+            store.save_object_to_file(self.path, {})
+        return times
+
+    def load(self) -> Mapping[tuple[PluginKind, str], PluginTime]:
+        return {
+            key: PluginTime(*plugin_time)
+            for key, plugin_time in store.load_object_from_file(self.path, default={}).items()
+        }
+
+
+class PluginTimesBuffer:
+    """Sum up the plugin times in memory and add them to the store from time to time
+
+    Locking and rewriting the store after every check run is too expensive for the
+    processes checking one host after the other.
+    """
+
+    def __init__(self, plugin_times_store: PluginTimesStore, flush_interval: float) -> None:
+        self._store: Final = plugin_times_store
+        self._flush_interval: Final = flush_interval
+        self._times: dict[tuple[PluginKind, str], PluginTime] = {}
+        self._last_flush = time.monotonic()
+
+    def add(self, times: Mapping[tuple[PluginKind, str], PluginTime]) -> None:
+        for key, plugin_time in times.items():
+            self._times[key] = self._times.get(key, PluginTime.null()) + plugin_time
+        if time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        times, self._times = self._times, {}
+        self._store.add(times)
+
+
+def slowest_plugins(
+    times: Mapping[tuple[PluginKind, str], PluginTime], limit: int | None = None
+) -> Sequence[tuple[PluginKind, str, PluginTime]]:
+    """The plugins keeping the checking busy the longest first"""
+    return sorted(
+        ((kind, name, plugin_time) for (kind, name), plugin_time in times.items()),
+        key=lambda entry: entry[2].wall_time,
+        reverse=True,
+    )[:limit]
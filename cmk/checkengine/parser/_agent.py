@@ -8,7 +8,7 @@ from __future__ import annotations
 import abc
 import logging
 import time
-from collections.abc import Iterator, Mapping, MutableMapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping, Sequence
 from typing import Final, final, NamedTuple
 
 import cmk.ccc.debug
@@ -32,6 +32,7 @@ from ._sectionstore import SectionStore
 
 class SectionWithHeader(NamedTuple):
     header: SectionMarker
+    # Chunks of undecoded lines, see `iter_section_lines()`
     section: list[AgentRawData]
 
 
@@ -102,6 +103,7 @@ class ParserState(abc.ABC):
 
     @abc.abstractmethod
     def do_action(self, line: bytes) -> ParserState:
+        """Handle data, that is one or more lines without section or piggyback markers"""
         raise NotImplementedError()
 
     @abc.abstractmethod
@@ -469,9 +471,7 @@ class HostSectionParser(ParserState):
         self.current_section: Final = current_section
 
     def do_action(self, line: bytes) -> ParserState:
-        self.sections[-1].section.append(
-            AgentRawData(line if self.current_section.nostrip else line.strip())
-        )
+        self.sections[-1].section.append(AgentRawData(line))
         return self
 
     def on_piggyback_header(self, piggyback_header: PiggybackMarker) -> ParserState:
@@ -534,10 +534,17 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
 
         def decode_sections(
             sections: ImmutableSection,
+            *,
+            selection: SectionNameCollection,
         ) -> MutableSectionMap[list[AgentRawDataSectionElem]]:
             out: MutableSectionMap[list[AgentRawDataSectionElem]] = {}
             for header, content in sections:
-                out.setdefault(header.name, []).extend(header.parse_line(line) for line in content)
+                if not (selection is NO_SELECTION or header.name in selection):
+                    continue
+                out.setdefault(header.name, []).extend(
+                    header.parse_line(line)
+                    for line in iter_section_lines(content, strip=not header.nostrip)
+                )
             return out
 
         def flatten_piggyback_section(
@@ -565,13 +572,9 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
                             header.separator,
                         )
                     ).encode(header.encoding)
-                yield from (bytes(line) for line in content)
+                yield from iter_section_lines(content, strip=False)
 
-        sections = {
-            name: content
-            for name, content in decode_sections(raw_sections).items()
-            if selection is NO_SELECTION or name in selection
-        }
+        sections = decode_sections(raw_sections, selection=selection)
         piggybacked_raw_data = {
             header.hostname: list(
                 flatten_piggyback_section(
@@ -614,7 +617,11 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
         self,
         raw_data: AgentRawData,
     ) -> tuple[ImmutableSection, Mapping[PiggybackMarker, ImmutableSection]]:
-        """Split agent output in chunks, splits lines by whitespaces."""
+        """Split agent output in sections
+
+        Only the section and piggyback markers are handled line by line. The data in between
+        is passed on in chunks and only split into lines when the section is decoded.
+        """
         parser: ParserState = NOOPParser(
             self.hostname,
             [],
@@ -623,7 +630,56 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
             encoding_fallback=self.encoding_fallback,
             logger=self._logger,
         )
-        for line in raw_data.split(b"\n"):
-            parser = parser(line.rstrip(b"\r"))
+        data_start = 0
+        for line_start, line_end, next_line_start in iter_marker_lines(raw_data):
+            if line_start > data_start:
+                parser = parser.do_action(raw_data[data_start:line_start])
+            parser = parser(raw_data[line_start:line_end])
+            data_start = next_line_start
+        if data_start < len(raw_data):
+            parser = parser.do_action(raw_data[data_start:])
 
         return parser.sections, parser.piggyback_sections
+
+
+def iter_marker_lines(raw_data: bytes) -> Iterator[tuple[int, int, int]]:
+    """Find the lines of the section and piggyback markers
+
+    Yields the start and the end (without trailing carriage returns) of every
+    line looking like a marker, and the start of the next line.
+
+    >>> data = b"<<<a>>>\\r\\n1\\n<<<<b>>>>\\n<<<no marker\\n2 <<<c>>>\\n<<<>>>"
+    >>> [data[start:end] for start, end, _next in iter_marker_lines(data)]
+    [b'<<<a>>>', b'<<<<b>>>>', b'<<<>>>']
+    """
+    if raw_data.startswith(b"<<<"):
+        line_start = 0
+    elif (line_start := raw_data.find(b"\n<<<") + 1) == 0:
+        return
+
+    while True:
+        if (newline := raw_data.find(b"\n", line_start)) == -1:
+            newline = len(raw_data)
+        line_end = newline
+        while line_end > line_start and raw_data[line_end - 1] == 0x0D:  # "\r"
+            line_end -= 1
+        if raw_data.endswith(b">>>", line_start, line_end):
+            yield line_start, line_end, newline + 1
+
+        if (line_start := raw_data.find(b"\n<<<", newline) + 1) == 0:
+            return
+
+
+def iter_section_lines(content: Iterable[bytes], *, strip: bool) -> Iterator[bytes]:
+    """Split the chunks of a section into lines, skipping empty ones
+
+    >>> list(iter_section_lines([b" a b \\r\\n\\n \\n", b"c"], strip=True))
+    [b'a b', b'c']
+    >>> list(iter_section_lines([b" a b \\r\\n\\n \\n", b"c"], strip=False))
+    [b' a b ', b'c']
+    """
+    for chunk in content:
+        for line in chunk.split(b"\n"):
+            if not (line := line.rstrip(b"\r")) or line.isspace():
+                continue
+            yield line.strip() if strip else line
@@ -157,6 +157,7 @@ class Rule(TypedDict, total=False):
     contact_groups: ContactGroups
     count: Count
     customer: str  # TODO: This is a GUI-only feature, which doesn't belong here at all.
+    delay: int
     description: str
     docu_url: str
     disabled: bool
@@ -333,6 +334,7 @@ class ConfigFromWATO(TypedDict):
     replication: Replication | None
     retention_interval: int
     rule_optimizer: bool
+    rule_matching_processes: int
     rule_packs: Sequence[ECRulePack]
     rules: Collection[Rule]
     sqlite_housekeeping_interval: int
@@ -40,6 +40,7 @@ def default_config() -> ConfigFromWATO:
         actions=[],
         debug_rules=False,
         rule_optimizer=True,
+        rule_matching_processes=0,
         log_level=LogConfig(
             {
                 "cmk.mkeventd": logging.INFO,
@@ -4,14 +4,16 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import itertools
-import shlex
-import subprocess
+import json
+import os
+import re
 import threading
 import time
-from collections.abc import Callable, Iterable, Sequence
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
 from logging import Logger
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from cmk.utils.log import VERBOSE
 from cmk.utils.render import date_and_time
@@ -39,8 +41,17 @@ class FileHistory(History):
         self._history_columns = history_columns
         self._lock = threading.Lock()
         self._active_history_period = ActiveHistoryPeriod()
+        # The first 4 columns of a history entry are not event columns, see add()
+        self._indexed_positions = {
+            colname: position
+            for position, (colname, _defval) in enumerate(event_columns, start=4)
+            if colname in _INDEXED_COLUMNS
+        }
+        self._logfile: _Logfile | None = None
 
     def flush(self) -> None:
+        with self._lock:
+            self._close_logfile()
         _expire_logfiles(self._settings, self._config, self._logger, self._lock, True)
 
     def add(self, event: Event, what: HistoryWhat, who: str = "", addinfo: str = "") -> None:
@@ -66,12 +77,20 @@ class FileHistory(History):
                 for colname, defval in self._event_columns
             ]
 
-            with get_logfile(
+            path = get_logfile(
                 self._config,
                 self._settings.paths.history_dir.value,
                 self._active_history_period,
-            ).open(mode="ab") as f:
-                f.write(b"\t".join(columns) + b"\n")
+            )
+            if self._logfile is None or self._logfile.path != path:
+                self._close_logfile()
+                self._logfile = _Logfile(path, self._indexed_positions, self._logger)
+            self._logfile.write(b"\t".join(columns) + b"\n")
+
+    def _close_logfile(self) -> None:
+        if self._logfile is not None:
+            self._logfile.close()
+            self._logfile = None
 
     def get(self, query: QueryGET) -> Iterable[Sequence[object]]:
         if not self._settings.paths.history_dir.value.exists():
@@ -82,7 +101,8 @@ class FileHistory(History):
         limit = query.limit
         self._logger.debug("Limit: %r", limit)
 
-        grep_pipeline = _grep_pipeline(filters)
+        line_filter = _line_filter(filters)
+        indexed_filters = _indexed_filters(filters)
 
         time_filters = [
             (f.operator_name, f.argument) for f in filters if f.column_name.split("_")[-1] == "time"
@@ -93,11 +113,16 @@ class FileHistory(History):
         )
         self._logger.debug("time range: %r", time_range)
 
+        # The last block of the active logfile is not in the index file yet
+        with self._lock:
+            active_index = None if self._logfile is None else self._logfile.snapshot()
+
         # We do not want to open all files. So our strategy is:
         # look for "time" filters and first apply the filter to
         # the first entry and modification time of the file. Only
         # if at least one of both timestamps is accepted then we
-        # take that file into account.
+        # take that file into account. Within the file, the index
+        # selects the blocks which may contain matching entries.
         # Use the later logfiles first, to get the newer log entries
         # first. When a limit is reached, the newer entries should
         # be processed in most cases. We assume that now.
@@ -114,22 +139,295 @@ class FileHistory(History):
             if not _intersects(time_range, _get_logfile_timespan(path)):
                 self._logger.debug("skipping history file %s because of time filters", path)
                 continue
-            tac = f"nl -b a {shlex.quote(str(path))} | tac"  # Process younger lines first
-            cmd = " | ".join([tac] + grep_pipeline)
-            self._logger.debug("preprocessing history file with command [%s]", cmd)
+            index = (
+                active_index
+                if active_index is not None and active_index.path == path
+                else self._load_index(path)
+            )
+            blocks = index.candidates(time_range, indexed_filters)
+            self._logger.debug(
+                "reading %d of %d blocks of history file %s", len(blocks), len(index.blocks), path
+            )
             new_entries = parse_history_file(
-                self._history_columns, path, query.filter_row, cmd, limit, self._logger
+                self._history_columns,
+                path,
+                blocks,
+                line_filter,
+                query.filter_row,
+                limit,
+                self._logger,
             )
             history_entries += new_entries
             if limit is not None:
                 limit -= len(new_entries)
         return history_entries
 
+    def _load_index(self, path: Path) -> "_LogfileIndex":
+        index = _LogfileIndex.load(path, self._logger)
+        num_stored = len(index.blocks)
+        tail = index.scan(path, self._indexed_positions)
+        if tail.num_lines:
+            index.append(tail.build())
+        if len(index.blocks) != num_stored:
+            with self._lock:
+                # The active logfile maintains its index itself
+                if self._logfile is None or self._logfile.path != path:
+                    index.save()
+        return index
+
     def housekeeping(self) -> None:
+        with self._lock:
+            if self._logfile is not None:
+                self._logfile.flush()
         _expire_logfiles(self._settings, self._config, self._logger, self._lock, False)
 
     def close(self) -> None:
-        pass
+        with self._lock:
+            self._close_logfile()
+
+
+# Number of history entries in one block of the index of a logfile
+_INDEX_BLOCK_SIZE = 1000
+
+# Filters with these operators on these columns select the blocks of a logfile by its index.
+_INDEXED_COLUMNS = ("event_id", "event_host", "event_rule_id")
+_INDEXED_OPERATORS = {"=", "=~", "in"}
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_suffix(".idx")
+
+
+@dataclass(frozen=True)
+class _IndexBlock:
+    """A range of consecutive entries of a logfile
+
+    The values of the indexed columns are stored in lower case, so they can be
+    used for case insensitive filters, too.
+    """
+
+    offset: int
+    end: int
+    first_line: int
+    num_lines: int
+    first_time: float | None
+    last_time: float | None
+    values: Mapping[str, frozenset[str]]
+
+    def serialize(self) -> str:
+        return json.dumps(
+            {
+                "offset": self.offset,
+                "end": self.end,
+                "first_line": self.first_line,
+                "num_lines": self.num_lines,
+                "first_time": self.first_time,
+                "last_time": self.last_time,
+                "values": {column: sorted(values) for column, values in self.values.items()},
+            }
+        )
+
+    @classmethod
+    def deserialize(cls, raw: str) -> "_IndexBlock":
+        data = json.loads(raw)
+        return cls(
+            offset=data["offset"],
+            end=data["end"],
+            first_line=data["first_line"],
+            num_lines=data["num_lines"],
+            first_time=data["first_time"],
+            last_time=data["last_time"],
+            values={column: frozenset(values) for column, values in data["values"].items()},
+        )
+
+
+class _IndexBlockBuilder:
+    def __init__(self, offset: int, first_line: int, indexed_positions: Mapping[str, int]) -> None:
+        self._offset = offset
+        self._end = offset
+        self._first_line = first_line
+        self._indexed_positions = indexed_positions
+        self.num_lines = 0
+        self._first_time: float | None = None
+        self._last_time: float | None = None
+        self._values: dict[str, set[str]] = {column: set() for column in indexed_positions}
+
+    def add(self, line: bytes) -> None:
+        self._end += len(line)
+        self.num_lines += 1
+        parts = line.decode("utf-8", "replace").rstrip("\n").split("\t")
+        try:
+            entry_time = float(parts[0])
+        except ValueError:
+            pass  # Invalid lines are reported when reading them
+        else:
+            self._first_time = (
+                entry_time if self._first_time is None else min(self._first_time, entry_time)
+            )
+            self._last_time = (
+                entry_time if self._last_time is None else max(self._last_time, entry_time)
+            )
+        for column, position in self._indexed_positions.items():
+            if position < len(parts):
+                self._values[column].add(parts[position].lower())
+
+    def build(self) -> _IndexBlock:
+        return _IndexBlock(
+            offset=self._offset,
+            end=self._end,
+            first_line=self._first_line,
+            num_lines=self.num_lines,
+            first_time=self._first_time,
+            last_time=self._last_time,
+            values={column: frozenset(values) for column, values in self._values.items()},
+        )
+
+
+class _LogfileIndex:
+    """The blocks of a logfile and posting lists of the indexed values
+
+    The index is stored in a sidecar file next to the logfile, one block per line.
+    """
+
+    def __init__(self, path: Path, blocks: Iterable[_IndexBlock] = ()) -> None:
+        self.path = path
+        self.blocks: list[_IndexBlock] = []
+        self._postings: dict[tuple[str, str], list[int]] = {}
+        for block in blocks:
+            self.append(block)
+
+    @property
+    def end(self) -> int:
+        return self.blocks[-1].end if self.blocks else 0
+
+    @property
+    def next_line(self) -> int:
+        return self.blocks[-1].first_line + self.blocks[-1].num_lines if self.blocks else 1
+
+    def append(self, block: _IndexBlock) -> None:
+        for column, values in block.values.items():
+            for value in values:
+                self._postings.setdefault((column, value), []).append(len(self.blocks))
+        self.blocks.append(block)
+
+    @classmethod
+    def load(cls, path: Path, logger: Logger) -> "_LogfileIndex":
+        """Load the stored index of a logfile, an invalid index is dropped"""
+        index = cls(path)
+        try:
+            with _index_path(path).open(encoding="utf-8") as f:
+                for raw in f:
+                    block = _IndexBlock.deserialize(raw)
+                    if block.offset != index.end or block.first_line != index.next_line:
+                        raise ValueError(f"block at offset {block.offset} is not contiguous")
+                    index.append(block)
+            if index.end > path.stat().st_size:
+                raise ValueError("logfile is shorter than its index")
+        except FileNotFoundError:
+            return cls(path)
+        except Exception as e:
+            logger.warning("Ignoring invalid index of history file %s: %s", path, e)
+            return cls(path)
+        return index
+
+    def save(self) -> None:
+        index_path = _index_path(self.path)
+        tmp_path = index_path.with_suffix(".idx.new")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            f.writelines(block.serialize() + "\n" for block in self.blocks)
+        os.replace(tmp_path, index_path)
+
+    def scan(self, path: Path, indexed_positions: Mapping[str, int]) -> _IndexBlockBuilder:
+        """Index the entries of the logfile behind the last block
+
+        Complete blocks are appended, the builder of the incomplete last block is returned.
+        """
+        builder = _IndexBlockBuilder(self.end, self.next_line, indexed_positions)
+        with path.open("rb") as f:
+            f.seek(self.end)
+            for line in f:
+                builder.add(line)
+                if builder.num_lines >= _INDEX_BLOCK_SIZE:
+                    block = builder.build()
+                    self.append(block)
+                    builder = _IndexBlockBuilder(
+                        block.end, block.first_line + block.num_lines, indexed_positions
+                    )
+        return builder
+
+    def candidates(
+        self,
+        time_range: tuple[float | None, float | None],
+        indexed_filters: Mapping[str, Sequence[frozenset[str]]],
+    ) -> list[_IndexBlock]:
+        """The blocks which may contain entries matching the filters"""
+        block_numbers: set[int] | None = None
+        for column, filter_values in indexed_filters.items():
+            for values in filter_values:
+                matching = {
+                    block_number
+                    for value in values
+                    for block_number in self._postings.get((column, value), ())
+                }
+                block_numbers = matching if block_numbers is None else block_numbers & matching
+        return [
+            block
+            for block_number, block in enumerate(self.blocks)
+            if (block_numbers is None or block_number in block_numbers)
+            and _intersects(time_range, (block.first_time, block.last_time))
+        ]
+
+
+class _Logfile:
+    """The logfile of the active history period, kept open for appending"""
+
+    def __init__(self, path: Path, indexed_positions: Mapping[str, int], logger: Logger) -> None:
+        self.path = path
+        self._indexed_positions = indexed_positions
+        self._index = _LogfileIndex.load(path, logger)
+        num_stored = len(self._index.blocks)
+        if path.exists():
+            self._block = self._index.scan(path, indexed_positions)
+        else:
+            self._block = _IndexBlockBuilder(0, 1, indexed_positions)
+        if len(self._index.blocks) != num_stored:
+            self._index.save()
+        self._file: BinaryIO = path.open("ab")
+
+    def write(self, line: bytes) -> None:
+        self._file.write(line)
+        # Written to disk right away, as before: A killed mkeventd must not lose entries
+        self.flush()
+        self._block.add(line)
+        if self._block.num_lines >= _INDEX_BLOCK_SIZE:
+            self._complete_block()
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def _complete_block(self) -> None:
+        # The index must never point behind the end of the logfile
+        self.flush()
+        block = self._block.build()
+        self._index.append(block)
+        with _index_path(self.path).open("a", encoding="utf-8") as f:
+            f.write(block.serialize() + "\n")
+        self._block = _IndexBlockBuilder(
+            block.end, block.first_line + block.num_lines, self._indexed_positions
+        )
+
+    def snapshot(self) -> _LogfileIndex:
+        """The index of all entries written so far, including the incomplete last block"""
+        self.flush()
+        index = _LogfileIndex(self.path, self._index.blocks)
+        if self._block.num_lines:
+            index.append(self._block.build())
+        return index
+
+    def close(self) -> None:
+        if self._block.num_lines:
+            self._complete_block()
+        self._file.close()
 
 
 def _expire_logfiles(
@@ -152,6 +450,7 @@ def _expire_logfiles(
                         "Deleting log file %s (age %s)", path, date_and_time(path.stat().st_mtime)
                     )
                     path.unlink()
+                    _index_path(path).unlink(missing_ok=True)
         except Exception as e:
             if settings.options.debug:
                 raise
@@ -173,42 +472,66 @@ _GREPABLE_COLUMNS = {
 }
 
 
-def _grep_pipeline(filters: Iterable[QueryFilter]) -> list[str]:
+def _line_filter(filters: Iterable[QueryFilter]) -> Callable[[bytes], bool]:
     """
-    Optimization: use grep in order to reduce amount of read lines based on some frequently used
-    filters. It's OK if the filters don't match 100% accurately on the right lines. If in doubt, you
-    can output more lines than necessary. This is only a kind of prefiltering.
+    Optimization: check the raw lines for some frequently used filters before parsing them. It's
+    OK if the filters don't match 100% accurately on the right lines. If in doubt, you can accept
+    more lines than necessary. This is only a kind of prefiltering.
 
-    >>> _grep_pipeline([])
-    []
+    >>> _line_filter([])(b"foo")
+    True
 
-    >>> _grep_pipeline([QueryFilter("event_core_host", '=', lambda x: True, '|| ping')])
-    ["grep -F -e '|| ping'"]
+    >>> line_filter = _line_filter([QueryFilter("event_core_host", '=', lambda x: True, '|| ping')])
+    >>> line_filter(b"foo\\t|| ping"), line_filter(b"foo\\t|| PING")
+    (True, False)
 
     """
-    return [
-        command
+    predicates = [
+        predicate
         for f in filters
         if f.column_name in _GREPABLE_COLUMNS
-        for command in [_grep_command(f.operator_name, str(f.argument))]
-        if command is not None
+        for predicate in [_line_predicate(f.operator_name, str(f.argument))]
+        if predicate is not None
     ]
+    return lambda line: all(predicate(line) for predicate in predicates)
 
 
-def _grep_command(operator_name: OperatorName, argument: str) -> str | None:
+def _line_predicate(operator_name: OperatorName, argument: str) -> Callable[[bytes], bool] | None:
     if operator_name == "=":
-        return f"grep -F {_grep_pattern(argument)}"
+        pattern = argument.encode("utf-8")
+        return lambda line: pattern in line
     if operator_name == "=~":
-        return f"grep -F -i {_grep_pattern(argument)}"
-    if operator_name == "~":
-        return f"grep -E {_grep_pattern(argument)}"
-    if operator_name == "~~":
-        return f"grep -E -i {_grep_pattern(argument)}"
+        pattern = argument.lower().encode("utf-8")
+        return lambda line: pattern in line.lower()
+    if operator_name in ("~", "~~"):
+        try:
+            regex = re.compile(
+                argument.encode("utf-8"), re.IGNORECASE if operator_name == "~~" else 0
+            )
+        except re.error:
+            return None  # Regex flavours differ, leave it to the real filter
+        return lambda line: regex.search(line) is not None
     return None
 
 
-def _grep_pattern(argument: str) -> str:
-    return f"-e {shlex.quote(argument)}"
+def _indexed_filters(filters: Iterable[QueryFilter]) -> Mapping[str, Sequence[frozenset[str]]]:
+    """The (lower case) values of the indexed columns the filters accept
+
+    >>> sorted(_indexed_filters([QueryFilter("event_host", 'in', lambda x: True, ['a', 'B'])])[
+    ...     "event_host"
+    ... ][0])
+    ['a', 'b']
+
+    """
+    indexed_filters: dict[str, list[frozenset[str]]] = {}
+    for f in filters:
+        if f.column_name not in _INDEXED_COLUMNS or f.operator_name not in _INDEXED_OPERATORS:
+            continue
+        arguments = f.argument if f.operator_name == "in" else [f.argument]
+        indexed_filters.setdefault(f.column_name, []).append(
+            frozenset(str(argument).lower() for argument in arguments)
+        )
+    return indexed_filters
 
 
 def _greatest_lower_bound_for_filters(
@@ -263,31 +586,36 @@ def _intersects(
 def parse_history_file(
     history_columns: Sequence[tuple[str, Any]],
     path: Path,
+    blocks: Sequence[_IndexBlock],
+    line_filter: Callable[[bytes], bool],
     filter_row: Callable[[Sequence[Any]], bool],
-    cmd: str,
     limit: int | None,
     logger: Logger,
 ) -> list[Any]:
+    """Read the entries of the given blocks, younger entries first"""
     entries: list[Any] = []
-    with subprocess.Popen(
-        cmd,
-        shell=True,  # nosec B602 # BNS:67522a
-        close_fds=True,
-        stdout=subprocess.PIPE,
-    ) as grep:
-        if grep.stdout is None:
-            raise Exception("Huh? stdout vanished...")
-
-        for line in grep.stdout:
-            if limit is not None and len(entries) > limit:
-                break
-            try:
-                parts: list[Any] = line.decode("utf-8").rstrip("\n").split("\t")
-                convert_history_line(history_columns, parts)
-                if filter_row(parts):
-                    entries.append(parts)
-            except Exception:
-                logger.exception("Invalid line '%s' in history file %s", line, path)
+    with path.open("rb") as f:
+        for block in reversed(blocks):
+            f.seek(block.offset)
+            lines = f.read(block.end - block.offset).split(b"\n")
+            if not lines[-1]:
+                lines.pop()
+            for line_number, line in zip(
+                range(block.first_line + len(lines) - 1, block.first_line - 1, -1),
+                reversed(lines),
+            ):
+                if limit is not None and len(entries) >= limit:
+                    return entries
+                if not line_filter(line):
+                    continue
+                try:
+                    parts: list[Any] = line.decode("utf-8").split("\t")
+                    parts.insert(0, line_number)
+                    convert_history_line(history_columns, parts)
+                    if filter_row(parts):
+                        entries.append(parts)
+                except Exception:
+                    logger.exception("Invalid line '%s' in history file %s", line, path)
 
     return entries
 
@@ -300,8 +628,8 @@ def parse_history_file_python(
     """Pure python reader for history files. Used for update config, where filtering is not needed.
 
     To avoid slurping the whole file in memory this generator yields chunks of entries.
-    This is not faster than the grep approach(parse_history_file()), but it's more memory efficient
-    and does not need to fork a subprocess and other cmk specific stuff.
+    This does not need the index of the history file (see parse_history_file()) and other cmk
+    specific stuff.
     """
     with open(path, "rb") as f:
         for chunk in itertools.batched(f, 100_000):
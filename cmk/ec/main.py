@@ -19,6 +19,7 @@ import errno
 import ipaddress
 import itertools
 import json
+import multiprocessing
 import os
 import pprint
 import select
@@ -29,10 +30,11 @@ import threading
 import time
 import traceback
 from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from logging import DEBUG, getLogger, Logger
 from pathlib import Path
 from types import FrameType
-from typing import Any, assert_never, IO, Literal, TypedDict
+from typing import Any, assert_never, IO, Literal, NamedTuple, TypedDict
 
 from setproctitle import setthreadtitle
 
@@ -46,6 +48,7 @@ from cmk.ccc.site import omd_site
 import cmk.utils.paths
 from cmk.utils import log
 from cmk.utils.hostaddress import HostAddress, HostName
+from cmk.utils.inotify import INotify, Masks
 from cmk.utils.iterables import partition
 from cmk.utils.log import VERBOSE
 from cmk.utils.translations import translate_hostname
@@ -295,6 +298,83 @@ def process_exists(pid: int) -> bool:
         return False
 
 
+# Upper limit of messages read from a single source per wakeup, so a flood on
+# one socket does not starve the others.
+_DRAIN_BUDGET = 1000
+# Large enough for every UDP datagram
+_RECEIVE_BUFFER_SIZE = 65535
+# Kernel receive buffer of the UDP sockets, to survive bursts. It is capped by net.core.rmem_max.
+_UDP_SOCKET_BUFFER_SIZE = 16 * 1024 * 1024
+# Not exported by the socket module: Attach the number of dropped datagrams to each datagram
+_SO_RXQ_OVFL = 40
+_DROP_COUNTER_BUFFER_SIZE = socket.CMSG_SPACE(4)
+
+
+def _is_readable(fd: FileDescr) -> bool:
+    """Check without blocking whether data (or an EOF) is waiting to be read"""
+    return bool(select.select([fd], [], [], 0)[0])
+
+
+def tune_udp_socket(udp_socket: socket.socket) -> None:
+    """Enlarge the receive buffer and enable the drop counter"""
+    with contextlib.suppress(OSError):
+        udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _UDP_SOCKET_BUFFER_SIZE)
+    with contextlib.suppress(OSError):
+        udp_socket.setsockopt(socket.SOL_SOCKET, _SO_RXQ_OVFL, 1)
+
+
+class SpoolDirectory:
+    """The files in the spool directory, oldest first
+
+    The directory is only listed initially and when the kernel's event queue
+    overflowed. Otherwise new files are reported by inotify, so we don't have
+    to list the directory in every iteration of the event loop. Files starting
+    with a dot are ignored: They are still being written.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._inotify = INotify()
+        # A dict is an ordered set
+        self._pending: dict[str, None] = {}
+        self._watch()
+
+    def fileno(self) -> int:
+        return self._inotify.fileno()
+
+    def close(self) -> None:
+        self._inotify.close()
+
+    @property
+    def backlog(self) -> int:
+        return len(self._pending)
+
+    def _watch(self) -> None:
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._inotify.add_watch(self._path, Masks.CLOSE_WRITE | Masks.MOVED_TO | Masks.ONLYDIR)
+        self._scan()
+
+    def _scan(self) -> None:
+        for path in sorted(self._path.glob("[!.]*"), key=lambda x: x.stat().st_mtime):
+            self._pending.setdefault(path.name)
+
+    def read_events(self) -> None:
+        for event in self._inotify.read(timeout=0):
+            if event.type & Masks.Q_OVERFLOW:
+                self._scan()
+            elif event.type & Masks.IGNORED:  # The directory itself was removed
+                self._watch()
+            elif not event.name.startswith("."):
+                self._pending.setdefault(event.name)
+
+    def pop(self) -> Path | None:
+        if not self._pending:
+            return None
+        name = next(iter(self._pending))
+        del self._pending[name]
+        return self._path / name
+
+
 def drain_pipe(pipe: FileDescr) -> None:
     while True:
         try:
@@ -358,161 +438,582 @@ class MKSignalException(MKException):
 #   '----------------------------------------------------------------------'
 
 
-class EventServer(ECServerThread):
-    """Processing and classification of incoming events."""
+class RuleMatchOutcome(NamedTuple):
+    """The result of matching an event against the rules
 
-    def __init__(
-        self,
-        logger: Logger,
-        settings: Settings,
-        config: Config,
-        slave_status: SlaveStatus,
-        perfcounters: Perfcounters,
-        lock_configuration: ECLock,
-        history: History,
-        event_status: EventStatus,
-        event_columns: Columns,
-        create_pipes_and_sockets: bool = True,
-    ) -> None:
-        super().__init__(
-            name="EventServer",
-            logger=logger,
-            settings=settings,
-            config=config,
-            slave_status=slave_status,
-            profiling_enabled=settings.options.profile_event,
-            profile_file=settings.paths.event_server_profile.value,
-        )
-        self._syslog_udp: socket.socket | None = None
-        self._syslog_tcp: socket.socket | None = None
-        self._snmp_trap_socket: socket.socket | None = None
+    rule_id is None if no rule matched. rule_hits contains the IDs of all
+    rules that matched, including those of skipped rule packs.
+    """
 
-        self._rules: list[Rule] = []
-        self._rule_by_id: dict[str | None, Rule] = {}
-        self._rule_hash: dict[int, dict[int, Any]] = {}
-        self._hash_stats: list[list[int]] = []  # facility/priority
-        for _unused_facility in range(32):
-            self._hash_stats.append([0] * 8)
+    event: Event
+    rule_id: str | None
+    match_groups: MatchGroups
+    cancelling: bool
+    dropped: bool
+    rule_tries: int
+    rule_hits: Sequence[str]
 
-        self.host_config = HostConfig(self._logger)
-        self._perfcounters = perfcounters
-        self._lock_configuration = lock_configuration
-        self._history = history
-        self._event_status = event_status
-        self._event_columns = event_columns
+
+class EventMatcher:
+    """The CPU heavy, stateless part of the event processing
+
+    Translates the host name, finds the rule matching an event and rewrites
+    the event accordingly. It does not touch the event status, so it can run
+    in worker processes as well.
+    """
+
+    def __init__(self, logger: Logger, settings: Settings, config: Config) -> None:
+        self._logger = logger
+        self.settings = settings
+        self._config = config
+        self.rule_packs: Sequence[ECRulePack] = []
+        self.rules: list[Rule] = []
+        self.rule_by_id: dict[str | None, Rule] = {}
+        self._rule_hash: dict[int, dict[int, Any]] = {}
         self._message_period = ActiveHistoryPeriod()
         self._time_period = TimePeriods(logger)
-        self._rule_matcher = RuleMatcher(
+        self.rule_matcher = RuleMatcher(
             logger=self._logger if config["debug_rules"] else None,
             omd_site_id=omd_site(),
             is_active_time_period=self._time_period.active,
         )
 
-        # HACK for testing: The real fix would involve breaking up these huge
-        # class monsters.
-        if not create_pipes_and_sockets:
-            return
+    def reload_configuration(self, config: Config) -> None:
+        self._config = config
+        self.compile_rules(self._config["rule_packs"])
+        self.rule_matcher = RuleMatcher(
+            logger=self._logger if config["debug_rules"] else None,
+            omd_site_id=omd_site(),
+            is_active_time_period=self._time_period.active,
+        )
 
-        self.create_pipe()
-        self.open_eventsocket()
-        self.open_syslog_udp()
-        self.open_syslog_tcp()
-        self.open_snmptrap()
-        self._snmp_trap_parser = SNMPTrapParser(
-            self.settings, self._config, self._logger.getChild("snmp")
-        ).parse
+    def compile_rules(self, rule_packs: Sequence[ECRulePack]) -> None:
+        """Precompile regular expressions and similar stuff."""
+        self.rule_packs = rule_packs
+        self.rules = []
+        self.rule_by_id = {}
+        # Speedup-Hash for rule execution
+        self._rule_hash = {}
+        count_disabled = 0
+        count_rules = 0
+        count_unspecific = 0
 
-    @classmethod
-    def status_columns(cls) -> Columns:
-        return list(
-            itertools.chain(
-                cls._general_columns(),
-                Perfcounters.status_columns(),
-                cls._replication_columns(),
-                cls._event_limit_columns(),
-            )
+        # Loop through all rule packs and with through their rules
+        for rule_pack in rule_packs:
+            if rule_pack["disabled"]:
+                count_disabled += len(rule_pack["rules"])
+                continue
+
+            for rule in rule_pack["rules"]:
+                if rule.get("disabled"):
+                    count_disabled += 1
+                else:
+                    count_rules += 1
+                    rule = rule.copy()  # keep original intact because of slave replication
+
+                    # Store information about rule pack right within the rule. This is needed
+                    # for debug output and also for skipping rule packs
+                    rule["pack"] = rule_pack["id"]
+                    self.rules.append(rule)
+                    self.rule_by_id[rule["id"]] = rule
+                    try:
+                        compile_rule(rule)
+                    except Exception:
+                        if self.settings.options.debug:
+                            raise
+                        rule["disabled"] = True
+                        count_disabled += 1
+                        self._logger.exception(
+                            "Ignoring rule '%s/%s' because of an invalid regex.",
+                            rule["pack"],
+                            rule["id"],
+                        )
+
+                    if self._config["rule_optimizer"]:
+                        self.hash_rule(rule)
+                        if (
+                            "match_facility" not in rule
+                            and "match_priority" not in rule
+                            and "cancel_priority" not in rule
+                            and "cancel_application" not in rule
+                        ):
+                            count_unspecific += 1
+
+        self._logger.info(
+            "Compiled %d active rules (ignoring %d disabled rules)", count_rules, count_disabled
         )
+        if self._config["rule_optimizer"]:
+            self._logger.info(
+                "Rule hash: %d rules - %d hashed, %d unspecific",
+                len(self.rules),
+                len(self.rules) - count_unspecific,
+                count_unspecific,
+            )
+            for facility in list(range(23)) + [31]:
+                if facility in self._rule_hash:
+                    stats = [
+                        f"{SyslogPriority(prio)}({len(entries)})"
+                        for prio, entries in self._rule_hash[facility].items()
+                    ]
+                    self._logger.info(" %-12s: %s", SyslogFacility(facility), " ".join(stats))
 
-    @classmethod
-    def _general_columns(cls) -> Columns:
-        return [
-            ("status_config_load_time", 0),
-            ("status_num_open_events", 0),
-            ("status_virtual_memory_size", 0),
-        ]
+    def hash_rule(self, rule: Rule) -> None:
+        """Construct rule hash for faster execution."""
+        facility = rule.get("match_facility")
+        if facility and not rule.get("invert_matching"):
+            self.hash_rule_facility(rule, facility)
+        else:
+            for facility in range(32):  # all syslog facilities
+                self.hash_rule_facility(rule, facility)
 
-    @classmethod
-    def _replication_columns(cls) -> Columns:
-        return [
-            ("status_replication_slavemode", ""),
-            ("status_replication_last_sync", 0.0),
-            ("status_replication_success", False),
-        ]
+    def hash_rule_facility(self, rule: Rule, facility: int) -> None:
+        needed_prios = [False] * 8
 
-    @classmethod
-    def _event_limit_columns(cls) -> Columns:
-        return [
-            ("status_event_limit_host", 0),
-            ("status_event_limit_rule", 0),
-            ("status_event_limit_overall", 0),
-            ("status_event_limit_active_hosts", []),
-            ("status_event_limit_active_rules", []),
-            ("status_event_limit_active_overall", False),
-        ]
+        if "match_priority" in rule:
+            prio_from, prio_to = rule["match_priority"]
+            for p in range(prio_to, prio_from + 1):  # Beware: from > to!
+                needed_prios[p] = True
+        else:  # all priorities match
+            needed_prios = [True] * 8  # needed to check this rule for all event priorities
 
-    def get_status(self) -> Iterable[Sequence[object]]:
-        return [
-            [
-                *self._add_general_status(),
-                *self._perfcounters.get_status(),
-                *self._add_replication_status(),
-                *self._add_event_limit_status(),
-            ]
-        ]
+        if "cancel_priority" in rule:
+            prio_from, prio_to = rule["cancel_priority"]
+            for p in range(prio_to, prio_from + 1):  # Beware: from > to!
+                needed_prios[p] = True
+        elif "match_ok" in rule:  # a cancelling rule where all priorities cancel
+            needed_prios = [True] * 8  # needed to check this rule for all event priorities
 
-    def _add_general_status(self) -> Sequence[object]:
-        return [
-            self._config["last_reload"],
-            self._event_status.num_existing_events,
-            self._virtual_memory_size(),
-        ]
+        if rule.get("invert_matching"):
+            needed_prios = [True] * 8
 
-    def _virtual_memory_size(self) -> int:
-        parts = Path("/proc/self/stat").read_text().split()
-        return int(parts[22])  # in Bytes
+        prio_hash = self._rule_hash.setdefault(facility, {})
+        for prio, need in enumerate(needed_prios):
+            if need:
+                prio_hash.setdefault(prio, []).append(rule)
 
-    def _add_replication_status(self) -> list[object]:
-        if is_replication_slave(self._config):
-            return [
-                self._slave_status["mode"],
-                self._slave_status["last_sync"],
-                self._slave_status["success"],
-            ]
-        return ["master", 0.0, False]
+    def match_event(self, event: Event) -> RuleMatchOutcome:  # pylint: disable=too-many-branches
+        self.do_translate_hostname(event)
 
-    def _add_event_limit_status(self) -> list[object]:
-        return [
-            self._config["event_limit"]["by_host"]["limit"],
-            self._config["event_limit"]["by_rule"]["limit"],
-            self._config["event_limit"]["overall"]["limit"],
-            self.get_hosts_with_active_event_limit(),
-            self.get_rules_with_active_event_limit(),
-            self.is_overall_event_limit_active(),
-        ]
+        # Log all incoming messages into a syslog-like text file if that is enabled
+        if self._config["log_messages"]:
+            self.log_message(event)
 
-    def create_pipe(self) -> None:
-        path = self.settings.paths.event_pipe.value
-        with contextlib.suppress(Exception):
-            if not path.is_fifo():
-                path.unlink()
-        if not path.exists():
-            os.mkfifo(str(path))
-        # We want to be able to receive events from all users on the local system
-        path.chmod(0o662)
+        # Rule optimizer
+        if self._config["rule_optimizer"]:
+            rule_candidates = self._rule_hash.get(event["facility"], {}).get(event["priority"], [])
+        else:
+            rule_candidates = self.rules
 
-        self._logger.info("Created FIFO '%s' for receiving events", path)
+        rule_tries = 0
+        rule_hits: list[str] = []
+        skip_pack = None
+        for rule in rule_candidates:
+            # TODO: Rewrite this skipping logic, so it's blindingly obvious, even for mypy.
+            if skip_pack and rule["pack"] == skip_pack:  # type: ignore[unreachable]
+                continue  # type: ignore[unreachable] # still in the rule pack that we want to skip
+            skip_pack = None  # new pack, reset skipping
 
-    def open_syslog_udp(self) -> None:
+            rule_tries += 1
+            try:
+                result = self.event_rule_matches(rule, event)
+            except Exception as e:
+                result = MatchFailure(
+                    reason=f"Rule would match, but due to inverted matching does not. {e}"
+                )
+                self._logger.exception(result.reason)
+
+            if not isinstance(result, MatchSuccess):
+                continue
+
+            rule_hits.append(rule["id"])
+            if self._config["debug_rules"]:
+                self._logger.info("  matching groups:\n%s", pprint.pformat(result.match_groups))
+
+            if self._config["log_rulehits"]:
+                self._logger.info(
+                    "Rule '%s/%s' hit by message %s/%s - '%s'.",
+                    rule["pack"],
+                    rule["id"],
+                    SyslogFacility(event["facility"]),
+                    SyslogPriority(event["priority"]),
+                    event["text"],
+                )
+
+            if rule.get("drop") == "skip_pack":
+                skip_pack = rule["pack"]
+                if self._config["debug_rules"]:
+                    self._logger.info("  skipping this rule pack (%s)", skip_pack)
+                continue
+
+            if not rule.get("drop") and not result.cancelling:
+                # Remember the rule id that this event originated from
+                event["rule_id"] = rule["id"]
+
+                # Attach optional contact group information for visibility
+                # and eventually for notifications
+                self.add_rule_contact_groups_to_event(rule, event)
+
+                # Store groups from matching this event. In order to make
+                # persistence easier, we do not save them as list but join
+                # them on ASCII-1.
+                match_groups_message = result.match_groups.get("match_groups_message", ())
+                assert match_groups_message is not False
+                event["match_groups"] = match_groups_message
+
+                match_groups_syslog_application = result.match_groups.get(
+                    "match_groups_syslog_application", ()
+                )
+                assert match_groups_syslog_application is not False
+                event["match_groups_syslog_application"] = match_groups_syslog_application
+
+                self.rewrite_event(rule, event, result.match_groups)
+
+            return RuleMatchOutcome(
+                event,
+                rule["id"],
+                result.match_groups,
+                cancelling=result.cancelling,
+                dropped=bool(rule.get("drop")),
+                rule_tries=rule_tries,
+                rule_hits=rule_hits,
+            )
+
+        return RuleMatchOutcome(
+            event,
+            None,
+            MatchGroups(),
+            cancelling=False,
+            dropped=False,
+            rule_tries=rule_tries,
+            rule_hits=rule_hits,
+        )
+
+    def add_rule_contact_groups_to_event(self, rule: Rule, event: Event) -> None:
+        if rule.get("contact_groups") is None:
+            event.update(
+                {
+                    "contact_groups": None,
+                    "contact_groups_notify": False,
+                    "contact_groups_precedence": "host",
+                }
+            )
+        else:
+            event.update(
+                {
+                    "contact_groups": rule["contact_groups"]["groups"],
+                    "contact_groups_notify": rule["contact_groups"]["notify"],
+                    "contact_groups_precedence": rule["contact_groups"]["precedence"],
+                }
+            )
+
+    def event_rule_matches(self, rule: Rule, event: Event) -> MatchResult:
+        """
+        Checks if an event matches a rule. Returns either MatchFailure (no match)
+        or a MatchSuccess with a pair of matchtype, groups, where matchtype is False for a
+        normal match and True for a cancelling match and the groups is a tuple
+        if matched regex groups in either text (normal) or match_ok (cancelling)
+        match.
+        """
+        return self.rule_matcher.event_rule_matches(rule, event)
+
+    def rewrite_event(  # pylint: disable=too-many-branches
+        self, rule: Rule, event: Event, match_groups: MatchGroups, set_first: bool = True
+    ) -> None:
+        """Rewrite texts and compute other fields in the event."""
+        if rule["state"] == -1:
+            prio = event["priority"]
+            if prio <= 3:
+                event["state"] = 2
+            elif prio == 4:
+                event["state"] = 1
+            else:
+                event["state"] = 0
+        elif isinstance(rule["state"], tuple) and rule["state"][0] == "text_pattern":
+            state_patterns = rule["state"][1]
+            text = event["text"]
+            if match(state_patterns.get("2", None), text, complete=False) is not False:
+                event["state"] = 2
+            elif match(state_patterns.get("1", None), text, complete=False) is not False:
+                event["state"] = 1
+            elif match(state_patterns.get("0", None), text, complete=False) is not False:
+                event["state"] = 0
+            else:
+                event["state"] = 3
+        else:
+            event["state"] = rule["state"]
+
+        if ("sl" not in event) or (rule["sl"]["precedence"] == "rule"):
+            event["sl"] = rule["sl"]["value"]
+        if set_first:
+            event["first"] = event["time"]
+        event["last"] = event["time"]
+        if "set_comment" in rule:
+            event["comment"] = replace_groups(rule["set_comment"], event["text"], match_groups)
+        if "set_text" in rule:
+            event["text"] = replace_groups(rule["set_text"], event["text"], match_groups)
+        if "set_host" in rule:
+            event["orig_host"] = event["host"]
+            event["host"] = HostName(replace_groups(rule["set_host"], event["host"], match_groups))
+        if "set_application" in rule:
+            event["application"] = replace_groups(
+                rule["set_application"], event["application"], match_groups
+            )
+        if "set_contact" in rule and "contact" not in event:
+            event["contact"] = replace_groups(
+                rule["set_contact"], event.get("contact", ""), match_groups
+            )
+
+    def do_translate_hostname(self, event: Event) -> None:
+        try:
+            event["host"] = translate_hostname(self._config["hostname_translation"], event["host"])
+        except Exception:
+            if self._config["debug_rules"]:
+                self._logger.exception('Unable to parse host "%s"', event.get("host"))
+            event["host"] = HostName("")
+
+    def log_message(self, event: Event) -> None:
+        try:
+            with get_logfile(
+                self._config, self.settings.paths.messages_dir.value, self._message_period
+            ).open(mode="ab") as f:
+                f.write(
+                    (
+                        "%s %s %s%s: %s\n"
+                        % (
+                            time.strftime("%b %d %H:%M:%S", time.localtime(event["time"])),
+                            event["host"],
+                            event["application"],
+                            f'[{event["pid"]}]' if event["pid"] else "",
+                            event["text"],
+                        )
+                    ).encode()
+                )
+        except Exception:
+            if self.settings.options.debug:
+                raise
+            # Better silently ignore errors. We could have run out of
+            # diskspace and make things worse by logging that we could
+            # not log.
+
+
+# The event matcher of a rule matching worker process
+_worker_event_matcher: EventMatcher | None = None
+
+
+def _init_rule_matching_worker(
+    settings: Settings, config: Config, rule_packs: Sequence[ECRulePack], log_level: int
+) -> None:
+    global _worker_event_matcher
+    if settings.options.foreground:
+        log.setup_logging_handler(sys.stderr)
+    else:
+        open_log(settings.paths.log_file.value)
+    logger = getLogger("cmk.mkeventd.EventServer")
+    logger.setLevel(log_level)
+    _worker_event_matcher = EventMatcher(logger, settings, config)
+    _worker_event_matcher.compile_rules(rule_packs)
+
+
+def _match_events(events: Sequence[Event]) -> Sequence[RuleMatchOutcome]:
+    assert _worker_event_matcher is not None
+    return [_worker_event_matcher.match_event(event) for event in events]
+
+
+class RuleMatchingPool:
+    """Matches events against the rules in worker processes
+
+    The events are sharded by their host, so the events of one host are always
+    matched by the same worker, in the order they were received.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        settings: Settings,
+        config: Config,
+        rule_packs: Sequence[ECRulePack],
+        processes: int,
+    ) -> None:
+        self._executors = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_rule_matching_worker,
+                initargs=(settings, config, rule_packs, logger.getEffectiveLevel()),
+            )
+            for _worker in range(processes)
+        ]
+
+    def match_events(self, events: Sequence[Event]) -> list[RuleMatchOutcome]:
+        """Match the events in parallel, the outcomes are in the order of the events"""
+        shards: list[list[int]] = [[] for _executor in self._executors]
+        for index, event in enumerate(events):
+            shards[hash(event["host"]) % len(shards)].append(index)
+
+        futures = [
+            (indices, executor.submit(_match_events, [events[index] for index in indices]))
+            for executor, indices in zip(self._executors, shards)
+            if indices
+        ]
+        outcomes: dict[int, RuleMatchOutcome] = {}
+        for indices, future in futures:
+            outcomes.update(zip(indices, future.result()))
+        return [outcomes[index] for index in range(len(events))]
+
+    def shutdown(self) -> None:
+        for executor in self._executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class EventServer(ECServerThread):
+    """Processing and classification of incoming events."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        settings: Settings,
+        config: Config,
+        slave_status: SlaveStatus,
+        perfcounters: Perfcounters,
+        lock_configuration: ECLock,
+        history: History,
+        event_status: EventStatus,
+        event_columns: Columns,
+        create_pipes_and_sockets: bool = True,
+    ) -> None:
+        super().__init__(
+            name="EventServer",
+            logger=logger,
+            settings=settings,
+            config=config,
+            slave_status=slave_status,
+            profiling_enabled=settings.options.profile_event,
+            profile_file=settings.paths.event_server_profile.value,
+        )
+        self._syslog_udp: socket.socket | None = None
+        self._syslog_tcp: socket.socket | None = None
+        self._snmp_trap_socket: socket.socket | None = None
+        # Number of datagrams the kernel dropped so far per UDP socket
+        self._udp_drops: dict[FileDescr, int] = {}
+
+        self._event_matcher = EventMatcher(logger, settings, config)
+        self._rule_matching_pool: RuleMatchingPool | None = None
+        self._hash_stats: list[list[int]] = []  # facility/priority
+        for _unused_facility in range(32):
+            self._hash_stats.append([0] * 8)
+
+        self.host_config = HostConfig(self._logger)
+        self._perfcounters = perfcounters
+        self._lock_configuration = lock_configuration
+        self._history = history
+        self._event_status = event_status
+        self._event_columns = event_columns
+
+        # HACK for testing: The real fix would involve breaking up these huge
+        # class monsters.
+        if not create_pipes_and_sockets:
+            return
+
+        self.create_pipe()
+        self.open_eventsocket()
+        self.open_syslog_udp()
+        self.open_syslog_tcp()
+        self.open_snmptrap()
+        self._snmp_trap_parser = SNMPTrapParser(
+            self.settings, self._config, self._logger.getChild("snmp")
+        ).parse
+
+    @classmethod
+    def status_columns(cls) -> Columns:
+        return list(
+            itertools.chain(
+                cls._general_columns(),
+                Perfcounters.status_columns(),
+                cls._replication_columns(),
+                cls._event_limit_columns(),
+            )
+        )
+
+    @classmethod
+    def _general_columns(cls) -> Columns:
+        return [
+            ("status_config_load_time", 0),
+            ("status_num_open_events", 0),
+            ("status_virtual_memory_size", 0),
+        ]
+
+    @classmethod
+    def _replication_columns(cls) -> Columns:
+        return [
+            ("status_replication_slavemode", ""),
+            ("status_replication_last_sync", 0.0),
+            ("status_replication_success", False),
+        ]
+
+    @classmethod
+    def _event_limit_columns(cls) -> Columns:
+        return [
+            ("status_event_limit_host", 0),
+            ("status_event_limit_rule", 0),
+            ("status_event_limit_overall", 0),
+            ("status_event_limit_active_hosts", []),
+            ("status_event_limit_active_rules", []),
+            ("status_event_limit_active_overall", False),
+        ]
+
+    def get_status(self) -> Iterable[Sequence[object]]:
+        return [
+            [
+                *self._add_general_status(),
+                *self._perfcounters.get_status(),
+                *self._add_replication_status(),
+                *self._add_event_limit_status(),
+            ]
+        ]
+
+    def _add_general_status(self) -> Sequence[object]:
+        return [
+            self._config["last_reload"],
+            self._event_status.num_existing_events,
+            self._virtual_memory_size(),
+        ]
+
+    def _virtual_memory_size(self) -> int:
+        parts = Path("/proc/self/stat").read_text().split()
+        return int(parts[22])  # in Bytes
+
+    def _add_replication_status(self) -> list[object]:
+        if is_replication_slave(self._config):
+            return [
+                self._slave_status["mode"],
+                self._slave_status["last_sync"],
+                self._slave_status["success"],
+            ]
+        return ["master", 0.0, False]
+
+    def _add_event_limit_status(self) -> list[object]:
+        return [
+            self._config["event_limit"]["by_host"]["limit"],
+            self._config["event_limit"]["by_rule"]["limit"],
+            self._config["event_limit"]["overall"]["limit"],
+            self.get_hosts_with_active_event_limit(),
+            self.get_rules_with_active_event_limit(),
+            self.is_overall_event_limit_active(),
+        ]
+
+    def create_pipe(self) -> None:
+        path = self.settings.paths.event_pipe.value
+        with contextlib.suppress(Exception):
+            if not path.is_fifo():
+                path.unlink()
+        if not path.exists():
+            os.mkfifo(str(path))
+        # We want to be able to receive events from all users on the local system
+        path.chmod(0o662)
+
+        self._logger.info("Created FIFO '%s' for receiving events", path)
+
+    def open_syslog_udp(self) -> None:
         endpoint = self.settings.options.syslog_udp
         try:
             if isinstance(endpoint, FileDescriptor):
@@ -658,104 +1159,185 @@ class EventServer(ECServerThread):
 
     def serve(self) -> None:  # pylint: disable=too-many-branches
         pipe = self.open_pipe()
-        listen_list = [
-            f
-            for f in (
-                pipe,
-                self._syslog_udp,
-                self._syslog_tcp,
-                self._eventsocket,
-                self._snmp_trap_socket,
-            )
-            if f is not None
-        ]
+        spool_directory = SpoolDirectory(self.settings.paths.spool_dir.value)
+        for udp_socket in (self._syslog_udp, self._snmp_trap_socket):
+            if udp_socket is not None:
+                tune_udp_socket(udp_socket)
+
+        poller = select.epoll()
+        for fd in [
+            pipe,
+            spool_directory.fileno(),
+            *(
+                s.fileno()
+                for s in (
+                    self._syslog_udp,
+                    self._syslog_tcp,
+                    self._eventsocket,
+                    self._snmp_trap_socket,
+                )
+                if s is not None
+            ),
+        ]:
+            poller.register(fd, select.EPOLLIN)
+
         client_sockets: dict[FileDescr, tuple[socket.socket, tuple[str, int] | None, bytes]] = {}
-        select_timeout = 1
         unprocessed_pipe_data = b""
-        while not self._terminate_event.is_set():
-            try:
-                readable: list[FileDescr | socket.socket] = select.select(
-                    listen_list + list(client_sockets.keys()), [], [], select_timeout
-                )[0]
-            except OSError as e:
-                if e.args[0] != errno.EINTR:
-                    raise
-                continue
-            address: tuple[str, int] | None  # host/port
-
-            # Accept new connection on event unix socket
-            if self._eventsocket in readable:
-                client_socket, remote_address = self._eventsocket.accept()
-                # We have a AF_UNIX socket, so the remote address is a str, which is always ''.
-                if not (isinstance(remote_address, str) and remote_address == ""):
-                    raise ValueError(
-                        f"Invalid remote address '{remote_address!r}' for event socket"
+        try:
+            while not self._terminate_event.is_set():
+                # Don't wait if there are spool files left: process them as fast as possible
+                readable = {fd for fd, _mask in poller.poll(0 if spool_directory.backlog else 1)}
+
+                # Accept new connection on event unix socket
+                if self._eventsocket.fileno() in readable:
+                    client_socket, remote_address = self._eventsocket.accept()
+                    # We have a AF_UNIX socket, so the remote address is a str, which is always ''.
+                    if not (isinstance(remote_address, str) and remote_address == ""):
+                        raise ValueError(
+                            f"Invalid remote address '{remote_address!r}' for event socket"
+                        )
+                    client_socket.setblocking(False)
+                    poller.register(client_socket.fileno(), select.EPOLLIN)
+                    client_sockets[client_socket.fileno()] = (client_socket, None, b"")
+
+                # Same for the TCP syslog socket
+                if self._syslog_tcp is not None and self._syslog_tcp.fileno() in readable:
+                    client_socket, address = self._syslog_tcp.accept()
+                    client_socket.setblocking(False)
+                    poller.register(client_socket.fileno(), select.EPOLLIN)
+                    client_sockets[client_socket.fileno()] = (
+                        client_socket,
+                        parse_address("syslog socket (TCP)", address),
+                        b"",
                     )
-                client_sockets[client_socket.fileno()] = (client_socket, None, b"")
-
-            # Same for the TCP syslog socket
-            if self._syslog_tcp is not None and self._syslog_tcp in readable:
-                client_socket, address = self._syslog_tcp.accept()
-                client_sockets[client_socket.fileno()] = (
-                    client_socket,
-                    parse_address("syslog socket (TCP)", address),
-                    b"",
-                )
 
-            # Read data from existing event unix socket connections
-            # NOTE: We modify client_socket in the loop, so we need to copy below!
-            for fd, (cs, address, previous_data) in list(client_sockets.items()):
-                if fd in readable:
-                    try:
-                        new_data = cs.recv(4096)
-                    except Exception:
-                        new_data = b""
-                        self._logger.exception("Exception during syslog socket_tcp recv")
-
-                    if new_data:
-                        messages, unprocessed = parse_bytes_into_syslog_messages(
-                            previous_data + new_data
-                        )
-                        self.process_syslog_messages(messages, address)
-                        client_sockets[fd] = (cs, address, unprocessed)
-                    else:  # the other side is gone, no more data will ever come
+                # Read data from existing event unix socket connections
+                # NOTE: We modify client_socket in the loop, so we need to copy below!
+                for fd, (cs, address, previous_data) in list(client_sockets.items()):
+                    if fd not in readable:
+                        continue
+                    messages, unprocessed, at_eof = self.read_stream(
+                        "syslog socket_tcp", fd, previous_data
+                    )
+                    self.process_syslog_messages(messages, address)
+                    if at_eof:  # the other side is gone, no more data will ever come
                         del client_sockets[fd]  # discarding previous_data is OK, it's incomplete
+                        poller.unregister(fd)
                         cs.close()  # do this *after* the bookkeeping above, close() can throw
+                    else:
+                        client_sockets[fd] = (cs, address, unprocessed)
 
-            # Read data from pipe
-            if pipe in readable:
-                try:
-                    unprocessed_pipe_data += os.read(pipe, 4096)
-                except Exception:
-                    self._logger.exception("General exception during pipe os.read")
+                # Read data from pipe
+                if pipe in readable:
+                    # The pipe is opened for writing, too, so we never see an EOF here.
+                    messages, unprocessed_pipe_data, _at_eof = self.read_stream(
+                        "pipe", pipe, unprocessed_pipe_data
+                    )
+                    self.process_syslog_messages(messages, None)
+
+                # Read events from builtin syslog server
+                if self._syslog_udp is not None and self._syslog_udp.fileno() in readable:
+                    self.process_potential_event_instrumented(
+                        event
+                        for message, address in self.receive_datagrams(
+                            self._syslog_udp, "syslog socket (UDP)"
+                        )
+                        for event in create_events_from_syslog_messages(
+                            [message],
+                            address,
+                            self._logger if self._config["debug_rules"] else None,
+                        )
+                    )
 
-                messages, unprocessed_pipe_data = parse_bytes_into_syslog_messages(
-                    unprocessed_pipe_data
-                )
-                self.process_syslog_messages(messages, None)
+                # Read events from builtin snmptrap server
+                if (
+                    self._snmp_trap_socket is not None
+                    and self._snmp_trap_socket.fileno() in readable
+                ):
+                    self.process_potential_event_instrumented(
+                        event
+                        for message, address in self.receive_datagrams(
+                            self._snmp_trap_socket, "SNMP trap"
+                        )
+                        for event in self.create_events_from_trap(message, address)
+                    )
 
-            # Read events from builtin syslog server
-            if self._syslog_udp is not None and self._syslog_udp in readable:
-                message, address = self._syslog_udp.recvfrom(4096)
-                self.process_syslog_messages(
-                    [message], parse_address("syslog socket (UDP)", address)
-                )
+                if spool_directory.fileno() in readable:
+                    spool_directory.read_events()
 
-            # Read events from builtin snmptrap server
-            if self._snmp_trap_socket is not None and self._snmp_trap_socket in readable:
-                message, address = self._snmp_trap_socket.recvfrom(65535)
-                self.process_potential_event_instrumented(
-                    self.create_events_from_trap(message, parse_address("SNMP trap", address))
+                # Process one spool file per iteration to not starve the sockets
+                if (spool_file := spool_directory.pop()) is not None:
+                    try:
+                        spool_data = spool_file.read_bytes()
+                    except FileNotFoundError:
+                        pass  # removed by someone else
+                    else:
+                        self.process_syslog_messages(spool_data.splitlines(), None)
+                        spool_file.unlink(missing_ok=True)
+                self._perfcounters.set_gauge("spool_backlog", spool_directory.backlog)
+        finally:
+            poller.close()
+            spool_directory.close()
+            with self._lock_configuration:
+                self._stop_rule_matching_pool()
+
+    def read_stream(
+        self, what: str, fd: FileDescr, unprocessed: bytes
+    ) -> tuple[Sequence[bytes], bytes, bool]:
+        """Read syslog messages from a non-blocking stream
+
+        Reads until the stream would block or the drain budget is used up.
+        Returns the complete messages, the unprocessed rest and whether the
+        stream reached its end.
+        """
+        messages: list[bytes] = []
+        while len(messages) < _DRAIN_BUDGET:
+            try:
+                data = os.read(fd, _RECEIVE_BUFFER_SIZE)
+            except BlockingIOError:
+                return messages, unprocessed, False
+            except Exception:
+                self._logger.exception("Exception during %s read", what)
+                return messages, unprocessed, True
+            if not data:
+                return messages, unprocessed, True
+            new_messages, unprocessed = parse_bytes_into_syslog_messages(unprocessed + data)
+            messages.extend(new_messages)
+        if _is_readable(fd):
+            self._perfcounters.count("drain_limit_hits")
+        return messages, unprocessed, False
+
+    def receive_datagrams(
+        self, udp_socket: socket.socket, what: str
+    ) -> Sequence[tuple[bytes, tuple[str, int]]]:
+        """Receive the queued datagrams until the socket would block or the drain budget is used up
+
+        Receiving all of them at once keeps the kernel buffer from overflowing
+        during bursts.
+        """
+        datagrams: list[tuple[bytes, tuple[str, int]]] = []
+        dropped: int | None = None
+        while len(datagrams) < _DRAIN_BUDGET:
+            try:
+                data, ancdata, _flags, address = udp_socket.recvmsg(
+                    _RECEIVE_BUFFER_SIZE, _DROP_COUNTER_BUFFER_SIZE, socket.MSG_DONTWAIT
                 )
+            except BlockingIOError:
+                break
+            for level, kind, value in ancdata:
+                if level == socket.SOL_SOCKET and kind == _SO_RXQ_OVFL:
+                    dropped = int.from_bytes(value[:4], sys.byteorder)
+            datagrams.append((data, parse_address(what, address)))
+        else:
+            if _is_readable(udp_socket.fileno()):
+                self._perfcounters.count("drain_limit_hits")
 
-            if spool_files := sorted(
-                self.settings.paths.spool_dir.value.glob("[!.]*"), key=lambda x: x.stat().st_mtime
-            ):
-                self.process_syslog_messages(spool_files[0].read_bytes().splitlines(), None)
-                spool_files[0].unlink()
-                select_timeout = 0  # enable fast processing to process further files
-            else:
-                select_timeout = 1  # restore default select timeout
+        if dropped is not None:
+            # The kernel reports the total number of drops as an unsigned 32 bit integer
+            previously_dropped = self._udp_drops.get(udp_socket.fileno(), 0)
+            self._perfcounters.count("udp_drops", (dropped - previously_dropped) % 2**32)
+            self._udp_drops[udp_socket.fileno()] = dropped
+        return datagrams
 
     def create_events_from_trap(self, data: bytes, address: tuple[str, int]) -> Iterator[Event]:
         try:
@@ -772,6 +1354,10 @@ class EventServer(ECServerThread):
         Processes incoming data, just a wrapper between the real data and the
         handler function to record some statistics etc.
         """
+        if self._config["rule_matching_processes"] > 0:
+            self._process_events_in_pool(list(events))
+            return
+
         for event in events:
             self._perfcounters.count("messages")
             before = time.time()
@@ -783,6 +1369,53 @@ class EventServer(ECServerThread):
             elapsed = time.time() - before
             self._perfcounters.count_time("processing", elapsed)
 
+    def _process_events_in_pool(self, events: Sequence[Event]) -> None:
+        if not events:
+            return
+        self._perfcounters.count("messages", len(events))
+        # In replication slave mode (when not took over), ignore all events
+        if is_replication_slave(self._config) and self._slave_status["mode"] == "sync":
+            if self.settings.options.debug:
+                self._logger.info("Replication: we are in slave mode, ignoring events")
+            return
+
+        before = time.time()
+        # The replication thread may replace the rules (and the workers) in the meantime
+        with self._lock_configuration:
+            try:
+                outcomes = self._get_rule_matching_pool().match_events(events)
+            except Exception:
+                if self.settings.options.debug:
+                    raise
+                self._logger.exception("Rule matching in worker processes failed, restarting them")
+                self._stop_rule_matching_pool()
+                outcomes = [self._event_matcher.match_event(event) for event in events]
+
+        for outcome in outcomes:
+            self.apply_rule_match_outcome(outcome)
+        self._perfcounters.count_time(
+            "processing", (time.time() - before) / len(events), samples=len(events)
+        )
+
+    # protected by self._lock_configuration
+    def _get_rule_matching_pool(self) -> RuleMatchingPool:
+        # Started on demand: Not before daemonizing and not at all if not configured
+        if self._rule_matching_pool is None:
+            self._rule_matching_pool = RuleMatchingPool(
+                self._logger,
+                self.settings,
+                self._config,
+                self._event_matcher.rule_packs,
+                self._config["rule_matching_processes"],
+            )
+        return self._rule_matching_pool
+
+    # protected by self._lock_configuration
+    def _stop_rule_matching_pool(self) -> None:
+        if self._rule_matching_pool is not None:
+            self._rule_matching_pool.shutdown()
+            self._rule_matching_pool = None
+
     def process_syslog_messages(
         self, messages: Iterable[bytes], address: tuple[str, int] | None
     ) -> None:
@@ -834,7 +1467,7 @@ class EventServer(ECServerThread):
         events = self._event_status.events()
         now = time.time()
         for event in events:
-            rule = self._rule_by_id.get(event["rule_id"])
+            rule = self._event_matcher.rule_by_id.get(event["rule_id"])
 
             if event["phase"] == "counting":
                 # Event belongs to a rule that does not longer exist? It
@@ -968,10 +1601,11 @@ class EventServer(ECServerThread):
            in that case.
         """
         now = time.time()
-        for rule in self._rules:
+        for rule in self._event_matcher.rules:
             if expect := rule.get("expect"):
                 if isinstance(
-                    self._rule_matcher.event_rule_matches_site(rule, event=Event()), MatchFailure
+                    self._event_matcher.rule_matcher.event_rule_matches_site(rule, event=Event()),
+                    MatchFailure,
                 ):
                     continue
 
@@ -1100,134 +1734,27 @@ class EventServer(ECServerThread):
             self._history.add(event, "COUNTFAILED")
             event_has_opened(
                 self._history,
-                self.settings,
-                self._config,
-                self._logger,
-                self.host_config,
-                self._event_columns,
-                rule,
-                event,
-            )
-            if rule.get("autodelete"):
-                event["phase"] = "closed"
-                self._event_status.remove_event(event, "AUTODELETE")
-
-    def reload_configuration(self, config: Config, history: History) -> None:
-        self._config = config
-        self._history = history
-        self._snmp_trap_parser = SNMPTrapParser(
-            self.settings, self._config, self._logger.getChild("snmp")
-        ).parse
-        self.compile_rules(self._config["rule_packs"])
-        self.host_config = HostConfig(self._logger)
-        self._rule_matcher = RuleMatcher(
-            logger=self._logger if config["debug_rules"] else None,
-            omd_site_id=omd_site(),
-            is_active_time_period=self._time_period.active,
-        )
-
-    def compile_rules(self, rule_packs: Sequence[ECRulePack]) -> None:
-        """Precompile regular expressions and similar stuff."""
-        self._rules = []
-        self._rule_by_id = {}
-        # Speedup-Hash for rule execution
-        self._rule_hash = {}
-        count_disabled = 0
-        count_rules = 0
-        count_unspecific = 0
-
-        # Loop through all rule packs and with through their rules
-        for rule_pack in rule_packs:
-            if rule_pack["disabled"]:
-                count_disabled += len(rule_pack["rules"])
-                continue
-
-            for rule in rule_pack["rules"]:
-                if rule.get("disabled"):
-                    count_disabled += 1
-                else:
-                    count_rules += 1
-                    rule = rule.copy()  # keep original intact because of slave replication
-
-                    # Store information about rule pack right within the rule. This is needed
-                    # for debug output and also for skipping rule packs
-                    rule["pack"] = rule_pack["id"]
-                    self._rules.append(rule)
-                    self._rule_by_id[rule["id"]] = rule
-                    try:
-                        compile_rule(rule)
-                    except Exception:
-                        if self.settings.options.debug:
-                            raise
-                        rule["disabled"] = True
-                        count_disabled += 1
-                        self._logger.exception(
-                            "Ignoring rule '%s/%s' because of an invalid regex.",
-                            rule["pack"],
-                            rule["id"],
-                        )
-
-                    if self._config["rule_optimizer"]:
-                        self.hash_rule(rule)
-                        if (
-                            "match_facility" not in rule
-                            and "match_priority" not in rule
-                            and "cancel_priority" not in rule
-                            and "cancel_application" not in rule
-                        ):
-                            count_unspecific += 1
-
-        self._logger.info(
-            "Compiled %d active rules (ignoring %d disabled rules)", count_rules, count_disabled
-        )
-        if self._config["rule_optimizer"]:
-            self._logger.info(
-                "Rule hash: %d rules - %d hashed, %d unspecific",
-                len(self._rules),
-                len(self._rules) - count_unspecific,
-                count_unspecific,
+                self.settings,
+                self._config,
+                self._logger,
+                self.host_config,
+                self._event_columns,
+                rule,
+                event,
             )
-            for facility in list(range(23)) + [31]:
-                if facility in self._rule_hash:
-                    stats = [
-                        f"{SyslogPriority(prio)}({len(entries)})"
-                        for prio, entries in self._rule_hash[facility].items()
-                    ]
-                    self._logger.info(" %-12s: %s", SyslogFacility(facility), " ".join(stats))
-
-    def hash_rule(self, rule: Rule) -> None:
-        """Construct rule hash for faster execution."""
-        facility = rule.get("match_facility")
-        if facility and not rule.get("invert_matching"):
-            self.hash_rule_facility(rule, facility)
-        else:
-            for facility in range(32):  # all syslog facilities
-                self.hash_rule_facility(rule, facility)
-
-    def hash_rule_facility(self, rule: Rule, facility: int) -> None:
-        needed_prios = [False] * 8
-
-        if "match_priority" in rule:
-            prio_from, prio_to = rule["match_priority"]
-            for p in range(prio_to, prio_from + 1):  # Beware: from > to!
-                needed_prios[p] = True
-        else:  # all priorities match
-            needed_prios = [True] * 8  # needed to check this rule for all event priorities
-
-        if "cancel_priority" in rule:
-            prio_from, prio_to = rule["cancel_priority"]
-            for p in range(prio_to, prio_from + 1):  # Beware: from > to!
-                needed_prios[p] = True
-        elif "match_ok" in rule:  # a cancelling rule where all priorities cancel
-            needed_prios = [True] * 8  # needed to check this rule for all event priorities
-
-        if rule.get("invert_matching"):
-            needed_prios = [True] * 8
+            if rule.get("autodelete"):
+                event["phase"] = "closed"
+                self._event_status.remove_event(event, "AUTODELETE")
 
-        prio_hash = self._rule_hash.setdefault(facility, {})
-        for prio, need in enumerate(needed_prios):
-            if need:
-                prio_hash.setdefault(prio, []).append(rule)
+    def reload_configuration(self, config: Config, history: History) -> None:
+        self._config = config
+        self._history = history
+        self._snmp_trap_parser = SNMPTrapParser(
+            self.settings, self._config, self._logger.getChild("snmp")
+        ).parse
+        self._event_matcher.reload_configuration(config)
+        self._stop_rule_matching_pool()
+        self.host_config = HostConfig(self._logger)
 
     def output_hash_stats(self) -> None:
         self._logger.info("Top 20 of facility/priority:")
@@ -1250,181 +1777,120 @@ class EventServer(ECServerThread):
                 (100.0 * count / float(total_count)),
             )
 
-    def process_potential_event(self, event: Event) -> None:  # pylint: disable=too-many-branches
-        self.do_translate_hostname(event)
-
-        # Log all incoming messages into a syslog-like text file if that is enabled
-        if self._config["log_messages"]:
-            self.log_message(event)
+    def process_potential_event(self, event: Event) -> None:
+        with self._lock_configuration:
+            outcome = self._event_matcher.match_event(event)
+        self.apply_rule_match_outcome(outcome)
 
-        # Rule optimizer
+    def apply_rule_match_outcome(self, outcome: RuleMatchOutcome) -> None:
+        """Apply the result of the rule matching to the event status"""
+        event = outcome.event
         if self._config["rule_optimizer"]:
             self._hash_stats[event["facility"]][event["priority"]] += 1
-            rule_candidates = self._rule_hash.get(event["facility"], {}).get(event["priority"], [])
-        else:
-            rule_candidates = self._rules
-
-        skip_pack = None
-        for rule in rule_candidates:
-            # TODO: Rewrite this skipping logic, so it's blindingly obvious, even for mypy.
-            if skip_pack and rule["pack"] == skip_pack:  # type: ignore[unreachable]
-                continue  # type: ignore[unreachable] # still in the rule pack that we want to skip
-            skip_pack = None  # new pack, reset skipping
 
-            try:
-                result = self.event_rule_matches(rule, event)
-            except Exception as e:
-                result = MatchFailure(
-                    reason=f"Rule would match, but due to inverted matching does not. {e}"
-                )
-                self._logger.exception(result.reason)
+        self._perfcounters.count("rule_tries", outcome.rule_tries)
+        for rule_id in outcome.rule_hits:
+            self._perfcounters.count("rule_hits")
+            self._event_status.count_rule_match(rule_id)
 
-            if isinstance(result, MatchSuccess):
-                self._perfcounters.count("rule_hits")
-                if self._config["debug_rules"]:
-                    self._logger.info("  matching groups:\n%s", pprint.pformat(result.match_groups))
+        if outcome.rule_id is None:
+            if self._config["archive_orphans"]:
+                self._event_status.archive_event(event)
+            return
 
-                self._event_status.count_rule_match(rule["id"])
-                if self._config["log_rulehits"]:
-                    self._logger.info(
-                        "Rule '%s/%s' hit by message %s/%s - '%s'.",
-                        rule["pack"],
-                        rule["id"],
-                        SyslogFacility(event["facility"]),
-                        SyslogPriority(event["priority"]),
-                        event["text"],
-                    )
+        rule = self._event_matcher.rule_by_id[outcome.rule_id]
+        if outcome.dropped:
+            self._perfcounters.count("drops")
+            return
 
-                if rule.get("drop"):
-                    if rule["drop"] == "skip_pack":
-                        skip_pack = rule["pack"]
-                        if self._config["debug_rules"]:
-                            self._logger.info("  skipping this rule pack (%s)", skip_pack)
-                        continue
-                    self._perfcounters.count("drops")
-                    return
+        if outcome.cancelling:
+            self._event_status.cancel_events(
+                self, self._event_columns, event, outcome.match_groups, rule
+            )
+            return
 
-                if result.cancelling:
-                    self._event_status.cancel_events(
-                        self, self._event_columns, event, result.match_groups, rule
+        # Lookup the monitoring core hosts and add the core host
+        # name to the event when one can be matched.
+        #
+        # Needs to be done AFTER event rewriting, because the rewriting
+        # may change the "host" field.
+        #
+        # For the moment we have no rule/condition matching on this
+        # field. So we only add the core host info for matched events.
+        self._add_core_host_to_new_event(event)
+
+        if "count" in rule:
+            count = rule["count"]
+            # Check if a matching event already exists that we need to
+            # count up. If the count reaches the limit, the event will
+            # be opened and its rule actions performed.
+            existing_event = self._event_status.count_event(self, event, count)
+            if existing_event:
+                if "delay" in rule:
+                    if self._config["debug_rules"]:
+                        self._logger.info(
+                            "Event opening will be delayed for %d seconds", rule["delay"]
+                        )
+                    existing_event["delay_until"] = time.time() + rule["delay"]
+                    existing_event["phase"] = "delayed"
+                else:
+                    event_has_opened(
+                        self._history,
+                        self.settings,
+                        self._config,
+                        self._logger,
+                        self.host_config,
+                        self._event_columns,
+                        rule,
+                        existing_event,
                     )
-                    return
 
-                # Remember the rule id that this event originated from
-                event["rule_id"] = rule["id"]
-
-                # Attach optional contact group information for visibility
-                # and eventually for notifications
-                self._add_rule_contact_groups_to_event(rule, event)
-
-                # Store groups from matching this event. In order to make
-                # persistence easier, we do not save them as list but join
-                # them on ASCII-1.
-                match_groups_message = result.match_groups.get("match_groups_message", ())
-                assert match_groups_message is not False
-                event["match_groups"] = match_groups_message
+                self._history.add(existing_event, "COUNTREACHED")
 
-                match_groups_syslog_application = result.match_groups.get(
-                    "match_groups_syslog_application", ()
+                if "delay" not in rule and rule.get("autodelete"):
+                    existing_event["phase"] = "closed"
+                    with self._event_status.lock:
+                        self._event_status.remove_event(existing_event, "AUTODELETE")
+        elif rule.get("expect"):
+            self._event_status.count_expected_event(self, event)
+        else:
+            if "delay" in rule:
+                if self._config["debug_rules"]:
+                    self._logger.info("Event opening will be delayed for %d seconds", rule["delay"])
+                event["delay_until"] = time.time() + rule["delay"]
+                event["phase"] = "delayed"
+            else:
+                event["phase"] = "open"
+
+            if self.new_event_respecting_limits(event) and event["phase"] == "open":
+                event_has_opened(
+                    self._history,
+                    self.settings,
+                    self._config,
+                    self._logger,
+                    self.host_config,
+                    self._event_columns,
+                    rule,
+                    event,
                 )
-                assert match_groups_syslog_application is not False
-                event["match_groups_syslog_application"] = match_groups_syslog_application
-
-                self.rewrite_event(rule, event, result.match_groups)
-
-                # Lookup the monitoring core hosts and add the core host
-                # name to the event when one can be matched.
-                #
-                # Needs to be done AFTER event rewriting, because the rewriting
-                # may change the "host" field.
-                #
-                # For the moment we have no rule/condition matching on this
-                # field. So we only add the core host info for matched events.
-                self._add_core_host_to_new_event(event)
-
-                if "count" in rule:
-                    count = rule["count"]
-                    # Check if a matching event already exists that we need to
-                    # count up. If the count reaches the limit, the event will
-                    # be opened and its rule actions performed.
-                    existing_event = self._event_status.count_event(self, event, count)
-                    if existing_event:
-                        if "delay" in rule:
-                            if self._config["debug_rules"]:
-                                self._logger.info(
-                                    "Event opening will be delayed for %d seconds", rule["delay"]
-                                )
-                            existing_event["delay_until"] = time.time() + rule["delay"]
-                            existing_event["phase"] = "delayed"
-                        else:
-                            event_has_opened(
-                                self._history,
-                                self.settings,
-                                self._config,
-                                self._logger,
-                                self.host_config,
-                                self._event_columns,
-                                rule,
-                                existing_event,
-                            )
-
-                        self._history.add(existing_event, "COUNTREACHED")
-
-                        if "delay" not in rule and rule.get("autodelete"):
-                            existing_event["phase"] = "closed"
-                            with self._event_status.lock:
-                                self._event_status.remove_event(existing_event, "AUTODELETE")
-                elif rule.get("expect"):
-                    self._event_status.count_expected_event(self, event)
-                else:
-                    if "delay" in rule:
-                        if self._config["debug_rules"]:
-                            self._logger.info(
-                                "Event opening will be delayed for %d seconds", rule["delay"]
-                            )
-                        event["delay_until"] = time.time() + rule["delay"]
-                        event["phase"] = "delayed"
-                    else:
-                        event["phase"] = "open"
+                if rule.get("autodelete"):
+                    event["phase"] = "closed"
+                    with self._event_status.lock:
+                        self._event_status.remove_event(event, "AUTODELETE")
 
-                    if self.new_event_respecting_limits(event) and event["phase"] == "open":
-                        event_has_opened(
-                            self._history,
-                            self.settings,
-                            self._config,
-                            self._logger,
-                            self.host_config,
-                            self._event_columns,
-                            rule,
-                            event,
-                        )
-                        if rule.get("autodelete"):
-                            event["phase"] = "closed"
-                            with self._event_status.lock:
-                                self._event_status.remove_event(event, "AUTODELETE")
-                return
+    # protected by self._lock_configuration
+    def compile_rules(self, rule_packs: Sequence[ECRulePack]) -> None:
+        self._event_matcher.compile_rules(rule_packs)
+        # The workers need to compile the new rules, too
+        self._stop_rule_matching_pool()
 
-        # End of loop over rules.
-        if self._config["archive_orphans"]:
-            self._event_status.archive_event(event)
+    def rewrite_event(
+        self, rule: Rule, event: Event, match_groups: MatchGroups, set_first: bool = True
+    ) -> None:
+        self._event_matcher.rewrite_event(rule, event, match_groups, set_first)
 
     def _add_rule_contact_groups_to_event(self, rule: Rule, event: Event) -> None:
-        if rule.get("contact_groups") is None:
-            event.update(
-                {
-                    "contact_groups": None,
-                    "contact_groups_notify": False,
-                    "contact_groups_precedence": "host",
-                }
-            )
-        else:
-            event.update(
-                {
-                    "contact_groups": rule["contact_groups"]["groups"],
-                    "contact_groups_notify": rule["contact_groups"]["notify"],
-                    "contact_groups_precedence": rule["contact_groups"]["precedence"],
-                }
-            )
+        self._event_matcher.add_rule_contact_groups_to_event(rule, event)
 
     def add_core_host_to_event(self, event: Event) -> None:
         event["core_host"] = self.host_config.get_canonical_name(event["host"])
@@ -1446,97 +1912,6 @@ class EventServer(ECServerThread):
             )
             return False
 
-    def event_rule_matches(self, rule: Rule, event: Event) -> MatchResult:
-        """
-        Checks if an event matches a rule. Returns either MatchFailure (no match)
-        or a MatchSuccess with a pair of matchtype, groups, where matchtype is False for a
-        normal match and True for a cancelling match and the groups is a tuple
-        if matched regex groups in either text (normal) or match_ok (cancelling)
-        match.
-        """
-        self._perfcounters.count("rule_tries")
-        with self._lock_configuration:
-            return self._rule_matcher.event_rule_matches(rule, event)
-
-    def rewrite_event(  # pylint: disable=too-many-branches
-        self, rule: Rule, event: Event, match_groups: MatchGroups, set_first: bool = True
-    ) -> None:
-        """Rewrite texts and compute other fields in the event."""
-        if rule["state"] == -1:
-            prio = event["priority"]
-            if prio <= 3:
-                event["state"] = 2
-            elif prio == 4:
-                event["state"] = 1
-            else:
-                event["state"] = 0
-        elif isinstance(rule["state"], tuple) and rule["state"][0] == "text_pattern":
-            state_patterns = rule["state"][1]
-            text = event["text"]
-            if match(state_patterns.get("2", None), text, complete=False) is not False:
-                event["state"] = 2
-            elif match(state_patterns.get("1", None), text, complete=False) is not False:
-                event["state"] = 1
-            elif match(state_patterns.get("0", None), text, complete=False) is not False:
-                event["state"] = 0
-            else:
-                event["state"] = 3
-        else:
-            event["state"] = rule["state"]
-
-        if ("sl" not in event) or (rule["sl"]["precedence"] == "rule"):
-            event["sl"] = rule["sl"]["value"]
-        if set_first:
-            event["first"] = event["time"]
-        event["last"] = event["time"]
-        if "set_comment" in rule:
-            event["comment"] = replace_groups(rule["set_comment"], event["text"], match_groups)
-        if "set_text" in rule:
-            event["text"] = replace_groups(rule["set_text"], event["text"], match_groups)
-        if "set_host" in rule:
-            event["orig_host"] = event["host"]
-            event["host"] = HostName(replace_groups(rule["set_host"], event["host"], match_groups))
-        if "set_application" in rule:
-            event["application"] = replace_groups(
-                rule["set_application"], event["application"], match_groups
-            )
-        if "set_contact" in rule and "contact" not in event:
-            event["contact"] = replace_groups(
-                rule["set_contact"], event.get("contact", ""), match_groups
-            )
-
-    def do_translate_hostname(self, event: Event) -> None:
-        try:
-            event["host"] = translate_hostname(self._config["hostname_translation"], event["host"])
-        except Exception:
-            if self._config["debug_rules"]:
-                self._logger.exception('Unable to parse host "%s"', event.get("host"))
-            event["host"] = HostName("")
-
-    def log_message(self, event: Event) -> None:
-        try:
-            with get_logfile(
-                self._config, self.settings.paths.messages_dir.value, self._message_period
-            ).open(mode="ab") as f:
-                f.write(
-                    (
-                        "%s %s %s%s: %s\n"
-                        % (
-                            time.strftime("%b %d %H:%M:%S", time.localtime(event["time"])),
-                            event["host"],
-                            event["application"],
-                            f'[{event["pid"]}]' if event["pid"] else "",
-                            event["text"],
-                        )
-                    ).encode()
-                )
-        except Exception:
-            if self.settings.options.debug:
-                raise
-            # Better silently ignore errors. We could have run out of
-            # diskspace and make things worse by logging that we could
-            # not log.
-
     def get_hosts_with_active_event_limit(self) -> list[str]:
         hosts = []
         for (hostname, core_host), count in self._event_status.num_existing_events_by_host.items():
@@ -1665,7 +2040,7 @@ class EventServer(ECServerThread):
 
     def _get_rule_event_limit(self, rule_id: str | None) -> tuple[int, str]:
         """Prefer the rule individual limit for by_rule limit (in case there is some)."""
-        if rule_limit := self._rule_by_id.get(rule_id, Rule()).get("event_limit"):
+        if rule_limit := self._event_matcher.rule_by_id.get(rule_id, Rule()).get("event_limit"):
             return rule_limit["limit"], rule_limit["action"]
 
         return (
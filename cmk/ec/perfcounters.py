@@ -28,6 +28,13 @@ class Perfcounters:
         "overflows",
         "events",
         "connects",
+        "udp_drops",  # datagrams dropped by the kernel, because the receive buffer was full
+        "drain_limit_hits",  # reads deferred to the next wakeup, because a source had more data
+    ]
+
+    # Current values, not accumulated
+    _gauge_names: Sequence[str] = [
+        "spool_backlog",  # files in the spool directory waiting to be processed
     ]
 
     # Average processing times
@@ -47,18 +54,25 @@ class Perfcounters:
         self._rates: dict[str, float] = {}
         self._average_rates: dict[str, float] = {}
         self._times: dict[str, float] = {}
+        self._gauges = {n: 0 for n in self._gauge_names}
         self._last_statistics: float | None = None
 
         self._logger = logger.getChild("Perfcounters")
 
-    def count(self, counter: str) -> None:
+    def count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def set_gauge(self, gauge: str, value: int) -> None:
         with self._lock:
-            self._counters[counter] += 1
+            self._gauges[gauge] = value
 
-    def count_time(self, counter: str, ptime: float) -> None:
+    def count_time(self, counter: str, ptime: float, samples: int = 1) -> None:
         with self._lock:
             if counter in self._times:
-                self._times[counter] = lerp(ptime, self._times[counter], self._weights[counter])
+                self._times[counter] = lerp(
+                    ptime, self._times[counter], self._weights[counter] ** samples
+                )
             else:
                 self._times[counter] = ptime
 
@@ -96,6 +110,9 @@ class Perfcounters:
         for name in cls._weights:
             columns.append((f"status_average_{name}_time", 0.0))
 
+        for name in cls._gauge_names:
+            columns.append((f"status_{name}", 0))
+
         return columns
 
     def get_status(self) -> Sequence[float]:
@@ -114,4 +131,7 @@ class Perfcounters:
             for name in self._weights:
                 row.append(self._times.get(name, 0.0))
 
+            for name in self._gauge_names:
+                row.append(self._gauges[name])
+
             return row
@@ -68,5 +68,6 @@ def history_files_to_sqlite(omd_root: Path, logger: logging.Logger) -> None:
 
         # processed files are not needed anymore
         file.rename(file.with_suffix(".bak"))
+        file.with_suffix(".idx").unlink(missing_ok=True)
         logger.debug("Renamed file %s", file)
     logger.debug("Migrating history files to sqlite took: %s", timedelta(seconds=time.time() - tic))
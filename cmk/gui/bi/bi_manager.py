@@ -4,11 +4,12 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 from __future__ import annotations
 
+import os
+from collections.abc import Iterator
 from pathlib import Path
 
 from livestatus import LivestatusOutputFormat, LivestatusResponse, SiteId
 
-from cmk.ccc import store
 from cmk.ccc.exceptions import MKGeneralException
 
 from cmk.utils.paths import default_config_dir
@@ -17,12 +18,18 @@ from cmk.gui import sites
 from cmk.gui.hooks import request_memoize
 from cmk.gui.i18n import _
 
-from cmk.bi.aggregation import BIAggregation
+from cmk.bi.compiled_storage import load_compiled_aggregation
 from cmk.bi.compiler import BICompiler, path_compiled_aggregations
 from cmk.bi.computer import BIComputer
 from cmk.bi.data_fetcher import BIStatusFetcher
 from cmk.bi.lib import SitesCallback
+from cmk.bi.result_cache import BINodeResultCache
 from cmk.bi.trees import BICompiledAggregation, BICompiledRule
+from cmk.bi.type_defs import frozen_aggregations_dir
+
+# Lives as long as the GUI process, so that the next request only recomputes
+# the nodes whose elements changed their state in the meantime
+_node_result_cache = BINodeResultCache()
 
 
 class BIManager:
@@ -31,13 +38,36 @@ class BIManager:
         self.compiler = BICompiler(self.bi_configuration_file(), sites_callback)
         self.compiler.load_compiled_aggregations()
         self.status_fetcher = BIStatusFetcher(sites_callback)
-        self.computer = BIComputer(self.compiler.compiled_aggregations, self.status_fetcher)
+        _node_result_cache.clear_on_change(_compilation_state())
+        self.computer = BIComputer(
+            self.compiler.compiled_aggregations, self.status_fetcher, _node_result_cache
+        )
 
     @classmethod
     def bi_configuration_file(cls) -> str:
         return str(Path(default_config_dir) / "multisite.d" / "wato" / "bi_config.bi")
 
 
+def _compilation_state() -> tuple[tuple[str, int, int], ...]:
+    """Changes whenever the aggregations are compiled or branches are frozen"""
+    return tuple(sorted(_stat_files(path_compiled_aggregations))) + tuple(
+        sorted(_stat_files(frozen_aggregations_dir))
+    )
+
+
+def _stat_files(directory: Path) -> Iterator[tuple[str, int, int]]:
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield entry.path, stat.st_ino, stat.st_mtime_ns
+    except OSError:
+        return
+
+
 def all_sites_with_id_and_online() -> list[tuple[SiteId, bool]]:
     return [
         (site_id, site_status["state"] == "online")
@@ -63,14 +93,12 @@ def bi_livestatus_query(
 @request_memoize(maxsize=10000)
 def load_compiled_branch(aggr_id: str, branch_title: str) -> BICompiledRule:
     compiled_aggregation = _load_compiled_aggregation(aggr_id)
-    for branch in compiled_aggregation.branches:
-        if branch.properties.title == branch_title:
-            return branch
+    if branch := compiled_aggregation.get_branch_by_title(branch_title):
+        return branch
     raise MKGeneralException(f"Branch {branch_title} not found in aggregation {aggr_id}")
 
 
 @request_memoize(maxsize=10000)
 def _load_compiled_aggregation(aggr_id: str) -> BICompiledAggregation:
-    return BIAggregation.create_trees_from_schema(
-        store.load_object_from_pickle_file(path_compiled_aggregations.joinpath(aggr_id), default={})
-    )
+    # Only the requested branches get materialized
+    return load_compiled_aggregation(path_compiled_aggregations.joinpath(aggr_id))
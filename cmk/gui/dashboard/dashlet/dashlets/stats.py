@@ -15,6 +15,7 @@ from cmk.gui.dashboard.type_defs import DashletConfig, DashletSize
 from cmk.gui.figures import FigureResponseData
 from cmk.gui.http import request
 from cmk.gui.i18n import _
+from cmk.gui.livestatus_cache import cached_live
 from cmk.gui.logged_in import user
 from cmk.gui.type_defs import HTTPVariables, SingleInfos, VisualContext
 from cmk.gui.utils.urls import makeuri_contextless
@@ -337,7 +338,7 @@ class StatsDashletDataGenerator(Generic[S], abc.ABC):
         query = cls._stats_query() + "\n" + filter_headers
         try:
             with sites.only_sites(only_sites):
-                result: list[int] = sites.live().query_summed_stats(query)
+                result: list[int] = cached_live().query_summed_stats(query)
         except MKLivestatusNotFoundError:
             result = []
 
@@ -24,6 +24,7 @@ from cmk.gui.graphing._unit import (
 )
 from cmk.gui.http import request
 from cmk.gui.i18n import _
+from cmk.gui.livestatus_cache import cached_live
 from cmk.gui.logged_in import user
 from cmk.gui.type_defs import ColumnName, VisualContext
 from cmk.gui.utils.urls import makeuri_contextless
@@ -53,7 +54,7 @@ def _table_query(
 
     with sites.only_sites(only_sites), sites.prepend_site():
         try:
-            rows = sites.live().query(query)
+            rows = cached_live().query(query)
         except MKTimeout:
             raise
         except Exception:
@@ -13,6 +13,8 @@ from dataclasses import dataclass
 from itertools import chain
 from typing import Annotated, assert_never, Callable, final, Literal, TypeVar
 
+import numpy as np
+import numpy.typing as npt
 from pydantic import BaseModel, computed_field, PlainValidator, SerializeAsAny
 
 from livestatus import SiteId
@@ -154,6 +156,81 @@ def time_series_operators() -> (
     }
 
 
+# Vectorized versions of the operators above. They work on all points at once: The operands are
+# the rows of the array, missing values (None) are NaN.
+
+
+def _array_operator_sum(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    return np.where(
+        np.isnan(operands).all(axis=0), np.nan, np.nansum(operands, axis=0, dtype=np.float64)
+    )
+
+
+def _array_operator_product(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    # NaN propagates
+    return np.prod(operands, axis=0, dtype=np.float64)
+
+
+def _array_operator_difference(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    return operands[0] - operands[1]
+
+
+def _array_operator_fraction(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    return np.divide(
+        operands[0],
+        operands[1],
+        out=np.full(operands.shape[1], np.nan),
+        where=operands[1] != 0,
+    )
+
+
+def _array_operator_maximum(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    # fmax and fmin ignore NaN, unless all values are NaN
+    return np.fmax.reduce(operands, axis=0)
+
+
+def _array_operator_minimum(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    return np.fmin.reduce(operands, axis=0)
+
+
+def _array_operator_average(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    counts = np.count_nonzero(~np.isnan(operands), axis=0)
+    return np.divide(
+        np.nansum(operands, axis=0, dtype=np.float64),
+        counts,
+        out=np.full(operands.shape[1], np.nan),
+        where=counts > 0,
+    )
+
+
+def array_operator_merge(operands: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """First non-NaN value of each point"""
+    first_valid = np.argmax(~np.isnan(operands), axis=0)
+    return np.take_along_axis(operands, first_valid[np.newaxis, :], axis=0)[0]
+
+
+_ARRAY_OPERATORS: Mapping[
+    Operators, Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]]
+] = {
+    "+": _array_operator_sum,
+    "*": _array_operator_product,
+    "-": _array_operator_difference,
+    "/": _array_operator_fraction,
+    "MAX": _array_operator_maximum,
+    "MIN": _array_operator_minimum,
+    "AVERAGE": _array_operator_average,
+    "MERGE": array_operator_merge,
+}
+
+
+def stack_time_series(time_series: Sequence[TimeSeries]) -> npt.NDArray[np.float64]:
+    """One row per time series, truncated to the shortest one"""
+    length = min(len(ts) for ts in time_series)
+    return np.array([ts.array[:length] for ts in time_series], dtype=np.float64).reshape(
+        len(time_series), length
+    )
+
+
 @dataclass(frozen=True)
 class TranslationKey:
     host_name: HostName
@@ -228,7 +305,7 @@ class MetricOpConstant(MetricOperation, frozen=True):
 
     def compute_time_series(self, rrd_data: RRDData) -> Sequence[AugmentedTimeSeries]:
         num_points, twindow = _derive_num_points_twindow(rrd_data)
-        return [AugmentedTimeSeries(data=TimeSeries([self.value] * num_points, twindow))]
+        return [AugmentedTimeSeries(data=TimeSeries(np.full(num_points, self.value), twindow))]
 
 
 class MetricOpConstantNA(MetricOperation, frozen=True):
@@ -241,7 +318,7 @@ class MetricOpConstantNA(MetricOperation, frozen=True):
 
     def compute_time_series(self, rrd_data: RRDData) -> Sequence[AugmentedTimeSeries]:
         num_points, twindow = _derive_num_points_twindow(rrd_data)
-        return [AugmentedTimeSeries(data=TimeSeries([None] * num_points, twindow))]
+        return [AugmentedTimeSeries(data=TimeSeries(np.full(num_points, np.nan), twindow))]
 
 
 def _time_series_math(
@@ -265,12 +342,11 @@ def _time_series_math(
         # Silently return so to get an empty graph slot
         return None
 
-    _op_title, op_func = operators[operator_id]
-    twindow = operands_evaluated[0].twindow
-
-    return TimeSeries(
-        [op_func_wrapper(op_func, list(tsp)) for tsp in zip(*operands_evaluated)], twindow
-    )
+    with np.errstate(all="ignore"):
+        return TimeSeries(
+            _ARRAY_OPERATORS[operator_id](stack_time_series(operands_evaluated)),
+            operands_evaluated[0].twindow,
+        )
 
 
 class MetricOpOperator(MetricOperation, frozen=True):
@@ -339,4 +415,4 @@ class MetricOpRRDSource(MetricOperation, frozen=True):
             return [AugmentedTimeSeries(data=rrd_data[key])]
 
         num_points, twindow = _derive_num_points_twindow(rrd_data)
-        return [AugmentedTimeSeries(data=TimeSeries([None] * num_points, twindow))]
+        return [AugmentedTimeSeries(data=TimeSeries(np.full(num_points, np.nan), twindow))]
@@ -35,11 +35,11 @@ from ._legacy import (
     LegacyUnitSpecification,
 )
 from ._metric_operation import (
+    array_operator_merge,
     GraphConsolidationFunction,
-    op_func_wrapper,
     RRDData,
     RRDDataKey,
-    time_series_operators,
+    stack_time_series,
 )
 from ._metrics import get_metric_spec
 from ._translated_metrics import find_matching_translation, TranslationSpec
@@ -112,13 +112,13 @@ def _align_and_resample_rrds(
         if start_time is None:
             start_time, end_time, step = time_series.twindow
         elif (start_time, end_time, step) != time_series.twindow:
-            time_series.values = (
-                time_series.downsample(
+            time_series.array = (
+                time_series.downsample_array(
                     (start_time, end_time, step),
                     key.consolidation_function or consolidation_function,
                 )
                 if step >= time_series.twindow[2]
-                else time_series.forward_fill_resample((start_time, end_time, step))
+                else time_series.forward_fill_resample_array((start_time, end_time, step))
             )
 
 
@@ -148,7 +148,7 @@ def _chop_last_empty_step(graph_data_range: GraphDataRange, rrd_data: RRDData) -
 
 def _chop_end_of_the_curve(rrd_data: RRDData, step: int) -> None:
     for data in rrd_data.values():
-        del data.values[-1]
+        data.array = data.array[:-1]
         data.end -= step
 
 
@@ -303,11 +303,8 @@ def translate_and_merge_rrd_columns(
     if not relevant_ts:
         return TimeSeries([0, 0, 0])
 
-    _op_title, op_func = time_series_operators()["MERGE"]
-    single_value_series = [op_func_wrapper(op_func, list(tsp)) for tsp in zip(*relevant_ts)]
-
     return TimeSeries(
-        single_value_series,
+        array_operator_merge(stack_time_series(relevant_ts)),
         time_window=relevant_ts[0].twindow,
         conversion=get_conversion_function(get_metric_spec(metric_name).unit_spec),
     )
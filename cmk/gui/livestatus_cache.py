@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Short-lived cache of livestatus results, shared by all GUI processes of the site
+
+Dashboards and sidebar snap-ins send the same queries on every refresh, for every user and
+browser tab. With the global setting "livestatus_result_cache" their results are kept in the
+Redis of the site for a few seconds. The results are shared between all requests with the same
+query, livestatus authorization and sites.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import NamedTuple
+
+from redis import Redis, RedisError
+
+from livestatus import Helpers, LivestatusResponse, MultiSiteConnection, QueryTypes
+
+from cmk.utils.redis import get_redis_client, redis_enabled
+
+from cmk.gui import sites
+from cmk.gui.config import active_config
+from cmk.gui.log import logger
+
+_KEY_PREFIX = "livestatus_result_cache"
+_INDEX_KEY = f"{_KEY_PREFIX}:index"
+_STATISTICS_KEY = f"{_KEY_PREFIX}:statistics"
+
+
+class LivestatusCacheStatistics(NamedTuple):
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / total if (total := self.hits + self.misses) else 0.0
+
+
+class CachedLiveStatus(Helpers):
+    """The query helpers of the livestatus connection, answered from the cache if possible
+
+    The queries are sent with the current settings of `sites.live()`, e.g. the
+    authorization, the selected sites and whether or not to prepend the site.
+    """
+
+    def query(self, query: QueryTypes, add_headers: str = "") -> LivestatusResponse:
+        connection = sites.live()
+        if (config := active_config.livestatus_result_cache) is None or not redis_enabled():
+            return connection.query(query, add_headers)
+
+        key = _cache_key(connection, query, add_headers)
+        try:
+            client = get_redis_client()
+            if (cached := client.get(key)) is not None:
+                client.hincrby(_STATISTICS_KEY, "hits")
+                return LivestatusResponse(json.loads(cached))
+        except RedisError as e:
+            logger.debug("Livestatus result cache not available: %s", e)
+            return connection.query(query, add_headers)
+
+        response = connection.query(query, add_headers)
+        try:
+            _store(client, key, response, config["ttl"], config["max_entries"])
+        except RedisError as e:
+            logger.debug("Failed to cache livestatus result: %s", e)
+        return response
+
+
+def cached_live() -> CachedLiveStatus:
+    """Like `sites.live()` for queries whose results may be a few seconds old"""
+    return CachedLiveStatus()
+
+
+def statistics() -> LivestatusCacheStatistics:
+    """The hits and misses of all GUI processes of the site"""
+    if not redis_enabled():
+        return LivestatusCacheStatistics(0, 0)
+    try:
+        counters = get_redis_client().hgetall(_STATISTICS_KEY)
+    except RedisError:
+        return LivestatusCacheStatistics(0, 0)
+    return LivestatusCacheStatistics(int(counters.get("hits", 0)), int(counters.get("misses", 0)))
+
+
+def _cache_key(connection: MultiSiteConnection, query: QueryTypes, add_headers: str) -> str:
+    return (
+        f"{_KEY_PREFIX}:"
+        + hashlib.sha256(
+            json.dumps(
+                [
+                    _normalize_query(query),
+                    _normalize_query(add_headers),
+                    sorted({site.connection.auth_header for site in connection.connections}),
+                    sorted(
+                        site_id
+                        for site_id in connection.alive_sites()
+                        if connection.only_sites is None or site_id in connection.only_sites
+                    ),
+                    connection.prepend_site,
+                    connection.limit,
+                    connection.get_output_format().value,
+                ]
+            ).encode()
+        ).hexdigest()
+    )
+
+
+def _normalize_query(query: QueryTypes) -> str:
+    """
+    >>> _normalize_query("GET hosts\\n  Stats: state = 0 \\n\\nStats: state = 1\\n")
+    'GET hosts\\nStats: state = 0\\nStats: state = 1'
+    """
+    return "\n".join(line for line in (line.strip() for line in str(query).splitlines()) if line)
+
+
+def _store(
+    client: Redis[str], key: str, response: LivestatusResponse, ttl: float, max_entries: int
+) -> None:
+    now = time.time()
+    pipeline = client.pipeline()
+    pipeline.hincrby(_STATISTICS_KEY, "misses")
+    pipeline.set(key, json.dumps(response), px=int(ttl * 1000))
+    # The index of all cached results, ordered by their age, for removing the oldest ones
+    pipeline.zadd(_INDEX_KEY, {key: now})
+    pipeline.zremrangebyscore(_INDEX_KEY, "-inf", now - ttl)
+    pipeline.zcard(_INDEX_KEY)
+    *_results, size = pipeline.execute()
+
+    if size > max_entries and (evicted := client.zpopmin(_INDEX_KEY, size - max_entries)):
+        client.delete(*(evicted_key for evicted_key, _score in evicted))
@@ -223,6 +223,7 @@ def register(
     config_var_registry.register(ConfigVariableEventConsoleStatisticsInterval)
     config_var_registry.register(ConfigVariableEventConsoleLogMessages)
     config_var_registry.register(ConfigVariableEventConsoleRuleOptimizer)
+    config_var_registry.register(ConfigVariableEventConsoleRuleMatchingProcesses)
     config_var_registry.register(ConfigVariableEventConsoleActions)
     config_var_registry.register(ConfigVariableEventConsoleArchiveOrphans)
     config_var_registry.register(ConfigVariableHostnameTranslation)
@@ -4179,6 +4180,34 @@ class ConfigVariableEventConsoleRuleOptimizer(ConfigVariable):
         )
 
 
+class ConfigVariableEventConsoleRuleMatchingProcesses(ConfigVariable):
+    def group(self) -> type[ConfigVariableGroup]:
+        return ConfigVariableGroupEventConsoleGeneric
+
+    def domain(self) -> type[ABCConfigDomain]:
+        return ConfigDomainEventConsole
+
+    def ident(self) -> str:
+        return "rule_matching_processes"
+
+    def valuespec(self) -> ValueSpec:
+        return Integer(
+            title=_("Parallel rule matching"),
+            help=_(
+                "Usually the Event Console matches all incoming messages against the rules "
+                "in a single thread, which limits the throughput to what one CPU core can "
+                "handle. With this option the hostname translation, the rule matching and "
+                "the rewriting of the events is done by this number of worker processes. "
+                "The messages are distributed among the workers by their host, so the "
+                "messages of one host are still processed in the order they were received. "
+                "Set this to 0 to do the matching in the Event Console process itself."
+            ),
+            minvalue=0,
+            label=_("Use"),
+            unit=_("processes"),
+        )
+
+
 class ConfigVariableEventConsoleActions(ConfigVariable):
     def group(self) -> type[ConfigVariableGroup]:
         return ConfigVariableGroupEventConsoleGeneric
@@ -84,7 +84,7 @@ from cmk.gui.watolib.activate_changes import has_pending_changes
 from cmk.gui.watolib.check_mk_automations import delete_hosts
 from cmk.gui.watolib.host_attributes import HostAttributes
 from cmk.gui.watolib.host_rename import RenameHostBackgroundJob, RenameHostsBackgroundJob
-from cmk.gui.watolib.hosts_and_folders import Folder, folder_tree, Host
+from cmk.gui.watolib.hosts_and_folders import Folder, folder_tree, Host, save_hosts_batched
 
 from cmk import fields
 
@@ -556,33 +556,34 @@ def bulk_update_hosts(params: Mapping[str, Any]) -> Response:
     succeeded_hosts: list[Host] = []
     failed_hosts: dict[HostName, str] = {}
 
-    for update_detail in body["entries"]:
-        host_name = update_detail["host_name"]
-        host: Host = Host.load_host(host_name)
+    with save_hosts_batched():
+        for update_detail in body["entries"]:
+            host_name = update_detail["host_name"]
+            host: Host = Host.load_host(host_name)
 
-        if not _validate_host_attributes_for_quick_setup(host, update_detail):
-            failed_hosts[host_name] = "Host is locked by Quick setup."
+            if not _validate_host_attributes_for_quick_setup(host, update_detail):
+                failed_hosts[host_name] = "Host is locked by Quick setup."
 
-        faulty_attributes = []
+            faulty_attributes = []
 
-        if new_attributes := update_detail.get("attributes"):
-            host.edit(new_attributes, None)
+            if new_attributes := update_detail.get("attributes"):
+                host.edit(new_attributes, None)
 
-        if update_attributes := update_detail.get("update_attributes"):
-            host.update_attributes(update_attributes)
+            if update_attributes := update_detail.get("update_attributes"):
+                host.update_attributes(update_attributes)
 
-        if remove_attributes := update_detail.get("remove_attributes"):
-            for attribute in remove_attributes:
-                if attribute not in host.attributes:
-                    faulty_attributes.append(attribute)
+            if remove_attributes := update_detail.get("remove_attributes"):
+                for attribute in remove_attributes:
+                    if attribute not in host.attributes:
+                        faulty_attributes.append(attribute)
 
-            host.clean_attributes(remove_attributes)
+                host.clean_attributes(remove_attributes)
 
-        if faulty_attributes:
-            failed_hosts[host_name] = f"Failed to remove {', '.join(faulty_attributes)}"
-            continue
+            if faulty_attributes:
+                failed_hosts[host_name] = f"Failed to remove {', '.join(faulty_attributes)}"
+                continue
 
-        succeeded_hosts.append(host)
+            succeeded_hosts.append(host)
 
     return _bulk_host_action_response(failed_hosts, succeeded_hosts)
 
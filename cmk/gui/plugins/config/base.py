@@ -71,6 +71,16 @@ def make_default_user_profile() -> UserSpec:
 ActivateChangesCommentMode = Literal["enforce", "optional", "disabled"]
 
 
+class LivestatusResultCacheSpec(TypedDict):
+    ttl: float
+    max_entries: int
+
+
+class BulkDiscoveryConcurrencySpec(TypedDict):
+    max_tasks: int
+    max_tasks_per_site: int
+
+
 class VirtualHostTreeSpec(TypedDict):
     id: str
     title: str
@@ -248,6 +258,10 @@ class CREConfig:
     # Whether the livestatu proxy daemon is available
     liveproxyd_enabled: bool = False
 
+    # Share the results of livestatus queries of dashboards and sidebar snap-ins between
+    # all users with the same permissions for a few seconds
+    livestatus_result_cache: LivestatusResultCacheSpec | None = None
+
     # Set this to a list in order to globally control which views are
     # being displayed in the sidebar snap-in "Views"
     visible_views: list[str] | None = None
@@ -347,6 +361,9 @@ class CREConfig:
             "error_handling": True,
         }
     )
+    bulk_discovery_concurrency: BulkDiscoveryConcurrencySpec = field(
+        default_factory=lambda: BulkDiscoveryConcurrencySpec(max_tasks=10, max_tasks_per_site=2)
+    )
 
     use_siteicons: bool = False
 
@@ -3,7 +3,10 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
-from cmk.gui import site_config, sites, user_sites
+from livestatus import connection_pool
+
+from cmk.gui import livestatus_cache, site_config, sites, user_sites
+from cmk.gui.config import active_config
 from cmk.gui.htmllib.generator import HTMLWriter
 from cmk.gui.htmllib.html import html
 from cmk.gui.i18n import _
@@ -47,7 +50,7 @@ class Performance(SidebarSnapin):
 
         try:
             sites.live().set_only_sites(only_sites)
-            data = sites.live().query(
+            data = livestatus_cache.cached_live().query(
                 "GET status\nColumns: service_checks_rate host_checks_rate "
                 "external_commands_rate connections_rate forks_rate "
                 "log_messages_rate cached_log_messages "
@@ -90,6 +93,21 @@ class Performance(SidebarSnapin):
             maxx = sum(row[1] for row in data)
             write_line(_("Com. buf. max/total"), "%d / %d" % (maxx, size), show_more=True)
 
+        if active_config.livestatus_result_cache is not None:
+            write_line(
+                _("Livestatus cache hits"),
+                "%.1f %%" % (100 * livestatus_cache.statistics().hit_rate),
+                show_more=True,
+            )
+
+        # Only counted for sites with persistent connections, in this GUI process
+        if (pool := connection_pool.statistics()).connected:
+            write_line(
+                _("Reused connections"),
+                "%d / %d" % (pool.reused, pool.reused + pool.connected),
+                show_more=True,
+            )
+
         html.close_table()
 
     @classmethod
@@ -14,6 +14,7 @@ from cmk.gui.htmllib.generator import HTMLWriter
 from cmk.gui.htmllib.html import html
 from cmk.gui.http import request
 from cmk.gui.i18n import _, ungettext
+from cmk.gui.livestatus_cache import cached_live
 from cmk.gui.logged_in import user
 from cmk.gui.type_defs import VisualContext
 from cmk.gui.utils.urls import makeuri_contextless
@@ -471,7 +472,7 @@ class TacticalOverviewSnapin(CustomizableSidebarSnapin):
             if only_sites:
                 sites.live().set_only_sites(only_sites)
 
-            return sites.live().query_summed_stats(query)
+            return cached_live().query_summed_stats(query)
         except livestatus.MKLivestatusNotFoundError:
             return deflt
         finally:
@@ -108,13 +108,15 @@ def cleanup_connections() -> Iterator[None]:
 # TODO: This is not really shutting down or closing connections. It only removes references to
 # sockets and connection classes. This should really be cleaned up (context managers, ...)
 def disconnect() -> None:
-    """Actively closes all Livestatus connections."""
+    """Actively closes all Livestatus connections.
+
+    Persistent connections are kept open for the following requests of this process."""
     # NOTE: g.__bool__() *can* return False due to the LocalProxy Kung Fu!
     if not g:  # type: ignore[truthy-bool]
         return
     logger.debug("Disconnecting site connections")
     if "live" in g:
-        g.live.disconnect()
+        g.live.release()
     g.pop("live", None)
     g.pop("site_status", None)
 
@@ -6,6 +6,9 @@
 from collections.abc import Callable, Iterator, Sequence
 from statistics import fmean
 
+import numpy as np
+import numpy.typing as npt
+
 Timestamp = int
 
 TimeWindow = tuple[Timestamp, Timestamp, int]
@@ -38,6 +41,22 @@ def aggregation_functions(series: TimeSeriesValues, aggr: str | None) -> TimeSer
             raise ValueError(f"Invalid Aggregation function {aggr}, only max, min, average allowed")
 
 
+def _no_conversion(v: float) -> float:
+    return v
+
+
+def to_array(values: TimeSeriesValues) -> npt.NDArray[np.float64]:
+    """Convert values to a float array, None becomes NaN"""
+    return np.array(values, dtype=np.float64)
+
+
+def to_values(array: npt.NDArray[np.float64]) -> list[TimeSeriesValue]:
+    """Convert a float array to values, NaN becomes None"""
+    values = array.astype(object)
+    values[np.isnan(array)] = None
+    return values.tolist()
+
+
 class TimeSeries:
     """Describes the returned time series returned by livestatus
 
@@ -46,6 +65,8 @@ class TimeSeries:
       which means they are at the end of the interval.
     - The Series describes the interval [start; end[
     - Start has no associated value to it.
+    - The values are kept in a numpy array, missing values (None) are stored as NaN.
+      `array` gives access to the array, `values` and the sequence protocol to the values.
 
     args:
         data : list
@@ -59,12 +80,12 @@ class TimeSeries:
 
     def __init__(
         self,
-        data: TimeSeriesValues,
+        data: TimeSeriesValues | npt.NDArray[np.float64],
         time_window: TimeWindow | None = None,
-        conversion: Callable[[float], float] = lambda v: v,
+        conversion: Callable[[float], float] = _no_conversion,
     ) -> None:
         if time_window is None:
-            if not data or data[0] is None or data[1] is None or data[2] is None:
+            if len(data) == 0 or data[0] is None or data[1] is None or data[2] is None:
                 raise ValueError(data)
 
             time_window = int(data[0]), int(data[1]), int(data[2])
@@ -74,7 +95,31 @@ class TimeSeries:
         self.start = int(time_window[0])
         self.end = int(time_window[1])
         self.step = int(time_window[2])
-        self.values = [v if v is None else conversion(v) for v in data]
+
+        array = data.astype(np.float64) if isinstance(data, np.ndarray) else to_array(data)
+        if conversion is not _no_conversion:
+            valid = ~np.isnan(array)
+            array[valid] = [conversion(v) for v in array[valid].tolist()]
+        self.array = array
+
+    @property
+    def array(self) -> npt.NDArray[np.float64]:
+        return self._array
+
+    @array.setter
+    def array(self, array: npt.NDArray[np.float64]) -> None:
+        self._array = array
+        self._values: list[TimeSeriesValue] | None = None
+
+    @property
+    def values(self) -> list[TimeSeriesValue]:
+        if self._values is None:
+            self._values = to_values(self._array)
+        return self._values
+
+    @values.setter
+    def values(self, values: TimeSeriesValues) -> None:
+        self.array = to_array(values)
 
     @property
     def twindow(self) -> TimeWindow:
@@ -88,13 +133,16 @@ class TimeSeries:
         """
         if twindow == self.twindow:
             return self.values
+        return to_values(self.forward_fill_resample_array(twindow))
 
-        idx_max = len(self.values) - 1
+    def forward_fill_resample_array(self, twindow: TimeWindow) -> npt.NDArray[np.float64]:
+        """Same as forward_fill_resample, but on the array"""
+        if twindow == self.twindow:
+            return self._array
 
-        return [
-            self.values[max(0, min(int((t - self.start) / self.step), idx_max))]
-            for t in range(*twindow)
-        ]
+        indices = (np.arange(*twindow) - self.start) / self.step
+        # astype truncates towards zero, just like int()
+        return self._array[np.clip(indices.astype(np.int64), 0, len(self._array) - 1)]
 
     def downsample(self, twindow: TimeWindow, cf: str | None = "max") -> TimeSeriesValues:
         """Downsample time series by consolidation function
@@ -106,24 +154,49 @@ class TimeSeries:
         """
         if twindow == self.twindow:
             return self.values
+        return to_values(self.downsample_array(twindow, cf))
 
-        dwsa = []
-        co: list[TimeSeriesValue] = []
-        desired_times = rrd_timestamps(twindow)
-        i = 0
-        for t, val in self.time_data_pairs():
-            if t > desired_times[i]:
-                dwsa.append(aggregation_functions(co, cf))
-                co = []
-                i += 1
-            co.append(val)
-
-        diff_len = len(desired_times) - len(dwsa)
-        if diff_len > 0:
-            dwsa.append(aggregation_functions(co, cf))
-            dwsa += [None] * (diff_len - 1)
-
-        return dwsa
+    def downsample_array(
+        self, twindow: TimeWindow, cf: str | None = "max"
+    ) -> npt.NDArray[np.float64]:
+        """Same as downsample, but on the array"""
+        if twindow == self.twindow:
+            return self._array
+
+        aggr = "max" if cf is None else cf.lower()
+        if aggr not in ("average", "max", "min"):
+            raise ValueError(f"Invalid Aggregation function {cf}, only max, min, average allowed")
+
+        desired_times = np.array(rrd_timestamps(twindow), dtype=np.int64)
+        timestamps = np.array(rrd_timestamps(self.twindow), dtype=np.int64)
+        length = min(len(timestamps), len(self._array))
+        # Each value belongs to the first desired time not before its own timestamp.
+        # Values after the last desired time are dropped.
+        bins = np.searchsorted(desired_times, timestamps[:length], side="left")
+        in_range = bins < len(desired_times)
+        bins = bins[in_range]
+        values = self._array[:length][in_range]
+
+        downsampled = np.full(len(desired_times), np.nan)
+        if not len(values):
+            return downsampled
+
+        # The bins are sorted, so each of them is a contiguous slice of the values
+        bin_starts = np.flatnonzero(np.diff(bins, prepend=-1))
+        match aggr:
+            case "max":
+                # fmax and fmin ignore NaN, unless all values are NaN
+                downsampled[bins[bin_starts]] = np.fmax.reduceat(values, bin_starts)
+            case "min":
+                downsampled[bins[bin_starts]] = np.fmin.reduceat(values, bin_starts)
+            case "average":
+                valid = ~np.isnan(values)
+                sums = np.add.reduceat(np.where(valid, values, 0.0), bin_starts)
+                counts = np.add.reduceat(valid.astype(np.int64), bin_starts)
+                downsampled[bins[bin_starts]] = np.divide(
+                    sums, counts, out=np.full(len(sums), np.nan), where=counts > 0
+                )
+        return downsampled
 
     def time_data_pairs(self) -> list[tuple[Timestamp, TimeSeriesValue]]:
         return list(zip(rrd_timestamps(self.twindow), self.values))
@@ -139,17 +212,19 @@ class TimeSeries:
             self.start == other.start
             and self.end == other.end
             and self.step == other.step
-            and self.values == other.values
+            and np.array_equal(self._array, other._array, equal_nan=True)
         )
 
     def __getitem__(self, i: int) -> TimeSeriesValue:
         return self.values[i]
 
     def __len__(self) -> int:
-        return len(self.values)
+        return len(self._array)
 
     def __iter__(self) -> Iterator[TimeSeriesValue]:
         yield from self.values
 
     def count(self, /, v: TimeSeriesValue) -> int:
-        return self.values.count(v)
+        if v is None:
+            return int(np.count_nonzero(np.isnan(self._array)))
+        return int(np.count_nonzero(self._array == v))
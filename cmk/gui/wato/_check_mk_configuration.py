@@ -133,14 +133,17 @@ def register(
     config_variable_registry.register(ConfigVariableDefaultLanguage)
     config_variable_registry.register(ConfigVariableShowMoreMode)
     config_variable_registry.register(ConfigVariableBulkDiscoveryDefaultSettings)
+    config_variable_registry.register(ConfigVariableBulkDiscoveryConcurrency)
     config_variable_registry.register(ConfigVariableLogLevels)
     config_variable_registry.register(ConfigVariableSlowViewsDurationThreshold)
     config_variable_registry.register(ConfigVariableDebug)
     config_variable_registry.register(ConfigVariableGUIProfile)
     config_variable_registry.register(ConfigVariableDebugLivestatusQueries)
     config_variable_registry.register(ConfigVariableCMCRulesetMatchingStats)
+    config_variable_registry.register(ConfigVariablePluginTimingStats)
     config_variable_registry.register(ConfigVariableSelectionLivetime)
     config_variable_registry.register(ConfigVariableShowLivestatusErrors)
+    config_variable_registry.register(ConfigVariableLivestatusResultCache)
     config_variable_registry.register(ConfigVariableEnableSounds)
     config_variable_registry.register(ConfigVariableSoftQueryLimit)
     config_variable_registry.register(ConfigVariableHardQueryLimit)
@@ -416,6 +419,47 @@ class ConfigVariableBulkDiscoveryDefaultSettings(ConfigVariable):
         return vs_bulk_discovery()
 
 
+class ConfigVariableBulkDiscoveryConcurrency(ConfigVariable):
+    def group(self) -> type[ConfigVariableGroup]:
+        return ConfigVariableGroupUserInterface
+
+    def domain(self) -> type[ABCConfigDomain]:
+        return ConfigDomainGUI
+
+    def ident(self) -> str:
+        return "bulk_discovery_concurrency"
+
+    def valuespec(self) -> ValueSpec:
+        return Dictionary(
+            title=_("Concurrent bulk discovery"),
+            help=_(
+                "A bulk discovery splits the hosts into groups of hosts of the same folder and "
+                "site, see the option <i>Number of hosts to handle at once</i>. Up to the "
+                "configured number of these groups are discovered at the same time. Raising the "
+                "number per site increases the load of the sites during the discovery."
+            ),
+            elements=[
+                (
+                    "max_tasks",
+                    Integer(
+                        title=_("Maximum number of concurrent discoveries"),
+                        minvalue=1,
+                        default_value=10,
+                    ),
+                ),
+                (
+                    "max_tasks_per_site",
+                    Integer(
+                        title=_("Maximum number of concurrent discoveries per site"),
+                        minvalue=1,
+                        default_value=2,
+                    ),
+                ),
+            ],
+            optional_keys=[],
+        )
+
+
 def _slow_view_logging_help():
     return _(
         "Some built-in or own views may take longer time than expected. In order to"
@@ -693,6 +737,55 @@ class ConfigVariableShowLivestatusErrors(ConfigVariable):
         )
 
 
+class ConfigVariableLivestatusResultCache(ConfigVariable):
+    def group(self) -> type[ConfigVariableGroup]:
+        return ConfigVariableGroupUserInterface
+
+    def domain(self) -> type[ABCConfigDomain]:
+        return ConfigDomainGUI
+
+    def ident(self) -> str:
+        return "livestatus_result_cache"
+
+    def valuespec(self) -> ValueSpec:
+        return Optional(
+            valuespec=Dictionary(
+                elements=[
+                    (
+                        "ttl",
+                        Float(
+                            title=_("Lifetime of cached results"),
+                            minvalue=1.0,
+                            default_value=10.0,
+                            unit="sec",
+                            display_format="%.1f",
+                        ),
+                    ),
+                    (
+                        "max_entries",
+                        Integer(
+                            title=_("Maximum number of cached results"),
+                            minvalue=1,
+                            default_value=10000,
+                        ),
+                    ),
+                ],
+                optional_keys=[],
+            ),
+            title=_("Cache livestatus results of dashboards and sidebar"),
+            label=_("Share livestatus results between users and browser tabs"),
+            help=_(
+                "Dashboards and sidebar snap-ins send the same livestatus queries on every "
+                "refresh, for every user and every browser tab. With this option the results "
+                "are kept for a few seconds and reused by all users with the same permissions, "
+                "which reduces the load of the monitoring cores with many auto-refreshing "
+                "screens. The results are at most as old as the configured lifetime. When the "
+                "maximum number of results is reached, the oldest ones are removed. The cache "
+                "is stored in the Redis of the site."
+            ),
+        )
+
+
 class ConfigVariableEnableSounds(ConfigVariable):
     def group(self) -> type[ConfigVariableGroup]:
         return ConfigVariableGroupUserInterface
@@ -3284,6 +3377,27 @@ class ConfigVariableCMCRulesetMatchingStats(ConfigVariable):
         )
 
 
+class ConfigVariablePluginTimingStats(ConfigVariable):
+    def group(self) -> type[ConfigVariableGroup]:
+        return ConfigVariableGroupDeveloperTools
+
+    def domain(self) -> type[ABCConfigDomain]:
+        return ConfigDomainCore
+
+    def ident(self) -> str:
+        return "plugin_timing_stats"
+
+    def valuespec(self) -> ValueSpec:
+        return Checkbox(
+            title=_("Collect plugin timing statistics"),
+            help=_(
+                "If enabled, the wall and CPU times of the section parse functions and the "
+                "check plug-ins are summed up over all check runs of the site. Use "
+                "<tt>cmk --plugin-times</tt> to show the slowest ones."
+            ),
+        )
+
+
 class ConfigVariableUseInlineSNMP(ConfigVariable):
     def group(self) -> type[ConfigVariableGroup]:
         return ConfigVariableGroupCheckExecution
@@ -30,6 +30,7 @@ from cmk.gui.watolib.hosts_and_folders import (
     disk_or_search_folder_from_request,
     Folder,
     Host,
+    save_hosts_batched,
     SearchFolder,
 )
 from cmk.gui.watolib.mode import ModeRegistry, redirect, WatoMode
@@ -79,12 +80,10 @@ class ModeBulkEdit(WatoMode):
 
         changed_attributes = collect_attributes("bulk", new=False)
         host_names = get_hostnames_from_checkboxes(self._folder)
-        for host_name in host_names:
-            host = self._folder.load_host(host_name)
-            host.update_attributes(changed_attributes)
-            # call_hook_hosts_changed() is called too often.
-            # Either offer API in class Host for bulk change or
-            # delay saving until end somehow
+        with save_hosts_batched():
+            for host_name in host_names:
+                host = self._folder.load_host(host_name)
+                host.update_attributes(changed_attributes)
 
         flash(_("Edited %d hosts") % len(host_names))
         return redirect(self._folder.url())
@@ -182,8 +181,9 @@ class ModeBulkCleanup(WatoMode):
         for host in hosts:
             host.permissions.need_permission("write")
 
-        for host in hosts:
-            host.clean_attributes(to_clean)
+        with save_hosts_batched():
+            for host in hosts:
+                host.clean_attributes(to_clean)
 
         return redirect(self._folder.url())
 
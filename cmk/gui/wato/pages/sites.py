@@ -424,8 +424,11 @@ class ModeEditSite(WatoMode):
                     label=_("Use persistent connections"),
                     help=_(
                         "If you enable persistent connections then Multisite will try to keep open "
-                        "the connection to the remote sites. This brings a great speed up in high-latency "
-                        "situations but locks a number of threads in the Livestatus module of the target site."
+                        "the connection to the remote sites and reuse it for the following page "
+                        "requests. This brings a great speed up in high-latency situations, "
+                        "especially with encrypted connections, but locks a number of threads in "
+                        "the Livestatus module of the target site. Connections that have been idle "
+                        "for a minute are closed."
                     ),
                 ),
             ),
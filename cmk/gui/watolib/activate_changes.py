@@ -164,6 +164,9 @@ ACTIVATION_PERISTED_DIR = cmk.utils.paths.var_dir + "/wato/activation"
 
 var_dir = cmk.utils.paths.var_dir + "/wato/"
 
+# Files modified less than this time before being hashed are hashed again on the next scan
+_RACY_FILE_AGE_NS = 2 * 10**9
+
 
 GENERAL_DIR_EXCLUDE = "__pycache__"
 
@@ -2215,6 +2218,7 @@ class ReplicationPathType(enum.StrEnum):
 
 def _get_config_sync_file_infos_per_inode(
     replication_paths: Sequence[ReplicationPath],
+    file_hashes: _ConfigSyncFileHashes | None = None,
 ) -> Mapping[int, ConfigSyncFileInfo]:
     inode_sync_states = {}
 
@@ -2226,11 +2230,11 @@ def _get_config_sync_file_infos_per_inode(
 
         if replication_path.ty == ReplicationPathType.FILE:
             inode_sync_states[os.stat(replication_path_full).st_ino] = _get_config_sync_file_info(
-                replication_path_full
+                replication_path_full, file_hashes
             )
         elif replication_path.ty == ReplicationPathType.DIR:
             _get_replication_dir_config_sync_file_infos_per_inode(
-                inode_sync_states, replication_path_full, replication_path.excludes
+                inode_sync_states, replication_path_full, replication_path.excludes, file_hashes
             )
         else:
             raise NotImplementedError()
@@ -2242,6 +2246,7 @@ def _get_replication_dir_config_sync_file_infos_per_inode(
     inode_sync_states: MutableMapping[int, ConfigSyncFileInfo],
     replication_path: str,
     replication_path_excludes: Sequence[str],
+    file_hashes: _ConfigSyncFileHashes | None,
 ) -> None:
     # Use os functionality instead of pathlib since it is faster
     for root, dir_names, file_names in os.walk(replication_path):
@@ -2256,12 +2261,16 @@ def _get_replication_dir_config_sync_file_infos_per_inode(
                 and os.path.islink(dir_path)
                 and not dir_name == GENERAL_DIR_EXCLUDE
             ):
-                inode_sync_states[os.stat(dir_path).st_ino] = _get_config_sync_file_info(dir_path)
+                inode_sync_states[os.stat(dir_path).st_ino] = _get_config_sync_file_info(
+                    dir_path, file_hashes
+                )
 
         for file_name in file_names:
             file_path = os.path.join(root, file_name)
             if os.path.exists(file_path):
-                inode_sync_states[os.stat(file_path).st_ino] = _get_config_sync_file_info(file_path)
+                inode_sync_states[os.stat(file_path).st_ino] = _get_config_sync_file_info(
+                    file_path, file_hashes
+                )
 
 
 def _prepare_for_activation_tasks(
@@ -2271,9 +2280,11 @@ def _prepare_for_activation_tasks(
     time_started: float,
     source: ActivationSource,
 ) -> tuple[Mapping[SiteId, ConfigSyncFileInfos], Mapping[SiteId, SiteActivationState]]:
+    file_hashes = _ConfigSyncFileHashes(_config_sync_file_hashes_path())
     config_sync_file_infos_per_inode = _get_config_sync_file_infos_per_inode(
-        list(replication_path_registry.values())
+        list(replication_path_registry.values()), file_hashes
     )
+    file_hashes.save()
     central_file_infos_per_site = {}
     site_activation_states_per_site = {}
     for site_id, snapshot_settings in sorted(site_snapshot_settings.items(), key=lambda e: e[0]):
@@ -3139,7 +3150,11 @@ class AutomationGetConfigSyncState(AutomationCommand[list[ReplicationPath]]):
 
     def execute(self, api_request: list[ReplicationPath]) -> GetConfigSyncStateResponse:
         with store.lock_checkmk_configuration(configuration_lockfile):
-            file_infos = _get_config_sync_file_infos(api_request, base_dir=cmk.utils.paths.omd_root)
+            file_hashes = _ConfigSyncFileHashes(_config_sync_file_hashes_path())
+            file_infos = _get_config_sync_file_infos(
+                api_request, base_dir=cmk.utils.paths.omd_root, file_hashes=file_hashes
+            )
+            file_hashes.save()
             transport_file_infos = {
                 k: (v.st_mode, v.st_size, v.link_target, v.file_hash) for k, v in file_infos.items()
             }
@@ -3179,13 +3194,15 @@ def _get_config_sync_file_infos(
     replication_paths: list[ReplicationPath],
     base_dir: Path,
     config_sync_file_infos_per_inode: Mapping[int, ConfigSyncFileInfo] | None = None,
+    file_hashes: _ConfigSyncFileHashes | None = None,
 ) -> ConfigSyncFileInfos:
     """Scans the given replication paths for the information needed for the config sync
 
     It produces a dictionary of sync file infos. One entry is created for each file.  Directories
     are not added to the dictionary unless it is a symlink.
     Since files to be synced for different site are copied as hardlink, the sync file infos can be
-    precomputed and the relevant info then identified via the files inode
+    precomputed and the relevant info then identified via the files inode.
+    The hashes of the files unchanged since the last scan are taken from file_hashes, if given.
     """
     if config_sync_file_infos_per_inode is None:
         config_sync_file_infos_per_inode = {}
@@ -3198,7 +3215,9 @@ def _get_config_sync_file_infos(
             continue  # Only report back existing things
 
         if replication_path.ty == ReplicationPathType.FILE:
-            infos[replication_path.site_path] = _get_config_sync_file_info(replication_path_full)
+            infos[replication_path.site_path] = _get_config_sync_file_info(
+                replication_path_full, file_hashes
+            )
 
         elif replication_path.ty == ReplicationPathType.DIR:
             _get_replication_dir_config_sync_file_infos(
@@ -3207,6 +3226,7 @@ def _get_config_sync_file_infos(
                 base_dir,
                 replication_path_full,
                 replication_path.excludes,
+                file_hashes,
             )
         else:
             raise NotImplementedError()
@@ -3219,6 +3239,7 @@ def _get_replication_dir_config_sync_file_infos(
     base_dir: Path,
     replication_path: str,
     replication_path_excludes: Sequence[str],
+    file_hashes: _ConfigSyncFileHashes | None,
 ) -> None:
     # Use os functionality instead of pathlib since it is faster
     for root, dir_names, file_names in os.walk(replication_path):
@@ -3238,22 +3259,68 @@ def _get_replication_dir_config_sync_file_infos(
                 ):
                     infos[valid_site_path] = sync_file_info
                 else:
-                    infos[valid_site_path] = _get_config_sync_file_info(config_sync_path)
+                    infos[valid_site_path] = _get_config_sync_file_info(
+                        config_sync_path, file_hashes
+                    )
             except FileNotFoundError:  # e.g. broken symlinks
-                infos[valid_site_path] = _get_config_sync_file_info(config_sync_path)
+                infos[valid_site_path] = _get_config_sync_file_info(config_sync_path, file_hashes)
 
 
-def _get_config_sync_file_info(file_path: str) -> ConfigSyncFileInfo:
+def _get_config_sync_file_info(
+    file_path: str, file_hashes: _ConfigSyncFileHashes | None = None
+) -> ConfigSyncFileInfo:
     stat = os.lstat(file_path)
     is_symlink = os.path.islink(file_path)
+    if is_symlink:
+        file_hash = None
+    elif file_hashes is None:
+        file_hash = _create_config_sync_file_hash(file_path)
+    else:
+        file_hash = file_hashes.file_hash(file_path, stat)
     return ConfigSyncFileInfo(
         stat.st_mode,
         stat.st_size,
         os.readlink(str(file_path)) if is_symlink else None,
-        _create_config_sync_file_hash(file_path) if not is_symlink else None,
+        file_hash,
     )
 
 
+class _ConfigSyncFileHashes:
+    """The hashes of the files to be synchronized, kept from one scan to the next
+
+    A file is only hashed again if its inode, size or modification time changed. Files modified
+    right before being hashed are not remembered: A further modification within the resolution of
+    the modification time would go unnoticed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        try:
+            self._cached: Mapping[str, tuple[int, int, int, str]] = (
+                store.load_object_from_pickle_file(path, default={})
+            )
+        except Exception as e:
+            logger.debug("Ignoring unreadable config sync file hashes %s: %s", path, e)
+            self._cached = {}
+        self._hashes: dict[str, tuple[int, int, int, str]] = {}
+
+    def file_hash(self, file_path: str, stat: os.stat_result) -> str:
+        key = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if (cached := self._cached.get(file_path)) is not None and cached[:3] == key:
+            self._hashes[file_path] = cached
+            return cached[3]
+
+        file_hash = _create_config_sync_file_hash(file_path)
+        if time.time_ns() - stat.st_mtime_ns > _RACY_FILE_AGE_NS:
+            self._hashes[file_path] = (*key, file_hash)
+        return file_hash
+
+    def save(self) -> None:
+        """Keep the hashes of the files of this scan, the vanished files are dropped"""
+        if self._hashes != self._cached:
+            store.save_object_to_pickle_file(self._path, self._hashes)
+
+
 def _create_config_sync_file_hash(file_path: str) -> str:
     sha256 = hashlib.sha256()
     with open(file_path, "rb") as f:
@@ -3285,6 +3352,10 @@ def _config_generation_path() -> Path:
     return wato_var_dir() / "config-generation.mk"
 
 
+def _config_sync_file_hashes_path() -> Path:
+    return wato_var_dir() / "config_sync_file_hashes.pkl"
+
+
 class ReceiveConfigSyncRequest(NamedTuple):
     site_id: SiteId
     sync_archive: bytes
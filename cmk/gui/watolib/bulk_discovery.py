@@ -3,8 +3,12 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
-from collections.abc import Sequence
+import queue
+import threading
+from collections import Counter, deque
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from functools import partial
+from multiprocessing.pool import ThreadPool
 from typing import NamedTuple, NewType, TypedDict
 
 from livestatus import SiteId
@@ -19,10 +23,13 @@ from cmk.automations.results import ServiceDiscoveryResult as AutomationDiscover
 from cmk.checkengine.discovery import DiscoveryResult, DiscoverySettings
 
 from cmk.gui.background_job import BackgroundJob, BackgroundProcessInterface, InitialStatusArgs
+from cmk.gui.config import active_config
 from cmk.gui.exceptions import MKUserError
 from cmk.gui.http import request
 from cmk.gui.i18n import _
 from cmk.gui.logged_in import user
+from cmk.gui.site_config import site_is_local
+from cmk.gui.utils.request_context import copy_request_context
 from cmk.gui.valuespec import (
     CascadingDropdown,
     Checkbox,
@@ -33,6 +40,7 @@ from cmk.gui.valuespec import (
     Tuple,
     ValueSpec,
 )
+from cmk.gui.watolib.activate_changes import sync_changes_before_remote_automation
 from cmk.gui.watolib.changes import add_service_change
 from cmk.gui.watolib.check_mk_automations import discovery
 from cmk.gui.watolib.hosts_and_folders import disk_or_search_folder_from_request, folder_tree, Host
@@ -245,8 +253,23 @@ class BulkDiscoveryBackgroundJob(BackgroundJob):
         )
         job_interface.send_progress_update(_("Bulk discovery started..."))
 
-        for task in tasks:
-            self._bulk_discover_item(task, mode, do_scan, ignore_errors, job_interface)
+        concurrency = active_config.bulk_discovery_concurrency
+        for task, response in execute_discovery_tasks(
+            tasks,
+            copy_request_context(
+                partial(
+                    self._discover_item,
+                    mode,
+                    do_scan,
+                    ignore_errors,
+                    request.request_timeout - 2,
+                    {task.site_id: threading.Lock() for task in tasks},
+                )
+            ),
+            max_tasks=concurrency["max_tasks"],
+            max_tasks_per_site=concurrency["max_tasks_per_site"],
+        ):
+            self._bulk_discover_item(task, response, job_interface)
 
         job_interface.send_progress_update(_("Bulk discovery finished."))
 
@@ -288,24 +311,39 @@ class BulkDiscoveryBackgroundJob(BackgroundJob):
         self._num_host_labels_total = 0
         self._num_host_labels_added = 0
 
-    def _bulk_discover_item(
-        self,
-        task: DiscoveryTask,
+    @staticmethod
+    def _discover_item(
         mode: DiscoverySettings,
         do_scan: DoFullScan,
         ignore_errors: IgnoreErrors,
+        timeout: int,
+        sync_locks: Mapping[SiteId, threading.Lock],
+        task: DiscoveryTask,
+    ) -> AutomationDiscoveryResult:
+        if task.site_id and not site_is_local(active_config, task.site_id):
+            # Only one of the concurrent tasks of a site may synchronize the pending changes
+            with sync_locks[task.site_id]:
+                sync_changes_before_remote_automation(task.site_id)
+        return discovery(
+            task.site_id,
+            mode.to_json(),
+            task.host_names,
+            scan=do_scan,
+            raise_errors=not ignore_errors,
+            timeout=timeout,
+            non_blocking_http=True,
+            sync=False,
+        )
+
+    def _bulk_discover_item(
+        self,
+        task: DiscoveryTask,
+        response: AutomationDiscoveryResult | Exception,
         job_interface: BackgroundProcessInterface,
     ) -> None:
         try:
-            response = discovery(
-                task.site_id,
-                mode.to_json(),
-                task.host_names,
-                scan=do_scan,
-                raise_errors=not ignore_errors,
-                timeout=request.request_timeout - 2,
-                non_blocking_http=True,
-            )
+            if isinstance(response, Exception):
+                raise response
             self._process_discovery_results(task, job_interface, response)
         except Exception as e:
             self._num_hosts_failed += len(task.host_names)
@@ -391,6 +429,56 @@ class BulkDiscoveryBackgroundJob(BackgroundJob):
         return _("discovery successful")
 
 
+def execute_discovery_tasks(
+    tasks: Sequence[DiscoveryTask],
+    discover: Callable[[DiscoveryTask], AutomationDiscoveryResult],
+    *,
+    max_tasks: int,
+    max_tasks_per_site: int,
+) -> Iterator[tuple[DiscoveryTask, AutomationDiscoveryResult | Exception]]:
+    """Discover the tasks in worker threads, yield the results in the order they finish
+
+    Most of the time of a discovery is spent waiting for the automation of the site. The tasks
+    of different sites are discovered at the same time, the tasks of a site in their order.
+    """
+    pending: dict[SiteId, deque[DiscoveryTask]] = {}
+    for task in tasks:
+        pending.setdefault(task.site_id, deque()).append(task)
+    running: Counter[SiteId] = Counter()
+    finished: queue.SimpleQueue[tuple[DiscoveryTask, AutomationDiscoveryResult | Exception]] = (
+        queue.SimpleQueue()
+    )
+
+    def discover_task(task: DiscoveryTask) -> None:
+        try:
+            finished.put((task, discover(task)))
+        except Exception as e:
+            finished.put((task, e))
+
+    with ThreadPool(max_tasks) as pool:
+        while pending or running.total():
+            # Start the tasks of the sites in turn, so that all sites are kept busy
+            started = True
+            while started:
+                started = False
+                for site_id, site_tasks in list(pending.items()):
+                    if running.total() >= max_tasks:
+                        break
+                    if running[site_id] >= max_tasks_per_site:
+                        continue
+                    pool.apply_async(discover_task, (site_tasks.popleft(),))
+                    running[site_id] += 1
+                    started = True
+                    # The site gets its next turn after all the other sites
+                    del pending[site_id]
+                    if site_tasks:
+                        pending[site_id] = site_tasks
+
+            task, response = finished.get()
+            running[task.site_id] -= 1
+            yield task, response
+
+
 def prepare_hosts_for_discovery(hostnames: Sequence[str]) -> list[DiscoveryHost]:
     hosts_to_discover = []
     for host_name in hostnames:
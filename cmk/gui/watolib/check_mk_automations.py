@@ -155,6 +155,7 @@ def discovery(
     raise_errors: bool,
     timeout: int | None = None,
     non_blocking_http: bool = False,
+    sync: bool = True,
 ) -> results.ServiceDiscoveryResult:
     return _deserialize(
         _automation_serialized(
@@ -167,6 +168,7 @@ def discovery(
                 *host_names,
             ],
             timeout=timeout,
+            sync=sync,
             non_blocking_http=non_blocking_http,
         ),
         results.ServiceDiscoveryResult,
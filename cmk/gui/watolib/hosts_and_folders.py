@@ -1122,6 +1122,138 @@ def disk_or_search_base_folder_from_request(
     return folder
 
 
+# The host attributes which are saved to the hosts.mk as maps from host name to value
+_HOSTS_FILE_ATTRIBUTE_MAPPINGS: Final = [
+    # host attr, cmk.base variable name
+    ("ipaddress", "ipaddresses"),
+    ("ipv6address", "ipv6addresses"),
+    ("snmp_community", "explicit_snmp_communities"),
+    ("management_snmp_community", "management_snmp_credentials"),
+    ("management_ipmi_credentials", "management_ipmi_credentials"),
+    ("management_protocol", "management_protocol"),
+]
+
+
+class _HostsFileFragment(NamedTuple):
+    """The data of one host in the hosts.mk of its folder"""
+
+    attributes: HostAttributes
+    labels: Labels
+    tag_groups: Mapping[TagGroupID, TagID]
+    cluster_nodes: Sequence[HostName] | None
+    attribute_values: Mapping[str, Any]
+    group_rules: tuple[list[GroupRuleType], bool] | None
+    custom_macros: Mapping[str, str]
+    explicit_host_conf: Mapping[str, str]
+
+
+def _compute_hosts_file_fragment(hostname: HostName, host: Host) -> _HostsFileFragment:
+    effective = host.effective_attributes()
+
+    cluster_nodes = None
+    if host.is_cluster():
+        cluster_nodes = host.cluster_nodes()
+        assert cluster_nodes is not None
+
+    # Save the effective attributes of a host to the related attribute maps.
+    # These maps are saved directly in the hosts.mk to transport the effective
+    # attributes to Checkmk base.
+    attribute_values = {
+        cmk_var_name: value
+        for attribute_name, cmk_var_name in _HOSTS_FILE_ATTRIBUTE_MAPPINGS
+        if (value := effective.get(attribute_name))
+    }
+
+    # Create contact group rule entries for hosts with explicitly set
+    # values Note: since the type if this entry is a list, not a single
+    # contact group, all other list entries coming after this one will
+    # be ignored. That way the host-entries have precedence over the
+    # folder entries.
+    #
+    # LM: This comment is wrong. The folders create list entries,
+    # but the hosts create string entries. This makes the hosts add
+    # their contact groups in addition to the effective folder contact
+    # groups I went back to ~2015 and it seems it was always working
+    # this way. I won't change it now and leave the comment here for
+    # reference.
+    group_rules = None
+    if "contactgroups" in host.attributes:
+        cgconfig = host.attributes["contactgroups"]
+        cgs = cgconfig["groups"]
+        if cgs and cgconfig["use"]:
+            group_rules = (
+                [GroupRuleType(value=cg, condition={"host_name": [hostname]}) for cg in cgs],
+                cgconfig["use_for_services"],
+            )
+
+    custom_macros: dict[str, str] = {}
+    explicit_host_conf: dict[str, str] = {}
+    for attr in host_attribute_registry.attributes():
+        attrname = attr.name()
+        if attrname in effective:
+            custom_varname = attr.nagios_name()
+            if custom_varname:
+                value = effective.get(attrname)
+                nagstring = attr.to_nagios(value)
+                if nagstring is not None:
+                    if attr.is_explicit():
+                        explicit_host_conf[custom_varname] = nagstring
+                    else:
+                        custom_macros[custom_varname] = nagstring
+
+    return _HostsFileFragment(
+        attributes=update_metadata(host.attributes, created_by=user.id),
+        labels=effective["labels"],
+        tag_groups=host.tag_groups(),
+        cluster_nodes=cluster_nodes,
+        attribute_values=attribute_values,
+        group_rules=group_rules,
+        custom_macros=custom_macros,
+        explicit_host_conf=explicit_host_conf,
+    )
+
+
+class _HostsSaveBatch:
+    def __init__(self) -> None:
+        # folder path -> folder and the changed hosts (None: all hosts)
+        self._folders: dict[str, tuple[Folder, set[HostName] | None]] = {}
+
+    def add(self, folder: Folder, changed_hosts: Collection[HostName] | None) -> None:
+        _previous_folder, previous_hosts = self._folders.get(folder.path(), (folder, set()))
+        self._folders[folder.path()] = (
+            folder,
+            None
+            if previous_hosts is None or changed_hosts is None
+            else previous_hosts | set(changed_hosts),
+        )
+
+    def save(self) -> None:
+        for folder, changed_hosts in self._folders.values():
+            folder.save_hosts(changed_hosts)
+
+
+def _hosts_save_batch() -> _HostsSaveBatch | None:
+    return g.get("hosts_save_batch")
+
+
+@contextmanager
+def save_hosts_batched() -> Iterator[None]:
+    """Save the hosts of every modified folder only once, when leaving the context
+
+    Use this when modifying many hosts one by one, e.g. in bulk operations.
+    """
+    if _hosts_save_batch() is not None:
+        yield  # Already batching
+        return
+
+    batch = g.hosts_save_batch = _HostsSaveBatch()
+    try:
+        yield
+    finally:
+        del g.hosts_save_batch
+        batch.save()
+
+
 class Folder(FolderProtocol):
     """This class represents a Setup folder that contains other folders and hosts."""
 
@@ -1223,6 +1355,8 @@ class Folder(FolderProtocol):
 
         self._loaded_subfolders: dict[PathWithoutSlash, Folder] | None = None
         self._choices_for_moving_host: Choices | None = None
+        # The data of the hosts in the hosts.mk, as of the last save
+        self._hosts_file_fragments: dict[HostName, _HostsFileFragment] = {}
 
     @property
     def _subfolders(self) -> dict[PathWithoutSlash, Folder]:
@@ -1306,27 +1440,37 @@ class Folder(FolderProtocol):
             clusters=variables["clusters"],
         )
 
-    def save_hosts(self) -> None:
+    def save_hosts(self, changed_hosts: Collection[HostName] | None = None) -> None:
+        """Save the hosts of this folder
+
+        When only some hosts were modified, pass their names as `changed_hosts`. The data of
+        the other hosts is then taken from the previous save. Within save_hosts_batched(),
+        the folder is saved once at the end of the batch.
+        """
         self.need_unlocked_hosts()
         self.permissions.need_permission("write")
+        if (batch := _hosts_save_batch()) is not None:
+            batch.add(self, changed_hosts)
+            return
+
         if self._hosts is not None:
-            # Clean up caches of all hosts in this folder, just to be sure. We could also
-            # check out all call sites of save_hosts() and partially drop the caches of
-            # individual hosts to optimize this.
-            for host in self._hosts.values():
-                host.drop_caches()
+            # Clean up caches of all (changed) hosts in this folder, just to be sure.
+            for hostname, host in self._hosts.items():
+                if changed_hosts is None or hostname in changed_hosts:
+                    host.drop_caches()
 
-            self._save_hosts_file()
+            self._save_hosts_file(changed_hosts)
             if may_use_redis():
                 # Inform redis that the modified-timestamp of the folder has been updated.
                 get_wato_redis_client(self.tree).folder_updated(self.filesystem_path())
 
         call_hook_hosts_changed(self)
 
-    def _save_hosts_file(self) -> None:  # pylint: disable=too-many-branches
+    def _save_hosts_file(self, changed_hosts: Collection[HostName] | None = None) -> None:
         store.makedirs(self.filesystem_path())
         exposed_folder_attributes_for_base = self._folder_attributes_for_base_config()
         if not self.has_hosts() and not exposed_folder_attributes_for_base:
+            self._hosts_file_fragments = {}
             for storage in get_all_storage_readers():
                 storage.remove(Path(self.hosts_file_path_without_extension()))
             return
@@ -1341,94 +1485,49 @@ class Folder(FolderProtocol):
         host_tags = {}
         host_labels = {}
         group_rules_list: list[tuple[list[GroupRuleType], bool]] = []
+        attributes: dict[str, dict[HostName, Any]] = {
+            cmk_var_name: {} for _attribute_name, cmk_var_name in _HOSTS_FILE_ATTRIBUTE_MAPPINGS
+        }
 
-        attribute_mappings: Sequence[tuple[str, str, dict[str, Any]]] = [
-            # host attr, cmk.base variable name, value
-            ("ipaddress", "ipaddresses", {}),
-            ("ipv6address", "ipv6addresses", {}),
-            ("snmp_community", "explicit_snmp_communities", {}),
-            ("management_snmp_community", "management_snmp_credentials", {}),
-            ("management_ipmi_credentials", "management_ipmi_credentials", {}),
-            ("management_protocol", "management_protocol", {}),
-        ]
-
+        fragments: dict[HostName, _HostsFileFragment] = {}
         for hostname, host in sorted(self.hosts().items()):
-            effective = host.effective_attributes()
-            cleaned_hosts[hostname] = update_metadata(host.attributes, created_by=user.id)
-            host_labels[hostname] = effective["labels"]
+            fragment = (
+                None
+                if changed_hosts is None or hostname in changed_hosts
+                else self._hosts_file_fragments.get(hostname)
+            )
+            if fragment is None:
+                fragment = _compute_hosts_file_fragment(hostname, host)
+            fragments[hostname] = fragment
 
-            tag_groups = host.tag_groups()
-            if tag_groups:
-                host_tags[hostname] = tag_groups
+            cleaned_hosts[hostname] = fragment.attributes
+            host_labels[hostname] = fragment.labels
+            if fragment.tag_groups:
+                host_tags[hostname] = fragment.tag_groups
 
-            if host.is_cluster():
-                nodes = host.cluster_nodes()
-                assert nodes is not None
-                clusters[hostname] = nodes
+            if fragment.cluster_nodes is not None:
+                clusters[hostname] = fragment.cluster_nodes
             else:
                 all_hosts.append(hostname)
 
-            # Save the effective attributes of a host to the related attribute maps.
-            # These maps are saved directly in the hosts.mk to transport the effective
-            # attributes to Checkmk base.
-            for (
-                attribute_name,
-                _cmk_var_name,
-                dictionary,
-            ) in attribute_mappings:
-                value = effective.get(attribute_name)
-                if value:
-                    dictionary[hostname] = value
-
-            # Create contact group rule entries for hosts with explicitly set
-            # values Note: since the type if this entry is a list, not a single
-            # contact group, all other list entries coming after this one will
-            # be ignored. That way the host-entries have precedence over the
-            # folder entries.
-            #
-            # LM: This comment is wrong. The folders create list entries,
-            # but the hosts create string entries. This makes the hosts add
-            # their contact groups in addition to the effective folder contact
-            # groups I went back to ~2015 and it seems it was always working
-            # this way. I won't change it now and leave the comment here for
-            # reference.
-            if "contactgroups" in host.attributes:
-                cgconfig = host.attributes["contactgroups"]
-                cgs = cgconfig["groups"]
-                if cgs and cgconfig["use"]:
-                    group_rules: list[GroupRuleType] = []
-                    for cg in cgs:
-                        group_rules.append(
-                            {
-                                "value": cg,
-                                "condition": {"host_name": [hostname]},
-                            }
-                        )
-                    group_rules_list.append((group_rules, cgconfig["use_for_services"]))
+            for cmk_var_name, value in fragment.attribute_values.items():
+                attributes[cmk_var_name][hostname] = value
 
-            for attr in host_attribute_registry.attributes():
-                attrname = attr.name()
-                if attrname in effective:
-                    custom_varname = attr.nagios_name()
-                    if custom_varname:
-                        value = effective.get(attrname)
-                        nagstring = attr.to_nagios(value)
-                        if nagstring is not None:
-                            if attr.is_explicit():
-                                explicit_host_conf.setdefault(custom_varname, {})
-                                explicit_host_conf[custom_varname][hostname] = nagstring
-                            else:
-                                custom_macros.setdefault(custom_varname, {})
-                                custom_macros[custom_varname][hostname] = nagstring
+            if fragment.group_rules is not None:
+                group_rules_list.append(fragment.group_rules)
+
+            for custom_varname, nagstring in fragment.custom_macros.items():
+                custom_macros.setdefault(custom_varname, {})[hostname] = nagstring
+            for custom_varname, nagstring in fragment.explicit_host_conf.items():
+                explicit_host_conf.setdefault(custom_varname, {})[hostname] = nagstring
+        self._hosts_file_fragments = fragments
 
         data = HostsStorageData(
             locked_hosts=False,
             all_hosts=all_hosts,
             clusters=clusters,
             attributes={
-                cmk_var_name: values
-                for _attribute_name, cmk_var_name, values in attribute_mappings
-                if values
+                cmk_var_name: values for cmk_var_name, values in attributes.items() if values
             },
             custom_macros=HostsStorageFieldsGenerator.custom_macros(custom_macros),
             host_tags=host_tags,
@@ -1522,6 +1621,7 @@ class Folder(FolderProtocol):
     def drop_caches(self) -> None:
         self.effective_attributes.drop_caches()
         self._choices_for_moving_host = None
+        self._hosts_file_fragments = {}
 
         if self._hosts is not None:
             for host in self._hosts.values():
@@ -3348,7 +3448,7 @@ class Host:
         self.attributes = attributes
         self._cluster_nodes = cluster_nodes
         affected_sites = list(set(affected_sites + [self.site_id()]))
-        self.folder().save_hosts()
+        self.folder().save_hosts([self.name()])
 
         add_change(
             "edit-host",
@@ -3380,7 +3480,7 @@ class Host:
                 # Mypy can not help here with the dynamic key access
                 del self.attributes[attrname]  # type: ignore[misc]
         affected_sites = list(set(affected_sites + [self.site_id()]))
-        self.folder().save_hosts()
+        self.folder().save_hosts([self.name()])
 
         add_change(
             "edit-host",
@@ -3416,10 +3516,10 @@ class Host:
         if how:
             if not self.attributes.get("inventory_failed"):
                 self.attributes["inventory_failed"] = True
-                self.folder().save_hosts()
+                self.folder().save_hosts([self.name()])
         elif self.attributes.get("inventory_failed"):
             del self.attributes["inventory_failed"]
-            self.folder().save_hosts()
+            self.folder().save_hosts([self.name()])
 
     def rename_cluster_node(self, oldname: HostName, newname: HostName) -> bool:
         # We must not check permissions here. Permissions
@@ -3440,7 +3540,7 @@ class Host:
             object_ref=self.object_ref(),
             sites=[self.site_id()],
         )
-        self.folder().save_hosts()
+        self.folder().save_hosts([self.name()])
         return True
 
     def rename_parent(self, oldname: HostName, newname: HostName) -> bool:
@@ -3457,7 +3557,7 @@ class Host:
             object_ref=self.object_ref(),
             sites=[self.site_id()],
         )
-        self.folder().save_hosts()
+        self.folder().save_hosts([self.name()])
         return True
 
     def rename(self, new_name: HostName) -> None:
@@ -8,15 +8,17 @@
 from __future__ import annotations
 
 import dataclasses
+import hashlib
 import itertools
 import os
+import pickle
 import pprint
 import re
 import subprocess
 from collections.abc import Callable, Container, Generator, Iterable, Iterator, Mapping, Sequence
 from enum import auto, Enum
 from pathlib import Path
-from typing import Any, assert_never, cast, Final
+from typing import Any, assert_never, cast, Final, NamedTuple
 
 from cmk.ccc import store
 from cmk.ccc.exceptions import MKGeneralException
@@ -52,7 +54,7 @@ from cmk.gui.exceptions import MKUserError
 from cmk.gui.hooks import request_memoize
 from cmk.gui.htmllib.html import html
 from cmk.gui.http import request
-from cmk.gui.i18n import _, _l
+from cmk.gui.i18n import _, _l, get_current_language
 from cmk.gui.log import logger
 from cmk.gui.utils.html import HTML
 from cmk.gui.valuespec import DropdownChoiceEntries, ValueSpec
@@ -81,7 +83,7 @@ from .rulespecs import (
 )
 from .simple_config_file import ConfigFileRegistry, WatoConfigFile
 from .timeperiods import TimeperiodSelection, TimeperiodUsage
-from .utils import ALL_HOSTS, ALL_SERVICES, NEGATE, wato_root_dir
+from .utils import ALL_HOSTS, ALL_SERVICES, multisite_dir, NEGATE, wato_root_dir
 
 # Make the GUI config module reset the base config to always get the latest state of the config
 register_post_config_load_hook(cmk.base.export.reset_config)
@@ -346,11 +348,16 @@ class RulesetCollection:
         if not path.exists():
             return  # Do not initialize rulesets when no rule at all exists
 
-        self.replace_folder_config(
-            folder,
-            RuleConfigFile(path).load_for_reading(),
-            only_varname,
-        )
+        compiled_rules_file = CompiledRulesFile(folder)
+        ruleset_configs = compiled_rules_file.load(only_varname)
+        if ruleset_configs is None:
+            ruleset_configs = compiled_rules_file.compile(self, only_varname)
+
+        for varname, ruleset_config in ruleset_configs:
+            if not ruleset_config:
+                continue  # Nothing configured: nothing left to do
+
+            self.replace_folder_ruleset_config(folder, ruleset_config, varname)
 
     @staticmethod
     def _context_helpers(folder: Folder) -> Mapping[str, object]:
@@ -441,6 +448,7 @@ class RulesetCollection:
         RuleConfigFile(Path(folder.rules_file_path())).save_rulesets_and_unknown_rulesets(
             rulesets, unknown_rulesets
         )
+        RuleSearchIndex.update(folder, rulesets.values())
 
         # check if this contains a password. If so, update the password file
         if any(
@@ -824,7 +832,9 @@ class Ruleset:
 
         # Store the matching rules for later result rendering
         self.search_matching_rules = []
-        for _folder, _rule_index, rule in self.get_rules():
+        for folder, _rule_index, rule in self.get_rules():
+            if not _may_match_fulltext(search_options, folder, (self.name, rule.id)):
+                continue
             if rule.matches_search(search_options):
                 self.search_matching_rules.append(rule)
 
@@ -1395,14 +1405,8 @@ class Rule:
             return False
 
         value_text = None
-        try:
-            value_text = str(self.ruleset.valuespec().value_to_html(self.value))
-        except Exception as e:
-            logger.exception("error searching ruleset %s", self.ruleset.title())
-            html.show_warning(
-                _("Failed to search rule of ruleset '%s' in folder '%s' (%r): %s")
-                % (self.ruleset.title(), self.folder.title(), self.to_config(), e)
-            )
+        if "rule_value" in search_options or "fulltext" in search_options:
+            value_text = self._value_text_for_search()
 
         if value_text is not None and not _match_search_expression(
             search_options, "rule_value", value_text
@@ -1419,15 +1423,7 @@ class Rule:
         ):
             return False
 
-        to_search = (
-            [
-                self.comment(),
-                self.description(),
-            ]
-            + (self.conditions.host_list[0] if self.conditions.host_list else [])
-            + (self.conditions.item_list[0] if self.conditions.item_list else [])
-        )
-
+        to_search = self.fulltext_search_texts()
         if value_text is not None:
             to_search.append(value_text)
 
@@ -1442,6 +1438,47 @@ class Rule:
 
         return True
 
+    def fulltext_search_texts(self) -> list[str]:
+        """The texts of the rule searched by the fulltext search, except for the value"""
+        return (
+            [
+                self.comment(),
+                self.description(),
+            ]
+            + (self.conditions.host_list[0] if self.conditions.host_list else [])
+            + (self.conditions.item_list[0] if self.conditions.item_list else [])
+        )
+
+    def value_text(self) -> str | None:
+        try:
+            return str(self.ruleset.valuespec().value_to_html(self.value))
+        except Exception:
+            logger.exception(
+                "error rendering value of rule %s of ruleset %s", self.id, self.ruleset.name
+            )
+            return None
+
+    def _value_text_for_search(self) -> str | None:
+        document = _folder_rule_search_index(self.folder.path()).document(
+            self.ruleset.name, self.id
+        )
+        if (
+            document is not None
+            and document.value_text is not None
+            and document.value_fingerprint == _value_fingerprint(self)
+        ):
+            return document.value_text
+
+        try:
+            return str(self.ruleset.valuespec().value_to_html(self.value))
+        except Exception as e:
+            logger.exception("error searching ruleset %s", self.ruleset.title())
+            html.show_warning(
+                _("Failed to search rule of ruleset '%s' in folder '%s' (%r): %s")
+                % (self.ruleset.title(), self.folder.title(), self.to_config(), e)
+            )
+            return None
+
     def _get_search_folders(self, search_options: SearchOptions) -> list[str]:
         current_folder, do_recursion = search_options["rule_folder"]
         current_folder = folder_tree().folder(current_folder)
@@ -1742,6 +1779,339 @@ def _get_ruleset_matcher():
     return cmk.base.export.get_ruleset_matcher()
 
 
+def _rules_file_stat(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class CompiledRulesFile:
+    """Cache of the rulesets of a rules.mk file, to load single rulesets without executing it
+
+    The cache file starts with the length of a pickled header, followed by the header and
+    one pickled slice per ruleset. The header contains the stat of the rules.mk the cache
+    was compiled from and the position of every slice, so a single ruleset is loaded by
+    reading its slice only.
+    """
+
+    _VERSION: Final = 1
+
+    def __init__(self, folder: Folder) -> None:
+        self._folder = folder
+        self._rules_file_path = Path(folder.rules_file_path())
+        self._path = Path(paths.tmp_dir, "wato", "rulesets", folder.path(), "rules.cache")
+
+    def _source_stat(self) -> tuple[int, int, int] | None:
+        return _rules_file_stat(self._rules_file_path)
+
+    def load(
+        self, only_varname: RulesetName | None = None
+    ) -> Sequence[tuple[RulesetName, Sequence[RuleSpec[object]]]] | None:
+        """Load the rulesets, None if the cache is missing or outdated"""
+        try:
+            with self._path.open("rb") as f:
+                header_length = int.from_bytes(f.read(8), "big")
+                version, source_stat, slices = pickle.loads(f.read(header_length))
+                if version != self._VERSION or source_stat != self._source_stat():
+                    return None
+
+                ruleset_configs = []
+                for varname in slices if only_varname is None else [only_varname]:
+                    if (slice_ := slices.get(varname)) is None:
+                        continue
+                    offset, length = slice_
+                    f.seek(8 + header_length + offset)
+                    ruleset_configs.append((varname, pickle.loads(f.read(length))))
+                return ruleset_configs
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.exception("Ignoring invalid rulesets cache %s", self._path)
+            return None
+
+    def compile(
+        self, collection: RulesetCollection, only_varname: RulesetName | None = None
+    ) -> Sequence[tuple[RulesetName, Sequence[RuleSpec[object]]]]:
+        """Load all rulesets from the rules.mk and update the cache"""
+        # Taken before loading: A concurrent modification outdates the cache immediately
+        source_stat = self._source_stat()
+        ruleset_configs = list(
+            collection.get_ruleset_configs_from_file(
+                self._folder, RuleConfigFile(self._rules_file_path).load_for_reading()
+            )
+        )
+        if source_stat is not None:
+            self._save(source_stat, ruleset_configs)
+
+        if only_varname is None:
+            return ruleset_configs
+        return [(varname, config) for varname, config in ruleset_configs if varname == only_varname]
+
+    def _save(
+        self,
+        source_stat: tuple[int, int, int],
+        ruleset_configs: Sequence[tuple[RulesetName, Sequence[RuleSpec[object]]]],
+    ) -> None:
+        slices: dict[RulesetName, tuple[int, int]] = {}
+        data: list[bytes] = []
+        offset = 0
+        for varname, ruleset_config in ruleset_configs:
+            if not ruleset_config:
+                continue  # Nothing configured: Missing slices are treated the same
+            pickled = pickle.dumps(ruleset_config, pickle.HIGHEST_PROTOCOL)
+            slices[varname] = (offset, len(pickled))
+            data.append(pickled)
+            offset += len(pickled)
+        header = pickle.dumps((self._VERSION, source_stat, slices), pickle.HIGHEST_PROTOCOL)
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            store.save_bytes_to_file(
+                self._path, b"".join([len(header).to_bytes(8, "big"), header, *data])
+            )
+        except OSError:
+            logger.exception("Failed to save rulesets cache %s", self._path)
+
+    def update(self) -> None:
+        """Recompile the cache after the rules.mk has been saved"""
+        if self._source_stat() is None:
+            self._path.unlink(missing_ok=True)
+            return
+        self.compile(RulesetCollection({}))
+
+
+_RuleKey = tuple[RulesetName, str]
+
+_REGEX_SPECIAL_CHARS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+_WORD_SEPARATORS = re.compile(r"\W+")
+
+
+def _words(text: str) -> set[str]:
+    """
+    >>> sorted(_words("Host web-01, Service 'CPU load'"))
+    ['01', 'cpu', 'host', 'load', 'service', 'web']
+    """
+    return {word for word in _WORD_SEPARATORS.split(text.lower()) if word}
+
+
+def _value_fingerprint(rule: Rule) -> str:
+    return hashlib.sha256(repr((rule.ruleset.name, rule.value)).encode()).hexdigest()
+
+
+def _rendering_dependencies_stat() -> tuple[tuple[str, int, int, int], ...]:
+    """The stat of the configuration files the rendered rule values may depend on
+
+    The values refer to e.g. time periods, groups or passwords by their IDs, but are rendered
+    with their titles.
+    """
+    return tuple(
+        sorted(
+            (str(path), *stat)
+            for directory in (wato_root_dir(), multisite_dir())
+            for path in Path(directory).glob("*.mk")
+            if path.name not in ("rules.mk", "hosts.mk")
+            and (stat := _rules_file_stat(path)) is not None
+        )
+    )
+
+
+_RuleSearchIndexSource = tuple[tuple[int, int, int], tuple[tuple[str, int, int, int], ...]]
+
+
+class _RuleSearchDocument(NamedTuple):
+    value_fingerprint: str
+    value_text: str | None
+
+
+class RuleSearchIndex:
+    """Full text index of the rules of a folder
+
+    Rendering the rule values is the expensive part of the rule search. The index keeps the
+    rendered values and maps the words of the texts searched by the fulltext search to the
+    rules containing them. It is updated when the rules of the folder are saved, reusing the
+    rendered values of unchanged rules, and rebuilt when the rules.mk was changed otherwise.
+    The rendered values are dropped once one of the global configuration files changed.
+    """
+
+    _VERSION: Final = 2
+
+    def __init__(
+        self,
+        documents: Mapping[_RuleKey, _RuleSearchDocument],
+        postings: Mapping[str, frozenset[_RuleKey]],
+        unindexed: frozenset[_RuleKey],
+    ) -> None:
+        self._documents = documents
+        self._postings = postings
+        # Rules which can not be excluded by the index, e.g. because of regex conditions
+        self._unindexed = unindexed
+        self._candidates: dict[str, frozenset[_RuleKey] | None] = {}
+
+    @staticmethod
+    def _path(folder: Folder) -> Path:
+        return Path(paths.tmp_dir, "wato", "rulesets", folder.path(), "search.cache")
+
+    def document(self, ruleset_name: RulesetName, rule_id: str) -> _RuleSearchDocument | None:
+        return self._documents.get((ruleset_name, rule_id))
+
+    def fulltext_candidates(self, fulltext: str) -> frozenset[_RuleKey] | None:
+        """The rules that may match the fulltext search, None if the index can not tell"""
+        if fulltext not in self._candidates:
+            self._candidates[fulltext] = self._compute_candidates(fulltext)
+        return self._candidates[fulltext]
+
+    def _compute_candidates(self, fulltext: str) -> frozenset[_RuleKey] | None:
+        if _REGEX_SPECIAL_CHARS.search(fulltext) or not (words := _words(fulltext)):
+            return None
+
+        # A literal search matches within the texts, so the words at the start and the end of
+        # the search may be parts of indexed words.
+        candidates: set[_RuleKey] | None = None
+        for word in words:
+            matching = {
+                key for indexed, keys in self._postings.items() if word in indexed for key in keys
+            }
+            candidates = matching if candidates is None else candidates & matching
+        return frozenset(candidates or ()) | self._unindexed
+
+    @classmethod
+    def load(cls, folder: Folder) -> RuleSearchIndex:
+        """Load the index of the folder, rebuild it if it is outdated"""
+        # Taken before loading: A concurrent modification outdates the index immediately
+        if (source_stat := cls._source_stat(folder)) is None:
+            return cls({}, {}, frozenset())
+
+        previous = cls._load(folder)
+        if previous is not None and previous[0] == source_stat:
+            return previous[1]
+
+        index = cls._build(
+            folder,
+            FolderRulesets.load_folder_rulesets(folder).get_rulesets().values(),
+            cls._reusable(previous, source_stat),
+        )
+        index._save(folder, source_stat)
+        return index
+
+    @classmethod
+    def update(cls, folder: Folder, rulesets: Iterable[Ruleset]) -> None:
+        """Update the index after the rules of the folder have been saved"""
+        if (source_stat := cls._source_stat(folder)) is None:
+            cls._path(folder).unlink(missing_ok=True)
+        else:
+            previous = cls._load(folder)
+            cls._build(folder, rulesets, cls._reusable(previous, source_stat))._save(
+                folder, source_stat
+            )
+        _folder_rule_search_index.cache_clear()  # type: ignore[attr-defined]
+
+    @staticmethod
+    def _source_stat(folder: Folder) -> _RuleSearchIndexSource | None:
+        if (rules_file_stat := _rules_file_stat(Path(folder.rules_file_path()))) is None:
+            return None
+        return rules_file_stat, _rendering_dependencies_stat()
+
+    @staticmethod
+    def _reusable(
+        previous: tuple[_RuleSearchIndexSource, RuleSearchIndex] | None,
+        source_stat: _RuleSearchIndexSource,
+    ) -> RuleSearchIndex | None:
+        """The previous index, if its rendered values are still valid"""
+        if previous is None or previous[0][1] != source_stat[1]:
+            return None
+        return previous[1]
+
+    @classmethod
+    def _load(cls, folder: Folder) -> tuple[_RuleSearchIndexSource, RuleSearchIndex] | None:
+        try:
+            with cls._path(folder).open("rb") as f:
+                version, language, source_stat, documents, postings, unindexed = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.exception("Ignoring invalid rule search index of folder %s", folder.path())
+            return None
+
+        # The rendered values are translated
+        if version != cls._VERSION or language != get_current_language():
+            return None
+        return source_stat, cls(documents, postings, unindexed)
+
+    def _save(self, folder: Folder, source_stat: _RuleSearchIndexSource) -> None:
+        path = self._path(folder)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            store.save_bytes_to_file(
+                path,
+                pickle.dumps(
+                    (
+                        self._VERSION,
+                        get_current_language(),
+                        source_stat,
+                        self._documents,
+                        self._postings,
+                        self._unindexed,
+                    ),
+                    pickle.HIGHEST_PROTOCOL,
+                ),
+            )
+        except OSError:
+            logger.exception("Failed to save rule search index %s", path)
+
+    @classmethod
+    def _build(
+        cls, folder: Folder, rulesets: Iterable[Ruleset], previous: RuleSearchIndex | None
+    ) -> RuleSearchIndex:
+        rendered_values = (
+            {}
+            if previous is None
+            else {
+                document.value_fingerprint: document.value_text
+                for document in previous._documents.values()
+            }
+        )
+        documents: dict[_RuleKey, _RuleSearchDocument] = {}
+        postings: dict[str, set[_RuleKey]] = {}
+        unindexed: set[_RuleKey] = set()
+        for ruleset in rulesets:
+            for rule in ruleset.get_folder_rules(folder):
+                key = (ruleset.name, rule.id)
+                fingerprint = _value_fingerprint(rule)
+                if fingerprint in rendered_values:
+                    value_text = rendered_values[fingerprint]
+                else:
+                    value_text = rendered_values[fingerprint] = rule.value_text()
+                documents[key] = _RuleSearchDocument(fingerprint, value_text)
+
+                texts = rule.fulltext_search_texts()
+                if value_text is None or any(text.startswith("~") for text in texts):
+                    unindexed.add(key)
+                for text in [*texts, value_text or ""]:
+                    for word in _words(text):
+                        postings.setdefault(word, set()).add(key)
+
+        return cls(
+            documents,
+            {word: frozenset(keys) for word, keys in postings.items()},
+            frozenset(unindexed),
+        )
+
+
+@request_memoize(maxsize=None)
+def _folder_rule_search_index(folder_path: str) -> RuleSearchIndex:
+    return RuleSearchIndex.load(folder_tree().folder(folder_path))
+
+
+def _may_match_fulltext(search_options: SearchOptions, folder: Folder, key: _RuleKey) -> bool:
+    if "fulltext" not in search_options:
+        return True
+    candidates = _folder_rule_search_index(folder.path()).fulltext_candidates(
+        search_options["fulltext"]
+    )
+    return candidates is None or key in candidates
+
+
 class RuleConfigFile(WatoConfigFile[Mapping[RulesetName, Any]]):
     """Handles reading and writing rules.mk files"""
 
@@ -1816,6 +2186,7 @@ class RuleConfigFile(WatoConfigFile[Mapping[RulesetName, Any]]):
                 add_header=not active_config.wato_use_git,
             )
         finally:
+            CompiledRulesFile(folder).update()
             if may_use_redis():
                 get_wato_redis_client(folder.tree).folder_updated(folder.filesystem_path())
 
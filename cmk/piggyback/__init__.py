@@ -8,6 +8,7 @@ from ._storage import (
     cleanup_piggyback_files,
     get_messages_for,
     get_piggybacked_host_with_sources,
+    get_sources_for,
     move_for_host_rename,
     PiggybackMessage,
     PiggybackMetaData,
@@ -21,6 +22,7 @@ __all__ = [
     "config",
     "get_messages_for",
     "get_piggybacked_host_with_sources",
+    "get_sources_for",
     "move_for_host_rename",
     "PiggybackMessage",
     "PiggybackMetaData",
@@ -10,14 +10,14 @@ import logging
 import os
 import shutil
 import tempfile
-from collections.abc import Iterable, Iterator, Mapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping, Sequence
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Self
 
 from cmk.utils.hostaddress import HostAddress, HostName
+from cmk.utils.inotify import Event, INotify, Masks
 
-from ._inotify import Event, INotify, Masks
 from ._paths import payload_dir, source_status_dir
 
 logger = logging.getLogger(__name__)
@@ -135,12 +135,25 @@ def get_messages_for(
     return piggyback_data
 
 
+def get_sources_for(piggybacked_hostname: HostAddress, omd_root: Path) -> Sequence[HostAddress]:
+    """Returns the sources having sent piggyback data for the given host
+
+    Other than `get_messages_for`, this neither reads the data nor looks at the times of it.
+    """
+    return [
+        HostAddress(payload_file.name)
+        for payload_file in _files_in(payload_dir(omd_root) / piggybacked_hostname)
+    ]
+
+
 def get_piggybacked_host_with_sources(
     omd_root: Path,
 ) -> Mapping[HostAddress, Sequence[PiggybackMetaData]]:
     """Generates all piggyback pig/piggybacked host pairs"""
+    # The sources usually send data for many piggybacked hosts
+    last_contacts: dict[HostName, int | None] = {}
     return {
-        piggybacked_host: _get_payload_meta_data(piggybacked_host, omd_root)
+        piggybacked_host: _get_payload_meta_data(piggybacked_host, omd_root, last_contacts)
         for piggybacked_host_folder in _get_piggybacked_host_folders(omd_root)
         if (piggybacked_host := HostAddress(piggybacked_host_folder.name))
     }
@@ -203,20 +216,32 @@ def _write_file_with_mtime(
     content: bytes,
     mtime: float,
 ) -> None:
-    """Create a file with the given mtime in a race-condition free manner"""
-    file_path.parent.mkdir(mode=0o770, exist_ok=True, parents=True)
+    """Create a file with the given mtime in a race-condition free manner
+
+    This is done for every piggybacked host of a source on every contact, so it avoids changing
+    the metadata of the file system where possible: The folder is only created if it's missing,
+    and the mtime is only set if it differs from the one of writing in the resolution it is
+    looked at (see _get_mtime).
+    """
+    try:
+        fd, tmp_path = _create_temporary_file(file_path)
+    except FileNotFoundError:
+        file_path.parent.mkdir(mode=0o770, exist_ok=True, parents=True)
+        fd, tmp_path = _create_temporary_file(file_path)
 
-    with tempfile.NamedTemporaryFile(
-        "wb", dir=str(file_path.parent), prefix=f".{file_path.name}.new", delete=False
-    ) as tmp:
-        tmp_path = tmp.name
+    with open(fd, "wb") as tmp:
         tmp.write(content)
+        tmp.flush()
+        if int(os.fstat(fd).st_mtime) != int(mtime):
+            os.utime(fd, (mtime, mtime))
 
-    tmp_stats = os.stat(tmp_path)
-    os.utime(tmp_path, (tmp_stats.st_atime, mtime))
     os.rename(tmp_path, str(file_path))
 
 
+def _create_temporary_file(file_path: Path) -> tuple[int, str]:
+    return tempfile.mkstemp(dir=str(file_path.parent), prefix=f".{file_path.name}.new")
+
+
 #   .--folders/files-------------------------------------------------------.
 #   |         __       _     _                  ____ _ _                   |
 #   |        / _| ___ | | __| | ___ _ __ ___   / / _(_) | ___  ___         |
@@ -228,29 +253,42 @@ def _write_file_with_mtime(
 
 
 def _get_payload_meta_data(
-    piggybacked_hostname: HostName, omd_root: Path
+    piggybacked_hostname: HostName,
+    omd_root: Path,
+    last_contacts: MutableMapping[HostName, int | None] | None = None,
 ) -> Sequence[PiggybackMetaData]:
     """Gather a list of piggyback files to read for further processing.
 
     Please note that there may be multiple parallel calls executing
     store_piggyback_raw_data() or cleanup_piggyback_files() functions.
     All these functions need to deal with suddenly vanishing or updated files/directories.
+
+    The last contacts of the sources already looked up are taken from `last_contacts`.
     """
+    if last_contacts is None:
+        last_contacts = {}
+
     piggybacked_host_folder = payload_dir(omd_root) / Path(piggybacked_hostname)
     meta_data = []
     for payload_file in _files_in(piggybacked_host_folder):
         source = HostAddress(payload_file.name)
-        status_file_path = _get_source_status_file_path(source, omd_root)
 
         if (mtime := _get_mtime(payload_file)) is None:
             continue
 
+        if source in last_contacts:
+            last_contact = last_contacts[source]
+        else:
+            last_contact = last_contacts[source] = _get_mtime(
+                _get_source_status_file_path(source, omd_root)
+            )
+
         meta_data.append(
             PiggybackMetaData(
                 source=source,
                 piggybacked=piggybacked_hostname,
                 last_update=mtime,
-                last_contact=_get_mtime(status_file_path),
+                last_contact=last_contact,
             )
         )
     return meta_data
@@ -11,8 +11,10 @@ be called manually.
 
 import argparse
 import logging
+import multiprocessing
 import subprocess
 import sys
+import time
 import traceback
 from collections.abc import Callable, Sequence
 from itertools import chain
@@ -47,7 +49,12 @@ from cmk.gui.wsgi.blueprints.global_vars import set_global_vars
 
 from cmk.update_config.plugins.pre_actions.utils import ConflictMode
 
-from .registry import pre_update_action_registry, update_action_registry
+from .registry import (
+    ParallelUpdateAction,
+    pre_update_action_registry,
+    update_action_registry,
+    update_items,
+)
 
 
 def main(
@@ -73,14 +80,16 @@ def main(
     exit_code = main_check_config(logger, arguments.conflict)
     if exit_code != 0 or arguments.dry_run:
         return exit_code
-    return main_update_config(logger, arguments.conflict)
+    return main_update_config(logger, arguments.conflict, arguments.jobs)
 
 
-def main_update_config(logger: logging.Logger, conflict: ConflictMode) -> Literal[0, 1]:
+def main_update_config(
+    logger: logging.Logger, conflict: ConflictMode, jobs: int | None = None
+) -> Literal[0, 1]:
     _load_plugins(logger)
 
     try:
-        return update_config(logger)
+        return update_config(logger, jobs)
     except Exception:
         if debug.enabled():
             raise
@@ -147,6 +156,16 @@ def _parse_arguments(args: Sequence[str]) -> argparse.Namespace:
         action="store_true",
         help="Execute the command even if the site is running.",
     )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help=(
+            "Number of processes for the actions which update many hosts or files. "
+            "Defaults to the number of CPUs."
+        ),
+    )
     return p.parse_args(args)
 
 
@@ -232,9 +251,10 @@ def check_config(logger: logging.Logger, conflict_mode: ConflictMode) -> None:
     logger.info(f"Done ({tty.green}success{tty.normal})\n")
 
 
-def update_config(logger: logging.Logger) -> Literal[0, 1]:
+def update_config(logger: logging.Logger, jobs: int | None = None) -> Literal[0, 1]:
     """Return exit code, 0 is ok, 1 is failure"""
     has_errors = False
+    processes = multiprocessing.cpu_count() if jobs is None else jobs
     logger.log(VERBOSE, "Initializing application...")
 
     main_modules.load_plugins()
@@ -252,14 +272,20 @@ def update_config(logger: logging.Logger) -> Literal[0, 1]:
 
         for num, action in enumerate(actions, start=1):
             logger.info(f" {tty.yellow}{num:02d}/{total:02d}{tty.normal} {action.title}...")
+            start = time.monotonic()
             try:
                 with ActivateChangesWriter.disable():
-                    action(logger)
+                    if isinstance(action, ParallelUpdateAction):
+                        update_items(action, logger, processes)
+                    else:
+                        action(logger)
             except Exception:
                 has_errors = True
                 logger.error(f' + "{action.title}" failed', exc_info=True)
                 if not action.continue_on_failure or debug.enabled():
                     raise
+            finally:
+                logger.log(VERBOSE, "   took %.2fs", time.monotonic() - start)
 
         if not has_errors and not is_wato_slave_site():
             # Force synchronization of the config after a successful configuration update
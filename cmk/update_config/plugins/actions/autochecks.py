@@ -3,17 +3,32 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+from collections.abc import Sequence
 from logging import Logger
 
-from cmk.update_config.plugins.lib.autochecks import rewrite_yielding_errors
-from cmk.update_config.registry import update_action_registry, UpdateAction
+from cmk.utils.hostaddress import HostName
 
+from cmk.gui.watolib.rulesets import AllRulesets
 
-class UpdateAutochecks(UpdateAction):
-    def __call__(self, logger: Logger) -> None:
+from cmk.update_config.plugins.lib.autochecks import autocheck_hosts, rewrite_host_yielding_errors
+from cmk.update_config.registry import ParallelUpdateAction, update_action_registry
+
+
+class UpdateAutochecks(ParallelUpdateAction[HostName]):
+    def __init__(self, *, name: str, title: str, sort_index: int) -> None:
+        super().__init__(name=name, title=title, sort_index=sort_index)
+        self._all_rulesets: AllRulesets | None = None
+
+    def items(self, logger: Logger) -> Sequence[HostName]:
+        self._all_rulesets = AllRulesets.load_all_rulesets()
+        return sorted(autocheck_hosts())
+
+    def update_item(self, item: HostName) -> Sequence[str]:
+        assert self._all_rulesets is not None
         # just consume to trigger rewriting. We already warned in pre-action.
-        for _error in rewrite_yielding_errors(write=True):
+        for _error in rewrite_host_yielding_errors(item, self._all_rulesets, write=True):
             pass
+        return ()
 
 
 update_action_registry.register(
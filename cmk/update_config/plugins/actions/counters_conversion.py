@@ -11,7 +11,7 @@ from pathlib import Path
 
 import cmk.utils.paths
 
-from cmk.update_config.registry import update_action_registry, UpdateAction
+from cmk.update_config.registry import ParallelUpdateAction, update_action_registry
 
 
 def _is_json(raw: str) -> bool:
@@ -29,21 +29,29 @@ def _ls(counters_path: Path) -> Sequence[Path]:
         return ()
 
 
-class ConvertCounters(UpdateAction):
-    def __call__(self, logger: Logger) -> None:
-        self.convert_counter_files(Path(cmk.utils.paths.counters_dir))
+class ConvertCounters(ParallelUpdateAction[Path]):
+    def items(self, logger: Logger) -> Sequence[Path]:
+        return sorted(_ls(Path(cmk.utils.paths.counters_dir)))
+
+    def update_item(self, item: Path) -> Sequence[str]:
+        self.convert_counter_file(item)
+        return ()
 
     @staticmethod
     def convert_counter_files(counters_path: Path) -> None:
         for f in _ls(counters_path):
-            if not (content := f.read_text().strip()) or _is_json(content):
-                continue
+            ConvertCounters.convert_counter_file(f)
+
+    @staticmethod
+    def convert_counter_file(f: Path) -> None:
+        if not (content := f.read_text().strip()) or _is_json(content):
+            return
 
-            f.write_text(
-                json.dumps(
-                    [(k, repr(v)) for k, v in ast.literal_eval(content).items()],
-                )
+        f.write_text(
+            json.dumps(
+                [(k, repr(v)) for k, v in ast.literal_eval(content).items()],
             )
+        )
 
 
 update_action_registry.register(
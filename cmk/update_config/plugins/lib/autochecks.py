@@ -75,10 +75,16 @@ class RewriteError:
 
 def rewrite_yielding_errors(*, write: bool) -> Iterable[RewriteError]:
     all_rulesets = AllRulesets.load_all_rulesets()
-    for hostname in _autocheck_hosts():
-        fixed_autochecks = yield from _get_fixed_autochecks(hostname, all_rulesets)
-        if write:
-            AutochecksStore(hostname).write(fixed_autochecks)
+    for hostname in autocheck_hosts():
+        yield from rewrite_host_yielding_errors(hostname, all_rulesets, write=write)
+
+
+def rewrite_host_yielding_errors(
+    host_name: HostName, all_rulesets: AllRulesets, *, write: bool
+) -> Iterable[RewriteError]:
+    fixed_autochecks = yield from _get_fixed_autochecks(host_name, all_rulesets)
+    if write:
+        AutochecksStore(host_name).write(fixed_autochecks)
 
 
 def _get_fixed_autochecks(
@@ -106,7 +112,7 @@ def _get_fixed_autochecks(
     return fixed_autochecks
 
 
-def _autocheck_hosts() -> Iterable[HostName]:
+def autocheck_hosts() -> Iterable[HostName]:
     for autocheck_file in Path(autochecks_dir).glob("*.mk"):
         yield HostName(autocheck_file.stem)
 
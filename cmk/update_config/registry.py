@@ -3,14 +3,23 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import multiprocessing
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Sequence
 from logging import Logger
-from typing import Final
+from typing import Final, Generic, NamedTuple, TypeVar
 
+from cmk.ccc import debug
+from cmk.ccc.exceptions import MKGeneralException
 from cmk.ccc.plugin_registry import Registry
 
+from cmk.utils.log import VERBOSE
+
+from cmk.update_config.lib import format_warning
 from cmk.update_config.plugins.pre_actions.utils import ConflictMode
 
+_TItem = TypeVar("_TItem")
+
 
 class UpdateAction(ABC):
     """Base class for all update actions"""
@@ -42,6 +51,96 @@ class UpdateAction(ABC):
         """
 
 
+class ParallelUpdateAction(UpdateAction, Generic[_TItem]):
+    """Base class for update actions which update many independent items, e.g. a file per host
+
+    The framework updates the items in worker processes. The workers are forked after
+    `items()` returned, so they see everything it has loaded. The items and the results are
+    passed between the processes, so they have to be picklable.
+    """
+
+    @abstractmethod
+    def items(self, logger: Logger) -> Sequence[_TItem]:
+        """
+        Prepare the update in the main process and return the items to update.
+        Warnings and errors are reported in the order of the items.
+        """
+
+    @abstractmethod
+    def update_item(self, item: _TItem) -> Sequence[str]:
+        """
+        Update a single item in a worker process and return warnings about it.
+        Raising an exception marks the item as failed, the other items are updated anyway.
+        """
+
+    def describe_item(self, item: _TItem) -> str:
+        return str(item)
+
+    def __call__(self, logger: Logger) -> None:
+        update_items(self, logger, processes=1)
+
+
+class _ItemResult(NamedTuple):
+    warnings: Sequence[str]
+    error: str | None
+
+
+# The action of the worker processes, inherited when they are forked
+_worker_action: ParallelUpdateAction | None = None
+
+
+def update_items(action: ParallelUpdateAction[_TItem], logger: Logger, processes: int) -> None:
+    """Update the items of the action using at most `processes` processes
+
+    Raises an exception after all items have been updated, if any of them failed.
+    """
+    items = action.items(logger)
+    failed = 0
+    for num, (item, result) in enumerate(
+        zip(items, _update_items(action, items, processes)), start=1
+    ):
+        for warning in result.warnings:
+            logger.warning(format_warning(f"{action.describe_item(item)}: {warning}"))
+        if result.error is not None:
+            failed += 1
+            logger.error(" + %s: %s", action.describe_item(item), result.error)
+        if num * 10 // len(items) > (num - 1) * 10 // len(items):
+            logger.log(VERBOSE, "   %d/%d done", num, len(items))
+
+    if failed:
+        raise MKGeneralException(f"Failed to update {failed} of {len(items)} items")
+
+
+def _update_items(
+    action: ParallelUpdateAction[_TItem], items: Sequence[_TItem], processes: int
+) -> Iterable[_ItemResult]:
+    global _worker_action
+    _worker_action = action
+    try:
+        if processes <= 1 or len(items) <= 1:
+            yield from map(_update_item, items)
+            return
+
+        processes = min(processes, len(items))
+        # Small chunks keep the processes busy until the end, but each one costs a round trip
+        chunksize = max(1, min(100, len(items) // (processes * 8)))
+        with multiprocessing.get_context("fork").Pool(processes=processes) as pool:
+            # imap returns the results in the order of the items, so the report is deterministic
+            yield from pool.imap(_update_item, items, chunksize=chunksize)
+    finally:
+        _worker_action = None
+
+
+def _update_item(item: object) -> _ItemResult:
+    assert _worker_action is not None
+    try:
+        return _ItemResult(_worker_action.update_item(item), None)
+    except Exception as e:
+        if debug.enabled():
+            raise
+        return _ItemResult((), str(e) or repr(e))
+
+
 class UpdateActionRegistry(Registry[UpdateAction]):
     def plugin_name(self, instance: UpdateAction) -> str:
         return instance.name
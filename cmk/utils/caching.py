@@ -6,10 +6,11 @@
 
 from __future__ import annotations
 
-import collections
+import itertools
+import weakref
 from collections.abc import Callable
 from functools import lru_cache, wraps
-from typing import ParamSpec, TypeVar
+from typing import Any, NamedTuple, ParamSpec, TypeVar
 
 import cmk.utils.misc
 
@@ -38,16 +39,56 @@ def instance_method_lru_cache(
     return wrap
 
 
+class CacheStatistics(NamedTuple):
+    entries: int
+    size: int
+    """The approximate memory footprint in bytes"""
+    evictions: int
+
+
 class CacheManager:
     def __init__(self) -> None:
-        self._caches: dict[str, DictCache] = collections.defaultdict(DictCache)
+        self._caches: dict[str, DictCache] = {}
+        # Caches owned by other objects, only known here for the statistics and the maximum size
+        self._owned_caches: weakref.WeakValueDictionary[tuple[str, int], DictCache] = (
+            weakref.WeakValueDictionary()
+        )
+        self._owned_cache_ids = itertools.count()
+        self._max_size: int | None = None
 
     def __contains__(self, name: str) -> bool:
         return name in self._caches
 
-    def obtain_cache(self, name: str) -> DictCache:
-        """get or create cache with provided name"""
-        return self._caches[name]
+    def obtain_cache(self, name: str, *, evictable: bool = False) -> DictCache:
+        """get or create cache with provided name
+
+        The least recently used entries of evictable caches are removed once the cache grows
+        beyond the maximum size of the manager. They must only hold values that can be computed
+        again.
+        """
+        if (cache := self._caches.get(name)) is None:
+            cache = self._caches[name] = DictCache()
+            if evictable:
+                cache.set_max_size(self._max_size)
+        return cache
+
+    def new_evictable_cache(self, name: str) -> DictCache:
+        """create an evictable cache owned by the caller
+
+        In contrast to obtain_cache, every call returns a new cache, which lives as long as the
+        caller keeps it. Use this for caches of objects that may exist more than once.
+        """
+        cache = DictCache()
+        cache.set_max_size(self._max_size)
+        self._owned_caches[(name, next(self._owned_cache_ids))] = cache
+        return cache
+
+    def set_max_size(self, max_size: int | None) -> None:
+        """Limit the approximate memory footprint of each of the evictable caches"""
+        self._max_size = max_size
+        for cache in itertools.chain(self._caches.values(), self._owned_caches.values()):
+            if cache.is_evictable():
+                cache.set_max_size(max_size)
 
     def clear(self) -> None:
         self._caches.clear()
@@ -56,12 +97,37 @@ class CacheManager:
         for cache in self._caches.values():
             cache.clear()
 
+    def statistics(self) -> dict[str, CacheStatistics]:
+        """The statistics of the caches, those of the owned caches are summed up per name"""
+        statistics = {name: cache.statistics() for name, cache in self._caches.items()}
+        for (name, _id), cache in list(self._owned_caches.items()):
+            owned = cache.statistics()
+            if (known := statistics.get(name)) is not None:
+                owned = CacheStatistics(*(a + b for a, b in zip(known, owned)))
+            statistics[name] = owned
+        return statistics
+
     def dump_sizes(self) -> dict[str, int]:
-        return {name: cmk.utils.misc.total_size(cache) for name, cache in self._caches.items()}
+        return {name: statistics.size for name, statistics in self.statistics().items()}
 
 
 class DictCache(dict):
+    """A dictionary, optionally bounded in size
+
+    Once a maximum size is set, the cache keeps track of the approximate memory footprint of its
+    entries and evicts the least recently used ones when it grows beyond the maximum. The size of
+    an entry is taken when the entry is set, later changes of mutable values are not accounted.
+    """
+
     _populated = False
+    _max_size: int | None = None
+    _evictable = False
+    _evictions = 0
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entry_sizes: dict[Any, int] = {}
+        self._size = 0
 
     def is_empty(self) -> bool:
         """Whether or not there is something in the collection at the moment"""
@@ -79,10 +145,94 @@ class DictCache(dict):
     def set_not_populated(self) -> None:
         self._populated = False
 
+    def is_evictable(self) -> bool:
+        return self._evictable
+
+    def set_max_size(self, max_size: int | None) -> None:
+        self._evictable = True
+        if max_size is not None and self._max_size is None:
+            self._entry_sizes = {key: _entry_size(key, value) for key, value in self.items()}
+            self._size = sum(self._entry_sizes.values())
+        elif max_size is None:
+            self._entry_sizes.clear()
+            self._size = 0
+        self._max_size = max_size
+        self._evict()
+
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(
+            entries=len(self),
+            size=cmk.utils.misc.total_size(self) if self._max_size is None else self._size,
+            evictions=self._evictions,
+        )
+
+    def __getitem__(self, key: Any) -> Any:
+        value = super().__getitem__(key)
+        if self._max_size is not None:
+            # Move the entry to the end of the dictionary, the most recently used one
+            super().__delitem__(key)
+            super().__setitem__(key, value)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if self._max_size is None:
+            super().__setitem__(key, value)
+            return
+        if key in self:
+            super().__delitem__(key)
+            self._size -= self._entry_sizes[key]
+        super().__setitem__(key, value)
+        self._size += (size := _entry_size(key, value))
+        self._entry_sizes[key] = size
+        self._evict()
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        self._size -= self._entry_sizes.pop(key, 0)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        if key not in self:
+            return super().pop(key, *default)
+        value = super().__getitem__(key)
+        del self[key]
+        return value
+
+    def popitem(self) -> tuple[Any, Any]:
+        key, value = super().popitem()
+        self._size -= self._entry_sizes.pop(key, 0)
+        return key, value
+
     def clear(self) -> None:
         super().clear()
+        self._entry_sizes.clear()
+        self._size = 0
         self.set_not_populated()
 
+    def _evict(self) -> None:
+        if self._max_size is None:
+            return
+        # The most recently set entry is kept, even if it exceeds the maximum on its own
+        while self._size > self._max_size and len(self) > 1:
+            del self[next(iter(self))]
+            self._evictions += 1
+
+
+def _entry_size(key: object, value: object) -> int:
+    return cmk.utils.misc.total_size((key, value))
+
 
 # This cache manager holds all caches that rely on the configuration
 # and have to be flushed once the configuration is reloaded in the
@@ -9,8 +9,6 @@ features that we want (type annotations).
 
 This is quite stripped down to only provide what we currently need,
 rather than being a comprehensive interface to what the kernel offers.
-
-As this is currently only needed for the piggyback hub, we put it here.
 """
 
 import enum
@@ -110,7 +108,8 @@ class _EventParser:
             offset = offset + self._FIXED_EVENT_PART_LEN + bytes_remaining
 
             yield Event(
-                Watchee(int(raw_watch_descriptor), self._wd_map[raw_watch_descriptor]),
+                # A queue overflow is not related to any watch (the descriptor is -1)
+                Watchee(int(raw_watch_descriptor), self._wd_map.get(raw_watch_descriptor, Path())),
                 Masks(raw_event_type),
                 Cookie(raw_cookie),
                 fsdecode(raw_name),
@@ -122,7 +121,7 @@ class _LibCINotify:
 
     __libc: CDLL | None = None
 
-    def __init__(self):
+    def __init__(self) -> None:
         if self.__libc is None:
             libc_so = find_library("c") or "libc.so.6"
             self.__libc = CDLL(libc_so, use_errno=True)
@@ -144,13 +143,21 @@ class _LibCINotify:
 
 
 class INotify:
-    def __init__(self):
+    def __init__(self) -> None:
         self._libc = _LibCINotify()
         self._parser = _EventParser()
         self._fileio = FileIO(self._libc.init1(os.O_CLOEXEC), mode="rb")
         self._poller = poll()
         self._poller.register(self._fileio.fileno())
 
+    def fileno(self) -> int:
+        """The file descriptor becomes readable as soon as events are available"""
+        return self._fileio.fileno()
+
+    def close(self) -> None:
+        self._poller.unregister(self._fileio.fileno())
+        self._fileio.close()
+
     def add_watch(self, path: Path, mask: Masks) -> Watchee:
         watch_descriptor = self._libc.add_watch(self._fileio.fileno(), fsencode(path), mask)
         self._parser.track(watch_descriptor, path)
@@ -17,6 +17,13 @@ class Eventconsolestatus(Table):
     )
     """The average connect rate"""
 
+    status_average_drain_limit_hit_rate = Column(
+        'status_average_drain_limit_hit_rate',
+        col_type='float',
+        description='The average drain limit hit rate',
+    )
+    """The average drain limit hit rate"""
+
     status_average_drop_rate = Column(
         'status_average_drop_rate',
         col_type='float',
@@ -80,6 +87,13 @@ class Eventconsolestatus(Table):
     )
     """The average sync time"""
 
+    status_average_udp_drop_rate = Column(
+        'status_average_udp_drop_rate',
+        col_type='float',
+        description='The average UDP drop rate',
+    )
+    """The average UDP drop rate"""
+
     status_config_load_time = Column(
         'status_config_load_time',
         col_type='int',
@@ -101,6 +115,20 @@ class Eventconsolestatus(Table):
     )
     """The number of connects"""
 
+    status_drain_limit_hit_rate = Column(
+        'status_drain_limit_hit_rate',
+        col_type='float',
+        description='The drain limit hit rate',
+    )
+    """The drain limit hit rate"""
+
+    status_drain_limit_hits = Column(
+        'status_drain_limit_hits',
+        col_type='int',
+        description='The number of times the Event Console left data of a source for the next wakeup, because it read the maximum number of messages at once',
+    )
+    """The number of times the Event Console left data of a source for the next wakeup, because it read the maximum number of messages at once"""
+
     status_drop_rate = Column(
         'status_drop_rate',
         col_type='float',
@@ -255,6 +283,27 @@ class Eventconsolestatus(Table):
     )
     """The number of rule tries"""
 
+    status_spool_backlog = Column(
+        'status_spool_backlog',
+        col_type='int',
+        description='The number of spool files waiting to be processed by the Event Console',
+    )
+    """The number of spool files waiting to be processed by the Event Console"""
+
+    status_udp_drop_rate = Column(
+        'status_udp_drop_rate',
+        col_type='float',
+        description='The UDP drop rate',
+    )
+    """The UDP drop rate"""
+
+    status_udp_drops = Column(
+        'status_udp_drops',
+        col_type='int',
+        description='The number of syslog datagrams dropped by the kernel, because the receive buffer of the Event Console was full',
+    )
+    """The number of syslog datagrams dropped by the kernel, because the receive buffer of the Event Console was full"""
+
     status_virtual_memory_size = Column(
         'status_virtual_memory_size',
         col_type='int',
@@ -122,10 +122,14 @@ class AbstractMemoryObserver(ABCResourceObserver):
             varname: cmk.utils.misc.total_size(value) for (varname, value) in storage.items()
         }
         self._dump("APPROXIMATE SIZES: GLOBALS TOP 50", globals_sizes, 50)
-        for title, module in [
-            ("CONFIG CACHE", cache_manager),
-        ]:
-            self._dump("APPROXIMATE SIZES: %s" % title, module.dump_sizes(), None)
+        self._dump(
+            "APPROXIMATE SIZES: CONFIG CACHE",
+            {
+                f"{name} ({statistics.entries} entries, {statistics.evictions} evicted)": statistics.size
+                for name, statistics in cache_manager.statistics().items()
+            },
+            None,
+        )
 
     def _dump(self, header: str, sizes: dict[str, int], limit: int | None) -> None:
         self._warning("=== %s ====" % header)
@@ -6,15 +6,25 @@
 
 from ._grouping import PREDICTION_PERIODS, Timegroup, timezone_at
 from ._plugin_interface import estimate_levels, make_updated_predictions
+from ._precompute import (
+    find_due_predictions,
+    precompute_predictions,
+    PredictionJob,
+    PredictionJobResult,
+)
 from ._prediction import DataStat, PredictionData, PredictionStore
 from ._query import PredictionQuerier
 
 __all__ = [
     "DataStat",
     "estimate_levels",
+    "find_due_predictions",
     "make_updated_predictions",
     "PredictionData",
+    "precompute_predictions",
     "PREDICTION_PERIODS",
+    "PredictionJob",
+    "PredictionJobResult",
     "PredictionQuerier",
     "PredictionStore",
     "Timegroup",
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Compute predictions ahead of time
+
+Predictions are valid for one day. Without this job all of them become due at
+the same time when a new day starts, and they are computed during the check
+execution. The batch job computes the predictions of the upcoming day shortly
+before the rollover, so the check only has to read them.
+"""
+
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple
+
+import cmk.ccc.debug
+
+from cmk.utils.hostaddress import HostName
+from cmk.utils.log import VERBOSE
+
+from cmk.agent_based.prediction_backend import PredictionInfo
+
+from ._prediction import compute_prediction, MetricRecord, PredictionStore
+
+logger = logging.getLogger("cmk.prediction")
+
+GetRecordedData = Callable[[str, int, int], MetricRecord | None]
+
+
+class PredictionJob(NamedTuple):
+    host_name: HostName
+    service_description: str
+    store_path: Path
+    meta: PredictionInfo
+
+
+class PredictionJobResult(NamedTuple):
+    job: PredictionJob
+    duration: float
+    computed: bool
+
+
+def find_due_predictions(
+    stores: Iterable[tuple[HostName, str, PredictionStore]],
+    now: float,
+    lookahead: float,
+) -> Sequence[PredictionJob]:
+    """Find all predictions that are missing or outdated
+
+    This includes the predictions of the upcoming period for all predictions
+    whose validity ends within the next `lookahead` seconds.
+    The jobs are sorted by the start of their validity, so the most urgent come first.
+    """
+    return sorted(
+        (
+            PredictionJob(host_name, service_description, store.path, meta)
+            for host_name, service_description, store in stores
+            for meta in _iter_due_predictions(store, now, lookahead)
+        ),
+        key=lambda job: (
+            job.meta.valid_interval[0],
+            job.host_name,
+            job.service_description,
+            job.meta.metric,
+        ),
+    )
+
+
+def _iter_due_predictions(
+    store: PredictionStore, now: float, lookahead: float
+) -> Iterator[PredictionInfo]:
+    store.remove_outdated_predictions(now)
+    for meta, prediction in store.iter_all_valid_predictions(now):
+        if prediction is None:
+            yield meta
+
+        if meta.valid_interval[1] - now > lookahead:
+            continue
+
+        upcoming = PredictionInfo.make(
+            meta.metric, meta.direction, meta.params, meta.valid_interval[1]
+        )
+        if not store.has_up_to_date_prediction(upcoming):
+            yield upcoming
+
+
+def precompute_predictions(
+    jobs: Sequence[PredictionJob],
+    make_get_recorded_data: Callable[[HostName, str], GetRecordedData],
+    processes: int,
+) -> Iterator[PredictionJobResult]:
+    """Compute and store the predictions of the jobs using at most `processes` processes
+
+    `make_get_recorded_data` is called in the worker processes, so it must be picklable.
+    """
+    run_job = partial(_run_job, make_get_recorded_data)
+    if processes <= 1 or len(jobs) <= 1:
+        yield from map(run_job, jobs)
+        return
+
+    with multiprocessing.Pool(processes=min(processes, len(jobs))) as pool:
+        # imap dispatches the jobs in order, so the most urgent ones are done first.
+        yield from pool.imap(run_job, jobs)
+
+
+def _run_job(
+    make_get_recorded_data: Callable[[HostName, str], GetRecordedData],
+    job: PredictionJob,
+) -> PredictionJobResult:
+    start = time.monotonic()
+    try:
+        prediction = compute_prediction(
+            job.meta, make_get_recorded_data(job.host_name, job.service_description)
+        )
+    except Exception as e:
+        if cmk.ccc.debug.enabled():
+            raise
+        logger.error(
+            "Failed to predict %s of %s / %s: %s",
+            job.meta.metric,
+            job.host_name,
+            job.service_description,
+            e,
+        )
+        prediction = None
+
+    if prediction is not None:
+        store = PredictionStore(job.store_path)
+        # The info file must not be newer than the data, otherwise the data is considered outdated.
+        store.save_prediction_info(job.meta)
+        store.save_prediction(job.meta, prediction)
+
+    duration = time.monotonic() - start
+    logger.log(
+        VERBOSE,
+        "Predicted %s / %s / %s of %s / %s in %.2fs",
+        job.meta.metric,
+        job.meta.params.period,
+        job.meta.valid_interval[0],
+        job.host_name,
+        job.service_description,
+        duration,
+    )
+    return PredictionJobResult(job, duration, prediction is not None)
@@ -4,11 +4,13 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import logging
-import math
+import tempfile
 from collections.abc import Callable, Iterable, Iterator, Sequence
 from pathlib import Path
-from typing import Final, Literal, NamedTuple, Protocol, Self
+from typing import Final, Literal, NamedTuple, Protocol
 
+import numpy as np
+import numpy.typing as npt
 from pydantic import BaseModel
 
 from cmk.agent_based.prediction_backend import PredictionInfo
@@ -38,17 +40,6 @@ class DataStat(NamedTuple):
     max_: float
     stdev: float | None
 
-    @classmethod
-    def from_values(cls, values: Sequence[float]) -> Self:
-        """Statistically summarize all the measured values"""
-        average = sum(values) / float(len(values))
-        return cls(
-            average=average,
-            min_=min(values),
-            max_=max(values),
-            stdev=_std_dev(values, average),
-        )
-
 
 class PredictionData(BaseModel, frozen=True):
     points: list[DataStat | None]
@@ -92,6 +83,17 @@ class PredictionStore:
     def _data_file(self, meta: PredictionInfo) -> Path:
         return self.path / self.relative_data_file(meta=meta)
 
+    def _info_file(self, meta: PredictionInfo) -> Path:
+        return Path(self.meta_file_path_template.format(meta=meta))
+
+    @staticmethod
+    def _is_up_to_date(info_path: Path, data_path: Path) -> bool:
+        # The info file is rewritten if the parameters change, which outdates the data.
+        try:
+            return data_path.stat().st_mtime >= info_path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+
     @staticmethod
     def filter_prediction_files_by_metric(
         metric: str, prediction_files: Iterable[Path]
@@ -103,10 +105,36 @@ class PredictionStore:
             if metric in prediction_file.parts
         )
 
+    @staticmethod
+    def _write_atomically(path: Path, content: str) -> None:
+        # The checks read the files concurrently and must never see a partially written one.
+        # We don't use the store, as it creates an empty file while locking.
+        path.parent.mkdir(exist_ok=True, parents=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf8", dir=path.parent, prefix=f".{path.name}.new", delete=False
+        ) as tmp:
+            tmp_path = Path(tmp.name)
+            try:
+                tmp_path.chmod(0o660)
+                tmp.write(content)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+        tmp_path.rename(path)
+
     def save_prediction(self, meta: PredictionInfo, prediction: PredictionData) -> None:
-        data_file = self._data_file(meta)
-        data_file.parent.mkdir(exist_ok=True, parents=True)
-        data_file.write_text(prediction.model_dump_json())
+        self._write_atomically(self._data_file(meta), prediction.model_dump_json())
+
+    def save_prediction_info(self, meta: PredictionInfo) -> None:
+        """Write the info file, just like the check plug-in does when it requests a prediction"""
+        self._write_atomically(self._info_file(meta), meta.model_dump_json())
+
+    def has_up_to_date_prediction(self, meta: PredictionInfo) -> bool:
+        info_file = self._info_file(meta)
+        return (
+            self._is_up_to_date(info_file, info_file.with_suffix(self.DATA_FILE_SUFFIX))
+            and PredictionInfo.model_validate_json(info_file.read_text()) == meta
+        )
 
     def iter_all_metadata_files(self) -> Iterable[Path]:
         if not self.path.exists():
@@ -134,11 +162,12 @@ class PredictionStore:
                 continue
 
             data_path = info_path.with_suffix(self.DATA_FILE_SUFFIX)
-            try:
-                if info_path.stat().st_mtime >= data_path.stat().st_mtime:
+            if self._is_up_to_date(info_path, data_path):
+                try:
                     yield meta, PredictionData.model_validate_json(data_path.read_text())
-            except FileNotFoundError:
-                pass
+                    continue
+                except FileNotFoundError:
+                    pass
 
             yield meta, None
 
@@ -189,32 +218,93 @@ def _calculate_data_for_prediction(
 
 def _forward_fill_resample(
     current_range: range, values: Sequence[float | None], new_range: range
-) -> Sequence[float | None]:
+) -> npt.NDArray[np.float64]:
+    """Resample to the new range, missing values (None) become NaN"""
+    # None -> NaN
+    values_array = np.array(values, dtype=np.float64)
     if current_range == new_range:
-        return values
+        return values_array
 
-    idx_max = len(values) - 1
-    return [
-        values[max(0, min(int((t - current_range.start) / current_range.step), idx_max))]
-        for t in new_range
-    ]
+    indices = (np.arange(new_range.start, new_range.stop, new_range.step) - current_range.start) / (
+        current_range.step
+    )
+    # astype truncates towards zero, just like int() did
+    return values_array[np.clip(indices.astype(np.int64), 0, len(values_array) - 1)]
 
 
-def _data_stats(slices: Iterable[Iterable[float | None]]) -> list[DataStat | None]:
+def _data_stats(
+    slices: Sequence[npt.NDArray[np.float64] | Sequence[float | None]],
+) -> list[DataStat | None]:
     "Statistically summarize all the upsampled RRD data"
-    return [  # can't inline this b/c it is unit tested :-/
+    if not slices:
+        return []
+
+    # One row per slice, one column per point in time. Columns are limited to the shortest slice.
+    length = min(len(s) for s in slices)
+    stacked = np.array([np.asarray(s, dtype=np.float64)[:length] for s in slices])
+    valid = ~np.isnan(stacked)
+    samples = valid.sum(axis=0)
+    has_samples = samples > 0
+    # Avoid division by zero for columns without data, they are dropped anyway
+    divisor = np.where(has_samples, samples, 1).astype(np.float64)
+
+    averages = _compensated_sum(stacked, valid) / divisor
+    minima = np.where(valid, stacked, np.inf).min(axis=0)
+    maxima = np.where(valid, stacked, -np.inf).max(axis=0)
+    stdevs = np.sqrt(
+        np.abs(_compensated_sum(np.square(stacked), valid) - np.square(averages) * samples)
+        / np.where(samples > 1, samples - 1, 1).astype(np.float64)
+    )
+
+    return [
         (
-            DataStat.from_values(point_line)
-            if (point_line := [x for x in time_column if x is not None])
+            DataStat(
+                average=average,
+                min_=min_,
+                max_=max_,
+                # In the case of a single data-point an unbiased standard deviation is undefined.
+                stdev=stdev if num_samples > 1 else None,
+            )
+            if num_samples
             else None
         )
-        for time_column in zip(*slices)
+        for average, min_, max_, stdev, num_samples in zip(
+            averages.tolist(),
+            minima.tolist(),
+            maxima.tolist(),
+            stdevs.tolist(),
+            samples.tolist(),
+        )
     ]
 
 
-def _std_dev(point_line: Sequence[float], average: float) -> float | None:
-    samples = len(point_line)
-    # In the case of a single data-point an unbiased standard deviation is undefined.
-    if samples == 1:
-        return None
-    return math.sqrt(abs(sum(p**2 for p in point_line) - average**2 * samples) / float(samples - 1))
+def _compensated_sum(
+    stacked: npt.NDArray[np.float64], valid: npt.NDArray[np.bool_]
+) -> npt.NDArray[np.float64]:
+    """Column wise sum of the valid values
+
+    Uses the same compensated (Neumaier) summation as the builtin sum() of Python 3.12, so the
+    results are the same as summing up the values of each column in Python.
+    """
+    total = np.zeros(stacked.shape[1], dtype=np.float64)
+    compensation = np.zeros(stacked.shape[1], dtype=np.float64)
+    seen = np.zeros(stacked.shape[1], dtype=np.bool_)
+    # Only iterates over the slices, the time columns are processed at once
+    for row, row_valid in zip(stacked, valid):
+        first = row_valid & ~seen
+        # sum() starts with the integer 0. Adding it turns -0.0 into 0.0
+        total[first] = row[first] + 0.0
+        rest = row_valid & seen
+        if rest.any():
+            current = total[rest]
+            value = row[rest]
+            new_total = current + value
+            compensation[rest] += np.where(
+                np.abs(current) >= np.abs(value),
+                (current - new_total) + value,
+                (value - new_total) + current,
+            )
+            total[rest] = new_total
+        seen |= row_valid
+
+    return np.where((compensation != 0) & np.isfinite(compensation), total + compensation, total)
@@ -673,6 +673,22 @@ class RulesetOptimizer:
 
         return self.__host_ruleset_cache.setdefault(cache_id, _impl(ruleset, with_foreign_hosts))
 
+    def get_host_rule_indexes(
+        self, ruleset: Sequence[RuleSpec[TRuleValue]], with_foreign_hosts: bool
+    ) -> Mapping[HostAddress, Sequence[int]]:
+        """The positions of the enabled rules that match the hosts by their host conditions
+
+        Other than get_host_ruleset() this tells rules with equal values apart. The service
+        conditions of the rules are not evaluated.
+        """
+        host_indexes: dict[HostAddress, list[int]] = {}
+        for index, rule in enumerate(ruleset):
+            if is_disabled(rule):
+                continue
+            for hostname in self._all_matching_hosts(rule["condition"], with_foreign_hosts):
+                host_indexes.setdefault(hostname, []).append(index)
+        return host_indexes
+
     def get_service_ruleset(
         self, ruleset: Sequence[RuleSpec[TRuleValue]], with_foreign_hosts: bool
     ) -> PreprocessedServiceRuleset[TRuleValue]:
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# Sends syslog messages via UDP at a fixed rate to the builtin syslog server of
+# the Event Console. Run it as site user to compare the number of sent messages
+# with the messages the Event Console received and the datagrams the kernel
+# dropped.
+#
+# Example: syslog_load_generator.py --rate 20000 --duration 10 localhost
+
+import argparse
+import json
+import os
+import socket
+import time
+from pathlib import Path
+
+_STATUS_COLUMNS = [
+    "status_messages",
+    "status_udp_drops",
+    "status_drain_limit_hits",
+    "status_average_message_rate",
+    "status_average_processing_time",
+]
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Send syslog messages at a fixed rate via UDP")
+    parser.add_argument("host", help="Host of the Event Console")
+    parser.add_argument("--port", type=int, default=514, help="Syslog UDP port (default: 514)")
+    parser.add_argument("--rate", type=int, default=10000, help="Messages per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Duration in seconds")
+    parser.add_argument("--size", type=int, default=200, help="Size of the messages in bytes")
+    parser.add_argument(
+        "--status-socket",
+        type=Path,
+        default=Path(os.environ.get("OMD_ROOT", "/"), "tmp/run/mkeventd/status"),
+        help="Status socket of the Event Console, for reading the counters",
+    )
+    return parser.parse_args()
+
+
+def query_status(status_socket: Path) -> dict[str, float] | None:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(10)
+            sock.connect(str(status_socket))
+            sock.sendall(
+                f"GET status\nColumns: {' '.join(_STATUS_COLUMNS)}\nOutputFormat: json\n".encode()
+            )
+            sock.shutdown(socket.SHUT_WR)
+            response = b""
+            while chunk := sock.recv(65536):
+                response += chunk
+    except OSError:
+        return None
+    headers, row = json.loads(response)
+    return dict(zip(headers, row))
+
+
+def send_messages(host: str, port: int, rate: int, duration: float, size: int) -> int:
+    prefix = b"<13>%s loadgen benchmark: " % time.strftime("%b %d %H:%M:%S").encode()
+    sent = 0
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        # Not connected: We don't want to see ICMP errors when nobody is listening
+        address = (host, port)
+        start = time.monotonic()
+        while (elapsed := time.monotonic() - start) < duration:
+            # Send in small bursts and catch up with the schedule, like real bursts of syslog
+            for _n in range(int(elapsed * rate) - sent):
+                sock.sendto((prefix + b"message %d " % sent).ljust(size, b"x"), address)
+                sent += 1
+            time.sleep(0.001)
+    return sent
+
+
+def main() -> None:
+    args = parse_arguments()
+    before = query_status(args.status_socket)
+    sent = send_messages(args.host, args.port, args.rate, args.duration, args.size)
+    print(f"Sent {sent} messages in {args.duration:.1f}s ({sent / args.duration:.0f}/s)")
+
+    if before is None:
+        print(f"Cannot read counters from {args.status_socket}")
+        return
+    time.sleep(2)  # let the Event Console process its backlog
+    after = query_status(args.status_socket)
+    if after is None:
+        print(f"Cannot read counters from {args.status_socket}")
+        return
+    for column in ("status_messages", "status_udp_drops", "status_drain_limit_hits"):
+        print(f"{column[7:]}: {after[column] - before[column]:.0f}")
+    print(f"average message rate: {after['status_average_message_rate']:.0f}/s")
+    print(f"average processing time: {after['status_average_processing_time'] * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
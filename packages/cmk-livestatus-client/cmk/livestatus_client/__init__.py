@@ -167,10 +167,6 @@ class LivestatusTestingError(RuntimeError):
 
 tracer = trace.get_tracer("cmk.livestatus_client")
 
-# TODO: This mechanism does not take different connection options into account
-# Keep a global array of persistent connections
-persistent_connections: dict[str, socket.socket] = {}
-
 # Regular expression for removing Cache: headers if caching is not allowed
 remove_cache_regex = re.compile("\nCache:[^\n]*")
 
@@ -527,6 +523,109 @@ Must begin with 'tcp:', 'tcp6:' or 'unix:'
     )
 
 
+class ConnectionPoolKey(NamedTuple):
+    socketurl: str
+    tls: bool
+    verify: bool
+    ca_file_path: str | None
+    site_name: SiteId | None
+
+
+class ConnectionPoolStatistics(NamedTuple):
+    reused: int
+    connected: int
+    evicted: int
+
+
+class ConnectionPool:
+    """The idle persistent connections of this process
+
+    Persistent connections are released to the pool instead of being closed. The following
+    connections with the same socket and TLS settings take them over and save the TCP and TLS
+    handshakes. Reusing the connection of another user is fine, because the AuthUser header is
+    sent with every query.
+
+    Connections are evicted once they have been idle for `idle_timeout` seconds, so that they do
+    not block threads of the livestatus server for long. Connections which have been closed by
+    the peer in the meantime are evicted when they are taken over.
+
+    A forked child process forgets the idle connections of its parent, otherwise both of them
+    would send queries on the same connection.
+    """
+
+    def __init__(self, idle_timeout: float = 60.0) -> None:
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle: dict[ConnectionPoolKey, list[tuple[float, socket.socket]]] = {}
+        self._reused = 0
+        self._connected = 0
+        self._evicted = 0
+
+    def acquire(self, key: ConnectionPoolKey) -> socket.socket | None:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                released_at, site_socket = idle.pop()
+                # A readable idle connection was closed by the peer or is out of sync
+                if now - released_at < self.idle_timeout and not is_socket_readable(site_socket, 0):
+                    self._reused += 1
+                    return site_socket
+                self._evict(site_socket)
+        return None
+
+    def count_connected(self) -> None:
+        with self._lock:
+            self._connected += 1
+
+    def release(self, key: ConnectionPoolKey, site_socket: socket.socket) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for idle in self._idle.values():
+                while idle and now - idle[0][0] >= self.idle_timeout:
+                    self._evict(idle.pop(0)[1])
+            self._idle.setdefault(key, []).append((now, site_socket))
+
+    def clear(self) -> None:
+        with self._lock:
+            for idle in self._idle.values():
+                for _released_at, site_socket in idle:
+                    self._evict(site_socket)
+            self._idle.clear()
+
+    def forget_inherited(self) -> None:
+        """Drop the idle connections of the parent, to be called in a forked child"""
+        # The lock may have been held by another thread of the parent while forking
+        self._lock = threading.Lock()
+        for idle in self._idle.values():
+            for _released_at, site_socket in idle:
+                # Closing the file descriptor of the child sends nothing, the parent still has it
+                with contextlib.suppress(OSError):
+                    site_socket.close()
+        self._idle.clear()
+
+    def statistics(self) -> ConnectionPoolStatistics:
+        with self._lock:
+            return ConnectionPoolStatistics(self._reused, self._connected, self._evicted)
+
+    def _evict(self, site_socket: socket.socket) -> None:
+        self._evicted += 1
+        try:
+            site_socket.close()
+        except OSError:
+            pass
+
+
+connection_pool = ConnectionPool()
+
+
+def _forget_inherited_connections() -> None:
+    connection_pool.forget_inherited()
+
+
+os.register_at_fork(after_in_child=_forget_inherited_connections)
+
+
 class SingleSiteConnection(Helpers):
     # So we only collect in a specific thread, and not in all of them. We also use
     # a class-variable for this case, so we activate this across all sites at once.
@@ -555,6 +654,8 @@ class SingleSiteConnection(Helpers):
         self.allow_cache = allow_cache
         self.socketurl = socketurl
         self.socket: socket.socket | None = None
+        # Whether a query has been sent whose response has not been read completely
+        self._response_pending = False
         self.timeout: int | None = None
         self.successful_persistence = False
         self._output_format = LivestatusOutputFormat.PYTHON
@@ -580,17 +681,23 @@ class SingleSiteConnection(Helpers):
         if self.socket:
             self.socket.settimeout(float(timeout))
 
+    @property
+    def _pool_key(self) -> ConnectionPoolKey:
+        return ConnectionPoolKey(
+            self.socketurl, self.tls, self.tls_verify, self._tls_ca_file_path, self.site_name
+        )
+
     def _try_get_persisted_connection(self) -> socket.socket | None:
-        if self.persist and self.socketurl in persistent_connections:
+        if self.persist and (site_socket := connection_pool.acquire(self._pool_key)) is not None:
             self.successful_persistence = True
-            return persistent_connections[self.socketurl]
+            return site_socket
         return None
 
     def connect(self) -> None:
         if (site_socket := self._try_get_persisted_connection()) is None:
             site_socket = self._create_new_socket_connection()
             if self.persist:
-                persistent_connections[self.socketurl] = site_socket
+                connection_pool.count_connected()
         self.socket = site_socket
 
     def _create_new_socket_connection(self) -> socket.socket:
@@ -663,6 +770,20 @@ class SingleSiteConnection(Helpers):
     def disconnect(self) -> None:
         self._close_socket()
 
+    def release(self) -> None:
+        """Hand over a persistent connection to the following connections of this process
+
+        Connections without persistence are closed, just like connections with a response still
+        pending, e.g. after an interrupted query: The next query must not read it.
+        """
+        if not self.persist or self.socket is None or self._response_pending:
+            self._close_socket()
+            return
+
+        connection_pool.release(self._pool_key, self.socket)
+        self.socket = None
+        self.successful_persistence = False
+
     def _close_socket(self) -> None:
         if self.socket is not None:
             try:
@@ -672,12 +793,8 @@ class SingleSiteConnection(Helpers):
 
             self.socket = None
 
-        if self.persist:
-            self.successful_persistence = False
-            try:
-                del persistent_connections[self.socketurl]
-            except KeyError:
-                pass
+        self._response_pending = False
+        self.successful_persistence = False
 
     def receive_data(self, size: int, timeout: float | None = None) -> bytes:
         if self.socket is None:
@@ -754,6 +871,7 @@ class SingleSiteConnection(Helpers):
             raise MKLivestatusSocketError("Socket to '%s' is not connected" % self.socketurl)
 
         try:
+            self._response_pending = True
             self.socket.sendall(query.encode("utf-8") + b"\n\n")
             if getattr(self.collect_queries, "active", False):
                 self.collect_queries.queries.append(query)
@@ -795,6 +913,7 @@ class SingleSiteConnection(Helpers):
             # while the data from a standard connection can still take some time.
             # 30 seconds should be more than enough for the maximum telegram size of 100MB
             data = self.receive_data(length, 30)
+            self._response_pending = False
 
             if code == "200":
                 return data
@@ -846,7 +965,9 @@ class SingleSiteConnection(Helpers):
             # Catches
             # MKLivestatusQueryError
             # MKLivestatusSocketError
-            # FIXME: ? self.disconnect()
+            if self._response_pending:
+                # The rest of the response can't be told apart from the next one
+                self.disconnect()
             raise MKLivestatusSocketError("Unhandled exception: %s" % e)
 
     def parse_raw_response(self, raw_response: bytes, query: Query) -> LivestatusResponse:
@@ -1138,6 +1259,12 @@ class MultiSiteConnection(Helpers):
             connected_site.connection.disconnect()
         self.connections.clear()
 
+    def release(self) -> None:
+        """Like disconnect(), but keeps the persistent connections open for reuse"""
+        for connected_site in self.connections:
+            connected_site.connection.release()
+        self.connections.clear()
+
     # Needed for temporary connection for status_hosts in disabled sites
     def _disconnect_site(self, sitename: SiteId) -> None:
         i = 0
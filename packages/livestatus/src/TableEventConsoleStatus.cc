@@ -80,6 +80,25 @@ TableEventConsoleStatus::TableEventConsoleStatus() {
     addColumn(ECRow::makeDoubleColumn("status_average_rule_hit_rate",
                                       "The average rule hit rate", offsets));
 
+    addColumn(ECRow::makeIntColumn(
+        "status_udp_drops",
+        "The number of syslog datagrams dropped by the kernel, because the receive buffer of the Event Console was full",
+        offsets));
+    addColumn(ECRow::makeDoubleColumn("status_udp_drop_rate",
+                                      "The UDP drop rate", offsets));
+    addColumn(ECRow::makeDoubleColumn("status_average_udp_drop_rate",
+                                      "The average UDP drop rate", offsets));
+
+    addColumn(ECRow::makeIntColumn(
+        "status_drain_limit_hits",
+        "The number of times the Event Console left data of a source for the next wakeup, because it read the maximum number of messages at once",
+        offsets));
+    addColumn(ECRow::makeDoubleColumn("status_drain_limit_hit_rate",
+                                      "The drain limit hit rate", offsets));
+    addColumn(ECRow::makeDoubleColumn("status_average_drain_limit_hit_rate",
+                                      "The average drain limit hit rate",
+                                      offsets));
+
     addColumn(ECRow::makeDoubleColumn(
         "status_average_processing_time",
         "The average incoming message processing time", offsets));
@@ -88,6 +107,10 @@ TableEventConsoleStatus::TableEventConsoleStatus() {
                                       offsets));
     addColumn(ECRow::makeDoubleColumn("status_average_sync_time",
                                       "The average sync time", offsets));
+    addColumn(ECRow::makeIntColumn(
+        "status_spool_backlog",
+        "The number of spool files waiting to be processed by the Event Console",
+        offsets));
     addColumn(ECRow::makeStringColumn(
         "status_replication_slavemode",
         "The replication slavemode (empty or one of sync/takeover)", offsets));
@@ -646,6 +646,7 @@ namespace {
 ColumnDefinitions event_console_status_columns() {
     return {
         {"status_average_connect_rate", ColumnType::double_},
+        {"status_average_drain_limit_hit_rate", ColumnType::double_},
         {"status_average_drop_rate", ColumnType::double_},
         {"status_average_event_rate", ColumnType::double_},
         {"status_average_message_rate", ColumnType::double_},
@@ -655,9 +656,12 @@ ColumnDefinitions event_console_status_columns() {
         {"status_average_rule_hit_rate", ColumnType::double_},
         {"status_average_rule_trie_rate", ColumnType::double_},
         {"status_average_sync_time", ColumnType::double_},
+        {"status_average_udp_drop_rate", ColumnType::double_},
         {"status_config_load_time", ColumnType::int_},
         {"status_connect_rate", ColumnType::double_},
         {"status_connects", ColumnType::int_},
+        {"status_drain_limit_hit_rate", ColumnType::double_},
+        {"status_drain_limit_hits", ColumnType::int_},
         {"status_drop_rate", ColumnType::double_},
         {"status_drops", ColumnType::int_},
         {"status_event_limit_active_hosts", ColumnType::list},
@@ -680,6 +684,9 @@ ColumnDefinitions event_console_status_columns() {
         {"status_rule_hits", ColumnType::int_},
         {"status_rule_trie_rate", ColumnType::double_},
         {"status_rule_tries", ColumnType::int_},
+        {"status_spool_backlog", ColumnType::int_},
+        {"status_udp_drop_rate", ColumnType::double_},
+        {"status_udp_drops", ColumnType::int_},
         {"status_virtual_memory_size", ColumnType::int_},
     };
 }
@@ -356,7 +356,7 @@ def test_dependencies_are_used() -> None:
     known_unused_packages = set(CEE_UNUSED_PACKAGES)
     known_unused_packages.add("setuptools")  # pinned transitive dependency
     if not is_enterprise_repo():
-        known_unused_packages.update(("PyPDF", "numpy", "roman"))
+        known_unused_packages.update(("PyPDF", "roman"))
 
     unused_dependencies = set(get_unused_dependencies())
 
@@ -58,9 +58,16 @@ def test_status_table_via_core(site: Site) -> None:
         "status_rule_hits",
         "status_rule_hit_rate",
         "status_average_rule_hit_rate",
+        "status_udp_drops",
+        "status_udp_drop_rate",
+        "status_average_udp_drop_rate",
+        "status_drain_limit_hits",
+        "status_drain_limit_hit_rate",
+        "status_average_drain_limit_hit_rate",
         "status_average_processing_time",
         "status_average_request_time",
         "status_average_sync_time",
+        "status_spool_backlog",
         "status_replication_slavemode",
         "status_replication_last_sync",
         "status_replication_success",
@@ -20,6 +20,8 @@ from pytest import MonkeyPatch
 
 from tests.testlib.base import Scenario
 
+from tests.unit.conftest import DummyLicensingHandler
+
 import cmk.ccc.debug
 import cmk.ccc.version as cmk_version
 
@@ -862,3 +864,161 @@ def test_create_nagios_config_commands(
 
     assert license_counter["services"] == 1
     assert outfile.getvalue() == expected_result
+
+
+def _create_config(
+    config_cache: config.ConfigCache, processes: int, host_objects_cache: Path | None = None
+) -> str:
+    outfile = io.StringIO()
+    core_nagios.create_config(
+        outfile,
+        VersionedConfigPath(processes),
+        config_cache,
+        hostnames=sorted(config_cache.hosts_config.hosts),
+        licensing_handler=DummyLicensingHandler(),
+        passwords={},
+        ip_address_of=ip_address_of_return_local,
+        processes=processes,
+        host_objects_cache=host_objects_cache,
+    )
+    return outfile.getvalue()
+
+
+def test_create_config_in_worker_processes(monkeypatch: MonkeyPatch) -> None:
+    ts = Scenario()
+    hostnames = [HostName(f"host{n:02d}") for n in range(11)]
+    for hostname in hostnames:
+        ts.add_host(hostname)
+    ts.set_ruleset(
+        "host_check_commands",
+        [
+            {
+                "id": "01",
+                "condition": {"host_name": [str(h) for h in hostnames[::3]]},
+                "value": ("service", "Check_MK"),
+            },
+        ],
+    )
+    ts.set_ruleset(
+        "host_groups",
+        [{"id": "02", "condition": {"host_name": ["host07"]}, "value": "group07"}],
+    )
+    ts.set_option("define_hostgroups", {"group07": "Group 7"})
+    config_cache = ts.apply(monkeypatch)
+    monkeypatch.setattr(config, "get_resource_macros", lambda: {})
+    monkeypatch.setattr(core_nagios._create_config, "_MIN_HOSTS_PER_CHUNK", 2)
+
+    sequential = _create_config(config_cache, 1)
+
+    # The host check commands are numbered across all chunks of hosts
+    assert "check-mk-host-custom-4" in sequential
+    assert "hostgroup_name                group07" in sequential
+    assert _create_config(config_cache, 3) == sequential
+
+
+def _host_objects_scenario(monkeypatch: MonkeyPatch, group_of_host01: str) -> config.ConfigCache:
+    ts = Scenario()
+    hostnames = [HostName(f"host{n:02d}") for n in range(4)]
+    for hostname in hostnames:
+        ts.add_host(hostname)
+    ts.set_ruleset(
+        "host_check_commands",
+        [
+            {
+                "id": "01",
+                "condition": {"host_name": [str(h) for h in hostnames[::2]]},
+                "value": ("service", "Check_MK"),
+            },
+        ],
+    )
+    ts.set_ruleset(
+        "host_groups",
+        [{"id": "02", "condition": {"host_name": ["host01"]}, "value": group_of_host01}],
+    )
+    ts.set_option("define_hostgroups", {"group1": "Group 1", "group2": "Group 2"})
+    config_cache = ts.apply(monkeypatch)
+    monkeypatch.setattr(config, "get_resource_macros", lambda: {})
+    return config_cache
+
+
+def test_create_config_with_host_objects_cache(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    created: list[HostName] = []
+    create_host_fragment = core_nagios._create_config._create_host_fragment
+
+    def _create_host_fragment_tracked(
+        config_cache: config.ConfigCache, hostname: HostName, *args: Any
+    ) -> Any:
+        created.append(hostname)
+        return create_host_fragment(config_cache, hostname, *args)
+
+    monkeypatch.setattr(
+        core_nagios._create_config, "_create_host_fragment", _create_host_fragment_tracked
+    )
+    host_objects_cache = tmp_path / "host_objects.pkl"
+
+    config_cache = _host_objects_scenario(monkeypatch, "group1")
+    expected = _create_config(config_cache, 1)
+    assert _create_config(config_cache, 1, host_objects_cache) == expected
+    assert created == ["host00", "host01", "host02", "host03"]
+
+    created.clear()
+    assert _create_config(config_cache, 1, host_objects_cache) == expected
+    assert not created
+
+    # Only the objects of the host matching the changed rule are created again
+    config_cache = _host_objects_scenario(monkeypatch, "group2")
+    expected = _create_config(config_cache, 1)
+    assert "hostgroups                    group2" in expected
+    assert _create_config(config_cache, 1, host_objects_cache) == expected
+    assert created == ["host01"]
+
+
+def _precompile_scenario(monkeypatch: MonkeyPatch, address_of_host01: str) -> config.ConfigCache:
+    ts = Scenario()
+    for hostname, address in [("host00", "127.0.0.1"), ("host01", address_of_host01)]:
+        ts.add_host(HostName(hostname), ipaddress=HostAddress(address))
+        ts.set_autochecks(
+            HostName(hostname), [AutocheckEntry(CheckPluginName("uptime"), None, {}, {})]
+        )
+    return ts.apply(monkeypatch)
+
+
+def _precompile(
+    config_cache: config.ConfigCache, serial: int, processes: int = 1
+) -> VersionedConfigPath:
+    config_path = VersionedConfigPath(serial)
+    with config_path.create(is_cmc=False):
+        core_nagios._precompile_host_checks.precompile_hostchecks(
+            config_path,
+            config_cache,
+            precompile_mode=core_nagios.PrecompileMode.INSTANT,
+            processes=processes,
+        )
+    return config_path
+
+
+def test_precompile_hostchecks_takes_over_unchanged_host_checks(monkeypatch: MonkeyPatch) -> None:
+    config_cache = _precompile_scenario(monkeypatch, "127.0.0.1")
+    first = _precompile(config_cache, 1)
+    second = _precompile(config_cache, 2)
+
+    for hostname in (HostName("host00"), HostName("host01")):
+        assert core_nagios.HostCheckStore.host_check_file_path(second, hostname).samefile(
+            core_nagios.HostCheckStore.host_check_file_path(first, hostname)
+        )
+
+    monkeypatch.setattr(core_nagios._precompile_host_checks, "_MIN_HOSTS_PER_CHUNK", 1)
+    third = _precompile(_precompile_scenario(monkeypatch, "127.0.0.2"), 3, processes=2)
+
+    assert core_nagios.HostCheckStore.host_check_file_path(third, HostName("host00")).samefile(
+        core_nagios.HostCheckStore.host_check_file_path(second, HostName("host00"))
+    )
+    assert not core_nagios.HostCheckStore.host_check_file_path(third, HostName("host01")).samefile(
+        core_nagios.HostCheckStore.host_check_file_path(second, HostName("host01"))
+    )
+    assert (
+        "127.0.0.2"
+        in core_nagios.HostCheckStore.host_check_source_file_path(
+            third, HostName("host01")
+        ).read_text()
+    )
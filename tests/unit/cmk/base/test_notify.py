@@ -5,12 +5,19 @@
 
 import os
 from collections.abc import Mapping
+from pathlib import Path
 from typing import Final
 
 import pytest
 from pytest import MonkeyPatch
 
-from cmk.utils.notify_types import Contact, ContactName, NotificationContext, NotifyPluginParams
+from cmk.utils.notify_types import (
+    AlwaysBulkParameters,
+    Contact,
+    ContactName,
+    NotificationContext,
+    NotifyPluginParams,
+)
 
 from cmk.events.event_context import EnrichedEventContext, EventContext
 
@@ -124,3 +131,67 @@ def test_rbn_groups_contacts(user_groups: Mapping[ContactName, list[str]]) -> No
         "dong",
         "harry",
     }
+
+
+def _bulk_notify(host_name: str) -> None:
+    notify.do_bulk_notify(
+        "mail",
+        {},
+        NotificationContext(
+            {
+                "WHAT": "HOST",
+                "CONTACTNAME": "harry",
+                "HOSTNAME": host_name,
+                "HOSTSTATE": "DOWN",
+                "HOSTOUTPUT": "Packet received via smart PING",
+            }
+        ),
+        AlwaysBulkParameters(count=2, groupby=["host"], groupby_custom=[], interval=60),
+    )
+
+
+def test_bulk_notifications(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(notify, "notification_bulkdir", str(tmp_path / "bulk"))
+    monkeypatch.setattr(notify, "log_to_history", lambda message: None)
+    sent_bulks = []
+
+    def call_bulk_notification_script(
+        plugin_name: str, context_lines: list[str], *, plugin_timeout: int
+    ) -> tuple[int, list[str]]:
+        sent_bulks.append(context_lines)
+        return 0, []
+
+    monkeypatch.setattr(notify, "call_bulk_notification_script", call_bulk_notification_script)
+
+    _bulk_notify("heute")
+    _bulk_notify("morgen")
+    assert notify.find_bulks(True, bulk_interval=10) == []
+    assert [
+        (bulk_dir.rsplit("/", 3)[1:], len(uuids))
+        for bulk_dir, _age, _interval, _timeperiod, _count, uuids in notify.find_bulks(
+            False, bulk_interval=10
+        )
+    ] == [
+        (["harry", "mail", "60,2,host,heute"], 1),
+        (["harry", "mail", "60,2,host,morgen"], 1),
+    ]
+
+    _bulk_notify("heute")
+    assert [bulk[0].rsplit("/", 1)[1] for bulk in notify.find_bulks(True, bulk_interval=10)] == [
+        "60,2,host,heute"
+    ]
+
+    notify.send_ripe_bulks(lambda *args: HTTP_PROXY, bulk_interval=10, plugin_timeout=60)
+    assert len(sent_bulks) == 1
+    assert not (tmp_path / "bulk/harry/mail/60,2,host,heute").exists()
+    assert list(notify._load_bulk_index() or {}) == ["harry/mail/60,2,host,morgen"]
+
+
+def test_find_bulks_creates_missing_index(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(notify, "notification_bulkdir", str(tmp_path / "bulk"))
+    _bulk_notify("heute")
+    _bulk_notify("heute")
+    (tmp_path / "bulk/.index.mk").unlink()
+
+    assert [len(bulk[-1]) for bulk in notify.find_bulks(True, bulk_interval=10)] == [2]
+    assert (notify._load_bulk_index() or {})["harry/mail/60,2,host,heute"][0] == 2
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from livestatus import SiteId
+
+from cmk.bi.compiled_storage import load_compiled_aggregation, save_compiled_aggregation
+from cmk.bi.data_fetcher import BIStructureFetcher
+from cmk.bi.packs import BIAggregationPacks
+from cmk.bi.searcher import BISearcher
+from cmk.bi.trees import BICompiledAggregation, BILazyCompiledBranches
+
+from .bi_test_data import sample_config
+
+
+@pytest.fixture(name="compiled_aggregation")
+def _compiled_aggregation(
+    bi_packs_sample_config: BIAggregationPacks,
+    bi_structure_fetcher: BIStructureFetcher,
+    bi_searcher: BISearcher,
+) -> BICompiledAggregation:
+    bi_structure_fetcher.add_site_data(SiteId("heute"), sample_config.bi_structure_states)
+    bi_searcher.set_hosts(bi_structure_fetcher.hosts)
+    bi_aggregation = bi_packs_sample_config.get_aggregation("default_aggregation")
+    assert bi_aggregation is not None
+    return bi_aggregation.compile(bi_searcher)
+
+
+def test_save_and_load_roundtrip(
+    tmp_path: Path, compiled_aggregation: BICompiledAggregation
+) -> None:
+    path = tmp_path / compiled_aggregation.id
+    save_compiled_aggregation(path, compiled_aggregation)
+
+    loaded_aggregation = load_compiled_aggregation(path)
+
+    assert isinstance(loaded_aggregation.branches, BILazyCompiledBranches)
+    assert loaded_aggregation.branch_infos() == compiled_aggregation.branch_infos()
+    assert loaded_aggregation.serialize() == compiled_aggregation.serialize()
+
+
+def test_branches_are_materialized_on_access(
+    tmp_path: Path, compiled_aggregation: BICompiledAggregation
+) -> None:
+    path = tmp_path / compiled_aggregation.id
+    save_compiled_aggregation(path, compiled_aggregation)
+    loaded_aggregation = load_compiled_aggregation(path)
+    assert isinstance(loaded_aggregation.branches, BILazyCompiledBranches)
+    assert len(loaded_aggregation.branches) == 2
+    assert loaded_aggregation.branches.num_materialized == 0
+
+    title = compiled_aggregation.branches[1].properties.title
+    branch = loaded_aggregation.get_branch_by_title(title)
+    assert branch is not None
+    assert branch.serialize() == compiled_aggregation.branches[1].serialize()
+    assert loaded_aggregation.branches.num_materialized == 1
+    # The materialized branch is kept
+    assert loaded_aggregation.branches[-1] is branch
+
+
+def test_load_previous_format(tmp_path: Path, compiled_aggregation: BICompiledAggregation) -> None:
+    path = tmp_path / compiled_aggregation.id
+    path.write_bytes(pickle.dumps(compiled_aggregation.serialize()))
+
+    loaded_aggregation = load_compiled_aggregation(path)
+
+    assert loaded_aggregation.serialize() == compiled_aggregation.serialize()
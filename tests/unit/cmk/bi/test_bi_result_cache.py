@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import time
+
+import pytest
+
+from livestatus import LivestatusResponse, SiteId
+
+from cmk.utils.hostaddress import HostName
+
+from cmk.bi.aggregation_functions import BIAggregationFunctionWorst
+from cmk.bi.data_fetcher import BIStatusFetcher, BIStructureFetcher
+from cmk.bi.lib import (
+    BIAggregationComputationOptions,
+    BIAggregationGroups,
+    BIHostSpec,
+    BIHostStatusInfoRow,
+    BIServiceWithFullState,
+    NodeResultBundle,
+    RequiredBIElement,
+)
+from cmk.bi.packs import BIAggregationPacks
+from cmk.bi.result_cache import BINodeResultCache
+from cmk.bi.rule_interface import BIRuleProperties
+from cmk.bi.searcher import BISearcher
+from cmk.bi.trees import BICompiledAggregation, BICompiledLeaf, BICompiledRule
+
+from .bi_test_data import sample_config
+
+_SITE_ID = SiteId("heute")
+
+
+def _flatten(bundle: NodeResultBundle) -> list:
+    return [
+        (bundle.instance, bundle.actual_result, bundle.assumed_result),
+        *(entry for nested in bundle.nested_results for entry in _flatten(nested)),
+    ]
+
+
+def _flatten_all(bundles: list[NodeResultBundle]) -> list:
+    return [entry for bundle in bundles for entry in _flatten(bundle)]
+
+
+def _service(state: int) -> BIServiceWithFullState:
+    return BIServiceWithFullState(state, True, f"state {state}", state, 1, 1, 0, False, True)
+
+
+def _rule(title: str, nodes: list) -> BICompiledRule:
+    return BICompiledRule(
+        title,
+        "default",
+        nodes,
+        [],
+        BIRuleProperties(
+            {"title": title, "comment": "", "docu_url": "", "icon": "", "state_messages": {}}
+        ),
+        BIAggregationFunctionWorst({"count": 1, "restrict_state": 2}),
+        {},
+    )
+
+
+def _synthetic_aggregation(
+    bi_status_fetcher: BIStatusFetcher, num_hosts: int, num_groups: int, num_services: int
+) -> BICompiledAggregation:
+    """One branch per host: host rule -> service group rules -> service leaves"""
+    branches = []
+    for host_idx in range(num_hosts):
+        host_name = HostName(f"host{host_idx}")
+        services = {}
+        groups = []
+        for group_idx in range(num_groups):
+            leaves = []
+            for service_idx in range(num_services):
+                service_description = f"service {group_idx}/{service_idx}"
+                services[service_description] = _service(0)
+                leaves.append(BICompiledLeaf(host_name, _SITE_ID, service_description))
+            groups.append(_rule(f"{host_name} group {group_idx}", leaves))
+        bi_status_fetcher.states[BIHostSpec(_SITE_ID, host_name)] = BIHostStatusInfoRow(
+            0, True, 0, "UP", 0, True, False, services, {}
+        )
+        branches.append(_rule(host_name, [BICompiledLeaf(host_name, _SITE_ID), *groups]))
+
+    return BICompiledAggregation(
+        "synthetic",
+        branches,
+        BIAggregationComputationOptions(
+            {"disabled": False, "use_hard_states": False, "escalate_downtimes_as_warn": False}
+        ),
+        {},
+        BIAggregationGroups({"names": ["Synthetic"], "paths": []}),
+    )
+
+
+def _set_service_state(
+    bi_status_fetcher: BIStatusFetcher, host_name: str, service_description: str, state: int
+) -> None:
+    host_spec = BIHostSpec(_SITE_ID, HostName(host_name))
+    host_row = bi_status_fetcher.states[host_spec]
+    bi_status_fetcher.states[host_spec] = host_row._replace(
+        services_with_fullstate={
+            **host_row.services_with_fullstate,
+            service_description: _service(state),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "status_data",
+    [
+        sample_config.bi_status_rows,
+        sample_config.bi_acknowledgment_status_rows,
+        sample_config.bi_downtime_status_rows,
+        sample_config.bi_service_period_status_rows,
+    ],
+)
+def test_cached_computation_matches_full_computation(
+    bi_packs_sample_config: BIAggregationPacks,
+    bi_structure_fetcher: BIStructureFetcher,
+    bi_searcher: BISearcher,
+    bi_status_fetcher: BIStatusFetcher,
+    status_data: LivestatusResponse,
+) -> None:
+    bi_structure_fetcher.add_site_data(_SITE_ID, sample_config.bi_structure_states)
+    bi_searcher.set_hosts(bi_structure_fetcher.hosts)
+    bi_status_fetcher.states = bi_status_fetcher.create_bi_status_data(status_data)
+    bi_aggregation = bi_packs_sample_config.get_aggregation("default_aggregation")
+    assert bi_aggregation is not None
+    compiled_aggregation = bi_aggregation.compile(bi_searcher)
+
+    cache = BINodeResultCache()
+    for _run in range(2):
+        assert _flatten_all(
+            cache.compute_branches(
+                compiled_aggregation, compiled_aggregation.branches, bi_status_fetcher
+            )
+        ) == _flatten_all(
+            compiled_aggregation.compute_branches(compiled_aggregation.branches, bi_status_fetcher)
+        )
+
+
+def test_only_dirty_paths_are_recomputed(bi_status_fetcher: BIStatusFetcher) -> None:
+    compiled_aggregation = _synthetic_aggregation(
+        bi_status_fetcher, num_hosts=3, num_groups=2, num_services=2
+    )
+    branches = compiled_aggregation.branches
+    cache = BINodeResultCache()
+
+    cache.compute_branches(compiled_aggregation, branches, bi_status_fetcher)
+    # 3 branches with 1 root and 2 groups each
+    assert cache.stats.computed_nodes == 9
+    assert cache.stats.cached_nodes == 0
+
+    cache.compute_branches(compiled_aggregation, branches, bi_status_fetcher)
+    assert cache.stats.computed_nodes == 9
+    assert cache.stats.cached_nodes == 3
+
+    _set_service_state(bi_status_fetcher, "host1", "service 1/0", 2)
+    results = cache.compute_branches(compiled_aggregation, branches, bi_status_fetcher)
+    # Root and group 1 of host1 are recomputed, group 0 of host1 and the other branches are not
+    assert cache.stats.computed_nodes == 11
+    assert cache.stats.cached_nodes == 3 + 3
+    assert [bundle.actual_result.state for bundle in results] == [0, 2, 0]
+    assert _flatten_all(results) == _flatten_all(
+        compiled_aggregation.compute_branches(branches, bi_status_fetcher)
+    )
+
+
+def test_assumed_states_invalidate_results(bi_status_fetcher: BIStatusFetcher) -> None:
+    compiled_aggregation = _synthetic_aggregation(
+        bi_status_fetcher, num_hosts=2, num_groups=1, num_services=2
+    )
+    branches = compiled_aggregation.branches
+    cache = BINodeResultCache()
+    cache.compute_branches(compiled_aggregation, branches, bi_status_fetcher)
+
+    bi_status_fetcher.assumed_states = {
+        RequiredBIElement(_SITE_ID, HostName("host0"), "service 0/1"): 1
+    }
+    results = cache.compute_branches(compiled_aggregation, branches, bi_status_fetcher)
+    assert results[0].assumed_result is not None
+    assert results[0].assumed_result.state == 1
+    assert results[1].assumed_result is None
+    assert _flatten_all(results) == _flatten_all(
+        compiled_aggregation.compute_branches(branches, bi_status_fetcher)
+    )
+
+
+def test_results_survive_reloaded_aggregations(bi_status_fetcher: BIStatusFetcher) -> None:
+    cache = BINodeResultCache()
+    cache.clear_on_change("compiled once")
+    compiled_aggregation = _synthetic_aggregation(
+        bi_status_fetcher, num_hosts=2, num_groups=1, num_services=1
+    )
+    cache.compute_branches(compiled_aggregation, compiled_aggregation.branches, bi_status_fetcher)
+    assert cache.stats.computed_nodes == 4
+
+    # The next request loads the same aggregation into new objects
+    cache.clear_on_change("compiled once")
+    reloaded_aggregation = _synthetic_aggregation(
+        bi_status_fetcher, num_hosts=2, num_groups=1, num_services=1
+    )
+    cache.compute_branches(reloaded_aggregation, reloaded_aggregation.branches, bi_status_fetcher)
+    assert cache.stats.computed_nodes == 4
+    assert cache.stats.cached_nodes == 2
+
+    cache.clear_on_change("compiled twice")
+    cache.compute_branches(reloaded_aggregation, reloaded_aggregation.branches, bi_status_fetcher)
+    assert cache.stats.computed_nodes == 4
+    assert cache.stats.cached_nodes == 0
+
+
+@pytest.mark.slow
+def test_benchmark_incremental_computation(bi_status_fetcher: BIStatusFetcher) -> None:
+    # 1000 branches with 1 + 9 rules and 1 + 90 leaves each: ~100k nodes
+    compiled_aggregation = _synthetic_aggregation(
+        bi_status_fetcher, num_hosts=1000, num_groups=9, num_services=10
+    )
+    branches = compiled_aggregation.branches
+    cache = BINodeResultCache()
+    cache.compute_branches(compiled_aggregation, branches, bi_status_fetcher)
+
+    full_durations = []
+    incremental_durations = []
+    for run in range(5):
+        _set_service_state(bi_status_fetcher, f"host{run}", "service 0/0", 2)
+
+        start = time.perf_counter()
+        full_results = compiled_aggregation.compute_branches(branches, bi_status_fetcher)
+        full_durations.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        incremental_results = cache.compute_branches(
+            compiled_aggregation, branches, bi_status_fetcher
+        )
+        incremental_durations.append(time.perf_counter() - start)
+
+        assert _flatten_all(incremental_results) == _flatten_all(full_results)
+
+    print(
+        f"\nBI computation of ~100k nodes, one changed service per run: "
+        f"full {min(full_durations):.3f}s, incremental {min(incremental_durations):.3f}s"
+    )
+    assert min(incremental_durations) < min(full_durations)
@@ -5,18 +5,27 @@
 
 from collections.abc import Mapping
 from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
 
 from cmk.utils.hostaddress import HostAddress
 from cmk.utils.servicename import ServiceName
 
 from cmk.checkengine.checking import (
+    _timing,
     AggregatedResult,
     check_plugins_missing_data,
     CheckPluginName,
     ConfiguredService,
     merge_enforced_services,
+    PluginTime,
+    PluginTimer,
+    PluginTimesBuffer,
+    PluginTimesStore,
     ServiceConfigurer,
     ServiceID,
+    slowest_plugins,
 )
 from cmk.checkengine.checkresults import UnsubmittableServiceCheckResult
 from cmk.checkengine.exitspec import ExitSpec
@@ -270,3 +279,85 @@ def test_aggregate_enforced_services_merge() -> None:
             True,
         ),
     )
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def process_time(self) -> float:
+        return self.now / 2
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_plugin_timer_exclusive_times(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = _FakeClock()
+    monkeypatch.setattr(_timing, "time", clock)
+    timer = PluginTimer()
+
+    def parse_function(string_table: object) -> object:
+        clock.now += 3.0
+        return string_table
+
+    parse = timer.track("parse", "uptime", parse_function)
+
+    def check_function() -> object:
+        clock.now += 1.0
+        parsed = parse("section")
+        clock.now += 1.0
+        return parsed
+
+    check = timer.track("check", "uptime", check_function)
+
+    assert check() == "section"
+    assert check() == "section"
+    assert timer.times == {
+        ("parse", "uptime"): PluginTime(2, 6.0, 3.0),
+        ("check", "uptime"): PluginTime(2, 4.0, 2.0),
+    }
+
+
+def test_plugin_times_store(tmp_path: Path) -> None:
+    plugin_times_store = PluginTimesStore(tmp_path / "plugin_times.mk")
+    assert not plugin_times_store.load()
+
+    plugin_times_store.add({("check", "df"): PluginTime(1, 0.5, 0.25)})
+    plugin_times_store.add(
+        {("check", "df"): PluginTime(2, 1.0, 0.5), ("parse", "df"): PluginTime(1, 2.0, 1.0)}
+    )
+
+    times = plugin_times_store.pop()
+    assert slowest_plugins(times) == [
+        ("parse", "df", PluginTime(1, 2.0, 1.0)),
+        ("check", "df", PluginTime(3, 1.5, 0.75)),
+    ]
+    assert slowest_plugins(times, 1) == [("parse", "df", PluginTime(1, 2.0, 1.0))]
+    assert not plugin_times_store.load()
+
+
+def test_plugin_times_buffer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = _FakeClock()
+    monkeypatch.setattr(_timing, "time", clock)
+    plugin_times_store = PluginTimesStore(tmp_path / "plugin_times.mk")
+    plugin_times_buffer = PluginTimesBuffer(plugin_times_store, flush_interval=60.0)
+
+    plugin_times_buffer.add({("check", "df"): PluginTime(1, 0.5, 0.25)})
+    clock.now += 30.0
+    plugin_times_buffer.add({("check", "df"): PluginTime(1, 0.5, 0.25)})
+    assert not plugin_times_store.load()
+
+    clock.now += 30.0
+    plugin_times_buffer.add({("parse", "df"): PluginTime(1, 2.0, 1.0)})
+    assert plugin_times_store.load() == {
+        ("check", "df"): PluginTime(2, 1.0, 0.5),
+        ("parse", "df"): PluginTime(1, 2.0, 1.0),
+    }
+
+    plugin_times_buffer.add({("check", "df"): PluginTime(1, 0.5, 0.25)})
+    plugin_times_buffer.flush()
+    assert plugin_times_store.load()[("check", "df")] == PluginTime(3, 1.5, 0.75)
@@ -26,6 +26,7 @@ from cmk.checkengine.parser import (
     AgentParser,
     AgentRawDataSectionElem,
     NO_SELECTION,
+    SectionNameCollection,
     SectionStore,
     SNMPParser,
 )
@@ -731,6 +732,52 @@ class TestAgentParser:
         }
         assert store.load() == {}
 
+    def test_line_endings_and_empty_lines(
+        self, parser: AgentParser, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(time, "time", lambda c=itertools.count(1000, 50): next(c))
+        monkeypatch.setattr(parser, "cache_piggybacked_data_for", 900)
+        raw_data = AgentRawData(
+            b"<<<stripped>>>\r\n  1st line  \r\n\r\n   \n"
+            b"<<<not_stripped:nostrip:sep(124)>>>\n  2nd|line  \r\r\n\n"
+            b"<<<<piggy>>>>\r\n<<<section>>>\n  3rd line  \n\n<<<<>>>>\n"
+            b"<<<stripped>>>\n4th line"
+        )
+
+        ahs = parser.parse(raw_data, selection=NO_SELECTION)
+
+        assert ahs.sections == {
+            SectionName("stripped"): [["1st", "line"], ["4th", "line"]],
+            SectionName("not_stripped"): [["2nd", "line"]],
+        }
+        assert ahs.piggybacked_raw_data == {
+            "piggy": [b"<<<section:cached(1000,900)>>>", b"  3rd line  "],
+        }
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("selected", [True, False])
+    def test_benchmark_parse_large_output(self, parser: AgentParser, selected: bool) -> None:
+        # Like the output of Windows agents with huge event log and process sections
+        raw_data = AgentRawData(
+            b"<<<check_mk>>>\nVersion: 2.4.0\n"
+            + b"".join(
+                b"<<<section_%d:sep(9)>>>\n" % n
+                + b"".join(b"line\t%d\tof section\t%d\n" % (m, n) for m in range(2000))
+                for n in range(100)
+            )
+            + b"<<<<piggy>>>>\n<<<section_0>>>\nline\n<<<<>>>>\n"
+        )
+        selection: SectionNameCollection = (
+            frozenset({SectionName("check_mk")}) if selected else NO_SELECTION
+        )
+
+        start = time.perf_counter()
+        ahs = parser.parse(raw_data, selection=selection)
+        duration = time.perf_counter() - start
+
+        assert len(ahs.sections) == (1 if selected else 101)
+        print(f"{len(raw_data)} bytes, selected {selected}: {duration:.3f}s")
+
 
 class ParserStateAdapter(ParserState):
     def __init__(self, *, translation: TranslationOptions | None = None):
@@ -4,14 +4,28 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import logging
+import os
+import socket
+from pathlib import Path
+
+import pytest
 
 from tests.unit.cmk.ec.helpers import new_event
 
 from cmk.utils.hostaddress import HostName
 
 import cmk.ec.export as ec
+import cmk.ec.main
 from cmk.ec.config import Config, MatchGroups, ServiceLevel
-from cmk.ec.main import create_history, EventServer, StatusTableEvents, StatusTableHistory
+from cmk.ec.main import (
+    create_history,
+    EventServer,
+    SpoolDirectory,
+    StatusTableEvents,
+    StatusTableHistory,
+    tune_udp_socket,
+)
+from cmk.ec.perfcounters import Perfcounters
 
 RULE = ec.Rule(
     actions=[],
@@ -61,3 +75,151 @@ def test_event_rewrite(
 
     assert event["text"] == "SUPERWARN"
     assert event["state"] == 2
+
+
+def test_spool_directory(tmp_path: Path) -> None:
+    spool_path = tmp_path / "spool"
+    spool_path.mkdir()
+    (spool_path / "old").write_bytes(b"old message")
+    os.utime(spool_path / "old", (1, 1))
+    (spool_path / "older").write_bytes(b"older message")
+    os.utime(spool_path / "older", (0, 0))
+
+    spool_directory = SpoolDirectory(spool_path)
+    try:
+        assert spool_directory.backlog == 2
+
+        (spool_path / ".incomplete").write_bytes(b"new message")
+        (spool_path / ".incomplete").rename(spool_path / "new")
+        (spool_path / "newest").write_bytes(b"newest message")
+        (spool_path / ".ignored").write_bytes(b"ignored message")
+        spool_directory.read_events()
+
+        assert spool_directory.backlog == 4
+        assert [spool_directory.pop() for _i in range(5)] == [
+            spool_path / "older",
+            spool_path / "old",
+            spool_path / "new",
+            spool_path / "newest",
+            None,
+        ]
+    finally:
+        spool_directory.close()
+
+
+def test_receive_datagrams(event_server: EventServer, perfcounters: Perfcounters) -> None:
+    with (
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver,
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender,
+    ):
+        receiver.bind(("127.0.0.1", 0))
+        tune_udp_socket(receiver)
+        sender.bind(("127.0.0.1", 0))
+        for n in range(5):
+            sender.sendto(b"message %d" % n, receiver.getsockname())
+
+        datagrams = event_server.receive_datagrams(receiver, "syslog socket (UDP)")
+        assert [message for message, _address in datagrams] == [b"message %d" % n for n in range(5)]
+        assert {address for _message, address in datagrams} == {sender.getsockname()}
+        assert not event_server.receive_datagrams(receiver, "syslog socket (UDP)")
+        assert perfcounters._counters["drain_limit_hits"] == 0
+        assert perfcounters._counters["udp_drops"] == 0
+
+
+def test_receive_datagrams_respects_budget(
+    event_server: EventServer, perfcounters: Perfcounters, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cmk.ec.main, "_DRAIN_BUDGET", 3)
+    with (
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver,
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender,
+    ):
+        receiver.bind(("127.0.0.1", 0))
+        for n in range(5):
+            sender.sendto(b"message %d" % n, receiver.getsockname())
+
+        assert len(event_server.receive_datagrams(receiver, "syslog socket (UDP)")) == 3
+        assert perfcounters._counters["drain_limit_hits"] == 1
+        assert len(event_server.receive_datagrams(receiver, "syslog socket (UDP)")) == 2
+
+
+def test_receive_datagrams_exhausting_budget_without_rest(
+    event_server: EventServer, perfcounters: Perfcounters, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cmk.ec.main, "_DRAIN_BUDGET", 3)
+    with (
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver,
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender,
+    ):
+        receiver.bind(("127.0.0.1", 0))
+        for n in range(3):
+            sender.sendto(b"message %d" % n, receiver.getsockname())
+
+        assert len(event_server.receive_datagrams(receiver, "syslog socket (UDP)")) == 3
+        assert perfcounters._counters["drain_limit_hits"] == 0
+
+
+def test_receive_datagrams_counts_drops(
+    event_server: EventServer, perfcounters: Perfcounters
+) -> None:
+    with (
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as receiver,
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender,
+    ):
+        receiver.bind(("127.0.0.1", 0))
+        tune_udp_socket(receiver)
+        # The smallest possible buffer, so the kernel has to drop most of the datagrams
+        receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1)
+        for _n in range(100):
+            sender.sendto(b"x" * 1000, receiver.getsockname())
+        received = len(event_server.receive_datagrams(receiver, "syslog socket (UDP)"))
+
+        # The drop counter is attached to the datagrams received after the drops
+        sender.sendto(b"x", receiver.getsockname())
+        received += len(event_server.receive_datagrams(receiver, "syslog socket (UDP)"))
+
+        assert perfcounters._counters["udp_drops"] == 101 - received
+
+
+def test_read_stream(event_server: EventServer) -> None:
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        reader.setblocking(False)
+        writer.sendall(b"first\nsecond\nincompl")
+
+        messages, unprocessed, at_eof = event_server.read_stream("test", reader.fileno(), b"")
+        assert list(messages) == [b"first", b"second"]
+        assert unprocessed == b"incompl"
+        assert not at_eof
+
+        writer.sendall(b"ete\n")
+        writer.shutdown(socket.SHUT_WR)
+        messages, unprocessed, at_eof = event_server.read_stream(
+            "test", reader.fileno(), unprocessed
+        )
+        assert list(messages) == [b"incomplete"]
+        assert unprocessed == b""
+        assert at_eof
+
+
+def test_read_stream_respects_budget(
+    event_server: EventServer, perfcounters: Perfcounters, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cmk.ec.main, "_RECEIVE_BUFFER_SIZE", 4)
+    monkeypatch.setattr(cmk.ec.main, "_DRAIN_BUDGET", 2)
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        reader.setblocking(False)
+        writer.sendall(b"a\nb\n")
+        messages, _unprocessed, _at_eof = event_server.read_stream("test", reader.fileno(), b"")
+        assert list(messages) == [b"a", b"b"]
+        assert perfcounters._counters["drain_limit_hits"] == 0
+
+        writer.sendall(b"c\nd\ne\n")
+        messages, unprocessed, _at_eof = event_server.read_stream("test", reader.fileno(), b"")
+        assert list(messages) == [b"c", b"d"]
+        assert perfcounters._counters["drain_limit_hits"] == 1
+        messages, _unprocessed, _at_eof = event_server.read_stream(
+            "test", reader.fileno(), unprocessed
+        )
+        assert list(messages) == [b"e"]
@@ -6,8 +6,9 @@
 
 import datetime
 import logging
-import shlex
+from collections.abc import Sequence
 from pathlib import Path
+from typing import Any
 from zoneinfo import ZoneInfo
 
 import time_machine
@@ -18,13 +19,13 @@ import cmk.ec.export as ec
 from cmk.ec.config import Config
 from cmk.ec.history import _current_history_period
 from cmk.ec.history_file import (
-    _grep_pipeline,
+    _LogfileIndex,
     convert_history_line,
     FileHistory,
     parse_history_file,
 )
-from cmk.ec.main import StatusTableHistory
-from cmk.ec.query import QueryFilter, QueryGET, StatusTable
+from cmk.ec.main import StatusTableEvents, StatusTableHistory
+from cmk.ec.query import QueryGET, StatusTable
 
 
 def test_file_add_get(history: FileHistory) -> None:
@@ -89,23 +90,99 @@ def test_history_parse(tmp_path: Path) -> None:
     """
     path = tmp_path / "history_test.log"
     path.write_text(values)
-    filter_ = QueryFilter(
-        column_name="event_id",
-        operator_name="=",
-        predicate=lambda x: True,
-        argument="1",
-    )
-    tac = f"nl -b a {shlex.quote(str(path))} | tac"
-    cmd = " | ".join([tac] + _grep_pipeline([filter_]))
+    index = _LogfileIndex(path)
+    index.append(index.scan(path, {}).build())
 
     new_entries = parse_history_file(
         StatusTableHistory.columns,
         path,
+        index.blocks,
+        lambda line: True,
         lambda x: True,
-        cmd,
         None,
         logging.getLogger("cmk.mkeventd"),
     )
 
     assert len(new_entries) == 4
+    assert new_entries[0][0] == 4
     assert new_entries[0][1] == 1666942292.3000507
+
+
+def _query(history: FileHistory, *headers: str) -> Sequence[Sequence[Any]]:
+    logger = logging.getLogger("cmk.mkeventd")
+    return list(
+        history.get(
+            QueryGET(
+                lambda name: StatusTableHistory(logger, history),
+                ["GET history", "Columns: history_line event_id event_host", *headers],
+                logger,
+            )
+        )
+    )
+
+
+def _fill(history: FileHistory, num_events: int) -> None:
+    for event_id in range(num_events):
+        history.add(
+            ec.Event(
+                id=event_id,
+                host=HostName(f"Host{event_id % 10}"),
+                rule_id=f"rule{event_id % 3}",
+                text=f"Event {event_id}",
+            ),
+            what="NEW",
+        )
+
+
+def test_file_index(history: FileHistory, settings: ec.Settings) -> None:
+    _fill(history, 2500)
+    (logfile,) = settings.paths.history_dir.value.glob("*.log")
+    # The index stores the complete blocks, the last block is still growing
+    assert len(_LogfileIndex.load(logfile, logging.getLogger("cmk.mkeventd")).blocks) == 2
+
+    rows = _query(history, "Filter: event_host = Host3", "Filter: event_rule_id = rule1")
+    assert sorted(row[5] for row in rows) == list(range(13, 2500, 30))
+    # The line numbers are the ones of the entries in the file
+    assert all(row[0] == row[5] + 1 for row in rows)
+    # Younger entries first
+    assert [row[5] for row in rows][:2] == [2473, 2443]
+
+    assert [row[5] for row in _query(history, "Filter: event_id = 1234")] == [1234]
+    assert [row[5] for row in _query(history, "Filter: event_id = 2499")] == [2499]
+    assert not _query(history, "Filter: event_host = unknown")
+    assert len(_query(history, "Filter: event_host in host1 HOST2")) == 500
+    assert len(_query(history, "Filter: event_host = Host1", "Limit: 7")) == 7
+
+
+def test_file_index_is_rebuilt(history: FileHistory, settings: ec.Settings, config: Config) -> None:
+    _fill(history, 1500)
+    history.close()
+    (logfile,) = settings.paths.history_dir.value.glob("*.log")
+    index_file = logfile.with_suffix(".idx")
+    # The incomplete last block is stored on close
+    assert len(_LogfileIndex.load(logfile, logging.getLogger("cmk.mkeventd")).blocks) == 2
+
+    index_file.write_text("garbage\n")
+    history = FileHistory(
+        settings,
+        config,
+        logging.getLogger("cmk.mkeventd"),
+        StatusTableEvents.columns,
+        StatusTableHistory.columns,
+    )
+    assert [row[5] for row in _query(history, "Filter: event_id = 1400")] == [1400]
+    assert len(_LogfileIndex.load(logfile, logging.getLogger("cmk.mkeventd")).blocks) == 2
+
+    # Continue writing to the existing logfile
+    _fill(history, 10)
+    assert sorted(row[0] for row in _query(history, "Filter: event_id = 5")) == [6, 1506]
+
+    history.flush()
+    assert not list(settings.paths.history_dir.value.iterdir())
+
+
+def test_file_entries_are_written_right_away(history: FileHistory, settings: ec.Settings) -> None:
+    _fill(history, 3)
+    (logfile,) = settings.paths.history_dir.value.glob("*.log")
+    # Nothing is left in the write buffer, even without housekeeping or a query
+    assert len(logfile.read_bytes().splitlines()) == 3
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import logging
+from collections.abc import Iterator, Sequence
+
+import pytest
+
+import cmk.ec.export as ec
+from cmk.ec.config import Config, ServiceLevel
+from cmk.ec.event import create_events_from_syslog_messages, Event
+from cmk.ec.helpers import ECLock
+from cmk.ec.history_file import FileHistory
+from cmk.ec.main import (
+    EventMatcher,
+    EventServer,
+    EventStatus,
+    RuleMatchingPool,
+    SlaveStatus,
+    StatusTableEvents,
+)
+from cmk.ec.perfcounters import Perfcounters
+
+
+def _rule(rule_id: str, **kwargs: object) -> ec.Rule:
+    rule = ec.Rule(
+        actions=[],
+        actions_in_downtime=True,
+        autodelete=False,
+        cancel_action_phases="always",
+        cancel_actions=[],
+        comment="",
+        description="",
+        disabled=False,
+        docu_url="",
+        id=rule_id,
+        invert_matching=False,
+        sl=ServiceLevel(precedence="message", value=0),
+        state=0,
+    )
+    rule.update(kwargs)  # type: ignore[typeddict-item]
+    return rule
+
+
+RULES = [
+    _rule("skip", match="^skipped", drop="skip_pack"),
+    _rule("skipped", match="^skipped"),
+    _rule("drop", match="^debug", drop=True),
+    _rule("problem", match="^error (.*)$", match_ok="^recovered (.*)$", state=2),
+    _rule("rewrite", match="^warning (.*)$", set_text="rewritten \\1", state=1),
+]
+
+
+@pytest.fixture(autouse=True)
+def log_directory(settings: ec.Settings) -> None:
+    # The worker processes log into the log file of the Event Console
+    settings.paths.log_file.value.parent.mkdir(parents=True, exist_ok=True)
+
+
+@pytest.fixture(name="rules_config")
+def fixture_rules_config(config: Config) -> Config:
+    return config | {"rule_packs": [ec.default_rule_pack(RULES)]}
+
+
+@pytest.fixture(name="event_matcher")
+def fixture_event_matcher(settings: ec.Settings, rules_config: Config) -> EventMatcher:
+    matcher = EventMatcher(logging.getLogger("cmk.mkeventd.EventServer"), settings, rules_config)
+    matcher.compile_rules(rules_config["rule_packs"])
+    return matcher
+
+
+@pytest.fixture(name="rule_matching_pool")
+def fixture_rule_matching_pool(
+    settings: ec.Settings, rules_config: Config
+) -> Iterator[RuleMatchingPool]:
+    pool = RuleMatchingPool(
+        logging.getLogger("cmk.mkeventd.EventServer"),
+        settings,
+        rules_config,
+        rules_config["rule_packs"],
+        2,
+    )
+    yield pool
+    pool.shutdown()
+
+
+def _events(texts: Sequence[str], hosts: int = 5) -> list[Event]:
+    return list(
+        create_events_from_syslog_messages(
+            [
+                f"<13>Oct 19 12:00:00 host{n % hosts} app[4711]: {text}".encode()
+                for n, text in enumerate(texts)
+            ],
+            None,
+            None,
+        )
+    )
+
+
+def test_match_event(event_matcher: EventMatcher) -> None:
+    orphan, skipped, dropped, cancelling, problem, rewritten = (
+        event_matcher.match_event(event)
+        for event in _events(
+            ["nothing", "skipped", "debug", "recovered disk", "error disk", "warning disk"]
+        )
+    )
+
+    assert orphan.rule_id is None
+    assert orphan.rule_tries == len(RULES)
+
+    assert skipped.rule_id is None
+    assert skipped.rule_hits == ["skip"]
+    assert skipped.rule_tries == 1  # all other rules are in the skipped pack
+
+    assert dropped.rule_id == "drop"
+    assert dropped.dropped
+
+    assert cancelling.rule_id == "problem"
+    assert cancelling.cancelling
+    assert not cancelling.dropped
+
+    assert problem.rule_id == "problem"
+    assert not problem.cancelling
+    assert problem.event["state"] == 2
+    assert problem.event["match_groups"] == ("disk",)
+
+    assert rewritten.rule_id == "rewrite"
+    assert rewritten.event["text"] == "rewritten disk"
+    assert rewritten.event["state"] == 1
+
+
+def test_rule_matching_pool_matches_like_event_matcher(
+    event_matcher: EventMatcher, rule_matching_pool: RuleMatchingPool
+) -> None:
+    texts = ["nothing", "skipped", "debug", "recovered disk", "error disk", "warning disk"] * 10
+    # The time of rewritten events is compared, so the events must not be shared
+    expected = [event_matcher.match_event(event) for event in _events(texts)]
+
+    assert rule_matching_pool.match_events(_events(texts)) == expected
+
+
+def _no_core_host(event: Event) -> None:
+    event["core_host"] = None
+
+
+def _event_server(
+    settings: ec.Settings,
+    config: Config,
+    slave_status: SlaveStatus,
+    history: FileHistory,
+) -> EventServer:
+    perfcounters = Perfcounters(logging.getLogger("cmk.mkeventd.lock.perfcounters"))
+    event_server = EventServer(
+        logging.getLogger("cmk.mkeventd.EventServer"),
+        settings,
+        config,
+        slave_status,
+        perfcounters,
+        ECLock(logging.getLogger("cmk.mkeventd.configuration")),
+        history,
+        EventStatus(
+            settings, config, perfcounters, history, logging.getLogger("cmk.mkeventd.EventStatus")
+        ),
+        StatusTableEvents.columns,
+        False,
+    )
+    event_server.reload_configuration(config, history=history)
+    # There is no monitoring core to ask for hosts and downtimes
+    event_server.add_core_host_to_event = _no_core_host  # type: ignore[method-assign]
+    return event_server
+
+
+def _processed(event_server: EventServer, events: Sequence[Event]) -> list[tuple[str, str, str]]:
+    event_server.process_potential_event_instrumented(events)
+    return sorted(
+        (event["host"], event["text"], event["phase"])
+        for event in event_server._event_status.events()  # pylint: disable=protected-access
+    )
+
+
+def test_process_events_in_worker_processes(
+    settings: ec.Settings,
+    rules_config: Config,
+    slave_status: SlaveStatus,
+    history: FileHistory,
+) -> None:
+    texts = ["error disk", "warning disk", "debug", "recovered disk", "error cpu", "error disk"]
+
+    expected = _processed(
+        _event_server(settings, rules_config, slave_status, history), _events(texts, hosts=3)
+    )
+
+    event_server = _event_server(
+        settings, rules_config | {"rule_matching_processes": 2}, slave_status, history
+    )
+    try:
+        assert _processed(event_server, _events(texts, hosts=3)) == expected
+    finally:
+        event_server._stop_rule_matching_pool()  # pylint: disable=protected-access
+
+    # The recovery of host0 cancelled its first error
+    assert expected == [
+        ("host1", "error cpu", "open"),
+        ("host1", "rewritten disk", "open"),
+        ("host2", "error disk", "open"),
+    ]
+
+
+@pytest.mark.parametrize("processes", [1, 4])
+def test_many_rules_match_alike_in_worker_processes(
+    settings: ec.Settings,
+    config: Config,
+    slave_status: SlaveStatus,
+    history: FileHistory,
+    processes: int,
+) -> None:
+    # Many rules that have to be tried, like on sites with big rule packs
+    rules = [_rule(f"rule{n}", match=f"^(message|text) {n}[a-z]+ (.*)$") for n in range(100)]
+    rules_config = config | {"rule_packs": [ec.default_rule_pack(rules)]}
+    texts = [f"message {n % 150}x abc" for n in range(300)]
+
+    expected = _processed(
+        _event_server(settings, rules_config, slave_status, history), _events(texts, hosts=100)
+    )
+
+    event_server = _event_server(
+        settings, rules_config | {"rule_matching_processes": processes}, slave_status, history
+    )
+    try:
+        assert _processed(event_server, _events(texts, hosts=100)) == expected
+    finally:
+        event_server._stop_rule_matching_pool()  # pylint: disable=protected-access
+
+    # The messages no rule matches are not events
+    assert len(expected) == 200
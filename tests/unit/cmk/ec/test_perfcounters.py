@@ -23,6 +23,21 @@ def test_perfcounters_count() -> None:
     assert not [(k, v) for k, v in c._counters.items() if k != "messages" and v > 0]
 
 
+def test_perfcounters_count_amount() -> None:
+    c = Perfcounters(logger)
+    c.count("udp_drops", 5)
+    c.count("udp_drops")
+    assert c._counters["udp_drops"] == 6
+
+
+def test_perfcounters_gauge() -> None:
+    c = Perfcounters(logger)
+    c.set_gauge("spool_backlog", 5)
+    c.set_gauge("spool_backlog", 2)
+    status = dict(zip([n for n, _d in c.status_columns()], c.get_status()))
+    assert status["status_spool_backlog"] == 2
+
+
 def test_perfcounters_count_time() -> None:
     c = Perfcounters(logger)
     assert "processing" not in c._times
@@ -34,6 +49,19 @@ def test_perfcounters_count_time() -> None:
     assert c._times["processing"] == 1.04
 
 
+def test_perfcounters_count_time_of_samples() -> None:
+    c = Perfcounters(logger)
+    c.count_time("processing", 1.0)
+    for _sample in range(3):
+        c.count_time("processing", 5.0)
+    one_by_one = c._times["processing"]
+
+    c = Perfcounters(logger)
+    c.count_time("processing", 1.0)
+    c.count_time("processing", 5.0, samples=3)
+    assert c._times["processing"] == pytest.approx(one_by_one)
+
+
 def test_perfcounters_do_statistics(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr("time.time", lambda: 1.0)
 
@@ -115,6 +143,9 @@ def test_perfcounters_correct_status_values() -> None:
     for _x in range(2):
         c.count("rule_tries")
 
+    c.count("udp_drops", 17)
+    c.set_gauge("spool_backlog", 3)
+
     for column_name, column_value in zip([n for n, _d in c.status_columns()], c.get_status()):
         if column_name.startswith("status_average_") and column_name.endswith("_time"):
             counter_name = column_name.split("_")[-2]
@@ -128,6 +159,9 @@ def test_perfcounters_correct_status_values() -> None:
             counter_name = column_name.split("_")[-2]
             assert column_value == c._rates.get(counter_name, 0.0)
 
+        elif column_name.startswith("status_") and column_name[7:] in c._gauges:
+            assert column_value == c._gauges[column_name[7:]]
+
         elif column_name.startswith("status_"):
             counter_name = "_".join(column_name.split("_")[1:])
             assert column_value == c._counters[counter_name], "Invalid value {!r}: {!r}".format(
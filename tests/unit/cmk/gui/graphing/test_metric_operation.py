@@ -3,13 +3,20 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import random
+import time
 from typing import Literal
 
 import pytest
 
 from cmk.ccc.exceptions import MKGeneralException
 
-from cmk.gui.graphing._metric_operation import _time_series_math, Operators
+from cmk.gui.graphing._metric_operation import (
+    _time_series_math,
+    op_func_wrapper,
+    Operators,
+    time_series_operators,
+)
 from cmk.gui.time_series import TimeSeries
 
 
@@ -28,3 +35,63 @@ def test__time_series_math_exc_symbol(args: tuple[Literal["%"], list[TimeSeries]
 def test__time_series_math_stable_singles(operator: Operators) -> None:
     test_ts = TimeSeries([0, 180, 60, 6, 5, 10, None, -2, -3.14])
     assert _time_series_math(operator, [test_ts]) == test_ts
+
+
+@pytest.mark.parametrize(
+    "operator, operands, expected",
+    [
+        pytest.param("+", [[1, None, None], [2, 3, None]], [3, 3, None], id="sum"),
+        pytest.param("*", [[2, None, 3], [4, 5, 0]], [8, None, 0], id="product"),
+        pytest.param("-", [[5, None, 1], [3, 1, 4]], [2, None, -3], id="difference"),
+        pytest.param("/", [[6, 1, None, 3], [3, 0, 2, None]], [2, None, None, None], id="fraction"),
+        pytest.param("MAX", [[1, None, None], [2, 3, None]], [2, 3, None], id="maximum"),
+        pytest.param("MIN", [[1, None, None], [2, 3, None]], [1, 3, None], id="minimum"),
+        pytest.param("AVERAGE", [[1, None, None], [2, 3, None]], [1.5, 3, None], id="average"),
+        pytest.param("MERGE", [[None, 2, None], [1, 3, None]], [1, 2, None], id="merge"),
+    ],
+)
+def test__time_series_math_missing_values(
+    operator: Operators, operands: list[list[float | None]], expected: list[float | None]
+) -> None:
+    twindow = (0, 60 * len(expected), 60)
+    assert _time_series_math(
+        operator, [TimeSeries(values, twindow) for values in operands]
+    ) == TimeSeries(expected, twindow)
+
+
+def test__time_series_math_truncates_to_shortest_operand() -> None:
+    result = _time_series_math(
+        "+", [TimeSeries([0, 180, 60, 1, 2, 3]), TimeSeries([0, 120, 60, 4, 5])]
+    )
+    assert result == TimeSeries([0, 180, 60, 5, 7])
+
+
+@pytest.mark.slow
+def test_benchmark_sum_of_many_time_series() -> None:
+    # Stacked sum of 200 interfaces over a long time range
+    rng = random.Random(42)
+    num_points = 10000
+    operands = [
+        TimeSeries(
+            [None if rng.random() < 0.05 else rng.uniform(0, 1e9) for _ in range(num_points)],
+            (0, 60 * num_points, 60),
+        )
+        for _ in range(200)
+    ]
+
+    start = time.perf_counter()
+    _op_title, op_func = time_series_operators()["+"]
+    point_wise = [op_func_wrapper(op_func, list(tsp)) for tsp in zip(*operands)]
+    point_wise_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = _time_series_math("+", operands)
+    vectorized_duration = time.perf_counter() - start
+
+    print(
+        f"\nSum of 200 time series with {num_points} points: "
+        f"point wise {point_wise_duration:.3f}s, vectorized {vectorized_duration:.3f}s"
+    )
+    assert result is not None
+    assert result.values == pytest.approx(point_wise, rel=1e-12)
+    assert vectorized_duration < point_wise_duration
@@ -21,6 +21,7 @@ from cmk.gui.graphing._graph_templates import TemplateGraphSpecification
 from cmk.gui.graphing._legacy import CheckMetricEntry
 from cmk.gui.graphing._metric_operation import MetricOpRRDSource, RRDDataKey
 from cmk.gui.graphing._rrd_fetch import (
+    _chop_end_of_the_curve,
     _reverse_translate_into_all_potentially_relevant_metrics,
     fetch_rrd_data_for_graph,
     translate_and_merge_rrd_columns,
@@ -136,6 +137,19 @@ def test_fetch_rrd_data_for_graph_with_conversion(
         }
 
 
+def test_chop_end_of_the_curve() -> None:
+    key = RRDDataKey(SiteId("site"), HostName("host"), "service", "metric", "average", 1.0)
+    rrd_data = {key: TimeSeries([1, 2, None], time_window=(0, 180, 60))}
+
+    _chop_end_of_the_curve(rrd_data, 60)
+
+    chopped = rrd_data[key]
+    assert len(chopped) == 2
+    assert chopped == TimeSeries([1, 2], time_window=(0, 120, 60))
+    assert chopped.array.tolist() == [1.0, 2.0]
+    assert chopped.values == [1.0, 2.0]
+
+
 def test_translate_and_merge_rrd_columns() -> None:
     assert translate_and_merge_rrd_columns(
         MetricName("my_metric"),
@@ -55,6 +55,7 @@ def test_default_config_from_plugins() -> None:
         "debug_livestatus_queries",
         "show_livestatus_errors",
         "liveproxyd_enabled",
+        "livestatus_result_cache",
         "visible_views",
         "hidden_views",
         "service_view_grouping",
@@ -82,6 +83,7 @@ def test_default_config_from_plugins() -> None:
         "crash_report_target",
         "guitests_enabled",
         "bulk_discovery_default_settings",
+        "bulk_discovery_concurrency",
         "use_siteicons",
         "graph_timeranges",
         "agent_controller_certificates",
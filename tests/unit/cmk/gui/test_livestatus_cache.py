@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from collections.abc import Iterator
+
+import pytest
+
+from tests.unit.cmk.gui.conftest import SetConfig
+
+from livestatus import SiteId, UserId
+
+from cmk.utils.livestatus_helpers.testing import MockLiveStatusConnection
+from cmk.utils.redis import get_redis_client
+
+from cmk.gui import sites
+from cmk.gui.livestatus_cache import cached_live, LivestatusCacheStatistics, statistics
+
+
+@pytest.fixture(name="result_cache")
+def fixture_result_cache(request_context: None, set_config: SetConfig) -> Iterator[None]:
+    get_redis_client().flushall()
+    with set_config(livestatus_result_cache={"ttl": 10.0, "max_entries": 2}):
+        yield
+
+
+@pytest.mark.usefixtures("result_cache")
+def test_cached_query(mock_livestatus: MockLiveStatusConnection) -> None:
+    mock_livestatus.expect_query("GET hosts\nColumns: name\nColumnHeaders: off")
+    with mock_livestatus():
+        result = cached_live().query_column("GET hosts\nColumns: name")
+        # Answered from the cache, another query would not be expected by the mock
+        assert cached_live().query_column("GET hosts\n  Columns: name \n\n") == result
+
+    assert sorted(result) == ["example.com", "heute"]
+    assert statistics() == LivestatusCacheStatistics(hits=1, misses=1)
+    assert statistics().hit_rate == 0.5
+
+
+@pytest.mark.usefixtures("result_cache")
+def test_cached_query_depends_on_sites(mock_livestatus: MockLiveStatusConnection) -> None:
+    mock_livestatus.expect_query("GET hosts\nColumns: name")
+    mock_livestatus.expect_query("GET hosts\nColumns: name")
+    mock_livestatus.expect_query("GET hosts\nColumns: name", sites=["NO_SITE"])
+    with mock_livestatus():
+        cached_live().query("GET hosts\nColumns: name")
+        with sites.prepend_site():
+            cached_live().query("GET hosts\nColumns: name")
+        with sites.only_sites(SiteId("NO_SITE")):
+            cached_live().query("GET hosts\nColumns: name")
+
+    assert statistics() == LivestatusCacheStatistics(hits=0, misses=3)
+
+
+@pytest.mark.usefixtures("result_cache")
+def test_oldest_results_are_evicted(mock_livestatus: MockLiveStatusConnection) -> None:
+    for column in ["name", "state", "parents"]:
+        mock_livestatus.expect_query(f"GET hosts\nColumns: {column}")
+    with mock_livestatus():
+        for column in ["name", "state", "parents"]:
+            cached_live().query(f"GET hosts\nColumns: {column}")
+
+        mock_livestatus.expect_query("GET hosts\nColumns: name")
+        cached_live().query("GET hosts\nColumns: name")
+        cached_live().query("GET hosts\nColumns: parents")
+
+    assert statistics() == LivestatusCacheStatistics(hits=1, misses=4)
+
+
+@pytest.mark.usefixtures("result_cache")
+def test_cached_query_depends_on_auth_user(mock_livestatus: MockLiveStatusConnection) -> None:
+    mock_livestatus.expect_query("GET hosts\nColumns: name\nAuthUser: alice")
+    mock_livestatus.expect_query("GET hosts\nColumns: name\nAuthUser: bob")
+    mock_livestatus.expect_query("GET hosts\nColumns: name")
+    with mock_livestatus():
+        live = sites.live()
+        for user_id in ["alice", "bob", ""]:
+            # Each of them is sent to livestatus, none is answered with the result of another user
+            live.set_auth_user("read", UserId(user_id))
+            live.set_auth_domain("read")
+            cached_live().query("GET hosts\nColumns: name")
+
+        # The cached results are still there, each of them for its own user only
+        live.set_auth_user("read", UserId("bob"))
+        live.set_auth_domain("read")
+        cached_live().query("GET hosts\nColumns: name")
+
+    assert statistics() == LivestatusCacheStatistics(hits=1, misses=3)
@@ -2,11 +2,20 @@
 # Copyright (C) 2019 Checkmk GmbH - License: GNU General Public License v2
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
+import random
+import time
+from functools import partial
 
-
+import numpy as np
 import pytest
 
-from cmk.gui.time_series import rrd_timestamps, TimeSeries, TimeSeriesValues, TimeWindow
+from cmk.gui.time_series import (
+    aggregation_functions,
+    rrd_timestamps,
+    TimeSeries,
+    TimeSeriesValues,
+    TimeWindow,
+)
 
 
 @pytest.mark.parametrize(
@@ -101,3 +110,98 @@ class TestTimeseries:
             ).count(None)
             == 2
         )
+
+    def test_missing_values_are_nan(self) -> None:
+        ts = TimeSeries([1, None, 3], time_window=(0, 30, 10))
+        assert np.isnan(ts.array[1])
+        assert ts.values == [1, None, 3]
+        assert list(ts) == [1, None, 3]
+        assert ts[1] is None
+
+    def test_set_values(self) -> None:
+        ts = TimeSeries([1, None, 3], time_window=(0, 30, 10))
+        ts.values = [None, 2]
+        assert ts.values == [None, 2]
+        assert len(ts) == 2
+        ts.array = np.array([4.0, np.nan])
+        assert ts.values == [4, None]
+
+    def test_equality_of_missing_values(self) -> None:
+        assert TimeSeries([1, None], time_window=(0, 20, 10)) == TimeSeries(
+            np.array([1.0, np.nan]), time_window=(0, 20, 10)
+        )
+
+
+def _list_based_forward_fill_resample(ts: TimeSeries, twindow: TimeWindow) -> TimeSeriesValues:
+    idx_max = len(ts.values) - 1
+    return [ts.values[max(0, min(int((t - ts.start) / ts.step), idx_max))] for t in range(*twindow)]
+
+
+def _list_based_downsample(ts: TimeSeries, twindow: TimeWindow, cf: str) -> TimeSeriesValues:
+    dwsa = []
+    co: list[float | None] = []
+    desired_times = rrd_timestamps(twindow)
+    i = 0
+    for t, val in ts.time_data_pairs():
+        if t > desired_times[i]:
+            dwsa.append(aggregation_functions(co, cf))
+            co = []
+            i += 1
+        co.append(val)
+
+    diff_len = len(desired_times) - len(dwsa)
+    if diff_len > 0:
+        dwsa.append(aggregation_functions(co, cf))
+        dwsa += [None] * (diff_len - 1)
+
+    return dwsa
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("cf", ["max", "min", "average"])
+def test_benchmark_resampling(cf: str) -> None:
+    # 400 days of one minute values
+    rng = random.Random(42)
+    start, step = 1700000000, 60
+    num_points = 400 * 1440
+    ts = TimeSeries(
+        [None if rng.random() < 0.05 else rng.uniform(0, 100) for _ in range(num_points)],
+        (start, start + num_points * step, step),
+    )
+    coarse = (start, start + num_points * step, 3600)
+    fine = (start, start + num_points * step, 30)
+
+    durations = {}
+    for name, list_based, vectorized in [
+        (
+            "downsample",
+            partial(_list_based_downsample, ts, coarse, cf),
+            partial(ts.downsample, coarse, cf),
+        ),
+        (
+            "forward fill",
+            partial(_list_based_forward_fill_resample, ts, fine),
+            partial(ts.forward_fill_resample, fine),
+        ),
+    ]:
+        begin = time.perf_counter()
+        expected = list_based()
+        list_based_duration = time.perf_counter() - begin
+        begin = time.perf_counter()
+        result = vectorized()
+        vectorized_duration = time.perf_counter() - begin
+
+        assert result == pytest.approx(expected, rel=1e-12)
+        durations[name] = (list_based_duration, vectorized_duration)
+
+    print(
+        f"\nResampling 400 days of one minute values ({cf}): "
+        + ", ".join(
+            f"{name} list based {list_based_duration:.3f}s, vectorized {vectorized_duration:.3f}s"
+            for name, (list_based_duration, vectorized_duration) in durations.items()
+        )
+    )
+    assert all(
+        vectorized_duration < list_based_duration
+        for list_based_duration, vectorized_duration in durations.values()
+    )
@@ -416,6 +416,48 @@ def _create_get_config_sync_file_infos_test_config(base_dir: Path) -> None:
     base_dir.joinpath("links/working-symlink-to-file").symlink_to("../etc/d3/xyz")
 
 
+def test_get_config_sync_file_infos_reuses_file_hashes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    base_dir = cmk.utils.paths.omd_root / "replication"
+    _create_get_config_sync_file_infos_test_config(base_dir)
+    replication_paths = [
+        ReplicationPath("dir", "d4-multiple-files", "etc/d4", []),
+        ReplicationPath("file", "f2", "bla/blub/f2", []),
+    ]
+    expected = activate_changes._get_config_sync_file_infos(replication_paths, base_dir)
+
+    # The test files have just been written
+    monkeypatch.setattr(activate_changes, "_RACY_FILE_AGE_NS", -1)
+    hashed = []
+    create_hash = activate_changes._create_config_sync_file_hash
+
+    def create_hash_recorded(file_path: str) -> str:
+        hashed.append(file_path)
+        return create_hash(file_path)
+
+    monkeypatch.setattr(activate_changes, "_create_config_sync_file_hash", create_hash_recorded)
+
+    def get_file_infos() -> activate_changes.ConfigSyncFileInfos:
+        file_hashes = activate_changes._ConfigSyncFileHashes(tmp_path / "hashes.pkl")
+        file_infos = activate_changes._get_config_sync_file_infos(
+            replication_paths, base_dir, file_hashes=file_hashes
+        )
+        file_hashes.save()
+        return file_infos
+
+    assert get_file_infos() == expected
+    assert len(hashed) == 5
+
+    hashed.clear()
+    assert get_file_infos() == expected
+    assert not hashed
+
+    base_dir.joinpath("etc/d4/x1").write_text("Dong123", encoding="utf-8")
+    assert get_file_infos()["etc/d4/x1"].file_hash == create_hash(str(base_dir / "etc/d4/x1"))
+    assert hashed == [str(base_dir / "etc/d4/x1")]
+
+
 def test_get_file_names_to_sync(request_context: None) -> None:
     remote, central = _get_test_file_infos()
     sync_delta = activate_changes.get_file_names_to_sync(
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import threading
+import time
+from collections import Counter
+
+from livestatus import SiteId
+
+from cmk.automations.results import ServiceDiscoveryResult
+
+from cmk.gui.watolib.bulk_discovery import DiscoveryTask, execute_discovery_tasks
+
+
+def _tasks() -> list[DiscoveryTask]:
+    return [
+        DiscoveryTask(SiteId(site_id), "", [f"{site_id}-{n}"])
+        for site_id, num_tasks in [("central", 3), ("remote1", 2), ("remote2", 1)]
+        for n in range(num_tasks)
+    ]
+
+
+def test_execute_discovery_tasks_concurrently() -> None:
+    lock = threading.Lock()
+    running: Counter[SiteId] = Counter()
+    max_running: Counter[SiteId] = Counter()
+    max_running_total = 0
+
+    def discover(task: DiscoveryTask) -> ServiceDiscoveryResult:
+        nonlocal max_running_total
+        with lock:
+            running[task.site_id] += 1
+            max_running[task.site_id] = max(max_running[task.site_id], running[task.site_id])
+            max_running_total = max(max_running_total, running.total())
+        time.sleep(0.05)
+        with lock:
+            running[task.site_id] -= 1
+        if task.host_names == ["remote1-1"]:
+            raise RuntimeError("unreachable")
+        return ServiceDiscoveryResult({})
+
+    results = list(execute_discovery_tasks(_tasks(), discover, max_tasks=3, max_tasks_per_site=2))
+
+    assert sorted(task.host_names[0] for task, _response in results) == [
+        "central-0",
+        "central-1",
+        "central-2",
+        "remote1-0",
+        "remote1-1",
+        "remote2-0",
+    ]
+    assert [str(response) for _task, response in results if isinstance(response, Exception)] == [
+        "unreachable"
+    ]
+    assert max_running_total == 3
+    assert max(max_running.values()) <= 2
+
+
+def test_execute_discovery_tasks_one_after_another() -> None:
+    order = []
+
+    def discover(task: DiscoveryTask) -> ServiceDiscoveryResult:
+        order.append(task.host_names[0])
+        return ServiceDiscoveryResult({})
+
+    results = list(execute_discovery_tasks(_tasks(), discover, max_tasks=1, max_tasks_per_site=1))
+
+    assert [task.host_names[0] for task, _response in results] == order
+    # The sites take turns
+    assert order == ["central-0", "remote1-0", "remote2-0", "central-1", "remote1-1", "central-2"]
@@ -7,6 +7,7 @@ from collections.abc import Callable, Mapping
 
 # pylint: disable=redefined-outer-name
 from dataclasses import dataclass
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -925,3 +926,127 @@ def test_rules_grouped_by_folder() -> None:
             list(rule[0].path() for rule in rulesets.rules_grouped_by_folder(sorted_rules, root))
             == expected_folder_order
         )
+
+
+def _save_local_rules(values: list[str]) -> Folder:
+    folder = folder_tree().root_folder()
+    all_rulesets = rulesets.AllRulesets.load_all_rulesets()
+    ruleset = all_rulesets.get(RuleGroup.CheckgroupParameters("local"))
+    ruleset.replace_folder_config(
+        folder,
+        [
+            {"id": str(nr), "value": value, "condition": {"host_name": ["HOSTLIST"]}}
+            for nr, value in enumerate(values)
+        ],
+    )
+    all_rulesets.save_folder(folder)
+    return folder
+
+
+def _local_values(collection: rulesets.RulesetCollection) -> list[object]:
+    return [
+        rule.value
+        for _folder, _index, rule in collection.get(
+            RuleGroup.CheckgroupParameters("local")
+        ).get_rules()
+    ]
+
+
+def test_compiled_rules_file_single_ruleset() -> None:
+    with disable_redis():
+        folder = _save_local_rules(["VAL1", "VAL2"])
+
+        compiled = rulesets.CompiledRulesFile(folder).load(RuleGroup.CheckgroupParameters("local"))
+        assert compiled is not None
+        assert [(varname, [r["value"] for r in config]) for varname, config in compiled] == [
+            (RuleGroup.CheckgroupParameters("local"), ["VAL1", "VAL2"])
+        ]
+        assert rulesets.CompiledRulesFile(folder).load("not_configured") == []
+
+        assert _local_values(
+            rulesets.SingleRulesetRecursively.load_single_ruleset_recursively(
+                RuleGroup.CheckgroupParameters("local")
+            )
+        ) == ["VAL1", "VAL2"]
+
+
+def test_compiled_rules_file_is_invalidated() -> None:
+    with disable_redis():
+        folder = _save_local_rules(["VAL1"])
+        rules_file_path = Path(folder.rules_file_path())
+        rules_file_path.write_text(
+            rules_file_path.read_text().replace("'VAL1'", "'CHANGED'"), encoding="utf-8"
+        )
+
+        assert rulesets.CompiledRulesFile(folder).load() is None
+        assert _local_values(rulesets.AllRulesets.load_all_rulesets()) == ["CHANGED"]
+        # Compiled again while loading
+        assert rulesets.CompiledRulesFile(folder).load() is not None
+
+
+def test_compiled_rules_file_is_updated_on_save() -> None:
+    with disable_redis():
+        folder = _save_local_rules(["VAL1"])
+        _save_local_rules(["VAL1", "VAL2"])
+
+        compiled = rulesets.CompiledRulesFile(folder).load()
+        assert compiled is not None
+        assert [[r["value"] for r in config] for _varname, config in compiled] == [["VAL1", "VAL2"]]
+
+        all_rulesets = rulesets.AllRulesets.load_all_rulesets()
+        ruleset = all_rulesets.get(RuleGroup.CheckgroupParameters("local"))
+        for rule in list(ruleset.get_folder_rules(folder)):
+            ruleset.delete_rule(rule, create_change=False)
+        all_rulesets.save_folder(folder)
+        # The empty rules.mk is removed, and so is its cache
+        assert rulesets.CompiledRulesFile(folder).load() is None
+
+
+def test_rule_search_index() -> None:
+    local = RuleGroup.CheckgroupParameters("local")
+    with disable_redis():
+        folder = _save_local_rules(["VAL1", "VAL2"])
+        index = rulesets.RuleSearchIndex.load(folder)
+
+        assert index.fulltext_candidates("hostlist") == frozenset({(local, "0"), (local, "1")})
+        assert index.fulltext_candidates("STLI") == frozenset({(local, "0"), (local, "1")})
+        assert index.fulltext_candidates("nothing") == frozenset()
+        # Regular expressions can not be answered by the index
+        assert index.fulltext_candidates("host.*") is None
+
+        # Saving the rules updates the index
+        _save_local_rules(["VAL1"])
+        assert rulesets.RuleSearchIndex.load(folder).fulltext_candidates("hostlist") == frozenset(
+            {(local, "0")}
+        )
+
+
+def test_rule_search_index_is_rendered_again(monkeypatch: pytest.MonkeyPatch) -> None:
+    with disable_redis():
+        folder = _save_local_rules(["VAL1"])
+        assert rulesets.RuleSearchIndex.load(folder).fulltext_candidates("renamed") == frozenset()
+
+        # The rendered values depend on e.g. the titles of time periods
+        monkeypatch.setattr(Rule, "value_text", lambda self: "Renamed time period")
+        Path(rulesets.wato_root_dir(), "timeperiods.mk").write_text("timeperiods.update({})\n")
+        assert rulesets.RuleSearchIndex.load(folder).fulltext_candidates("renamed") == frozenset(
+            {(RuleGroup.CheckgroupParameters("local"), "0")}
+        )
+
+
+def test_rule_search_index_regex_conditions() -> None:
+    folder = folder_tree().root_folder()
+    with disable_redis():
+        all_rulesets = rulesets.AllRulesets.load_all_rulesets()
+        ruleset = all_rulesets.get(RuleGroup.CheckgroupParameters("local"))
+        ruleset.replace_folder_config(
+            folder, [{"id": "1", "value": "VAL", "condition": {"host_name": [{"$regex": "web"}]}}]
+        )
+        all_rulesets.save_folder(folder)
+
+        # The regex of the condition is matched against the search
+        assert ruleset.matches_search_with_rules({"fulltext": "webserver"})
+        assert rulesets.RuleSearchIndex.load(folder).fulltext_candidates("webserver") == frozenset(
+            {(RuleGroup.CheckgroupParameters("local"), "1")}
+        )
+        assert not ruleset.matches_search_with_rules({"fulltext": "mailserver"})
@@ -1210,3 +1210,63 @@ def test_subfolder_cache_invalidated() -> None:
     # subfolders are part of the tree
     with pytest.raises(AssertionError):
         assert subfolder.effective_attributes()["alias"] == "other_alias"
+
+
+def _create_hosts(folder: Folder, num_hosts: int) -> None:
+    folder.create_hosts(
+        [
+            (
+                HostName(f"host-{n}"),
+                HostAttributes(ipaddress=HostAddress(f"127.0.0.{n}"), labels={"n": str(n)}),
+                None,
+            )
+            for n in range(num_hosts)
+        ]
+    )
+
+
+def test_save_changed_hosts_only(monkeypatch: MonkeyPatch) -> None:
+    folder = folder_tree().root_folder()
+    hosts_file = folder.hosts_file_path()
+    with time_machine.travel(datetime.datetime(2024, 1, 1, tzinfo=ZoneInfo("UTC")), tick=False):
+        _create_hosts(folder, 5)
+        compute_fragment = MagicMock(wraps=hosts_and_folders._compute_hosts_file_fragment)
+        monkeypatch.setattr(hosts_and_folders, "_compute_hosts_file_fragment", compute_fragment)
+
+        folder.load_host(HostName("host-2")).edit(
+            HostAttributes(ipaddress=HostAddress("10.0.0.2"), alias="Two"), None
+        )
+        assert [call.args[0] for call in compute_fragment.call_args_list] == ["host-2"]
+        with open(hosts_file, "rb") as f:
+            incremental = f.read()
+
+        folder.save_hosts()
+        assert compute_fragment.call_count == 6
+        with open(hosts_file, "rb") as f:
+            assert f.read() == incremental
+
+    assert b"10.0.0.2" in incremental
+    assert b"Two" in incremental
+
+
+def test_save_hosts_batched(monkeypatch: MonkeyPatch) -> None:
+    folder = folder_tree().root_folder()
+    _create_hosts(folder, 3)
+    save_hosts_file = MagicMock(wraps=folder._save_hosts_file)
+    monkeypatch.setattr(folder, "_save_hosts_file", save_hosts_file)
+
+    with hosts_and_folders.save_hosts_batched():
+        for host_name in ["host-0", "host-1"]:
+            folder.load_host(HostName(host_name)).update_attributes(
+                HostAttributes(alias=f"alias {host_name}")
+            )
+        save_hosts_file.assert_not_called()
+
+    save_hosts_file.assert_called_once_with({"host-0", "host-1"})
+    folder_tree().invalidate_caches()
+    hosts = folder_tree().root_folder().hosts()
+    assert [host.attributes.get("alias") for _name, host in sorted(hosts.items())] == [
+        "alias host-0",
+        "alias host-1",
+        None,
+    ]
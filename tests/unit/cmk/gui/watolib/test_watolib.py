@@ -92,6 +92,7 @@ def test_registered_configvars() -> None:
         "archive_orphans",
         "auth_by_http_header",
         "builtin_icon_visibility",
+        "bulk_discovery_concurrency",
         "bulk_discovery_default_settings",
         "check_mk_perfdata_with_times",
         "cluster_max_cachefile_age",
@@ -123,6 +124,7 @@ def test_registered_configvars() -> None:
         "inventory_check_autotrigger",
         "inventory_check_interval",
         "inventory_check_severity",
+        "livestatus_result_cache",
         "log_logon_failures",
         "lock_on_logon_failures",
         "log_level",
@@ -148,6 +150,7 @@ def test_registered_configvars() -> None:
         "password_policy",
         "piggyback_hub_enabled",
         "piggyback_max_cachefile_age",
+        "plugin_timing_stats",
         "profile",
         "quicksearch_dropdown_limit",
         "quicksearch_search_order",
@@ -158,6 +161,7 @@ def test_registered_configvars() -> None:
         "restart_locking",
         "retention_interval",
         "rrdcached_tuning",
+        "rule_matching_processes",
         "rule_optimizer",
         "ruleset_matching_stats",
         "selection_livetime",
@@ -6,6 +6,7 @@
 # pylint: disable=protected-access
 
 import pprint
+import time
 
 import cmk.utils.log
 import cmk.utils.paths
@@ -48,6 +49,19 @@ def test_store_piggyback_raw_data_simple() -> None:
     assert stored.raw_data == b"line1\nline2\n"
 
 
+def test_store_piggyback_raw_data_now() -> None:
+    now = time.time()
+    piggyback.store_piggyback_raw_data(
+        HostAddress("source"), {_TEST_HOST_NAME: _PAYLOAD}, now, cmk.utils.paths.omd_root
+    )
+
+    stored = _get_only_raw_data_element(_TEST_HOST_NAME)
+
+    assert stored.meta.last_update == int(now)
+    assert stored.meta.last_contact == int(now)
+    assert stored.raw_data == b"pay\nload\n"
+
+
 def test_get_piggyback_raw_data_not_updated() -> None:
     piggyback.store_piggyback_raw_data(
         HostAddress("source1"), {_TEST_HOST_NAME: _PAYLOAD}, _REF_TIME, cmk.utils.paths.omd_root
@@ -197,3 +211,19 @@ def test_get_source_and_piggyback_hosts() -> None:
             ),
         ],
     }
+
+
+def test_get_sources_for() -> None:
+    for source in ("source2", "source1"):
+        piggyback.store_piggyback_raw_data(
+            HostAddress(source),
+            {HostAddress("test-host"): _PAYLOAD},
+            _REF_TIME,
+            cmk.utils.paths.omd_root,
+        )
+
+    assert piggyback.get_sources_for(HostAddress("test-host"), cmk.utils.paths.omd_root) == [
+        HostAddress("source1"),
+        HostAddress("source2"),
+    ]
+    assert not piggyback.get_sources_for(HostAddress("no-host"), cmk.utils.paths.omd_root)
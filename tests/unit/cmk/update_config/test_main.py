@@ -6,12 +6,14 @@
 # pylint: disable=protected-access
 
 import logging
-from collections.abc import Iterator
+from collections.abc import Iterator, Sequence
 from pathlib import Path
 
 import pytest
 from pytest_mock import MockerFixture
 
+from cmk.ccc.exceptions import MKGeneralException
+
 import cmk.utils.paths
 
 from cmk.update_config import main, registry
@@ -105,6 +107,58 @@ def test_config_updater_executes_plugins(
     assert mock_plugin.calls == 1
 
 
+class MockParallelUpdateAction(registry.ParallelUpdateAction[int]):
+    def items(self, logger: logging.Logger) -> Sequence[int]:
+        return range(1, 21)
+
+    def update_item(self, item: int) -> Sequence[str]:
+        if item % 7 == 0:
+            raise ValueError(f"broken {item}")
+        return [f"odd {item}"] if item % 5 == 1 else []
+
+
+@pytest.mark.parametrize("processes", [1, 3])
+def test_update_items(caplog: pytest.LogCaptureFixture, processes: int) -> None:
+    action = MockParallelUpdateAction(name="test", title="Test Title", sort_index=4)
+
+    with caplog.at_level(logging.WARNING):
+        with pytest.raises(MKGeneralException, match="Failed to update 2 of 20 items"):
+            registry.update_items(action, logging.getLogger(), processes)
+
+    # The report is in the order of the items, independent of the processes
+    assert [record.getMessage().strip() for record in caplog.records] == [
+        "1: odd 1",
+        "6: odd 6",
+        "+ 7: broken 7",
+        "11: odd 11",
+        "+ 14: broken 14",
+        "16: odd 16",
+    ]
+
+
+def test_config_updater_executes_parallel_plugins(
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockerFixture,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    packages_dir = Path(cmk.utils.paths.var_dir, "packages")
+    packages_dir.mkdir(parents=True, exist_ok=True)
+    monkeypatch.setattr(cmk.utils.paths, "installed_packages_dir", packages_dir)
+    reg = registry.UpdateActionRegistry()
+    reg.register(MockParallelUpdateAction(name="test", title="Test Title", sort_index=4))
+    mocker.patch.object(main, "pre_update_action_registry", registry.PreUpdateActionRegistry())
+    mocker.patch.object(main, "update_action_registry", reg)
+    mocker.patch.object(main, "_initialize_base_environment")
+
+    assert main.main(["-v", "--jobs", "2"], ensure_site_is_stopped_callback=lambda _: None) == 1
+
+    output = capsys.readouterr().out
+    assert "01/01 Test Title..." in output
+    assert "20/20 done" in output
+    assert "took " in output
+    assert output.endswith("Done (with errors)\n")
+
+
 def test_load_plugins() -> None:
     main._load_plugins(logging.getLogger())
     assert registry.update_action_registry
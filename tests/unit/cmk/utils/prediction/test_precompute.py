@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# Copyright (C) 2024 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import os
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from cmk.utils.hostaddress import HostName
+from cmk.utils.prediction import (
+    find_due_predictions,
+    make_updated_predictions,
+    precompute_predictions,
+    PredictionStore,
+)
+
+from cmk.agent_based.prediction_backend import PredictionInfo, PredictionParameters
+
+_HOST_NAME = HostName("heute")
+_SERVICE_DESCRIPTION = "CPU load"
+
+
+@dataclass(frozen=True)
+class _MetricRecord:
+    window: range
+    values: Sequence[float | None]
+
+
+def _get_recorded_data(_metric: str, start: int, end: int) -> _MetricRecord:
+    return _MetricRecord(range(start, end, 3600), [float(t % 7) for t in range(start, end, 3600)])
+
+
+def _make_get_recorded_data(
+    _host_name: HostName, _service_description: str
+) -> Callable[[str, int, int], _MetricRecord]:
+    return _get_recorded_data
+
+
+def _fail(_metric: str, _start: int, _end: int) -> _MetricRecord:
+    raise AssertionError("the check must not compute the prediction")
+
+
+def _meta(now: float) -> PredictionInfo:
+    return PredictionInfo.make(
+        "load1",
+        "upper",
+        PredictionParameters(period="wday", horizon=14, levels=("absolute", (2.0, 4.0))),
+        now,
+    )
+
+
+@pytest.fixture(name="store")
+def _store(tmp_path: Path) -> PredictionStore:
+    return PredictionStore(tmp_path / _HOST_NAME / "CPU_load")
+
+
+def test_find_due_predictions(store: PredictionStore) -> None:
+    current = _meta(1700000000)
+    store.save_prediction_info(current)
+    upcoming = _meta(current.valid_interval[1])
+
+    stores = [(_HOST_NAME, _SERVICE_DESCRIPTION, store)]
+    early = current.valid_interval[0] + 3600
+    assert [job.meta for job in find_due_predictions(stores, early, 3600)] == [current]
+
+    late = current.valid_interval[1] - 1800
+    jobs = find_due_predictions(stores, late, 3600)
+    assert [job.meta for job in jobs] == [current, upcoming]
+    assert {(job.host_name, job.service_description, job.store_path) for job in jobs} == {
+        (_HOST_NAME, _SERVICE_DESCRIPTION, store.path)
+    }
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_precompute_predictions(store: PredictionStore, processes: int) -> None:
+    current = _meta(1700000000)
+    store.save_prediction_info(current)
+    late = current.valid_interval[1] - 1800
+    stores = [(_HOST_NAME, _SERVICE_DESCRIPTION, store)]
+    jobs = find_due_predictions(stores, late, 3600)
+
+    results = list(precompute_predictions(jobs, _make_get_recorded_data, processes))
+
+    assert [result.job for result in results] == list(jobs)
+    assert all(result.computed for result in results)
+    assert not find_due_predictions(stores, late, 3600)
+    assert all(store.has_up_to_date_prediction(job.meta) for job in jobs)
+
+
+def test_check_only_reads_precomputed_predictions(store: PredictionStore) -> None:
+    current = _meta(1700000000)
+    store.save_prediction_info(current)
+    now = current.valid_interval[1] - 1800
+    upcoming = _meta(current.valid_interval[1])
+    list(
+        precompute_predictions(
+            find_due_predictions([(_HOST_NAME, _SERVICE_DESCRIPTION, store)], now, 3600),
+            _make_get_recorded_data,
+            1,
+        )
+    )
+
+    assert hash(current) in make_updated_predictions(store, _fail, now)
+    assert hash(upcoming) in make_updated_predictions(store, _fail, upcoming.valid_interval[0])
+
+
+def test_outdated_info_invalidates_prediction(store: PredictionStore) -> None:
+    current = _meta(1700000000)
+    store.save_prediction_info(current)
+    now = current.valid_interval[0] + 3600
+    list(
+        precompute_predictions(
+            find_due_predictions([(_HOST_NAME, _SERVICE_DESCRIPTION, store)], now, 3600),
+            _make_get_recorded_data,
+            1,
+        )
+    )
+    assert store.has_up_to_date_prediction(current)
+
+    changed = current.model_copy(
+        update={"params": current.params.model_copy(update={"horizon": 28})}
+    )
+    store.save_prediction_info(changed)
+    # Make sure the info file is newer, even with a coarse file system timestamp resolution
+    info_file = next(iter(store.iter_all_metadata_files()))
+    os.utime(info_file, (now, info_file.stat().st_mtime + 1))
+
+    assert not store.has_up_to_date_prediction(current)
+    assert [meta for meta, prediction in store.iter_all_valid_predictions(now)] == [changed]
+    assert all(prediction is None for _meta, prediction in store.iter_all_valid_predictions(now))
+
+
+def test_save_prediction_info_replaces_file(store: PredictionStore) -> None:
+    current = _meta(1700000000)
+    store.save_prediction_info(current)
+    info_file = next(iter(store.iter_all_metadata_files()))
+    inode = info_file.stat().st_ino
+
+    store.save_prediction_info(current)
+    # A reader that opened the old file keeps reading a complete one
+    assert info_file.stat().st_ino != inode
+    assert [path.name for path in info_file.parent.iterdir()] == [info_file.name]
@@ -6,6 +6,9 @@
 # pylint: disable=protected-access
 
 import json
+import math
+import random
+from collections.abc import Iterable, Sequence
 
 import pytest
 
@@ -13,7 +16,7 @@ from tests.testlib.repo import repo_path
 
 from livestatus import RRDResponse
 
-from cmk.utils.prediction import _prediction
+from cmk.utils.prediction import _prediction, DataStat
 
 
 def _load_fake_rrd_response(start: int, end: int) -> RRDResponse:
@@ -210,3 +213,123 @@ def test_calculate_data_for_prediction(
     assert len(expected_reference.points) == len(data_for_pred.points)
     for cal, ref in zip(data_for_pred.points, expected_reference.points):
         assert cal == pytest.approx(ref, rel=1e-12, abs=1e-12)
+
+
+def _list_based_forward_fill_resample(
+    current_range: range, values: Sequence[float | None], new_range: range
+) -> Sequence[float | None]:
+    # The list based implementation which was used before the vectorization
+    if current_range == new_range:
+        return values
+
+    idx_max = len(values) - 1
+    return [
+        values[max(0, min(int((t - current_range.start) / current_range.step), idx_max))]
+        for t in new_range
+    ]
+
+
+def _list_based_data_stats(slices: Iterable[Iterable[float | None]]) -> list[DataStat | None]:
+    def _from_values(values: Sequence[float]) -> DataStat:
+        average = sum(values) / float(len(values))
+        samples = len(values)
+        return DataStat(
+            average=average,
+            min_=min(values),
+            max_=max(values),
+            stdev=(
+                None
+                if samples == 1
+                else math.sqrt(
+                    abs(sum(p**2 for p in values) - average**2 * samples) / float(samples - 1)
+                )
+            ),
+        )
+
+    return [
+        _from_values(point_line)
+        if (point_line := [x for x in time_column if x is not None])
+        else None
+        for time_column in zip(*slices)
+    ]
+
+
+def _list_based_calculate_data_for_prediction(
+    youngest_range: range,
+    raw_slices: Sequence[tuple[range, Sequence[float | None], int]],
+) -> _prediction.PredictionData:
+    return _prediction.PredictionData(
+        points=_list_based_data_stats(
+            [
+                _list_based_forward_fill_resample(
+                    current_range,
+                    values,
+                    range(
+                        youngest_range.start - shift,
+                        youngest_range.stop - shift,
+                        youngest_range.step,
+                    ),
+                )
+                for current_range, values, shift in raw_slices
+            ]
+        ),
+        start=youngest_range.start,
+        step=youngest_range.step,
+    )
+
+
+def _random_raw_slices(
+    rng: random.Random, num_slices: int, num_points: int, step: int
+) -> list[tuple[range, Sequence[float | None], int]]:
+    youngest_start = 1700000000
+    raw_slices: list[tuple[range, Sequence[float | None], int]] = []
+    for slice_idx in range(num_slices):
+        shift = slice_idx * 86400
+        # Older slices have a coarser resolution
+        slice_step = step * (1 + slice_idx % 3)
+        start = youngest_start - shift
+        window = range(start, start + num_points * step, slice_step)
+        raw_slices.append(
+            (
+                window,
+                [
+                    None if rng.random() < 0.1 else rng.choice([-0.0, 0, 1e15, rng.uniform(-5, 50)])
+                    for _t in window
+                ],
+                shift,
+            )
+        )
+    return raw_slices
+
+
+def _assert_same_prediction(
+    vectorized: _prediction.PredictionData, list_based: _prediction.PredictionData
+) -> None:
+    assert (vectorized.start, vectorized.step) == (list_based.start, list_based.step)
+    assert len(vectorized.points) == len(list_based.points)
+    for vectorized_point, list_based_point in zip(vectorized.points, list_based.points):
+        if vectorized_point is None or list_based_point is None:
+            assert vectorized_point is list_based_point
+            continue
+        assert vectorized_point._replace(stdev=None) == list_based_point._replace(stdev=None)
+        # numpy squares by multiplication, Python by pow(). This may differ in the last bit.
+        assert vectorized_point.stdev == pytest.approx(list_based_point.stdev, rel=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_calculate_data_for_prediction_matches_list_based_implementation(seed: int) -> None:
+    raw_slices = _random_raw_slices(random.Random(seed), num_slices=13, num_points=500, step=60)
+    _assert_same_prediction(
+        _prediction._calculate_data_for_prediction(raw_slices[0][0], raw_slices),
+        _list_based_calculate_data_for_prediction(raw_slices[0][0], raw_slices),
+    )
+
+
+@pytest.mark.slow
+def test_calculate_data_for_prediction_over_90_days() -> None:
+    # 90 days horizon with one minute steps
+    raw_slices = _random_raw_slices(random.Random(42), num_slices=90, num_points=1440, step=60)
+    _assert_same_prediction(
+        _prediction._calculate_data_for_prediction(raw_slices[0][0], raw_slices),
+        _list_based_calculate_data_for_prediction(raw_slices[0][0], raw_slices),
+    )
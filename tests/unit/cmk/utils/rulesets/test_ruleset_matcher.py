@@ -274,6 +274,29 @@ def test_basic_get_host_values() -> None:
     assert list(matcher.get_host_values(HostName("host2"), ruleset=ruleset)) == ["BLUB"]
 
 
+def test_get_host_rule_indexes() -> None:
+    hostnames = [HostName("abc"), HostName("host1"), HostName("host2")]
+    matcher = RulesetMatcher(
+        host_tags={hostname: {} for hostname in hostnames},
+        host_paths={},
+        label_manager=LabelManager(
+            explicit_host_labels={},
+            host_label_rules=(),
+            service_label_rules=(),
+            discovered_labels_of_service=lambda *args, **kw: {},
+        ),
+        all_configured_hosts=frozenset(hostnames),
+        clusters_of={},
+        nodes_of={},
+        builtin_host_labels_store=BuiltinHostLabelsStore(),
+    )
+
+    assert matcher.ruleset_optimizer.get_host_rule_indexes(ruleset, with_foreign_hosts=False) == {
+        HostName("host1"): [0, 1],
+        HostName("host2"): [1],
+    }
+
+
 def test_basic_get_host_values_subfolders() -> None:
     matcher = RulesetMatcher(
         host_tags={
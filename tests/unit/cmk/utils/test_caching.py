@@ -45,3 +45,76 @@ def test_populated() -> None:
     assert cache.is_populated()
     cache.clear()
     assert not cache.is_populated()
+
+
+def test_statistics() -> None:
+    mgr = cmk.utils.caching.CacheManager()
+
+    cache = mgr.obtain_cache("test")
+    cache.update({"a": 1, "b": 2})
+
+    statistics = mgr.statistics()["test"]
+    assert statistics.entries == 2
+    assert statistics.size > 0
+    assert statistics.evictions == 0
+    assert mgr.dump_sizes() == {"test": statistics.size}
+
+
+def test_evict_least_recently_used() -> None:
+    mgr = cmk.utils.caching.CacheManager()
+
+    unbounded = mgr.obtain_cache("unbounded")
+    cache = mgr.obtain_cache("evictable", evictable=True)
+    for key in "abcd":
+        cache[key] = unbounded[key] = key * 100
+    mgr.set_max_size(10000)
+    entry_size = cache.statistics().size // 4
+
+    mgr.set_max_size(3 * entry_size)
+    assert list(cache) == ["b", "c", "d"]
+    assert len(unbounded) == 4
+
+    assert cache["b"] == "b" * 100
+    cache.setdefault("e", "e" * 100)
+    assert list(cache) == ["d", "b", "e"]
+    assert cache.statistics() == (3, 3 * entry_size, 2)
+
+    del cache["d"]
+    assert cache.statistics() == (2, 2 * entry_size, 2)
+
+    mgr.clear_all()
+    assert cache.statistics() == (0, 0, 2)
+
+
+def test_evictable_cache_keeps_newest_entry() -> None:
+    mgr = cmk.utils.caching.CacheManager()
+    mgr.set_max_size(1)
+
+    cache = mgr.obtain_cache("test", evictable=True)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache == {"b": 2}
+    assert cache.statistics().evictions == 1
+
+    mgr.set_max_size(None)
+    cache["a"] = 1
+    assert cache == {"b": 2, "a": 1}
+
+
+def test_new_evictable_cache() -> None:
+    mgr = cmk.utils.caching.CacheManager()
+    mgr.set_max_size(10000)
+
+    cache = mgr.new_evictable_cache("test")
+    other_cache = mgr.new_evictable_cache("test")
+    assert cache is not other_cache
+    assert "test" not in mgr
+    assert cache.is_evictable()
+
+    cache["a"] = 1
+    other_cache.update({"a": 2, "b": 3})
+    assert cache == {"a": 1}
+    assert mgr.statistics()["test"].entries == 3
+
+    del other_cache
+    assert mgr.statistics()["test"].entries == 1
@@ -8,9 +8,10 @@
 # pylint: disable=redefined-outer-name
 
 import errno
+import os
 import socket
 import ssl
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from contextlib import closing
 from pathlib import Path
 
@@ -152,6 +153,146 @@ def test_livestatus_ipv6_connection() -> None:
         live.connect()
 
 
+@pytest.fixture(name="listening_socket")
+def fixture_listening_socket() -> Iterator[socket.socket]:
+    with closing(socket.socket(socket.AF_INET)) as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(5)
+        yield sock
+
+
+@pytest.fixture(name="connection_pool")
+def fixture_connection_pool(monkeypatch: MonkeyPatch) -> Iterator[livestatus.ConnectionPool]:
+    pool = livestatus.ConnectionPool()
+    monkeypatch.setattr("cmk.livestatus_client.connection_pool", pool)
+    yield pool
+    pool.clear()
+
+
+def _connect(listening_socket: socket.socket, persist: bool) -> livestatus.SingleSiteConnection:
+    live = livestatus.SingleSiteConnection(
+        "tcp:127.0.0.1:%d" % listening_socket.getsockname()[1], persist=persist
+    )
+    live.connect()
+    return live
+
+
+def test_persistent_connection_is_reused(
+    listening_socket: socket.socket, connection_pool: livestatus.ConnectionPool
+) -> None:
+    live = _connect(listening_socket, persist=True)
+    site_socket = live.socket
+    assert not live.successfully_persisted()
+    live.release()
+    assert live.socket is None
+
+    # Another connection, e.g. of the next request, takes over the socket
+    live = _connect(listening_socket, persist=True)
+    assert live.socket is site_socket
+    assert live.successfully_persisted()
+
+    # ... and it is not shared with concurrent connections
+    assert _connect(listening_socket, persist=True).socket is not site_socket
+    assert _connect(listening_socket, persist=False).socket is not site_socket
+
+    assert connection_pool.statistics() == livestatus.ConnectionPoolStatistics(
+        reused=1, connected=2, evicted=0
+    )
+
+
+def test_connection_without_persistence_is_closed(
+    listening_socket: socket.socket, connection_pool: livestatus.ConnectionPool
+) -> None:
+    live = _connect(listening_socket, persist=False)
+    site_socket = live.socket
+    assert site_socket is not None
+    live.release()
+
+    assert site_socket.fileno() == -1
+    assert _connect(listening_socket, persist=True).socket is not site_socket
+    assert connection_pool.statistics() == livestatus.ConnectionPoolStatistics(
+        reused=0, connected=1, evicted=0
+    )
+
+
+def test_persistent_connection_closed_by_peer_is_evicted(
+    listening_socket: socket.socket, connection_pool: livestatus.ConnectionPool
+) -> None:
+    live = _connect(listening_socket, persist=True)
+    site_socket = live.socket
+    listening_socket.accept()[0].close()
+    live.release()
+
+    assert _connect(listening_socket, persist=True).socket is not site_socket
+    assert connection_pool.statistics() == livestatus.ConnectionPoolStatistics(
+        reused=0, connected=2, evicted=1
+    )
+
+
+def test_persistent_connection_with_pending_response_is_closed(
+    listening_socket: socket.socket, connection_pool: livestatus.ConnectionPool
+) -> None:
+    live = _connect(listening_socket, persist=True)
+    site_socket = live.socket
+    assert site_socket is not None
+    peer = listening_socket.accept()[0]
+    live.send_query("GET hosts\nColumns: name")
+    # The query is interrupted, e.g. by a timeout, before the response arrives
+    live.release()
+
+    assert site_socket.fileno() == -1
+    live = _connect(listening_socket, persist=True)
+    assert live.socket is not site_socket
+    assert not live.successfully_persisted()
+    peer.close()
+
+
+def test_persistent_connection_with_read_response_is_reused(
+    listening_socket: socket.socket, connection_pool: livestatus.ConnectionPool
+) -> None:
+    live = _connect(listening_socket, persist=True)
+    site_socket = live.socket
+    peer = listening_socket.accept()[0]
+    peer.sendall(b'200          12\n[["heute"]]\n')
+    assert live.query("GET hosts\nColumns: name") == [["heute"]]
+    live.release()
+
+    assert _connect(listening_socket, persist=True).socket is site_socket
+    peer.close()
+
+
+def test_idle_persistent_connection_is_evicted(
+    listening_socket: socket.socket, connection_pool: livestatus.ConnectionPool
+) -> None:
+    connection_pool.idle_timeout = 0
+    live = _connect(listening_socket, persist=True)
+    site_socket = live.socket
+    live.release()
+
+    assert _connect(listening_socket, persist=True).socket is not site_socket
+    assert connection_pool.statistics().evicted == 1
+
+
+def test_forked_child_does_not_use_idle_persistent_connections(
+    listening_socket: socket.socket, connection_pool: livestatus.ConnectionPool
+) -> None:
+    live = _connect(listening_socket, persist=True)
+    site_socket = live.socket
+    peer = listening_socket.accept()[0]
+    live.release()
+
+    if (pid := os.fork()) == 0:
+        live = _connect(listening_socket, persist=True)
+        os._exit(0 if live.socket is not site_socket and not live.successfully_persisted() else 1)
+    assert os.waitpid(pid, 0)[1] == 0
+
+    # The parent still owns the connection, the child has neither used nor shut it down
+    with pytest.raises(BlockingIOError):
+        peer.recv(1, socket.MSG_DONTWAIT)
+    assert _connect(listening_socket, persist=True).socket is site_socket
+    peer.close()
+
+
 @pytest.mark.parametrize(
     "socket_url,result",
     [